@@ -1,5 +1,6 @@
-from flask import Blueprint, jsonify
-from core.binance_client import BinanceClient
+from flask import Blueprint, jsonify, request
+from core.binance_client import get_binance_client
+from core.price_snapshot import PriceSnapshot
 import os
 
 binance_prices_bp = Blueprint('binance_prices', __name__)
@@ -9,7 +10,7 @@ use_binance = os.getenv('USE_BINANCE_API', 'true').lower() == 'true'
 
 if use_binance:
     try:
-        binance_client = BinanceClient()
+        binance_client = get_binance_client()
         print("✅ BinanceClient carregado para preços em tempo real")
     except Exception as e:
         print(f"⚠️ Erro ao carregar BinanceClient: {e}")
@@ -18,35 +19,48 @@ else:
     print("🔒 Binance API desabilitada para preços")
     binance_client = None
 
+# Snapshot compartilhado: uma chamada à Binance por intervalo para todos os usuários
+price_snapshot = PriceSnapshot(binance_client)
+
+def _binance_available() -> bool:
+    return bool(binance_client and getattr(binance_client, 'use_binance_api', False))
+
 @binance_prices_bp.route('/api/binance/price/<symbol>')
 def get_symbol_price(symbol):
     """
-    Obtém o preço atual de um símbolo da Binance
+    Obtém o preço atual de um símbolo a partir do snapshot compartilhado
     
     Args:
         symbol: Símbolo da moeda (ex: ETHUSDT)
         
     Returns:
-        JSON com o preço atual
+        JSON com o preço atual e a idade do snapshot
     """
     try:
-        if not binance_client or not hasattr(binance_client, 'use_binance_api') or not binance_client.use_binance_api:
+        if not _binance_available():
             return jsonify({
                 'success': False,
                 'error': 'Binance API não disponível',
                 'price': None
             }), 503
         
-        # Buscar preço atual via API da Binance
-        response = binance_client.make_request(f'/fapi/v1/ticker/price?symbol={symbol}')
+        symbol = symbol.upper()
+        snapshot = price_snapshot.get_price(symbol)
+        
+        if not snapshot['available']:
+            return jsonify({
+                'success': False,
+                'error': 'Snapshot de preços indisponível',
+                'price': None
+            }), 503
         
-        if response and 'price' in response:
-            price = float(response['price'])
+        if symbol in snapshot['prices']:
             return jsonify({
                 'success': True,
                 'symbol': symbol,
-                'price': price,
-                'timestamp': response.get('timestamp', None)
+                'price': snapshot['prices'][symbol],
+                'timestamp': snapshot['updated_at'],
+                'age_ms': snapshot['age_ms']
             })
         else:
             return jsonify({
@@ -66,39 +80,41 @@ def get_symbol_price(symbol):
 @binance_prices_bp.route('/api/binance/prices')
 def get_multiple_prices():
     """
-    Obtém preços de múltiplos símbolos da Binance
+    Obtém preços de múltiplos símbolos a partir do snapshot compartilhado
+    
+    Query params:
+        symbols: Lista separada por vírgula (ex: BTCUSDT,ETHUSDT); ausente = todos
     
     Returns:
-        JSON com preços de todos os símbolos
+        JSON com preços, símbolos não encontrados e idade do snapshot
     """
     try:
-        if not binance_client or not hasattr(binance_client, 'use_binance_api') or not binance_client.use_binance_api:
+        if not _binance_available():
             return jsonify({
                 'success': False,
                 'error': 'Binance API não disponível',
                 'prices': {}
             }), 503
         
-        # Buscar todos os preços via API da Binance
-        response = binance_client.make_request('/fapi/v1/ticker/price')
+        symbols_param = request.args.get('symbols', '')
+        symbols = [s.strip().upper() for s in symbols_param.split(',') if s.strip()] or None
+        snapshot = price_snapshot.get_prices(symbols)
         
-        if response and isinstance(response, list):
-            prices = {}
-            for item in response:
-                if 'symbol' in item and 'price' in item:
-                    prices[item['symbol']] = float(item['price'])
-            
+        if snapshot['available']:
             return jsonify({
                 'success': True,
-                'prices': prices,
-                'count': len(prices)
+                'prices': snapshot['prices'],
+                'count': len(snapshot['prices']),
+                'missing': snapshot['missing'],
+                'timestamp': snapshot['updated_at'],
+                'age_ms': snapshot['age_ms']
             })
         else:
             return jsonify({
                 'success': False,
                 'error': 'Erro ao buscar preços',
                 'prices': {}
-            }), 500
+            }), 503
             
     except Exception as e:
         print(f"❌ Erro ao buscar preços múltiplos: {e}")
@@ -106,4 +122,9 @@ def get_multiple_prices():
             'success': False,
             'error': str(e),
             'prices': {}
-        }), 500
\ No newline at end of file
+        }), 500
+
+@binance_prices_bp.route('/api/binance/prices/status')
+def get_prices_status():
+    """Estatísticas do snapshot de preços (idade, atualizações, falhas)"""
+    return jsonify({'success': True, 'data': price_snapshot.get_stats()})
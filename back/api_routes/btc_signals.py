@@ -4,14 +4,18 @@ from middleware.auth_middleware import jwt_required, get_current_user
 from core.database import Database
 from core.btc_signal_manager import BTCSignalManager
 from core.signal_confirmation_system import SignalConfirmationSystem
-from core.binance_client import BinanceClient
+from core.binance_client import get_binance_client
 from core.btc_correlation_analyzer import BTCCorrelationAnalyzer
+from core.response_cache import response_cache
+from core.json_provider import format_legacy_values
+from core.logger import setup_logger
 import traceback
 from datetime import datetime
 import pytz
 
 # Criar blueprint
 btc_signals_bp = Blueprint('btc_signals', __name__, url_prefix='/api/btc-signals')
+logger = setup_logger('api_routes.btc_signals')
 
 # Instâncias globais (serão inicializadas no app principal)
 btc_signal_manager = None
@@ -24,7 +28,7 @@ def init_btc_signals_routes(db_instance: Database, btc_manager: BTCSignalManager
     btc_signal_manager = btc_manager
     
     # Inicializar sistemas auxiliares
-    binance_client = BinanceClient()
+    binance_client = get_binance_client()
     confirmation_system = SignalConfirmationSystem(binance_client)
     btc_analyzer = BTCCorrelationAnalyzer(binance_client)
     
@@ -34,7 +38,7 @@ def init_btc_signals_routes(db_instance: Database, btc_manager: BTCSignalManager
 def get_pending_signals():
     """Retorna lista de sinais aguardando confirmação - Rota pública para dashboard"""
     try:
-        print('📊 Processando requisição para /api/btc-signals/pending')
+        logger.debug('📊 Processando requisição para /api/btc-signals/pending')
         
         if not btc_signal_manager:
             return jsonify({
@@ -55,7 +59,7 @@ def get_pending_signals():
         })
         
     except Exception as e:
-        print(f"❌ Erro ao obter sinais pendentes: {e}")
+        logger.error(f"❌ Erro ao obter sinais pendentes: {e}")
         traceback.print_exc()
         return jsonify({
             'success': False,
@@ -117,7 +121,7 @@ def start_monitoring():
             }), 500
         
     except Exception as e:
-        print(f"❌ Erro ao iniciar monitoramento: {e}")
+        logger.error(f"❌ Erro ao iniciar monitoramento: {e}")
         traceback.print_exc()
         return jsonify({
             'success': False,
@@ -167,7 +171,7 @@ def stop_monitoring():
         })
         
     except Exception as e:
-        print(f"❌ Erro ao parar monitoramento: {e}")
+        logger.error(f"❌ Erro ao parar monitoramento: {e}")
         traceback.print_exc()
         return jsonify({
             'success': False,
@@ -222,7 +226,7 @@ def get_daily_signals_status():
         })
         
     except Exception as e:
-        print(f"❌ Erro ao obter status diário: {e}")
+        logger.error(f"❌ Erro ao obter status diário: {e}")
         traceback.print_exc()
         return jsonify({
             'success': False,
@@ -235,7 +239,7 @@ def get_daily_signals_status():
 def get_rejected_signals():
     """Retorna lista de sinais rejeitados - Rota pública para dashboard"""
     try:
-        print('📊 Processando requisição para /api/btc-signals/rejected')
+        logger.debug('📊 Processando requisição para /api/btc-signals/rejected')
         
         if not btc_signal_manager:
             return jsonify({
@@ -261,7 +265,7 @@ def get_rejected_signals():
         })
         
     except Exception as e:
-        print(f"❌ Erro ao obter sinais rejeitados: {e}")
+        logger.error(f"❌ Erro ao obter sinais rejeitados: {e}")
         traceback.print_exc()
         return jsonify({
             'success': False,
@@ -348,7 +352,7 @@ def get_confirmed_signals():
             return jsonify(formatted_signals)
         
     except Exception as e:
-        print(f"❌ Erro ao obter sinais confirmados: {e}")
+        logger.error(f"❌ Erro ao obter sinais confirmados: {e}")
         traceback.print_exc()
         return jsonify({
             'success': False,
@@ -358,10 +362,11 @@ def get_confirmed_signals():
 
 
 @btc_signals_bp.route('/metrics', methods=['GET'])
+@response_cache.cached(ttl=10)
 def get_btc_metrics():
     """Retorna métricas do sistema BTC - Rota pública para cards do dashboard"""
     try:
-        print('📊 Processando requisição para /api/btc-signals/metrics')
+        logger.debug('📊 Processando requisição para /api/btc-signals/metrics')
         
         if not btc_signal_manager or not btc_analyzer:
             return jsonify({
@@ -378,39 +383,13 @@ def get_btc_metrics():
         # Obter dados de preço do BTC
         btc_price_data = btc_analyzer.get_btc_price_data()
         
-        # Converter todos os valores para tipos serializáveis
-        def make_serializable(obj):
-            """Converte objetos para tipos serializáveis JSON"""
-            import numpy as np
-            import pandas as pd
-            
-            if isinstance(obj, dict):
-                return {k: make_serializable(v) for k, v in obj.items()}
-            elif isinstance(obj, list):
-                return [make_serializable(item) for item in obj]
-            elif isinstance(obj, tuple):
-                return [make_serializable(item) for item in obj]
-            elif isinstance(obj, (np.integer, np.floating)):
-                return obj.item()
-            elif isinstance(obj, np.ndarray):
-                return obj.tolist()
-            elif isinstance(obj, (np.bool_, bool)):
-                return bool(obj)
-            elif isinstance(obj, (pd.Timestamp, datetime)):
-                return obj.strftime('%d/%m/%Y %H:%M:%S') if hasattr(obj, 'strftime') else str(obj)
-            elif hasattr(obj, 'item'):  # outros tipos numpy
-                return obj.item()
-            elif isinstance(obj, (int, float, str, type(None))):
-                return obj
-            else:
-                return str(obj)
-        
+        # Tipos NumPy/pandas ficam com o JSON provider; datas mantêm o formato da rota
         return jsonify({
             'success': True,
             'data': {
-                'confirmation_metrics': make_serializable(confirmation_metrics),
-                'btc_analysis': make_serializable(btc_analysis),
-                'btc_price_data': make_serializable(btc_price_data),
+                'confirmation_metrics': format_legacy_values(confirmation_metrics),
+                'btc_analysis': format_legacy_values(btc_analysis),
+                'btc_price_data': format_legacy_values(btc_price_data),
                 'system_status': {
                     'btc_manager_active': bool(btc_signal_manager.is_monitoring),
                     'last_updated': datetime.now().strftime('%d/%m/%Y %H:%M:%S')
@@ -419,7 +398,7 @@ def get_btc_metrics():
         })
         
     except Exception as e:
-        print(f"❌ Erro ao obter métricas BTC: {e}")
+        logger.error(f"❌ Erro ao obter métricas BTC: {e}")
         traceback.print_exc()
         return jsonify({
             'success': False,
@@ -465,7 +444,7 @@ def confirm_signal_manually(signal_id):
             }), 404
         
     except Exception as e:
-        print(f"❌ Erro ao confirmar sinal: {e}")
+        logger.error(f"❌ Erro ao confirmar sinal: {e}")
         traceback.print_exc()
         return jsonify({
             'success': False,
@@ -516,7 +495,7 @@ def reject_signal_manually(signal_id):
             }), 404
         
     except Exception as e:
-        print(f"❌ Erro ao rejeitar sinal: {e}")
+        logger.error(f"❌ Erro ao rejeitar sinal: {e}")
         traceback.print_exc()
         return jsonify({
             'success': False,
@@ -571,7 +550,7 @@ def get_symbol_btc_analysis(symbol):
         })
         
     except Exception as e:
-        print(f"❌ Erro na análise do símbolo {symbol}: {e}")
+        logger.error(f"❌ Erro na análise do símbolo {symbol}: {e}")
         traceback.print_exc()
         return jsonify({
             'success': False,
@@ -614,7 +593,7 @@ def get_btc_config():
         })
         
     except Exception as e:
-        print(f"❌ Erro ao obter configurações BTC: {e}")
+        logger.error(f"❌ Erro ao obter configurações BTC: {e}")
         traceback.print_exc()
         return jsonify({
             'success': False,
@@ -670,7 +649,7 @@ def update_btc_config():
         })
         
     except Exception as e:
-        print(f"❌ Erro ao atualizar configurações BTC: {e}")
+        logger.error(f"❌ Erro ao atualizar configurações BTC: {e}")
         traceback.print_exc()
         return jsonify({
             'success': False,
@@ -711,7 +690,7 @@ def get_system_status():
         })
         
     except Exception as e:
-        print(f"❌ Erro ao obter status do sistema: {e}")
+        logger.error(f"❌ Erro ao obter status do sistema: {e}")
         traceback.print_exc()
         return jsonify({
             'success': False,
@@ -748,7 +727,7 @@ def test_btc_system():
         })
         
     except Exception as e:
-        print(f"❌ Erro no teste do sistema BTC: {e}")
+        logger.error(f"❌ Erro no teste do sistema BTC: {e}")
         traceback.print_exc()
         return jsonify({
             'success': False,
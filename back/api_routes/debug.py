@@ -1,7 +1,11 @@
-from flask import Blueprint, jsonify, current_app
+from flask import Blueprint, Response, jsonify, current_app, request
+import math
 import os
 import pandas as pd
 from datetime import datetime
+from core.response_cache import response_cache
+from core.stack_profiler import MAX_DURATION_SECONDS, ProfilerBusyError, sample_stacks, to_collapsed, top_functions
+from middleware.auth_middleware import jwt_required, get_current_user
 
 debug_bp = Blueprint('debug', __name__)
 
@@ -26,6 +30,7 @@ def system_status():
         # Verificar arquivos CSV
         csv_files = {
             'auth_tokens': bot_instance.db.auth_tokens_file,
+            'password_reset_tokens': bot_instance.db.password_reset_tokens_file,
             'users': bot_instance.db.users_file,
             'signals_list': bot_instance.db.signals_list_file,
             'config': bot_instance.db.config_file
@@ -55,12 +60,33 @@ def system_status():
                         valid_tokens = df[df['expires_at'] > now]
                         file_info['valid_tokens'] = len(valid_tokens)
                         file_info['expired_tokens'] = len(df) - len(valid_tokens)
+
+                    # Informações específicas para tokens de redefinição de senha
+                    if name == 'password_reset_tokens' and not df.empty:
+                        used = df['used'].astype(str).str.lower().isin(['true', '1'])
+                        expiration_time = pd.to_datetime(df['expiration_time'], errors='coerce')
+                        file_info['valid_tokens'] = int((~used & (expiration_time > datetime.now())).sum())
+                        file_info['used_tokens'] = int(used.sum())
                         
                 except Exception as e:
                     file_info['error'] = str(e)
                     
             status['files'][name] = file_info
             
+        # Status da compactação de tokens e latência do índice de autenticação
+        try:
+            from core.token_compactor import token_compactor
+            status['tokens'] = token_compactor.get_status(bot_instance.db)
+        except Exception as e:
+            status['tokens'] = {'error': str(e)}
+            
+        # Métricas da camada compartilhada do Supabase
+        try:
+            from core.supabase_client import supabase_db
+            status['supabase'] = supabase_db.get_metrics()
+        except Exception as e:
+            status['supabase'] = {'error': str(e)}
+            
         # Verificar conexão com banco
         try:
             users = bot_instance.db.get_all_users()
@@ -76,6 +102,16 @@ def system_status():
         current_app.logger.error(f"Erro no diagnóstico: {e}")
         return jsonify({'error': f'Erro no diagnóstico: {str(e)}'}), 500
 
+@debug_bp.route('/cache-stats', methods=['GET'])
+def cache_stats():
+    """Hit ratio e ocupação do cache de respostas por rota"""
+    try:
+        return jsonify(response_cache.get_stats()), 200
+
+    except Exception as e:
+        current_app.logger.error(f"Erro nas estatísticas de cache: {e}")
+        return jsonify({'error': f'Erro nas estatísticas de cache: {str(e)}'}), 500
+
 @debug_bp.route('/test-token/<token>', methods=['GET'])
 def test_token(token):
     """Endpoint para testar um token específico"""
@@ -97,4 +133,56 @@ def test_token(token):
         
     except Exception as e:
         current_app.logger.error(f"Erro no teste de token: {e}")
-        return jsonify({'error': f'Erro no teste de token: {str(e)}'}), 500
\ No newline at end of file
+        return jsonify({'error': f'Erro no teste de token: {str(e)}'}), 500
+
+@debug_bp.route('/profile', methods=['GET'])
+@jwt_required
+def profile_threads():
+    """
+    Perfil por amostragem de todas as threads (somente administradores)
+
+    Query params:
+        seconds: Duração (padrão 10, máximo MAX_DURATION_SECONDS)
+        interval_ms: Intervalo entre amostras (padrão 10, mínimo 5)
+        thread: Filtra threads pelo nome (ex.: waitress, Thread-3)
+        format: 'collapsed' (arquivo para flame graph, padrão) ou 'json'
+    """
+    user_data = get_current_user()
+    if not user_data or not user_data.get('is_admin'):
+        return jsonify({
+            'success': False,
+            'message': 'Acesso negado. Apenas administradores podem acessar esta funcionalidade.'
+        }), 403
+
+    try:
+        seconds = float(request.args.get('seconds', 10))
+        interval_ms = float(request.args.get('interval_ms', 10))
+    except ValueError:
+        return jsonify({'success': False, 'message': 'seconds e interval_ms devem ser numéricos'}), 400
+    if not (math.isfinite(seconds) and math.isfinite(interval_ms)):
+        return jsonify({'success': False, 'message': 'seconds e interval_ms devem ser números finitos'}), 400
+    seconds = min(seconds, MAX_DURATION_SECONDS)
+
+    try:
+        profile = sample_stacks(seconds, interval_ms, request.args.get('thread'))
+    except ProfilerBusyError as e:
+        return jsonify({'success': False, 'message': str(e)}), 409
+
+    if request.args.get('format', 'collapsed') == 'json':
+        return jsonify({
+            'success': True,
+            'samples': profile['samples'],
+            'duration_seconds': profile['duration_seconds'],
+            'interval_ms': profile['interval_ms'],
+            'overhead_pct': profile['overhead_pct'],
+            'threads': profile['threads'],
+            'top_functions': top_functions(profile['stacks']),
+            'collapsed': to_collapsed(profile['stacks'])
+        }), 200
+
+    filename = f"profile-{datetime.now().strftime('%Y%m%d-%H%M%S')}.collapsed"
+    response = Response(to_collapsed(profile['stacks']), mimetype='text/plain')
+    response.headers['Content-Disposition'] = f'attachment; filename={filename}'
+    response.headers['X-Profile-Samples'] = str(profile['samples'])
+    response.headers['X-Profile-Overhead-Pct'] = str(profile['overhead_pct'])
+    return response
@@ -0,0 +1,75 @@
+# API Routes para eventos em tempo real (Server-Sent Events)
+from flask import Blueprint, Response, jsonify, request, stream_with_context
+from core.event_bus import event_bus
+from middleware.auth_middleware import sse_jwt_required
+import json
+import time
+
+events_bp = Blueprint('events', __name__, url_prefix='/api/events')
+
+# Intervalo de keepalive: mantém proxies abertos e detecta clientes desconectados
+KEEPALIVE_SECONDS = 15
+# Duração máxima de uma conexão: libera a thread do waitress; o navegador
+# reconecta sozinho (EventSource) enviando Last-Event-ID
+MAX_STREAM_SECONDS = 300
+# Tempo sugerido ao cliente para reconectar (ms)
+RETRY_MS = 3000
+
+
+def _format_event(event):
+    """Formata um evento do barramento no protocolo SSE"""
+    payload = json.dumps(event['data'], default=str, separators=(',', ':'))
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {payload}\n\n"
+
+
+@events_bp.route('/stream', methods=['GET'])
+@sse_jwt_required
+def stream_events():
+    """
+    Stream SSE com deltas de sinais, monitoramento e tendência do BTC
+
+    Exige autenticação: EventSource não envia cabeçalhos, então o token pode
+    ir no parâmetro de query 'token' (ex.: /api/events/stream?token=...).
+    """
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    try:
+        last_event_id = int(last_event_id) if last_event_id else None
+    except ValueError:
+        last_event_id = None
+
+    subscription = event_bus.subscribe(last_event_id)
+    if subscription is None:
+        response = jsonify({
+            'success': False,
+            'message': 'Limite de conexões em tempo real atingido, use polling'
+        })
+        response.status_code = 503
+        response.headers['Retry-After'] = '30'
+        return response
+
+    def generate():
+        started = time.time()
+        try:
+            yield f"retry: {RETRY_MS}\n\n"
+            while time.time() - started < MAX_STREAM_SECONDS:
+                event = subscription.get(timeout=KEEPALIVE_SECONDS)
+                if event is None:
+                    yield ": keepalive\n\n"
+                    continue
+                yield _format_event(event)
+        finally:
+            event_bus.unsubscribe(subscription)
+
+    response = Response(stream_with_context(generate()), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+
+@events_bp.route('/status', methods=['GET'])
+def events_status():
+    """Estatísticas do barramento de eventos"""
+    return jsonify({
+        'success': True,
+        'data': event_bus.get_stats()
+    })
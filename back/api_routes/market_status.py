@@ -2,6 +2,7 @@ from flask import Blueprint, jsonify
 from datetime import datetime
 import pytz
 import traceback
+from core.response_cache import response_cache
 
 market_status_bp = Blueprint('market_status', __name__)
 
@@ -57,6 +58,7 @@ def get_market_status():
     }
 
 @market_status_bp.route('/market-status', methods=['GET'])
+@response_cache.cached(ttl=15)
 def market_status():
     """Retorna status dos mercados e dados completos do BTC"""
     try:
@@ -0,0 +1,26 @@
+# API Route /metrics no formato texto do Prometheus
+from flask import Blueprint, Response, jsonify, request
+from core.metrics import CONTENT_TYPE, metrics_registry
+import hmac
+import os
+
+metrics_bp = Blueprint('metrics', __name__)
+
+
+@metrics_bp.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    """Histogramas e contadores por etapa para coleta pelo Prometheus local"""
+    if not metrics_registry.enabled:
+        return jsonify({'success': False, 'message': 'Métricas desabilitadas (METRICS_ENABLED=true para ligar)'}), 404
+
+    # Token opcional: com METRICS_TOKEN definido, exige "Authorization: Bearer <token>"
+    token = os.getenv('METRICS_TOKEN')
+    if token:
+        provided = request.headers.get('Authorization', '').replace('Bearer ', '', 1)
+        if not hmac.compare_digest(provided, token):
+            return jsonify({'success': False, 'message': 'Não autorizado'}), 401
+
+    response = Response(metrics_registry.render(), mimetype='text/plain')
+    response.headers['Content-Type'] = CONTENT_TYPE
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
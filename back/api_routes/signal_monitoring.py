@@ -7,18 +7,91 @@ Endpoints para gerenciar e visualizar sinais monitorados
 
 from flask import Blueprint, jsonify, request
 from middleware.auth_middleware import jwt_required, get_current_user
-from core.signal_monitoring_system import SignalMonitoringSystem
+from core.signal_monitoring_system import SignalMonitoringSystem, MonitoredSignal
 from core.binance_client import BinanceClient
 from core.database import Database
+from core.response_cache import response_cache
+from core.logger import setup_logger
 import traceback
 from datetime import datetime
+from itertools import islice
 
 # Criar blueprint
 signal_monitoring_bp = Blueprint('signal_monitoring', __name__, url_prefix='/api/signal-monitoring')
+logger = setup_logger('api_routes.signal_monitoring')
 
 # Instâncias globais (serão inicializadas no app principal)
 monitoring_system = None
 
+# Paginação das listagens de sinais (opcional: sem limit/cursor a lista vem inteira)
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+# Simulação sem paginação: ativos + últimos expirados (janela do formato anterior)
+SIMULATION_EXPIRED_WINDOW = 50
+# Campos padrão: todos menos o histórico de preços (incluído só sob demanda)
+DEFAULT_SIGNAL_FIELDS = [name for name in MonitoredSignal.__dataclass_fields__ if name != 'price_history']
+
+
+def _parse_page_args():
+    """
+    Lê limit/cursor/fields/include_history da query string
+    
+    Sem `limit` nem `cursor` a listagem não é paginada (limit None), como antes
+    da paginação: TradingSimulation e BTCAnalysisPage não seguem next_cursor.
+    
+    Returns:
+        (limit, cursor, fields) ou levanta ValueError com campo inválido
+    """
+    cursor = request.args.get('cursor')
+    if 'limit' in request.args or cursor:
+        limit = request.args.get('limit', DEFAULT_PAGE_SIZE, type=int) or DEFAULT_PAGE_SIZE
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+    else:
+        limit = None
+    
+    fields_arg = request.args.get('fields')
+    if fields_arg:
+        fields = [f.strip() for f in fields_arg.split(',') if f.strip()]
+        invalid = [f for f in fields if f not in MonitoredSignal.__dataclass_fields__]
+        if invalid:
+            raise ValueError(f"Campos inválidos: {', '.join(invalid)}")
+        if 'id' not in fields:
+            fields.insert(0, 'id')
+    else:
+        fields = list(DEFAULT_SIGNAL_FIELDS)
+    
+    if request.args.get('include_history', '').lower() in ('1', 'true', 'yes') and 'price_history' not in fields:
+        fields.append('price_history')
+    
+    return limit, cursor, fields
+
+
+def _format_simulation_signal(signal: MonitoredSignal) -> dict:
+    """Formata um sinal no shape da rota de simulação (sem histórico de preços)"""
+    return {
+        'id': signal.id,
+        'symbol': signal.symbol,
+        'signal_type': signal.signal_type,
+        'status': signal.status,
+        'entry_price': signal.entry_price,
+        'current_price': signal.current_price,
+        'days_monitored': signal.days_monitored,
+        'simulation': {
+            'investment': signal.simulation_investment,
+            'current_value': signal.simulation_current_value,
+            'pnl_usd': signal.simulation_pnl_usd,
+            'pnl_percentage': signal.simulation_pnl_percentage,
+            'max_value_reached': signal.simulation_max_value_reached,
+            'target_value': signal.simulation_target_value,
+            'position_size': signal.simulation_position_size
+        },
+        'leverage': {
+            'max_leverage': signal.max_leverage,
+            'current_profit': signal.current_profit,
+            'max_profit_reached': signal.max_profit_reached
+        }
+    }
+
 def init_signal_monitoring_routes(db_instance: Database, binance_client: BinanceClient):
     """
     Inicializa as rotas de monitoramento com as instâncias necessárias
@@ -30,10 +103,11 @@ def init_signal_monitoring_routes(db_instance: Database, binance_client: Binance
     global monitoring_system
     
     try:
-        monitoring_system = SignalMonitoringSystem(binance_client, db_instance)
+        # Mesma instância usada pelo BTCSignalManager (um único dono do estado em disco)
+        monitoring_system = SignalMonitoringSystem.get_instance(db_instance, binance_client)
         print("✅ Rotas de Monitoramento de Sinais inicializadas!")
     except Exception as e:
-        print(f"❌ Erro ao inicializar rotas de monitoramento: {e}")
+        logger.error(f"❌ Erro ao inicializar rotas de monitoramento: {e}")
         traceback.print_exc()
 
 @signal_monitoring_bp.route('/status', methods=['GET'])
@@ -74,7 +148,7 @@ def get_monitoring_status():
         })
         
     except Exception as e:
-        print(f"❌ Erro ao obter status do monitoramento: {e}")
+        logger.error(f"❌ Erro ao obter status do monitoramento: {e}")
         traceback.print_exc()
         return jsonify({
             'success': False,
@@ -87,7 +161,7 @@ def get_active_signals():
     Retorna lista de sinais sendo monitorados ativamente - Rota pública para dashboard
     """
     try:
-        print('📊 Processando requisição para /api/signal-monitoring/signals/active')
+        logger.debug('📊 Processando requisição para /api/signal-monitoring/signals/active')
         
         if not monitoring_system:
             return jsonify({
@@ -95,23 +169,28 @@ def get_active_signals():
                 'message': 'Sistema de monitoramento não inicializado'
             }), 500
         
-        # Obter sinais monitorados
-        monitored_signals = monitoring_system.get_monitored_signals()
+        try:
+            limit, cursor, fields = _parse_page_args()
+        except ValueError as e:
+            return jsonify({'success': False, 'message': str(e)}), 400
         
-        # Ordenar por valor da simulação (maior primeiro)
-        monitored_signals.sort(key=lambda x: x.get('simulation_current_value', 1000), reverse=True)
+        # Página já ordenada por valor da simulação (maior primeiro)
+        page = monitoring_system.query_signals('active', limit, cursor)
+        monitored_signals = [signal.to_dict(fields) for signal in page['signals']]
         
         return jsonify({
             'success': True,
             'data': {
                 'signals': monitored_signals,
                 'count': len(monitored_signals),
+                'total': page['total'],
+                'next_cursor': page['next_cursor'],
                 'last_updated': datetime.now().strftime('%d/%m/%Y %H:%M:%S')
             }
         })
         
     except Exception as e:
-        print(f"❌ Erro ao obter sinais ativos: {e}")
+        logger.error(f"❌ Erro ao obter sinais ativos: {e}")
         traceback.print_exc()
         return jsonify({
             'success': False,
@@ -119,12 +198,13 @@ def get_active_signals():
         }), 500
 
 @signal_monitoring_bp.route('/signals/simulation', methods=['GET'])
+@response_cache.cached(ttl=10)
 def get_simulation_data():
     """
     Retorna dados de simulação financeira dos sinais monitorados - Rota pública
     """
     try:
-        print('💰 Processando requisição para /api/signal-monitoring/signals/simulation')
+        logger.debug('💰 Processando requisição para /api/signal-monitoring/signals/simulation')
         
         if not monitoring_system:
             return jsonify({
@@ -132,84 +212,46 @@ def get_simulation_data():
                 'message': 'Sistema de monitoramento não inicializado'
             }), 500
         
-        # Obter sinais monitorados
-        monitored_signals = monitoring_system.get_monitored_signals()
-        expired_signals = monitoring_system.get_expired_signals()
-        
-        # Formatar dados de simulação
-        simulation_data = []
-        
-        # Processar sinais ativos
-        for signal in monitored_signals:
-            simulation_data.append({
-                'id': signal.get('id'),
-                'symbol': signal.get('symbol'),
-                'signal_type': signal.get('signal_type'),
-                'status': 'MONITORING',
-                'entry_price': signal.get('entry_price'),
-                'current_price': signal.get('current_price'),
-                'days_monitored': signal.get('days_monitored'),
-                'simulation': {
-                    'investment': signal.get('simulation_investment', 1000),
-                    'current_value': signal.get('simulation_current_value', 1000),
-                    'pnl_usd': signal.get('simulation_pnl_usd', 0),
-                    'pnl_percentage': signal.get('simulation_pnl_percentage', 0),
-                    'max_value_reached': signal.get('simulation_max_value_reached', 1000),
-                    'target_value': signal.get('simulation_target_value', 4000),
-                    'position_size': signal.get('simulation_position_size', 0)
-                },
-                'leverage': {
-                    'max_leverage': signal.get('max_leverage'),
-                    'current_profit': signal.get('current_profit', 0),
-                    'max_profit_reached': signal.get('max_profit_reached', 0)
-                }
-            })
-        
-        # Processar sinais expirados (últimos 50)
-        for signal in expired_signals[-50:]:
-            simulation_data.append({
-                'id': signal.get('id'),
-                'symbol': signal.get('symbol'),
-                'signal_type': signal.get('signal_type'),
-                'status': signal.get('status', 'EXPIRED'),
-                'entry_price': signal.get('entry_price'),
-                'current_price': signal.get('current_price'),
-                'days_monitored': signal.get('days_monitored'),
-                'simulation': {
-                    'investment': signal.get('simulation_investment', 1000),
-                    'current_value': signal.get('simulation_current_value', 1000),
-                    'pnl_usd': signal.get('simulation_pnl_usd', 0),
-                    'pnl_percentage': signal.get('simulation_pnl_percentage', 0),
-                    'max_value_reached': signal.get('simulation_max_value_reached', 1000),
-                    'target_value': signal.get('simulation_target_value', 4000),
-                    'position_size': signal.get('simulation_position_size', 0)
-                },
-                'leverage': {
-                    'max_leverage': signal.get('max_leverage'),
-                    'current_profit': signal.get('current_profit', 0),
-                    'max_profit_reached': signal.get('max_profit_reached', 0)
-                }
-            })
-        
-        # Ordenar por valor atual (maior primeiro)
-        simulation_data.sort(key=lambda x: x['simulation']['current_value'], reverse=True)
-        
-        # Calcular estatísticas
-        total_investment = len(simulation_data) * 1000
-        total_current_value = sum(s['simulation']['current_value'] for s in simulation_data)
+        try:
+            limit, cursor, _ = _parse_page_args()
+        except ValueError as e:
+            return jsonify({'success': False, 'message': str(e)}), 400
+        
+        active_count = len(monitoring_system.active_by_value)
+        if limit is None:
+            # Sem paginação: ativos + últimos SIMULATION_EXPIRED_WINDOW expirados, com as
+            # estatísticas sobre essa mesma janela (tamanho limitado como antes)
+            recent_expired = list(islice(reversed(monitoring_system.expired_signals.values()),
+                                         SIMULATION_EXPIRED_WINDOW))[::-1]
+            window = list(monitoring_system.monitored_signals.values()) + recent_expired
+            window.sort(key=lambda signal: signal.simulation_current_value, reverse=True)
+            page = {'signals': window, 'next_cursor': None}
+            total_signals = len(window)
+            total_current_value = sum(signal.simulation_current_value for signal in window)
+            completed_count = sum(1 for signal in window if signal.status == 'COMPLETED')
+        else:
+            # Ativos + expirados, já ordenados por valor atual (maior primeiro)
+            page = monitoring_system.query_signals('simulation', limit, cursor)
+            # Estatísticas sobre todos os sinais, a partir dos índices e agregados
+            total_signals = page['total']
+            total_current_value = (monitoring_system.active_by_value.value_sum +
+                                   monitoring_system.expired_by_value.value_sum)
+            completed_count = monitoring_system.aggregates.snapshot()['success_count']
+        simulation_data = [_format_simulation_signal(signal) for signal in page['signals']]
+        
+        total_investment = total_signals * 1000
         total_pnl = total_current_value - total_investment
-        
-        completed_signals = [s for s in simulation_data if s['status'] == 'COMPLETED']
-        success_rate = (len(completed_signals) / len(simulation_data) * 100) if simulation_data else 0
+        success_rate = (completed_count / total_signals * 100) if total_signals else 0
         
         return jsonify({
             'success': True,
             'data': {
                 'signals': simulation_data,
+                'next_cursor': page['next_cursor'],
                 'statistics': {
-                    'total_signals': len(simulation_data),
-                    'active_signals': len(monitored_signals),
-                    'completed_signals': len(completed_signals),
+                    'total_signals': total_signals,
+                    'active_signals': active_count,
+                    'completed_signals': completed_count,
                     'success_rate': round(success_rate, 2),
                     'total_investment': total_investment,
                     'total_current_value': round(total_current_value, 2),
@@ -221,7 +263,7 @@ def get_simulation_data():
         })
         
     except Exception as e:
-        print(f"❌ Erro ao obter dados de simulação: {e}")
+        logger.error(f"❌ Erro ao obter dados de simulação: {e}")
         traceback.print_exc()
         return jsonify({
             'success': False,
@@ -234,7 +276,7 @@ def get_expired_signals():
     Retorna lista de sinais expirados/completados - Rota pública para dashboard
     """
     try:
-        print('📊 Processando requisição para /api/signal-monitoring/signals/expired')
+        logger.debug('📊 Processando requisição para /api/signal-monitoring/signals/expired')
         
         if not monitoring_system:
             return jsonify({
@@ -242,30 +284,40 @@ def get_expired_signals():
                 'message': 'Sistema de monitoramento não inicializado'
             }), 500
         
-        # Obter sinais expirados
-        expired_signals = monitoring_system.get_expired_signals()
+        try:
+            limit, cursor, fields = _parse_page_args()
+        except ValueError as e:
+            return jsonify({'success': False, 'message': str(e)}), 400
+        if 'status' not in fields:
+            fields.append('status')
         
-        # Ordenar por lucro máximo atingido (maior primeiro)
-        expired_signals.sort(key=lambda x: x.get('max_profit_reached', 0), reverse=True)
+        # Página já ordenada por lucro máximo atingido (maior primeiro)
+        page = monitoring_system.query_signals('expired', limit, cursor)
+        expired_signals = [signal.to_dict(fields) for signal in page['signals']]
         
         # Separar por status
         completed_signals = [s for s in expired_signals if s.get('status') == 'COMPLETED']
         expired_only = [s for s in expired_signals if s.get('status') == 'EXPIRED']
         
+        # Totais sobre todo o histórico, a partir dos agregados
+        aggregates = monitoring_system.aggregates.snapshot()
+        total_evaluated = aggregates['total_evaluated']
+        
         return jsonify({
             'success': True,
             'data': {
                 'completed_signals': completed_signals,
                 'expired_signals': expired_only,
-                'total_completed': len(completed_signals),
-                'total_expired': len(expired_only),
-                'success_rate': (len(completed_signals) / len(expired_signals) * 100) if expired_signals else 0,
+                'total_completed': aggregates['success_count'],
+                'total_expired': aggregates['failure_count'],
+                'success_rate': (aggregates['success_count'] / total_evaluated * 100) if total_evaluated else 0,
+                'next_cursor': page['next_cursor'],
                 'last_updated': datetime.now().strftime('%d/%m/%Y %H:%M:%S')
             }
         })
         
     except Exception as e:
-        print(f"❌ Erro ao obter sinais expirados: {e}")
+        logger.error(f"❌ Erro ao obter sinais expirados: {e}")
         traceback.print_exc()
         return jsonify({
             'success': False,
@@ -331,7 +383,7 @@ def add_signal_to_monitoring():
             }), 500
         
     except Exception as e:
-        print(f"❌ Erro ao adicionar sinal ao monitoramento: {e}")
+        logger.error(f"❌ Erro ao adicionar sinal ao monitoramento: {e}")
         traceback.print_exc()
         return jsonify({
             'success': False,
@@ -390,7 +442,7 @@ def start_monitoring():
             }), 500
         
     except Exception as e:
-        print(f"❌ Erro ao iniciar monitoramento: {e}")
+        logger.error(f"❌ Erro ao iniciar monitoramento: {e}")
         traceback.print_exc()
         return jsonify({
             'success': False,
@@ -431,7 +483,7 @@ def stop_monitoring():
         })
         
     except Exception as e:
-        print(f"❌ Erro ao parar monitoramento: {e}")
+        logger.error(f"❌ Erro ao parar monitoramento: {e}")
         traceback.print_exc()
         return jsonify({
             'success': False,
@@ -476,7 +528,7 @@ def get_symbol_leverage(symbol):
         })
         
     except Exception as e:
-        print(f"❌ Erro ao obter alavancagem para {symbol}: {e}")
+        logger.error(f"❌ Erro ao obter alavancagem para {symbol}: {e}")
         traceback.print_exc()
         return jsonify({
             'success': False,
@@ -490,7 +542,7 @@ def get_monitoring_stats():
     Rota pública para exibição nos cards do dashboard
     """
     try:
-        print('📊 Processando requisição para /api/signal-monitoring/stats')
+        logger.debug('📊 Processando requisição para /api/signal-monitoring/stats')
         
         if not monitoring_system:
             return jsonify({
@@ -501,24 +553,19 @@ def get_monitoring_stats():
         # Obter estatísticas
         stats = monitoring_system.get_monitoring_stats()
         
-        # Adicionar informações extras
-        monitored_signals = monitoring_system.get_monitored_signals()
-        expired_signals = monitoring_system.get_expired_signals()
-        
-        # Calcular estatísticas por alavancagem
+        # Estatísticas por alavancagem: ativos direto dos objetos, histórico pelos agregados
         leverage_stats = {}
-        for signal in monitored_signals + expired_signals:
-            leverage = signal.get('max_leverage', 50)
-            if leverage not in leverage_stats:
-                leverage_stats[leverage] = {'count': 0, 'avg_profit': 0, 'profits': []}
-            
-            leverage_stats[leverage]['count'] += 1
-            leverage_stats[leverage]['profits'].append(signal.get('current_profit', 0))
+        for leverage, data in monitoring_system.aggregates.snapshot()['by_leverage'].items():
+            leverage_stats[leverage] = {'count': data['total'], 'profit_sum': data['current_profit_sum']}
+        
+        for signal in list(monitoring_system.monitored_signals.values()):
+            bucket = leverage_stats.setdefault(signal.max_leverage, {'count': 0, 'profit_sum': 0.0})
+            bucket['count'] += 1
+            bucket['profit_sum'] += signal.current_profit
         
         # Calcular médias
         for leverage, data in leverage_stats.items():
-            if data['profits']:
-                data['avg_profit'] = sum(data['profits']) / len(data['profits'])
+            data['avg_profit'] = data.pop('profit_sum') / data['count'] if data['count'] else 0
         
         return jsonify({
             'success': True,
@@ -534,7 +581,7 @@ def get_monitoring_stats():
         })
         
     except Exception as e:
-        print(f"❌ Erro ao obter estatísticas: {e}")
+        logger.error(f"❌ Erro ao obter estatísticas: {e}")
         traceback.print_exc()
         return jsonify({
             'success': False,
@@ -572,7 +619,7 @@ def get_quantitative_report():
         })
         
     except Exception as e:
-        print(f"❌ Erro ao gerar relatório quantitativo: {e}")
+        logger.error(f"❌ Erro ao gerar relatório quantitativo: {e}")
         traceback.print_exc()
         return jsonify({
             'success': False,
@@ -5,83 +5,82 @@ import threading
 import time
 from datetime import datetime
 
-from flask import Blueprint, jsonify, g, current_app
 from middleware.auth_middleware import jwt_required
 
-def get_btc_confirmed_signals():
-    """Função para obter sinais confirmados do sistema BTC e converter para o formato dos cards"""
-    print("🔍 [DEBUG] Iniciando get_btc_confirmed_signals()")
+def get_btc_signal_manager():
+    """Localiza o BTCSignalManager na instância do bot (app.py ou app_supabase.py)"""
+    bot_instance = getattr(current_app, 'bot_instance', None)
+    if not bot_instance:
+        return None
+    
+    btc_signal_manager = getattr(bot_instance, 'btc_signal_manager', None)
+    if btc_signal_manager:
+        return btc_signal_manager
+    
+    analyzer = getattr(bot_instance, 'analyzer', None) or getattr(bot_instance, 'technical_analysis', None)
+    return getattr(analyzer, 'btc_signal_manager', None)
+
+# Cache da conversão para o formato dos cards, indexado pelo ETag da view de confirmados
+_cards_cache = {'etag': None, 'signals': []}
+_cards_cache_lock = threading.Lock()
+
+def _convert_to_card(signal):
+    """Converte um sinal confirmado para o formato dos cards do dashboard"""
+    # Converter tipo de COMPRA/VENDA para LONG/SHORT
+    signal_type = "LONG" if signal.get('type') == 'COMPRA' else "SHORT"
+    
+    btc_signal = {
+        "symbol": signal.get('symbol', ''),
+        "type": signal_type,
+        "entry_price": float(signal.get('entry_price', 0)),
+        "entry_time": signal.get('confirmed_at', signal.get('created_at', '')),
+        "created_at": signal.get('created_at', ''),
+        "confirmed_at": signal.get('confirmed_at', ''),
+        "target_price": float(signal.get('target_price', 0)),
+        "projection_percentage": round(float(signal.get('projection_percentage', 0)), 2),
+        "status": "CONFIRMADO",
+        "quality_score": round(float(signal.get('quality_score', 0)), 1),
+        "signal_class": "BTC_CONFIRMED"
+    }
+    
+    # Garantir que não há valores None
+    for key, value in btc_signal.items():
+        if value is None:
+            btc_signal[key] = ''
+    
+    return btc_signal
+
+def get_btc_confirmed_signals_with_etag():
+    """
+    Obtém sinais confirmados do sistema BTC no formato dos cards.
+    Retorna (lista de sinais, etag) — a conversão só é refeita quando a view muda.
+    """
     try:
-        # Obter instância do BTCSignalManager do app
-        bot_instance = getattr(current_app, 'bot_instance', None)
-        print(f"🔍 [DEBUG] Bot instance: {bot_instance}")
-        
-        if not bot_instance:
-            print("❌ [DEBUG] Bot instance não encontrada")
-            return []
-            
-        print(f"🔍 [DEBUG] Bot instance attributes: {[attr for attr in dir(bot_instance) if not attr.startswith('_')]}")
-        
-        if not hasattr(bot_instance, 'analyzer'):
-            print("❌ [DEBUG] Analyzer attribute não encontrado")
-            return []
-        
-        analyzer = bot_instance.analyzer
-        print(f"🔍 [DEBUG] Analyzer: {analyzer}")
-        
-        if not hasattr(analyzer, 'btc_signal_manager'):
-            print("❌ [DEBUG] BTCSignalManager attribute não encontrado no analyzer")
-            return []
-        
-        btc_signal_manager = analyzer.btc_signal_manager
-        print(f"🔍 [DEBUG] BTCSignalManager: {btc_signal_manager}")
-        
+        btc_signal_manager = get_btc_signal_manager()
         if not btc_signal_manager:
-            print("❌ [DEBUG] BTCSignalManager não inicializado")
-            return []
+            current_app.logger.warning("BTCSignalManager não disponível para /api/signals")
+            return [], None
         
-        # Obter sinais confirmados do sistema BTC (sem limite)
-        print("🔍 [DEBUG] Chamando get_confirmed_signals() - sem limite")
-        confirmed_signals = btc_signal_manager.get_confirmed_signals()
-        print(f"🔍 [DEBUG] Sinais confirmados retornados: {len(confirmed_signals) if confirmed_signals else 0}")
+        confirmed_signals, etag = btc_signal_manager.get_confirmed_view()
         
-        if confirmed_signals:
-            print(f"🔍 [DEBUG] Primeiro sinal: {confirmed_signals[0] if confirmed_signals else 'None'}")
-        
-        # Converter para o formato esperado pelos cards do dashboard
-        btc_signals = []
-        for signal in confirmed_signals:
-            # Converter tipo de COMPRA/VENDA para LONG/SHORT
-            signal_type = "LONG" if signal.get('type') == 'COMPRA' else "SHORT"
-            
-            # Converter sinal para formato dos cards
-            btc_signal = {
-                "symbol": signal.get('symbol', ''),
-                "type": signal_type,
-                "entry_price": float(signal.get('entry_price', 0)),
-                "entry_time": signal.get('confirmed_at', signal.get('created_at', '')),
-                "created_at": signal.get('created_at', ''),
-                "confirmed_at": signal.get('confirmed_at', ''),
-                "target_price": float(signal.get('target_price', 0)),
-                "projection_percentage": round(float(signal.get('projection_percentage', 0)), 2),
-                "status": "CONFIRMADO",
-                "quality_score": round(float(signal.get('quality_score', 0)), 1),
-                "signal_class": "BTC_CONFIRMED"
-            }
-            
-            # Garantir que não há valores None
-            for key, value in btc_signal.items():
-                if value is None:
-                    btc_signal[key] = '' if isinstance(value, str) else 0
+        with _cards_cache_lock:
+            if _cards_cache['etag'] != etag:
+                btc_signals = [_convert_to_card(signal) for signal in confirmed_signals]
+                # Ordenar por data de confirmação (mais recentes primeiro)
+                btc_signals.sort(key=lambda x: x.get('entry_time', ''), reverse=True)
+                _cards_cache['signals'] = btc_signals
+                _cards_cache['etag'] = etag
             
-            btc_signals.append(btc_signal)
-        
-        current_app.logger.debug(f"Sinais BTC confirmados convertidos: {len(btc_signals)}")
-        return btc_signals
+            return _cards_cache['signals'], etag
         
     except Exception as e:
         current_app.logger.error(f"Erro ao obter sinais BTC confirmados: {e}")
-        return []
+        return [], None
+
+def get_btc_confirmed_signals():
+    """Função para obter sinais confirmados do sistema BTC e converter para o formato dos cards"""
+    btc_signals, _ = get_btc_confirmed_signals_with_etag()
+    return list(btc_signals)
 
 signals_bp = Blueprint('signals', __name__)
 
@@ -171,26 +170,24 @@ def handle_options():
 @signals_bp.route('/', methods=['GET'])
 @jwt_required
 def get_signals():
-    """Endpoint para obter APENAS os sinais confirmados do sistema BTC"""
-    print("🔍 [DEBUG] Rota /api/signals foi acessada!")
+    """Endpoint para obter APENAS os sinais confirmados do sistema BTC (suporta If-None-Match)"""
     try:
-        # Acessa os dados do usuário do objeto g
-        user_data = g.user_data
-        print(f"🔍 [DEBUG] User data: {user_data}")
-        
-        # Obter APENAS sinais confirmados do sistema BTC
-        print("🔍 [DEBUG] Chamando get_btc_confirmed_signals()")
-        btc_confirmed_signals = get_btc_confirmed_signals()
-        print(f"🔍 [DEBUG] Sinais retornados: {len(btc_confirmed_signals) if btc_confirmed_signals else 0}")
+        btc_confirmed_signals, etag = get_btc_confirmed_signals_with_etag()
         
-        # Ordenar por data de confirmação (mais recentes primeiro)
-        btc_confirmed_signals.sort(key=lambda x: x.get('entry_time', ''), reverse=True)
+        # Dashboard já possui a versão atual: responder sem corpo
+        if etag and request.if_none_match.contains(etag):
+            response = current_app.response_class(status=304)
+            response.set_etag(etag)
+            return response
         
-        print(f"🔍 [DEBUG] Retornando apenas sinais BTC confirmados: {len(btc_confirmed_signals)}")
-        return jsonify(btc_confirmed_signals), 200
+        response = jsonify(btc_confirmed_signals)
+        if etag:
+            response.set_etag(etag)
+            response.headers['Cache-Control'] = 'private, no-cache'
+        return response, 200
 
     except Exception as e:
-        print(f"❌ [DEBUG] Erro ao obter sinais confirmados: {e}")
+        print(f"❌ Erro ao obter sinais confirmados: {e}")
         import traceback
         traceback.print_exc()
         return jsonify({"error": "Erro interno do servidor ao obter sinais confirmados"}), 500
@@ -15,9 +15,9 @@ use_binance = os.getenv('USE_BINANCE_API', 'true').lower() == 'true'
 
 if use_binance:
     try:
-        from core.binance_client import BinanceClient
+        from core.binance_client import get_binance_client
         from core.technical_analysis import TechnicalAnalysis
-        binance_client = BinanceClient()
+        binance_client = get_binance_client()
         technical_analysis = TechnicalAnalysis(db_instance)
         print("✅ Componentes Binance carregados com sucesso")
     except Exception as e:
@@ -21,24 +21,12 @@ load_dotenv()
 # Importar configurações
 from config import server
 from supabase_config import supabase_config
+from core.response_cache import response_cache
 
-# Importar blueprints das rotas
-from api_routes.auth import auth_bp
-from api_routes.signals import signals_bp
-from api_routes.trading import trading_bp
-from api_routes.users import users_bp
-from api_routes.notifications import notifications_bp
-from api_routes.market_times import market_times_bp
-from api_routes.market_status import market_status_bp
-from api_routes.cleanup_status import cleanup_status_bp
-from api_routes.debug import debug_bp
-from api_routes.payments import payments_bp
-from api_routes.customers import customers_bp
-from api_routes.btc_signals import btc_signals_bp, init_btc_signals_routes
-from api_routes.signal_monitoring import signal_monitoring_bp, init_signal_monitoring_routes
-from api_routes.restart_system import restart_system_bp
-from api_routes.binance_prices import binance_prices_bp
-from api_routes.scheduler_management import scheduler_management_bp
+from core.staged_boot import StagedBootApp, boot_tracker
+
+# Blueprints e subsistemas pesados (pandas, ta, binance, supabase) são
+# importados em _register_blueprints, dentro da inicialização em estágios
 
 # Configurar CORS
 CORS(server, resources={
@@ -76,7 +64,7 @@ class KryptonBotSupabase:
         """
         try:
             # Importar e inicializar componentes essenciais
-            from core.binance_client import BinanceClient
+            from core.binance_client import get_binance_client
             from core.telegram_notifier import TelegramNotifier
             from core.technical_analysis import TechnicalAnalysis
             from core.gerenciar_sinais import GerenciadorSinais
@@ -88,7 +76,7 @@ class KryptonBotSupabase:
             self.db = Database()
             
             # Inicializar clientes
-            self.binance_client = BinanceClient()
+            self.binance_client = get_binance_client()
             self.telegram = TelegramNotifier()
             
             # Inicializar análise técnica com instância do banco
@@ -144,6 +132,15 @@ class KryptonBotSupabase:
                 print(f"⚠️ Erro ao inicializar sistema de limpeza: {cleanup_error}")
                 self.cleanup_system = None
             
+            # Inicializar compactação periódica dos tokens de autenticação/redefinição
+            try:
+                from core.token_compactor import token_compactor
+                token_compactor.start_scheduler(self.db)
+                self.token_compactor = token_compactor
+            except Exception as token_error:
+                print(f"⚠️ Erro ao inicializar compactação de tokens: {token_error}")
+                self.token_compactor = None
+            
             # Inicializar monitoramento contínuo de mercado de forma otimizada
             try:
                 import threading
@@ -223,35 +220,40 @@ class KryptonBotSupabase:
 # Instância global do bot
 bot = None
 
-def create_app():
+# Estágios da inicialização, na ordem em que create_app os executa
+BOOT_STAGES = ('bot', 'blueprints', 'subsystem_routes')
+
+class MockBot:
+    """Bot substituto quando a inicialização falha, para a aplicação continuar no ar"""
+    def get_status(self):
+        return {
+            'bot': 'degraded',
+            'error': 'Initialization failed',
+            'timestamp': datetime.now().isoformat()
+        }
+
+def _register_blueprints(server):
     """
-    Factory function para criar a aplicação Flask
+    Importa e registra os blueprints das rotas de API
+    Importação adiada: vários módulos de rotas carregam pandas/ta/binance e
+    montam componentes no import, o que não deve atrasar o /api/health
     """
-    global bot
+    from api_routes.auth import auth_bp
+    from api_routes.signals import signals_bp
+    from api_routes.trading import trading_bp
+    from api_routes.users import users_bp
+    from api_routes.notifications import notifications_bp
+    from api_routes.market_times import market_times_bp
+    from api_routes.market_status import market_status_bp
+    from api_routes.cleanup_status import cleanup_status_bp
+    from api_routes.debug import debug_bp
+    from api_routes.payments import payments_bp
+    from api_routes.customers import customers_bp
+    from api_routes.binance_prices import binance_prices_bp
+    from api_routes.scheduler_management import scheduler_management_bp
+    from api_routes.events import events_bp
+    from api_routes.metrics import metrics_bp
     
-    try:
-        # Inicializar o bot
-        bot = KryptonBotSupabase()
-        print("✅ Bot inicializado com sucesso")
-    except Exception as e:
-        print(f"⚠️ Erro ao inicializar bot: {e}")
-        # Criar um bot mock para permitir que a aplicação inicie
-        class MockBot:
-            def get_status(self):
-                return {
-                    'bot': 'degraded',
-                    'error': 'Initialization failed',
-                    'timestamp': datetime.now().isoformat()
-                }
-        bot = MockBot()
-    
-    # Configurações adicionais
-    server.config['JWT_SECRET'] = os.getenv('JWT_SECRET', 'default-jwt-secret-key')
-    
-    # Adicionar instância do bot ao contexto da aplicação
-    server.bot_instance = bot
-    
-    # Registrar blueprints das rotas de API
     server.register_blueprint(auth_bp, url_prefix='/api/auth')
     server.register_blueprint(signals_bp, url_prefix='/api/signals')
     server.register_blueprint(trading_bp, url_prefix='/api/trading')
@@ -265,11 +267,21 @@ def create_app():
     server.register_blueprint(customers_bp, url_prefix='/api/customers')
     server.register_blueprint(binance_prices_bp)
     server.register_blueprint(scheduler_management_bp)
+    server.register_blueprint(events_bp)
+    server.register_blueprint(metrics_bp)
     try:
+        from api_routes.restart_system import restart_system_bp
         server.register_blueprint(restart_system_bp)
         print("✅ Blueprint restart_system registrado com sucesso")
     except Exception as e:
         print(f"❌ Erro ao registrar restart_system blueprint: {e}")
+
+def _register_subsystem_routes(server, bot):
+    """
+    Registra as rotas que dependem dos subsistemas do bot (monitoramento e BTC)
+    """
+    from api_routes.btc_signals import btc_signals_bp, init_btc_signals_routes
+    from api_routes.signal_monitoring import signal_monitoring_bp, init_signal_monitoring_routes
     
     # Registrar rotas de Monitoramento de Sinais
     try:
@@ -322,6 +334,32 @@ def create_app():
             print("⚠️ Sistema BTC não disponível - rotas BTC não registradas")
     except Exception as e:
         print(f"⚠️ Erro ao registrar rotas BTC: {e}")
+
+def create_app():
+    """
+    Factory function para criar a aplicação Flask
+    Cada etapa é um estágio do boot_tracker (duração e falhas em /api/ready)
+    """
+    global bot
+    
+    # Inicializar o bot
+    bot = boot_tracker.run_stage('bot', KryptonBotSupabase)
+    if bot is not None:
+        print("✅ Bot inicializado com sucesso")
+    else:
+        print("⚠️ Erro ao inicializar bot - usando bot degradado")
+        # Criar um bot mock para permitir que a aplicação inicie
+        bot = MockBot()
+    
+    # Configurações adicionais
+    server.config['JWT_SECRET'] = os.getenv('JWT_SECRET', 'default-jwt-secret-key')
+    
+    # Adicionar instância do bot ao contexto da aplicação
+    server.bot_instance = bot
+    
+    # Registrar blueprints das rotas de API
+    boot_tracker.run_stage('blueprints', _register_blueprints, server)
+    boot_tracker.run_stage('subsystem_routes', _register_subsystem_routes, server, bot)
     
     # Registrar rotas básicas
     @server.route('/api/health')
@@ -337,7 +375,8 @@ def create_app():
                 'status': 'healthy',
                 'service': 'krypton-bot-supabase',
                 'timestamp': datetime.now().isoformat(),
-                'version': '1.0.0'
+                'version': '1.0.0',
+                'phase': boot_tracker.get_status()['phase']
             }), 200
         except Exception as e:
             return jsonify({
@@ -346,6 +385,15 @@ def create_app():
                 'error': str(e)
             }), 500
     
+    @server.route('/api/ready')
+    def readiness_check():
+        """
+        Endpoint de prontidão: 200 quando a inicialização em estágios terminou,
+        503 enquanto os subsistemas aquecem (com o estado de cada estágio)
+        """
+        status = boot_tracker.get_status()
+        return jsonify(status), 200 if status['ready'] else 503
+    
     @server.route('/api/status')
     def api_status():
         """
@@ -482,25 +530,21 @@ def create_app():
     
     # NOVO: Endpoint público para sinais (sem autenticação)
     @server.route('/api/signals/public', methods=['GET'])
+    @response_cache.cached(ttl=30)
     def get_public_signals():
         """Endpoint público para obter sinais sem autenticação diretamente do banco"""
         try:
             from datetime import datetime, timedelta
-            from supabase import create_client, Client
-            
-            # Inicializar cliente Supabase
-            supabase_url = os.getenv('SUPABASE_URL')
-            supabase_key = os.getenv('SUPABASE_ANON_KEY')
+            from core.supabase_client import supabase_db
             
-            if not supabase_url or not supabase_key:
+            # Cliente Supabase compartilhado
+            if not supabase_db.is_configured:
                 return jsonify({
                     'success': False,
                     'error': 'Supabase não configurado',
                     'message': 'Configuração do banco de dados não encontrada'
                 }), 500
             
-            supabase: Client = create_client(supabase_url, supabase_key)
-            
             # Buscar sinais diretamente do banco de dados (baseado no horário de São Paulo)
             try:
                 import pytz
@@ -530,7 +574,10 @@ def create_app():
                 
                 print(f"🔍 Buscando sinais desde: {last_cleanup.strftime('%d/%m/%Y %H:%M')} (SP) / {last_cleanup_utc} (UTC)")
                 
-                result = supabase.table('signals').select('*').eq('status', 'OPEN').gte('created_at', last_cleanup_utc).order('created_at', desc=True).execute()
+                result = supabase_db.execute(
+                    'signals', 'select_public',
+                    lambda table: table.select('*').eq('status', 'OPEN').gte('created_at', last_cleanup_utc).order('created_at', desc=True)
+                )
             except Exception as e:
                 print(f"⚠️ Erro na consulta Supabase: {e}")
                 return jsonify({
@@ -604,6 +651,7 @@ def create_app():
                 'message': 'Erro ao buscar sinais do banco de dados'
             }), 500
     
+    boot_tracker.mark_finished()
     return server
 
 def main():
@@ -620,14 +668,21 @@ def main():
         print("💡 Executando em modo degradado - configure as variáveis do Supabase para funcionalidade completa")
         # Não sair, continuar em modo degradado
     
-    # Criar aplicação
-    app = create_app()
-    
     # Configurações do servidor
     port = int(os.getenv('FLASK_PORT', 5000))
     host = os.getenv('FLASK_HOST', '0.0.0.0')
     debug = os.getenv('FLASK_DEBUG', 'False').lower() == 'true'
     
+    if debug:
+        # Reloader do Flask exige o app completo antes de escutar
+        app = create_app()
+    else:
+        # Inicialização em estágios: /api/health responde já, subsistemas aquecem em fundo
+        app = StagedBootApp(boot_tracker)
+        boot_tracker.add_stages(BOOT_STAGES)
+        boot_tracker.start_background(create_app, on_ready=app.set_target)
+        print("🔄 Subsistemas inicializando em background (progresso em /api/ready)...")
+    
     print(f"🌐 Servidor iniciando em {host}:{port}")
     print(f"🔧 Debug mode: {debug}")
     print(f"🗄️ Database: Supabase")
@@ -646,24 +701,22 @@ def main():
             # Modo produção com Waitress (mais estável que Flask dev server)
             try:
                 from waitress import serve
+                from core.event_bus import event_bus
                 print("🚀 Usando Waitress para produção...")
                 serve(
                     app,
                     host=host,
                     port=port,
-                    threads=10,
+                    # Cada conexão SSE ocupa uma thread: reservar threads extras para elas
+                    threads=10 + event_bus.max_subscribers,
                     connection_limit=1000,
                     cleanup_interval=30,
                     channel_timeout=120
                 )
             except ImportError:
                 print("⚠️ Waitress não disponível, usando Flask dev server")
-                app.run(
-                    host=host,
-                    port=port,
-                    debug=debug,
-                    threaded=True
-                )
+                from werkzeug.serving import run_simple
+                run_simple(host, port, app, threaded=True)
     except KeyboardInterrupt:
         print("\n👋 Encerrando aplicação...")
     except Exception as e:
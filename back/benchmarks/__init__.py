@@ -0,0 +1,7 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks do pipeline de varredura (rodar a partir de back/):
+
+    python -m benchmarks                      # compara com baselines/default.json
+    python -m benchmarks --update-baseline    # grava um novo baseline
+"""
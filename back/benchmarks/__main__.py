@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+CLI da suíte de benchmarks
+
+    python -m benchmarks --pairs 50,100,300 --threshold 25
+    python -m benchmarks --cassette cassettes/scan_100.json.gz --latency-ms 80
+    python -m benchmarks --update-baseline
+
+Sai com código 1 se alguma métrica piorar além do limite em relação ao baseline.
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.suite import (
+    DEFAULT_PAIRS, DEFAULT_THRESHOLD_PCT, compare, load_baseline, machine_info, run_suite, save_baseline
+)
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines', 'default.json')
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='Benchmarks do pipeline de varredura')
+    parser.add_argument('--pairs', default=','.join(str(p) for p in DEFAULT_PAIRS),
+                        help='Tamanhos de varredura separados por vírgula')
+    parser.add_argument('--repeats', type=int, default=3, help='Repetições por medida (mediana)')
+    parser.add_argument('--cassette', default=None, help='Gravação de BinanceRecorder (padrão: mercado sintético)')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='Latência simulada por requisição')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='Arquivo JSON de baseline')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD_PCT,
+                        help='Piora percentual máxima aceita')
+    parser.add_argument('--update-baseline', action='store_true', help='Grava os resultados como novo baseline')
+    args = parser.parse_args(argv)
+
+    pairs_list = [int(p) for p in args.pairs.split(',') if p.strip()]
+    config = {'pairs': pairs_list, 'repeats': args.repeats, 'cassette': args.cassette, 'latency_ms': args.latency_ms}
+    results = run_suite(pairs_list, args.repeats, args.cassette, args.latency_ms)
+
+    baseline = load_baseline(args.baseline)
+    if args.update_baseline or baseline is None:
+        save_baseline(args.baseline, results, config, (baseline or {}).get('thresholds'))
+        return 0
+
+    if baseline.get('machine') != machine_info():
+        print("⚠️ Baseline gravado em outra máquina/ambiente - comparação apenas indicativa")
+    if baseline.get('config') != config:
+        print(f"⚠️ Configuração diferente do baseline: {baseline.get('config')}")
+
+    rows = compare(results, baseline, args.threshold)
+    print(f"\n{'métrica':<34} {'baseline':>10} {'atual':>10} {'variação':>9}")
+    for row in rows:
+        flag = '❌' if row['regressed'] else '✅'
+        print(f"{flag} {row['metric']:<32} {row['baseline_ms']:>10.3f} {row['current_ms']:>10.3f} "
+              f"{row['change_pct']:>+8.1f}%")
+
+    regressions = [row for row in rows if row['regressed']]
+    if regressions:
+        print(f"\n❌ {len(regressions)} métrica(s) pioraram além do limite")
+        return 1
+    print(f"\n✅ Nenhuma regressão ({len(rows)} métricas comparadas)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
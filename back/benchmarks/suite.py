@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+"""
+Suíte de Benchmarks do Pipeline de Varredura
+Mede (em ms, menor é melhor, mediana das repetições) o scan_market completo,
+os indicadores de tendência/entrada, suporte/resistência, o KlinesCache sob
+concorrência, o ciclo de confirmação do BTCSignalManager e a consulta
+Database.get_user_by_token, e compara com um baseline JSON salvo.
+"""
+
+import json
+import os
+import platform
+import statistics
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+import pandas as pd
+
+from core.database import Database
+from core.klines_cache import KlinesCache
+
+from .synthetic import add_pending_signals, build_client, build_signal_manager, build_technical_analysis
+
+BASELINE_VERSION = 1
+DEFAULT_PAIRS = (50, 100, 300)
+DEFAULT_THRESHOLD_PCT = 25.0
+
+# Diferenças absolutas abaixo disso são ruído de medição, nunca regressão
+NOISE_FLOOR_MS = 0.05
+
+CACHE_THREADS = 8
+CACHE_OPS_PER_THREAD = 2000
+TOKEN_LOOKUPS = 200
+
+
+def _median_ms(func: Callable[[], Any], repeats: int, setup: Optional[Callable[[], Any]] = None) -> float:
+    """Mediana (ms) de `repeats` execuções; setup roda fora da medição"""
+    durations = []
+    for _ in range(repeats):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations) * 1000
+
+
+def bench_scan(pairs: int, repeats: int, cassette: Optional[str] = None,
+               latency_ms: float = 0.0) -> Dict[str, float]:
+    """scan_market completo com cache de klines vazio (frio) e preenchido (quente)"""
+    client = build_client(pairs, cassette, latency_ms)
+    analyzer = build_technical_analysis(client, pairs)
+
+    def reset_cache():
+        analyzer.cache_manager.klines_1h.clear()
+        analyzer.cache_manager.klines_4h.clear()
+        analyzer.btc_signal_manager.pending_signals.clear()
+
+    cold = _median_ms(analyzer.scan_market, repeats, setup=reset_cache)
+    analyzer.scan_market()
+    warm = _median_ms(analyzer.scan_market, repeats,
+                      setup=analyzer.btc_signal_manager.pending_signals.clear)
+    return {'scan_cold_ms': cold, 'scan_warm_ms': warm}
+
+
+def bench_indicators(pairs: int, repeats: int, cassette: Optional[str] = None) -> Dict[str, float]:
+    """analyze_trend_df, analyze_entry_df e suporte/resistência (ms por par)"""
+    client = build_client(pairs, cassette)
+    analyzer = build_technical_analysis(client, pairs)
+    frames = [(analyzer.get_klines(symbol, '4h', 100), analyzer.get_klines(symbol, '1h', 100))
+              for symbol in analyzer.top_pairs]
+    frames = [(trend, entry) for trend, entry in frames if trend is not None and entry is not None]
+    count = max(1, len(frames))
+
+    def run_trend():
+        for trend_df, _ in frames:
+            analyzer.analyze_trend_df(trend_df)
+
+    def run_entry():
+        for _, entry_df in frames:
+            analyzer.analyze_entry_df(entry_df)
+
+    def run_levels():
+        for _, entry_df in frames:
+            analyzer.calculate_support_resistance_levels(entry_df, float(entry_df['close'].iloc[-1]))
+
+    return {
+        'trend_per_pair_ms': _median_ms(run_trend, repeats) / count,
+        'entry_per_pair_ms': _median_ms(run_entry, repeats) / count,
+        'levels_per_pair_ms': _median_ms(run_levels, repeats) / count
+    }
+
+
+def bench_klines_cache(pairs: int, repeats: int) -> Dict[str, float]:
+    """get/set do KlinesCache com CACHE_THREADS threads disputando os mesmos pares (ms por operação)"""
+    frame = pd.DataFrame({col: [1.0] * 100 for col in ('open', 'high', 'low', 'close', 'volume')})
+    symbols = [f'PAIR{i}USDT' for i in range(pairs)]
+
+    def run():
+        cache = KlinesCache(default_ttl=300)
+
+        def worker(offset: int):
+            for i in range(CACHE_OPS_PER_THREAD):
+                symbol = symbols[(i + offset) % pairs]
+                if cache.get(symbol, '1h', 100) is None:
+                    cache.set(symbol, '1h', frame, 100)
+
+        threads = [threading.Thread(target=worker, args=(n * 7,)) for n in range(CACHE_THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    return {'klines_cache_op_ms': _median_ms(run, repeats) / (CACHE_THREADS * CACHE_OPS_PER_THREAD)}
+
+
+def bench_confirmation_cycle(pairs: int, repeats: int, cassette: Optional[str] = None,
+                             latency_ms: float = 0.0) -> Dict[str, float]:
+    """Um ciclo de _check_signal_confirmation sobre `pairs` sinais pendentes (sem confirmar/rejeitar)"""
+    client = build_client(pairs, cassette, latency_ms)
+    manager = build_signal_manager(client)
+    symbols = build_technical_analysis(client, pairs, manager).top_pairs
+    add_pending_signals(manager, symbols)
+
+    def reset_attempts():
+        for signal in manager.pending_signals:
+            signal['confirmation_attempts'] = 0
+            signal['confirmation_checks'] = []
+
+    def run_cycle():
+        for signal in manager.pending_signals:
+            manager._check_signal_confirmation(signal)
+
+    return {'confirmation_cycle_ms': _median_ms(run_cycle, repeats, setup=reset_attempts)}
+
+
+def bench_token_lookup(pairs: int, repeats: int) -> Dict[str, float]:
+    """Database.get_user_by_token com pairs*10 usuários e pairs*100 tokens em CSV (ms por consulta)"""
+    work_dir = tempfile.mkdtemp(prefix='bench_tokens_')
+    users = [{'username': f'user{i}', 'password': 'x', 'email': f'user{i}@example.com',
+              'is_admin': False, 'id': str(uuid.uuid4()), 'status': 'active'} for i in range(pairs * 10)]
+    expires = (datetime.now() + timedelta(days=7)).isoformat()
+    created = datetime.now().isoformat()
+    tokens = [{'token': uuid.uuid4().hex, 'user_id': users[i % len(users)]['id'],
+               'created_at': created, 'expires_at': expires} for i in range(pairs * 100)]
+
+    db = Database.__new__(Database)
+    db.users_file = os.path.join(work_dir, 'users.csv')
+    db.auth_tokens_file = os.path.join(work_dir, 'auth_tokens.csv')
+    pd.DataFrame(users).to_csv(db.users_file, index=False)
+    pd.DataFrame(tokens).to_csv(db.auth_tokens_file, index=False)
+
+    lookups = [tokens[(i * 37) % len(tokens)]['token'] for i in range(TOKEN_LOOKUPS)]
+    try:
+        assert db.get_user_by_token(lookups[0]) is not None
+
+        def run():
+            for token in lookups:
+                db.get_user_by_token(token)
+
+        return {'token_lookup_ms': _median_ms(run, repeats) / TOKEN_LOOKUPS}
+    finally:
+        for name in os.listdir(work_dir):
+            os.remove(os.path.join(work_dir, name))
+        os.rmdir(work_dir)
+
+
+def run_suite(pairs_list=DEFAULT_PAIRS, repeats: int = 3, cassette: Optional[str] = None,
+              latency_ms: float = 0.0) -> Dict[str, float]:
+    """
+    Executa todos os benchmarks para cada tamanho de varredura
+
+    Args:
+        pairs_list: Quantidades de pares (ex. 50, 100, 300)
+        repeats: Repetições por medida (usa-se a mediana)
+        cassette: Gravação de BinanceRecorder; None usa o mercado sintético
+        latency_ms: Latência simulada por requisição à Binance
+
+    Returns:
+        Dict "metrica@pares" -> ms
+    """
+    results: Dict[str, float] = {}
+    for pairs in pairs_list:
+        print(f"📊 Benchmarks com {pairs} pares...")
+        measured = {}
+        measured.update(bench_scan(pairs, repeats, cassette, latency_ms))
+        measured.update(bench_indicators(pairs, repeats, cassette))
+        measured.update(bench_klines_cache(pairs, repeats))
+        measured.update(bench_confirmation_cycle(pairs, repeats, cassette, latency_ms))
+        measured.update(bench_token_lookup(pairs, repeats))
+        for name, value in measured.items():
+            results[f'{name}@{pairs}'] = round(value, 4)
+            print(f"   {name:<24} {value:10.3f}ms")
+    return results
+
+
+def compare(results: Dict[str, float], baseline: Dict[str, Any],
+            threshold_pct: float = DEFAULT_THRESHOLD_PCT) -> List[Dict[str, Any]]:
+    """
+    Compara os resultados com o baseline
+
+    Args:
+        results: Saída de run_suite
+        baseline: Conteúdo de load_baseline (thresholds por métrica opcionais)
+        threshold_pct: Piora percentual máxima aceita
+
+    Returns:
+        List[Dict]: Uma linha por métrica presente nos dois lados, com 'regressed'
+    """
+    reference = baseline.get('metrics', {})
+    overrides = baseline.get('thresholds', {})
+    rows = []
+    for name in sorted(set(results) & set(reference)):
+        base, current = reference[name], results[name]
+        limit = overrides.get(name.split('@')[0], threshold_pct)
+        change_pct = (current - base) / base * 100 if base else 0.0
+        rows.append({
+            'metric': name,
+            'baseline_ms': base,
+            'current_ms': current,
+            'change_pct': round(change_pct, 1),
+            'threshold_pct': limit,
+            'regressed': change_pct > limit and (current - base) > NOISE_FLOOR_MS
+        })
+    return rows
+
+
+def machine_info() -> Dict[str, Any]:
+    """Identificação da máquina gravada junto do baseline"""
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpus': os.cpu_count()
+    }
+
+
+def save_baseline(path: str, results: Dict[str, float], config: Dict[str, Any],
+                  thresholds: Optional[Dict[str, float]] = None) -> str:
+    """Salva os resultados como novo baseline (preserva thresholds por métrica)"""
+    payload = {
+        'version': BASELINE_VERSION,
+        'created_at': datetime.now().strftime('%d/%m/%Y %H:%M:%S'),
+        'machine': machine_info(),
+        'config': config,
+        'thresholds': thresholds or {},
+        'metrics': results
+    }
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, indent=2, ensure_ascii=False)
+    print(f"💾 Baseline salvo: {path} ({len(results)} métricas)")
+    return path
+
+
+def load_baseline(path: str) -> Optional[Dict[str, Any]]:
+    """Carrega um baseline; None se não existir"""
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        payload = json.load(f)
+    if payload.get('version') != BASELINE_VERSION:
+        raise ValueError(f"Versão de baseline não suportada: {payload.get('version')}")
+    return payload
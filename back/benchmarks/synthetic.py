@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+"""
+Mercado Sintético e Montagem dos Componentes para Benchmarks
+Transporte determinístico com a mesma interface do ReplayTransport e
+construtores leves de TechnicalAnalysis/BTCSignalManager ligados a um
+ReplayBinanceClient (sem chaves, rede, CSV ou Telegram).
+"""
+
+import json
+import time
+import zlib
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from core.binance_replay import ReplayBinanceClient, ReplayTransport, request_key
+from core.btc_correlation_analyzer import BTCCorrelationAnalyzer
+from core.btc_signal_manager import BTCSignalManager
+from core.klines_cache import CacheManager
+from core.scan_scheduler import AdaptiveScanScheduler
+from core.technical_analysis import TechnicalAnalysis
+
+
+def symbols_for(pairs: int) -> List[str]:
+    """Símbolos sintéticos PAIR0USDT..PAIR{n-1}USDT"""
+    return [f'PAIR{i}USDT' for i in range(pairs)]
+
+
+class SyntheticTransport:
+    """
+    Gera respostas REST determinísticas por requisição
+
+    Cada chave (endpoint + parâmetros) recebe uma semente fixa; o corpo é
+    gerado uma vez e desserializado a cada chamada, como response.json().
+    """
+
+    def __init__(self, pairs: int, latency_ms: float = 0.0, seed: int = 2024):
+        self.symbols = symbols_for(pairs) + ['BTCUSDT']
+        self.latency_ms = latency_ms
+        self.seed = seed
+        self._bodies: Dict[str, Optional[str]] = {}
+        self.stats = {'requests': 0, 'misses': 0, 'simulated_latency_ms': 0.0}
+
+    def _rng(self, key: str) -> np.random.Generator:
+        return np.random.default_rng(zlib.crc32(key.encode('utf-8')) ^ self.seed)
+
+    def _generate(self, key: str, endpoint: str, params: Dict[str, Any]) -> Any:
+        rng = self._rng(key)
+        path = endpoint.partition('?')[0]
+        if path == '/fapi/v1/exchangeInfo':
+            return {'symbols': [{'symbol': s, 'status': 'TRADING', 'contractType': 'PERPETUAL'} for s in self.symbols]}
+        if path == '/fapi/v1/leverageBracket':
+            return [{'symbol': s, 'brackets': [{'bracket': 1, 'initialLeverage': 75}]} for s in self.symbols]
+        if path == '/fapi/v1/ticker/24hr':
+            rows = []
+            for i, symbol in enumerate(self.symbols):
+                last = 10 + i
+                rows.append({'symbol': symbol, 'lastPrice': str(last), 'volume': str(1e6 * (1 + rng.random())),
+                             'priceChangePercent': str(round(rng.normal(0, 3), 2)),
+                             'highPrice': str(last * 1.04), 'lowPrice': str(last * 0.96)})
+            return rows
+        if path == '/fapi/v1/ticker/price':
+            return [{'symbol': s, 'price': str(10 + i)} for i, s in enumerate(self.symbols)]
+        if path == '/fapi/v1/klines':
+            limit = int(params.get('limit', 100))
+            # Mesmo passeio para qualquer limit: as últimas velas coincidem entre consultas
+            walk_rng = self._rng(f"{params.get('symbol')}:{params.get('interval')}")
+            returns = walk_rng.normal(walk_rng.normal(0, 0.002), 0.012, 500)
+            close = 10 * np.exp(np.cumsum(returns))[-limit:]
+            volume = walk_rng.integers(1_000, 100_000, 500)[-limit:]
+            start = 1_700_000_000_000
+            return [[start + i * 3_600_000, c * 0.998, c * 1.006, c * 0.994, c, float(v), start + (i + 1) * 3_600_000 - 1]
+                    for i, (c, v) in enumerate(zip(close.tolist(), volume.tolist()))]
+        return None
+
+    def request(self, endpoint: str, method: str = 'GET', params: Optional[Dict] = None) -> Optional[Any]:
+        """Mesma interface de ReplayTransport.request"""
+        params = params or {}
+        key = request_key(endpoint, method, params)
+        self.stats['requests'] += 1
+        if key not in self._bodies:
+            response = self._generate(key, endpoint, params)
+            self._bodies[key] = json.dumps(response) if response is not None else None
+        body = self._bodies[key]
+        if body is None:
+            self.stats['misses'] += 1
+            return None
+        if self.latency_ms:
+            self.stats['simulated_latency_ms'] += self.latency_ms
+            time.sleep(self.latency_ms / 1000)
+        return json.loads(body)
+
+    def reset(self) -> None:
+        self.stats = {'requests': 0, 'misses': 0, 'simulated_latency_ms': 0.0}
+
+
+def build_client(pairs: int, cassette: Optional[str] = None, latency_ms: float = 0.0) -> ReplayBinanceClient:
+    """
+    Cliente Binance offline
+
+    Args:
+        pairs: Quantidade de pares sintéticos (ignorado com gravação)
+        cassette: Arquivo de BinanceRecorder; None usa dados sintéticos
+        latency_ms: Latência simulada por requisição
+    """
+    transport = ReplayTransport(cassette, latency_ms=latency_ms) if cassette else SyntheticTransport(pairs, latency_ms)
+    return ReplayBinanceClient(transport)
+
+
+def build_signal_manager(client: ReplayBinanceClient) -> BTCSignalManager:
+    """BTCSignalManager sem banco, CSV, Telegram nem threads"""
+    manager = BTCSignalManager.__new__(BTCSignalManager)
+    manager.db = None
+    manager.binance = client
+    manager.btc_analyzer = BTCCorrelationAnalyzer(client)
+    # Mesmos valores de BTCSignalManager.__init__
+    manager.config = {
+        'confirmation_timeout': 14400,
+        'check_interval': 300,
+        'max_confirmation_attempts': 12,
+        'min_breakout_percentage': 0.5,
+        'min_volume_increase': 1.2,
+        'btc_alignment_threshold': 0.3,
+        'confirmed_view_sync_interval': 60
+    }
+    manager.pending_signals = []
+    manager.confirmed_signals = []
+    manager.rejected_signals = []
+    manager.daily_confirmed_signals = set()
+    manager.is_monitoring = False
+    manager.notifier = None
+    return manager
+
+
+def build_technical_analysis(client: ReplayBinanceClient, pairs: int,
+                             manager: Optional[BTCSignalManager] = None) -> TechnicalAnalysis:
+    """TechnicalAnalysis com os pares já selecionados e cache de klines vazio"""
+    analyzer = TechnicalAnalysis.__new__(TechnicalAnalysis)
+    analyzer.db = None
+    analyzer.binance = client
+    analyzer.config = {
+        'trend_timeframe': '4h',
+        'entry_timeframe': '1h',
+        'quality_score_minimum': 65.0,
+        'scan_interval': 60,
+        'pairs_update_interval': 1200,
+        'target_percentage_min': 6.0,
+        'max_pairs': pairs
+    }
+    analyzer.top_pairs = client.get_top_pairs(limit=pairs) if isinstance(client.transport, ReplayTransport) \
+        else symbols_for(pairs)
+    analyzer.all_usdt_pairs = list(analyzer.top_pairs)
+    analyzer.pairs_last_update = time.time()
+    analyzer.is_monitoring = False
+    analyzer.notifier = None
+    analyzer.cache_manager = CacheManager()
+    analyzer.scan_scheduler = AdaptiveScanScheduler()
+    analyzer.btc_signal_manager = manager or build_signal_manager(client)
+    return analyzer
+
+
+def add_pending_signals(manager: BTCSignalManager, symbols: List[str]) -> List[str]:
+    """
+    Registra um sinal pendente por símbolo via add_pending_signal (metade compra, metade venda)
+
+    Returns:
+        List[str]: IDs dos sinais pendentes criados
+    """
+    ids = []
+    for i, symbol in enumerate(symbols):
+        signal_type = 'COMPRA' if i % 2 == 0 else 'VENDA'
+        entry_price = 10.0 + i
+        ids.append(manager.add_pending_signal({
+            'symbol': symbol,
+            'type': signal_type,
+            'entry_price': entry_price,
+            'target_price': entry_price * (1.06 if signal_type == 'COMPRA' else 0.94),
+            'projection_percentage': 6.0,
+            'quality_score': 75.0,
+            'signal_class': 'STANDARD',
+            'btc_correlation': 0.5,
+            'btc_trend': 'NEUTRAL'
+        }))
+    return ids
+
+
+def synthetic_history(pairs: int, hours: int, seed: int = 2024, start_ms: int = 1_672_531_200_000):
+    """
+    Histórico 1h sintético (com BTCUSDT) para o backtest: passeios aleatórios com
+    regimes de tendência, volume com picos e alguns pares listados no meio do período
+
+    Args:
+        pairs: Quantidade de pares
+        hours: Velas 1h por par
+        seed: Semente (reprodutível)
+        start_ms: Abertura da primeira vela (padrão 01/01/2023 00:00 UTC)
+
+    Returns:
+        MarketHistory
+    """
+    from core.backtest import MarketHistory
+
+    rng = np.random.default_rng(seed)
+    columns = pairs + 1
+    drift = np.repeat(rng.normal(0, 0.002, (hours // 72 + 1, columns)), 72, axis=0)[:hours]
+    returns = drift + rng.normal(0, 0.01, (hours, columns))
+    close = 10 * np.exp(np.cumsum(returns, axis=0)) * rng.uniform(0.5, 50, columns)
+    open_ = np.vstack([close[:1], close[:-1]])
+    wick = np.abs(rng.normal(0, 0.004, (2, hours, columns)))
+    high = np.maximum(open_, close) * (1 + wick[0])
+    low = np.minimum(open_, close) * (1 - wick[1])
+    volume = rng.lognormal(10, 0.4, (hours, columns)) * np.where(rng.random((hours, columns)) < 0.05, 3.0, 1.0)
+
+    # Um a cada dez pares só passa a existir depois de 10% do período
+    listed_late = (np.arange(columns) % 10 == 9) & (np.arange(columns) < pairs)
+    for values in (open_, high, low, close, volume):
+        values[:hours // 10, listed_late] = np.nan
+
+    open_time = start_ms + np.arange(hours, dtype=np.int64) * 3_600_000
+    candles = {'open': open_[:, :pairs], 'high': high[:, :pairs], 'low': low[:, :pairs],
+               'close': close[:, :pairs], 'volume': volume[:, :pairs]}
+    btc = {'open': open_[:, pairs:], 'high': high[:, pairs:], 'low': low[:, pairs:],
+           'close': close[:, pairs:], 'volume': volume[:, pairs:]}
+    return MarketHistory(open_time, symbols_for(pairs), candles, btc)
@@ -22,6 +22,10 @@ if not os.getenv('FLASK_ENV'):
 # Configurar Flask com pasta static correta
 server = Flask(__name__, static_folder='static', static_url_path='')
 
+# JSON com suporte nativo a NumPy/pandas (orjson opcional via JSON_USE_ORJSON)
+from core.json_provider import init_json_provider
+init_json_provider(server)
+
 
 
 # Configurações de segurança
@@ -0,0 +1,751 @@
+# -*- coding: utf-8 -*-
+"""
+Backtest Vetorizado do Pipeline de Sinais
+Reproduz meses de velas 1h arquivadas de centenas de pares pelas mesmas regras
+do sistema ao vivo: pontuação de TechnicalAnalysis._calculate_signal_scores,
+alvo de calculate_target_price, verificações de confirmação do
+BTCSignalManager e objetivo do SignalMonitoringSystem. Tudo é vetorizado no
+tempo e nos símbolos (matrizes tempo x símbolo) e o relatório traz taxas de
+acerto por signal_class.
+
+Os indicadores são os que a análise ao vivo enxerga: janelas de `window` velas
+(limit do get_klines), com a vela 4h em formação reconstruída a partir do 1h.
+Como a EMA é uma recursão linear, a EMA de cada janela é a EMA do histórico
+completo menos uma correção geométrica a partir do início da janela, sem
+recalcular nada janela a janela.
+
+Uso:
+    history = MarketHistory.from_csv_dir('data/klines')   # {SYMBOL}_1h.csv
+    features = compute_features(history)                  # caro: uma vez por histórico
+    report = run_backtest(features, {'quality_score_minimum': 70, 'min_breakout_percentage': 0.8})
+"""
+
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .binance_limiter import request_lane
+from .logger import setup_logger
+
+logger = setup_logger('core.backtest')
+
+H1_MS = 3_600_000
+H4_MS = 4 * H1_MS
+BAR_SECONDS = 3600
+
+CANDLE_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+# Mesmos cortes de TechnicalAnalysis._get_signal_classification
+SIGNAL_CLASSES = ['STANDARD', 'PREMIUM', 'PREMIUM+', 'ELITE']
+CLASS_BINS = [80.0, 85.0, 90.0]
+
+BTC_NEUTRAL, BTC_BULLISH, BTC_BEARISH = 0, 1, -1
+
+DEFAULT_BACKTEST_CONFIG: Dict[str, Any] = {
+    # TechnicalAnalysis
+    'quality_score_minimum': 65.0,
+    # BTCSignalManager
+    'confirmation_timeout': 14400,
+    'check_interval': 300,
+    'max_confirmation_attempts': 12,
+    'min_breakout_percentage': 0.5,
+    'min_volume_increase': 1.2,
+    # SignalMonitoringSystem: alvo do sinal dentro do período de monitoramento
+    'monitoring_days': 15
+}
+
+
+class MarketHistory:
+    """Velas 1h de vários símbolos alinhadas numa grade horária comum (tempo x símbolo)"""
+
+    def __init__(self, open_time: np.ndarray, symbols: List[str], candles: Dict[str, np.ndarray],
+                 btc: Optional[Dict[str, np.ndarray]] = None):
+        """
+        Args:
+            open_time: Abertura de cada vela da grade (ms, passo de 1h)
+            symbols: Símbolos das colunas
+            candles: open/high/low/close/volume, matrizes (tempo x símbolo); NaN fora da listagem
+            btc: Mesmas chaves para o BTCUSDT, matrizes (tempo x 1); None = BTC neutro
+        """
+        self.open_time = np.asarray(open_time, dtype=np.int64)
+        self.symbols = list(symbols)
+        self.candles = candles
+        self.btc = btc
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.candles['close'].shape
+
+    @classmethod
+    def from_frames(cls, frames: Dict[str, pd.DataFrame], btc_symbol: str = 'BTCUSDT') -> 'MarketHistory':
+        """
+        Alinha DataFrames de klines 1h (open_time em ms + OHLCV) por símbolo
+
+        Lacunas no meio do histórico repetem o último fechamento com volume zero;
+        antes da listagem e depois da deslistagem ficam NaN.
+        """
+        frames = {symbol: df for symbol, df in frames.items() if df is not None and len(df)}
+        if not frames:
+            raise ValueError("Nenhum histórico de klines informado")
+
+        start = min(int(df['open_time'].min()) for df in frames.values())
+        end = max(int(df['open_time'].max()) for df in frames.values())
+        grid = np.arange(start - start % H1_MS, end + 1, H1_MS, dtype=np.int64)
+
+        def align(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+            data = df.drop_duplicates('open_time').set_index('open_time')[CANDLE_COLUMNS].astype(float)
+            data = data.reindex(grid)
+            listed = data['close'].notna()
+            first, last = listed.idxmax(), listed[::-1].idxmax()
+            inside = (data.index >= first) & (data.index <= last)
+            close = data['close'].where(~inside, data['close'].ffill())
+            data.loc[inside, 'volume'] = data.loc[inside, 'volume'].fillna(0.0)
+            for col in ('open', 'high', 'low'):
+                data[col] = data[col].where(~inside | data[col].notna(), close)
+            data['close'] = close
+            return {col: data[col].to_numpy() for col in CANDLE_COLUMNS}
+
+        btc = None
+        if btc_symbol in frames:
+            btc = {col: values[:, None] for col, values in align(frames.pop(btc_symbol)).items()}
+        symbols = sorted(frames)
+        aligned = [align(frames[symbol]) for symbol in symbols]
+        candles = {col: np.column_stack([a[col] for a in aligned]) for col in CANDLE_COLUMNS}
+        return cls(grid, symbols, candles, btc)
+
+    @classmethod
+    def from_csv_dir(cls, data_dir: str, symbols: Optional[List[str]] = None,
+                     btc_symbol: str = 'BTCUSDT') -> 'MarketHistory':
+        """
+        Carrega os arquivos {SYMBOL}_1h.csv gerados por download_history
+
+        Args:
+            data_dir: Diretório dos CSVs
+            symbols: Subconjunto de símbolos (padrão: todos os arquivos)
+            btc_symbol: Símbolo de referência para o alinhamento BTC
+        """
+        if symbols is None:
+            symbols = sorted(name[:-len('_1h.csv')] for name in os.listdir(data_dir) if name.endswith('_1h.csv'))
+        wanted = list(dict.fromkeys(list(symbols) + [btc_symbol]))
+        frames = {}
+        for symbol in wanted:
+            path = os.path.join(data_dir, f'{symbol}_1h.csv')
+            if os.path.exists(path):
+                frames[symbol] = pd.read_csv(path)
+            elif symbol != btc_symbol:
+                logger.warning("⚠️ Histórico não encontrado: %s", path)
+        if btc_symbol not in frames:
+            logger.warning("⚠️ Sem histórico de %s - alinhamento BTC considerado neutro", btc_symbol)
+        return cls.from_frames(frames, btc_symbol)
+
+
+def download_history(client, symbols: List[str], data_dir: str, days: int = 365,
+                     btc_symbol: str = 'BTCUSDT') -> List[str]:
+    """
+    Baixa klines 1h paginados da Binance para {data_dir}/{SYMBOL}_1h.csv
+
+    Args:
+        client: BinanceClient conectado
+        symbols: Símbolos a baixar (o BTC é incluído automaticamente)
+        data_dir: Diretório de saída
+        days: Quantos dias de histórico
+
+    Returns:
+        List[str]: Arquivos gravados
+    """
+    os.makedirs(data_dir, exist_ok=True)
+    end_ms = int(time.time() * 1000)
+    start_ms = end_ms - days * 24 * H1_MS
+    written = []
+    for symbol in list(dict.fromkeys(list(symbols) + [btc_symbol])):
+        rows, cursor = [], start_ms
+        while cursor < end_ms:
+            # Download em lote: menor prioridade, não atrasa o bot rodando no mesmo processo
+            with request_lane('housekeeping'):
+                page = client.make_request('/fapi/v1/klines', 'GET', {
+                    'symbol': symbol, 'interval': '1h', 'startTime': cursor, 'endTime': end_ms, 'limit': 1500
+                })
+            if not page:
+                break
+            rows.extend(page)
+            cursor = int(page[-1][0]) + H1_MS
+        if not rows:
+            logger.warning("⚠️ Sem klines para %s", symbol)
+            continue
+        df = pd.DataFrame([row[:6] for row in rows], columns=['open_time'] + CANDLE_COLUMNS)
+        path = os.path.join(data_dir, f'{symbol}_1h.csv')
+        df.drop_duplicates('open_time').to_csv(path, index=False)
+        written.append(path)
+        print(f"💾 {symbol}: {len(df)} velas 1h")
+    return written
+
+
+def _ewm(values: np.ndarray, alpha: float) -> np.ndarray:
+    """Recursão y = (1-α)·y[-1] + α·x por coluna (adjust=False, como a biblioteca ta), a partir do 1º valor"""
+    return pd.DataFrame(values).ewm(alpha=alpha, adjust=False).mean().to_numpy()
+
+
+def _geometric_ema(initial: np.ndarray, ratio: float, alpha: float, steps: np.ndarray) -> np.ndarray:
+    """EMA (α) da sequência initial·ratio^j iniciada em initial, avaliada após `steps` passos"""
+    decay = 1 - alpha
+    return initial * (decay ** steps + alpha * ratio * (ratio ** steps - decay ** steps) / (ratio - decay))
+
+
+class _Windows:
+    """Índices das janelas de `window` velas (1h e 4h em formação) vistas em cada linha da grade"""
+
+    def __init__(self, open_time: np.ndarray, close: np.ndarray, window: int):
+        rows_count = close.shape[0]
+        self.rows = np.arange(rows_count)[:, None]
+        self.cols = np.arange(close.shape[1])[None, :]
+        listed = ~np.isnan(close)
+        self.first = np.where(listed.any(axis=0), listed.argmax(axis=0), rows_count)
+
+        start = np.maximum(self.rows - (window - 1), self.first)
+        self.count_1h = self.rows - start + 1
+        self.start_1h = np.clip(start, 0, rows_count - 1)
+
+        bucket = open_time // H4_MS
+        self.bucket = (bucket - bucket[0])[:, None]
+        last_rows = np.flatnonzero(np.diff(bucket, append=bucket[-1] + 1))
+        self.close_4h = close[last_rows]
+        buckets = len(last_rows)
+        first_4h = np.where(self.first < rows_count, self.bucket[np.minimum(self.first, rows_count - 1), 0], buckets)
+        start = np.maximum(self.bucket - (window - 1), first_4h)
+        self.first_4h = first_4h
+        self.count_4h = self.bucket - start + 1
+        self.start_4h = np.clip(start, 0, buckets - 1)
+        self.prev_4h = np.clip(self.bucket - 1, 0, buckets - 1)
+
+    def ema_1h(self, series: np.ndarray, span: int) -> np.ndarray:
+        """EMA(span) da janela 1h terminada em cada linha"""
+        alpha = 2 / (span + 1)
+        full = _ewm(series, alpha)
+        offset = self.rows - self.start_1h
+        return full - (1 - alpha) ** offset * (full[self.start_1h, self.cols] - series[self.start_1h, self.cols])
+
+    def ema_4h(self, close: np.ndarray, span: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        EMA(span) da janela 4h cuja última vela está em formação (fechamento = close 1h atual)
+
+        Returns:
+            (ema da janela, ema completa das velas fechadas, correção no início da janela)
+        """
+        alpha = 2 / (span + 1)
+        full = _ewm(self.close_4h, alpha)
+        has_closed = self.bucket > self.first_4h
+        forming = np.where(has_closed, (1 - alpha) * full[self.prev_4h, self.cols] + alpha * close, close)
+        gap = full[self.start_4h, self.cols] - self.close_4h[self.start_4h, self.cols]
+        return forming - (1 - alpha) ** (self.bucket - self.start_4h) * gap, full, gap
+
+
+def _trend_4h(windows: _Windows, close: np.ndarray) -> Dict[str, np.ndarray]:
+    """analyze_trend_df vetorizado: EMAs 20/50 e MACD(12, 26, 9) da janela 4h"""
+    ema20, _, _ = windows.ema_4h(close, 20)
+    ema50, _, _ = windows.ema_4h(close, 50)
+    ema12, full12, gap12 = windows.ema_4h(close, 12)
+    ema26, full26, gap26 = windows.ema_4h(close, 26)
+
+    # Linha MACD completa (NaN nas 25 primeiras velas, como min_periods da ta) e sua média de sinal
+    r12, r26, alpha9 = 1 - 2 / 13, 1 - 2 / 27, 2 / 10
+    macd_full = full12 - full26
+    macd_full[np.arange(len(macd_full))[:, None] < windows.first_4h[None, :] + 25] = np.nan
+    signal_full = _ewm(macd_full, alpha9)
+
+    # Sinal da janela na última vela fechada: parte linear + correções geométricas do início da janela
+    start, prev = windows.start_4h, windows.prev_4h
+    cols = windows.cols
+    first_signal = np.clip(start + 25, 0, len(macd_full) - 1)
+    steps = np.maximum(prev - first_signal, 0)
+    signal_prev = (signal_full[prev, cols]
+                   - (1 - alpha9) ** steps * (signal_full[first_signal, cols] - macd_full[first_signal, cols])
+                   + _geometric_ema(-gap12 * r12 ** 25, r12, alpha9, steps)
+                   + _geometric_ema(gap26 * r26 ** 25, r26, alpha9, steps))
+    macd_line = ema12 - ema26
+    macd_signal = (1 - alpha9) * signal_prev + alpha9 * macd_line
+
+    return {
+        'close': close,
+        'ema20': ema20,
+        'ema50': ema50,
+        'is_uptrend': (close > ema20 * 0.995) & (ema20 > ema50 * 1.005),
+        'trend_strength': np.abs(close - ema20) / close,
+        'macd_signal': macd_line - macd_signal
+    }
+
+
+def _entry_1h(windows: _Windows, candles: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """analyze_entry_df vetorizado: RSI(14), ATR(14), momentum e volume da janela 1h"""
+    close, high, low, volume = candles['close'], candles['high'], candles['low'], candles['volume']
+    rows, cols, start = windows.rows, windows.cols, windows.start_1h
+    listed = ~np.isnan(close)
+    prev_close = np.vstack([np.full((1, close.shape[1]), np.nan), close[:-1]])
+
+    # RSI: na primeira vela da janela a variação é NaN e entra como zero
+    with np.errstate(invalid='ignore'):
+        diff = close - prev_close
+        up = np.where(listed, np.where(diff > 0, diff, 0.0), np.nan)
+        down = np.where(listed, np.where(diff < 0, -diff, 0.0), np.nan)
+    decay = (1 - 1 / 14) ** (rows - start)
+    up_full, down_full = _ewm(up, 1 / 14), _ewm(down, 1 / 14)
+    avg_up = up_full - decay * up_full[start, cols]
+    avg_down = down_full - decay * down_full[start, cols]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi = np.where(avg_down == 0, 100.0, 100 - 100 / (1 + avg_up / avg_down))
+
+    # ATR: semente = média das 14 primeiras TR da janela (a primeira sem fechamento anterior)
+    true_range = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+    cumulative = np.vstack([np.zeros((1, close.shape[1])), np.nancumsum(true_range, axis=0)])
+    seed_row = np.minimum(start + 13, len(close) - 1)
+    seed = ((high - low)[start, cols]
+            + cumulative[np.minimum(start + 14, len(close)), cols] - cumulative[start + 1, cols]) / 14
+    atr_full = _ewm(true_range, 1 / 14)
+    with np.errstate(over='ignore'):
+        atr = atr_full - (1 - 1 / 14) ** (rows - seed_row) * (atr_full[seed_row, cols] - seed)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        atr_ratio = np.where(close > 0, atr / close, 0.02)
+
+        close_2 = np.vstack([np.full((2, close.shape[1]), np.nan), close[:-2]])
+        price_change = np.where(windows.count_1h >= 3, (close - close_2) / close_2, 0.0)
+
+        volume_frame = pd.DataFrame(volume)
+        volume_ratio = (volume_frame.rolling(5).mean() / volume_frame.rolling(20).mean()).to_numpy()
+        volume_ratio = np.where(windows.count_1h >= 20, volume_ratio, 1.0)
+
+    return {
+        'rsi': rsi,
+        'atr_ratio': atr_ratio,
+        'price_change': price_change,
+        'momentum_positive': price_change > 0,
+        'volume_ratio': volume_ratio
+    }
+
+
+def _support_resistance(candles: Dict[str, np.ndarray], window: int,
+                        chunk_cells: int = 4_000_000) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    calculate_support_resistance_levels vetorizado
+
+    Pivôs (máxima/mínima de 5 velas centradas) só dependem dos vizinhos, então
+    são marcados uma vez no histórico; cada linha procura os pivôs da sua janela
+    (posições 2..window-3) por uma visão deslizante, em blocos de linhas.
+
+    Returns:
+        (support_distance, resistance_distance) em %
+    """
+    close, high, low = candles['close'], candles['high'], candles['low']
+    rows_count, symbols = close.shape
+    high_frame, low_frame = pd.DataFrame(high), pd.DataFrame(low)
+    with np.errstate(invalid='ignore'):
+        pivot_high = (high == high_frame.rolling(5, center=True).max().to_numpy()) & \
+            (high > high_frame.shift(1).to_numpy()) & (high > high_frame.shift(-1).to_numpy())
+        pivot_low = (low == low_frame.rolling(5, center=True).min().to_numpy()) & \
+            (low < low_frame.shift(1).to_numpy()) & (low < low_frame.shift(-1).to_numpy())
+    pad = np.full((window, symbols), np.nan)
+    highs = np.vstack([pad, np.where(pivot_high, high, np.nan)])
+    lows = np.vstack([pad, np.where(pivot_low, low, np.nan)])
+    span = window - 4
+    high_view = np.lib.stride_tricks.sliding_window_view(highs, span, axis=0)
+    low_view = np.lib.stride_tricks.sliding_window_view(lows, span, axis=0)
+
+    resistance = np.empty_like(close)
+    support = np.empty_like(close)
+    step = max(1, chunk_cells // max(1, symbols * span))
+    with np.errstate(invalid='ignore'):
+        for begin in range(0, rows_count, step):
+            end = min(begin + step, rows_count)
+            price = close[begin:end, :, None]
+            levels = high_view[begin + 3:end + 3]
+            resistance[begin:end] = np.where(levels > price, levels, np.inf).min(axis=-1)
+            levels = low_view[begin + 3:end + 3]
+            support[begin:end] = np.where(levels < price, levels, -np.inf).max(axis=-1)
+    resistance = np.where(np.isinf(resistance), close * 1.02, resistance)
+    support = np.where(np.isinf(support), close * 0.98, support)
+    return np.abs(close - support) / close * 100, np.abs(resistance - close) / close * 100
+
+
+def _candle_scores(candles: Dict[str, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """_analyze_candlestick_patterns vetorizado (compra, venda)"""
+    open_, high, low, close = candles['open'], candles['high'], candles['low'], candles['close']
+    body = np.abs(close - open_)
+    candle_range = high - low
+    doji = body < candle_range * 0.3
+    lower_shadow = np.minimum(close, open_) - low
+    upper_shadow = high - np.maximum(close, open_)
+    buy = np.where(lower_shadow > body * 2, 10.0, np.where(doji, 5.0, 0.0))
+    sell = np.where(upper_shadow > body * 2, 10.0, np.where(doji, 5.0, 0.0))
+    flat = candle_range == 0
+    return np.where(flat, 0.0, buy), np.where(flat, 0.0, sell)
+
+
+def _btc_trend(open_time: np.ndarray, btc: Optional[Dict[str, np.ndarray]],
+               window: int) -> Tuple[np.ndarray, np.ndarray]:
+    """get_current_btc_analysis vetorizado: tendência 4H e força 0,7·4H + 0,3·1H"""
+    if btc is None:
+        return np.zeros(len(open_time), dtype=np.int8), np.full(len(open_time), 50.0)
+
+    close = btc['close']
+    windows = _Windows(open_time, close, window)
+
+    def classify(ema20: np.ndarray, ema50: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        bullish = (close > ema20 * 1.005) & (ema20 > ema50 * 1.01)
+        bearish = (close < ema20 * 0.995) & (ema20 < ema50 * 0.99)
+        trend = np.where(bullish, BTC_BULLISH, np.where(bearish, BTC_BEARISH, BTC_NEUTRAL))
+        strength = np.where(trend != BTC_NEUTRAL, np.minimum(100.0, np.abs(close - ema20) / close * 1000), 50.0)
+        return trend, strength
+
+    trend_4h, strength_4h = classify(windows.ema_4h(close, 20)[0], windows.ema_4h(close, 50)[0])
+    _, strength_1h = classify(windows.ema_1h(close, 20), windows.ema_1h(close, 50))
+    enough = (windows.count_4h >= 50) & (windows.count_1h >= 50) & ~np.isnan(close)
+    trend = np.where(enough, trend_4h, BTC_NEUTRAL)[:, 0].astype(np.int8)
+    strength = np.where(enough, strength_4h * 0.7 + strength_1h * 0.3, 50.0)[:, 0]
+    return trend, strength
+
+
+def compute_features(history: MarketHistory, window: int = 100, min_candles: int = 50,
+                     target_percentage_min: float = 6.0) -> Dict[str, Any]:
+    """
+    Calcula, para cada vela 1h fechada e cada símbolo, tudo o que analyze_symbol
+    calcularia naquele instante (independe dos limites ajustáveis do backtest)
+
+    Args:
+        history: Velas 1h alinhadas
+        window: Velas por consulta (limit do get_klines)
+        min_candles: Mínimo de velas por timeframe para analisar (analyze_symbol)
+        target_percentage_min: Alvo mínimo (config de TechnicalAnalysis)
+
+    Returns:
+        Dict com matrizes (tempo x símbolo): quality_score, signal_class, is_buy,
+        target_price, pontuações por componente e entradas da confirmação
+    """
+    start_time = time.time()
+    candles = history.candles
+    close = candles['close']
+    windows = _Windows(history.open_time, close, window)
+
+    trend = _trend_4h(windows, close)
+    entry = _entry_1h(windows, candles)
+    support_distance, resistance_distance = _support_resistance(candles, window)
+    candle_buy, candle_sell = _candle_scores(candles)
+    is_buy = trend['is_uptrend']
+
+    with np.errstate(invalid='ignore'):
+        # 1. Tendência 4H (35 pts)
+        trend_score = np.minimum(trend['trend_strength'] * 50.0, 15.0)
+        trend_score += np.where(np.where(is_buy, trend['close'] >= trend['ema20'] * 0.98,
+                                         trend['close'] <= trend['ema20'] * 1.02), 10.0, 0.0)
+        trend_score += np.where(np.where(is_buy, trend['macd_signal'] > 0, trend['macd_signal'] < 0), 10.0, 0.0)
+
+        # 2. Confirmação 1H (25 pts)
+        change = entry['price_change']
+        momentum = entry['momentum_positive']
+        entry_score = np.where(is_buy,
+                               np.where(momentum, 15.0, np.where(change > 0.002, 10.0, 0.0)),
+                               np.where(~momentum, 15.0, np.where(change < -0.002, 10.0, 0.0)))
+        volume_ratio = entry['volume_ratio']
+        entry_score += np.where(volume_ratio > 1.2, 10.0, np.where(volume_ratio > 1.0, 5.0, 0.0))
+
+        # 3. RSI (20 pts)
+        rsi = entry['rsi']
+        neutral_zone = (rsi >= 30) & (rsi <= 70)
+        aligned = np.where(is_buy, (rsi >= 30) & (rsi <= 50), (rsi >= 50) & (rsi <= 70))
+        rsi_score = np.where(neutral_zone, np.where(aligned, 20.0, 15.0), 5.0)
+
+        # 4. Padrões técnicos (20 pts)
+        distance = np.where(is_buy, support_distance, resistance_distance)
+        pattern_score = np.where((distance >= 2) & (distance <= 5), 10.0, np.where(distance <= 8, 5.0, 0.0))
+        pattern_score += np.where(is_buy, candle_buy, candle_sell)
+
+    quality = trend_score + entry_score + rsi_score + pattern_score
+
+    # calculate_target_price
+    with np.errstate(invalid='ignore'):
+        total_percentage = (target_percentage_min
+                            + np.minimum(entry['atr_ratio'] * 400, 8.0)
+                            + np.minimum(trend['trend_strength'] * 100, 3.0)
+                            + np.minimum((quality - 80) / 20, 1.0))
+        total_percentage = np.minimum(total_percentage, 20.0)
+        target = np.where(is_buy, close * (1 + total_percentage / 100), close * (1 - total_percentage / 100))
+        target = np.where(is_buy & (target <= close), close * 1.06, target)
+        target = np.where(~is_buy & (target >= close), close * 0.94, target)
+
+    valid = (~np.isnan(close) & ~np.isnan(quality)
+             & (windows.count_1h >= min_candles) & (windows.count_4h >= min_candles))
+
+    # Entradas das verificações de confirmação (últimas 5 velas 1h de cada linha)
+    volume = candles['volume']
+    volume_frame = pd.DataFrame(volume)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        recent = volume_frame.rolling(2).mean().to_numpy()
+        previous = volume_frame.shift(2).rolling(3).mean().to_numpy()
+        confirm_volume_ratio = np.where(previous > 0, recent / previous, 1.0)
+        rising = np.diff(close, axis=0, prepend=np.nan) > 0
+        falling = np.diff(close, axis=0, prepend=np.nan) < 0
+    rising_prev = np.vstack([np.zeros((1, close.shape[1]), bool), rising[:-1]])
+    falling_prev = np.vstack([np.zeros((1, close.shape[1]), bool), falling[:-1]])
+    btc_trend, btc_strength = _btc_trend(history.open_time, history.btc, window)
+
+    features = {
+        'open_time': history.open_time,
+        'symbols': history.symbols,
+        'close': close,
+        'high': candles['high'],
+        'low': candles['low'],
+        'valid': valid,
+        'is_buy': is_buy,
+        'quality_score': np.where(valid, quality, np.nan),
+        'signal_class': np.digitize(np.nan_to_num(quality), CLASS_BINS).astype(np.int8),
+        'target_price': target,
+        'trend_score': trend_score,
+        'entry_score': entry_score,
+        'rsi_score': rsi_score,
+        'pattern_score': pattern_score,
+        'confirm_volume_ratio': confirm_volume_ratio,
+        'momentum_up': rising & rising_prev,
+        'momentum_down': falling & falling_prev,
+        'btc_trend': btc_trend,
+        'btc_strength': btc_strength,
+        'window': window
+    }
+    logger.info("📊 Features do backtest: %d velas x %d símbolos em %.1fs",
+                close.shape[0], close.shape[1], time.time() - start_time)
+    return features
+
+
+def save_features(features: Dict[str, Any], directory: str) -> str:
+    """
+    Grava as features como um .npy por matriz (+ meta.json), para reuso entre
+    execuções e leitura mapeada em memória por vários processos
+
+    Returns:
+        str: Diretório gravado
+    """
+    os.makedirs(directory, exist_ok=True)
+    meta = {}
+    for name, value in features.items():
+        if isinstance(value, np.ndarray):
+            np.save(os.path.join(directory, f'{name}.npy'), value)
+        else:
+            meta[name] = value
+    with open(os.path.join(directory, 'meta.json'), 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+    return directory
+
+
+def load_features(directory: str, mmap: bool = True) -> Dict[str, Any]:
+    """Lê features gravadas por save_features (somente leitura, mapeadas em memória por padrão)"""
+    with open(os.path.join(directory, 'meta.json'), 'r', encoding='utf-8') as f:
+        features: Dict[str, Any] = json.load(f)
+    for name in os.listdir(directory):
+        if name.endswith('.npy'):
+            features[name[:-4]] = np.load(os.path.join(directory, name), mmap_mode='r' if mmap else None)
+    return features
+
+
+def _sao_paulo_days(open_time: np.ndarray) -> np.ndarray:
+    """Dia (America/Sao_Paulo) do fechamento de cada vela, para a regra de um sinal por dia"""
+    closes = pd.to_datetime(open_time + H1_MS, unit='ms', utc=True).tz_convert('America/Sao_Paulo')
+    return (closes.normalize().tz_localize(None).to_numpy().astype('datetime64[D]').astype(np.int64))
+
+
+def _forward_extremes(values: np.ndarray, horizon: int, how: str) -> np.ndarray:
+    """Máximo/mínimo das `horizon` velas seguintes a cada linha (exclusive a própria)"""
+    frame = pd.DataFrame(values[::-1])
+    rolled = getattr(frame.rolling(horizon, min_periods=1), how)().to_numpy()[::-1]
+    return np.vstack([rolled[1:], np.full((1, values.shape[1]), np.nan)])
+
+
+def run_backtest(features: Dict[str, Any], config: Optional[Dict[str, Any]] = None,
+                 return_events: bool = False) -> Dict[str, Any]:
+    """
+    Aplica filtro de qualidade, confirmação BTC, deduplicação e objetivo de alvo
+
+    Cada verificação de confirmação usa a próxima vela 1h fechada (o arquivo não
+    tem granularidade de 5 minutos); um sinal recebe até
+    min(max_confirmation_attempts·check_interval, confirmation_timeout) / 1h
+    verificações (mínimo 1) antes de expirar.
+
+    Args:
+        features: Saída de compute_features
+        config: Sobrescreve DEFAULT_BACKTEST_CONFIG
+        return_events: Inclui um DataFrame com cada pré-sinal avaliado
+
+    Returns:
+        Dict com contagens, decisões e taxas de acerto por signal_class
+    """
+    start_time = time.time()
+    cfg = {**DEFAULT_BACKTEST_CONFIG, **(config or {})}
+    close, high, low = features['close'], features['high'], features['low']
+    rows_count = close.shape[0]
+    checks = max(1, int(min(cfg['max_confirmation_attempts'] * cfg['check_interval'],
+                            cfg['confirmation_timeout']) // BAR_SECONDS))
+    horizon = int(cfg['monitoring_days'] * 24)
+
+    with np.errstate(invalid='ignore'):
+        candidates = features['valid'] & (features['quality_score'] >= cfg['quality_score_minimum'])
+    candidates[rows_count - checks:] = False  # sem velas suficientes para decidir
+    event_rows, event_cols = np.nonzero(candidates)  # ordem cronológica
+    is_buy = features['is_buy'][event_rows, event_cols]
+    entry_price = close[event_rows, event_cols]
+
+    # Verificações de confirmação (eventos x tentativas)
+    check_rows = event_rows[:, None] + np.arange(1, checks + 1)[None, :]
+    cols = event_cols[:, None]
+    buy = is_buy[:, None]
+    entry = entry_price[:, None]
+    current = close[check_rows, cols]
+    min_breakout = cfg['min_breakout_percentage'] / 100
+    with np.errstate(invalid='ignore'):
+        breakout_ok = np.where(buy, current >= entry * (1 + min_breakout), current <= entry * (1 - min_breakout))
+        breakout_bad = ~breakout_ok & np.where(buy, current <= entry * (1 - min_breakout * 2),
+                                               current >= entry * (1 + min_breakout * 2))
+        volume_ratio = features['confirm_volume_ratio'][check_rows, cols]
+        volume_ok = volume_ratio >= cfg['min_volume_increase']
+        volume_bad = ~volume_ok & (volume_ratio < 0.8)
+    btc_trend = features['btc_trend'][check_rows]
+    btc_strong = features['btc_strength'][check_rows] > 0.5
+    btc_ok = np.where(buy, btc_trend == BTC_BULLISH, btc_trend == BTC_BEARISH)
+    btc_bad = ~btc_ok & btc_strong & np.where(buy, btc_trend == BTC_BEARISH, btc_trend == BTC_BULLISH)
+    momentum_ok = np.where(buy, features['momentum_up'][check_rows, cols], features['momentum_down'][check_rows, cols])
+
+    confirmations = breakout_ok.astype(np.int8) + volume_ok + btc_ok + momentum_ok
+    rejections = breakout_bad.astype(np.int8) + volume_bad + btc_bad
+    reject = rejections >= 2
+    confirm = ~reject & (confirmations >= 3)
+    decided = reject | confirm
+    first_decision = np.where(decided.any(axis=1), decided.argmax(axis=1), checks - 1)
+    event_index = np.arange(len(event_rows))
+    outcome = np.where(confirm[event_index, first_decision], 'confirmed',
+                       np.where(reject[event_index, first_decision], 'rejected', 'expired'))
+    decision_rows = event_rows + first_decision + 1
+
+    # Deduplicação: um pendente por (símbolo, tipo) e nada repetido no dia em que confirmou
+    days = _sao_paulo_days(features['open_time'])
+    keys = (event_cols * 2 + is_buy).tolist()
+    pending_until = {}
+    confirmed_day = {}
+    accepted = np.zeros(len(event_rows), dtype=bool)
+    for i, (row, key, decision_row, result) in enumerate(zip(event_rows.tolist(), keys,
+                                                              decision_rows.tolist(), outcome.tolist())):
+        if row < pending_until.get(key, -1) or confirmed_day.get(key) == days[row]:
+            continue
+        accepted[i] = True
+        pending_until[key] = decision_row
+        if result == 'confirmed':
+            confirmed_day[key] = days[decision_row]
+
+    # Objetivo: alvo tocado nas velas seguintes à decisão, dentro do período de monitoramento
+    forward_high = _forward_extremes(high, horizon, 'max')
+    forward_low = _forward_extremes(low, horizon, 'min')
+    target = features['target_price'][event_rows, event_cols]
+    best = np.where(is_buy, forward_high[decision_rows, event_cols], forward_low[decision_rows, event_cols])
+    with np.errstate(invalid='ignore'):
+        hit = np.where(is_buy, best >= target, best <= target)
+        max_favorable = np.where(is_buy, best - entry_price, entry_price - best) / entry_price * 100
+        target_pct = np.abs(target - entry_price) / entry_price * 100
+    evaluable = decision_rows + horizon < rows_count
+
+    classes = features['signal_class'][event_rows, event_cols]
+
+    def summarize(mask: np.ndarray) -> Dict[str, Any]:
+        summary: Dict[str, Any] = {'signals': int(mask.sum())}
+        for result in ('confirmed', 'rejected', 'expired'):
+            selected = mask & (outcome == result)
+            summary[result] = int(selected.sum())
+            scored = selected & evaluable
+            summary[f'hit_rate_{result}'] = round(float(hit[scored].mean() * 100), 1) if scored.any() else None
+        summary['confirmation_rate'] = round(summary['confirmed'] / summary['signals'] * 100, 1) \
+            if summary['signals'] else 0.0
+        confirmed = mask & (outcome == 'confirmed')
+        summary['avg_target_pct'] = round(float(target_pct[confirmed].mean()), 2) if confirmed.any() else None
+        summary['avg_max_favorable_pct'] = round(float(np.nanmean(max_favorable[confirmed & evaluable])), 2) \
+            if (confirmed & evaluable).any() else None
+        return summary
+
+    open_time = features['open_time']
+    report: Dict[str, Any] = {
+        'config': cfg,
+        'period': {
+            'start': pd.to_datetime(int(open_time[0]), unit='ms').strftime('%d/%m/%Y %H:%M'),
+            'end': pd.to_datetime(int(open_time[-1]), unit='ms').strftime('%d/%m/%Y %H:%M'),
+            'hours': int(rows_count),
+            'symbols': len(features['symbols'])
+        },
+        'checks_per_signal': checks,
+        'pre_signals': int(len(event_rows)),
+        'duplicates_skipped': int((~accepted).sum()),
+        'overall': summarize(accepted),
+        'by_class': {name: summarize(accepted & (classes == index)) for index, name in enumerate(SIGNAL_CLASSES)},
+        'elapsed_ms': 0.0
+    }
+    if return_events:
+        symbols = np.asarray(features['symbols'])
+        report['events'] = pd.DataFrame({
+            'open_time': open_time[event_rows],
+            'symbol': symbols[event_cols],
+            'type': np.where(is_buy, 'COMPRA', 'VENDA'),
+            'entry_price': entry_price,
+            'target_price': target,
+            'quality_score': features['quality_score'][event_rows, event_cols],
+            'signal_class': np.asarray(SIGNAL_CLASSES)[classes],
+            'accepted': accepted,
+            'decision': outcome,
+            'decision_time': open_time[np.minimum(decision_rows, rows_count - 1)],
+            'hit': np.where(evaluable, hit, False),
+            'evaluable': evaluable,
+            'max_favorable_pct': max_favorable
+        })
+    report['elapsed_ms'] = round((time.time() - start_time) * 1000, 1)
+    return report
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """Tabela de texto com as taxas de acerto por classe"""
+    def pct(value):
+        return f"{value:6.1f}%" if value is not None else '     -'
+
+    period = report['period']
+    lines = [
+        f"📊 Backtest {period['start']} → {period['end']} ({period['hours']}h x {period['symbols']} pares)",
+        f"   Pré-sinais: {report['pre_signals']} | duplicados ignorados: {report['duplicates_skipped']} | "
+        f"verificações por sinal: {report['checks_per_signal']}",
+        f"   {'classe':<10} {'sinais':>7} {'confirm.':>8} {'taxa':>7} {'acerto conf.':>12} "
+        f"{'acerto rej.':>11} {'acerto exp.':>11}"
+    ]
+    for name, row in list(report['by_class'].items()) + [('TOTAL', report['overall'])]:
+        lines.append(f"   {name:<10} {row['signals']:>7} {row['confirmed']:>8} {row['confirmation_rate']:>6.1f}% "
+                     f"{pct(row['hit_rate_confirmed']):>12} {pct(row['hit_rate_rejected']):>11} "
+                     f"{pct(row['hit_rate_expired']):>11}")
+    return '\n'.join(lines)
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(prog='python -m core.backtest', description='Backtest vetorizado dos sinais')
+    parser.add_argument('data_dir', help='Diretório com {SYMBOL}_1h.csv')
+    parser.add_argument('--download', type=int, default=0, metavar='PARES',
+                        help='Baixa antes os N pares de maior volume (BinanceClient)')
+    parser.add_argument('--days', type=int, default=365, help='Dias de histórico no download')
+    for key, value in DEFAULT_BACKTEST_CONFIG.items():
+        parser.add_argument(f"--{key.replace('_', '-')}", type=type(value), default=value)
+    parser.add_argument('--json', default=None, help='Salva o relatório em JSON')
+    args = parser.parse_args()
+
+    if args.download:
+        from .binance_client import BinanceClient
+        binance = BinanceClient()
+        download_history(binance, binance.get_top_pairs(limit=args.download), args.data_dir, args.days)
+
+    started = time.time()
+    history = MarketHistory.from_csv_dir(args.data_dir)
+    result = run_backtest(compute_features(history), {key: getattr(args, key) for key in DEFAULT_BACKTEST_CONFIG})
+    print(format_report(result))
+    print(f"⏱️ Tempo total: {time.time() - started:.1f}s")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2, ensure_ascii=False, default=str)
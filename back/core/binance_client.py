@@ -1,14 +1,36 @@
-from typing import Dict, Optional, List, Any
+from typing import Dict, Optional, List, Any, Tuple
 import requests
+from requests.adapters import HTTPAdapter
 import time
 import json
 import logging
 import os
+import threading
 from datetime import datetime
 from config import server
 from logging import Logger
+from .binance_limiter import binance_limiter, request_weight
+from .metrics import BINANCE_REQUEST_SECONDS
+
+# Respostas GET reaproveitadas por todos os consumidores do cliente (segundos).
+# Os objetos devolvidos são compartilhados: quem chama não deve alterá-los.
+RESPONSE_CACHE_TTL = {
+    '/fapi/v1/exchangeInfo': 300,
+    '/fapi/v1/leverageBracket': 600,
+    '/fapi/v1/ticker/24hr': 10
+}
+# Parâmetros que variam a cada chamada e não fazem parte da chave do cache
+_VOLATILE_PARAMS = ('timestamp', 'signature', 'recvWindow')
+# Intervalo de ressincronização do relógio com a Binance
+TIME_SYNC_INTERVAL = 1800
 
 class BinanceClient:
+    # Valores de classe: também valem para subclasses que não chamam __init__ (ReplayBinanceClient)
+    time_offset = 0
+    _last_sync_time = 0.0
+    _time_sync_lock = threading.Lock()
+    _response_cache: Optional[Dict[str, Tuple[float, Any]]] = None
+
     def __init__(self):
         # Verificar se deve usar a API da Binance
         use_binance_env = os.getenv('USE_BINANCE_API', 'true')
@@ -38,7 +60,19 @@ class BinanceClient:
         self.api_secret = api_secret
         self.logger: Logger = self.setup_logging()
         self.time_offset = 0
-        self._init_time_offset()
+        self._last_sync_time = 0.0
+        self._time_sync_lock = threading.Lock()
+
+        # Sessão HTTP compartilhada (keep-alive) dimensionada para as threads da varredura
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=int(os.getenv('BINANCE_HTTP_POOL_SIZE', '16')))
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.limiter = binance_limiter
+        self._response_cache = {}
+        self._response_cache_lock = threading.Lock()
+
+        # Sincronização de tempo adiada para a primeira requisição assinada (get_timestamp)
         self.logger.info("BinanceClient inicializado com sucesso")
 
     def _check_api_enabled(self) -> bool:
@@ -58,7 +92,7 @@ class BinanceClient:
             success = False
             for attempt in range(5):
                 try:
-                    server_time = requests.get(f"{self.base_url}/fapi/v1/time", timeout=10).json()
+                    server_time = self.session.get(f"{self.base_url}/fapi/v1/time", timeout=10).json()
                     if 'serverTime' not in server_time:
                         self.logger.warning(f"Resposta inválida do servidor de tempo: {server_time}")
                         time.sleep(1)
@@ -86,11 +120,12 @@ class BinanceClient:
         if not self._check_api_enabled():
             return int(time.time() * 1000)
             
-        # Adiciona verificação periódica do offset a cada 30 minutos
-        current_time = time.time()
-        if not hasattr(self, '_last_sync_time') or current_time - getattr(self, '_last_sync_time', 0) > 1800:
-            self._init_time_offset()
-            self._last_sync_time = current_time
+        # Sincroniza na primeira requisição assinada e depois a cada 30 minutos
+        if time.time() - self._last_sync_time > TIME_SYNC_INTERVAL:
+            with self._time_sync_lock:
+                if time.time() - self._last_sync_time > TIME_SYNC_INTERVAL:
+                    self._init_time_offset()
+                    self._last_sync_time = time.time()
             
         return int(time.time() * 1000) + self.time_offset
 
@@ -146,10 +181,20 @@ class BinanceClient:
         max_retries = 3
         retry_delay = 1
         
-        # Rate limiting otimizado: reduzir delay entre requests
-        time.sleep(0.02)  # 20ms entre requests (era 50ms)
+        # Respostas de metadados/ticker reaproveitadas entre consumidores
+        cache_ttl = RESPONSE_CACHE_TTL.get(endpoint) if method == 'GET' else None
+        if cache_ttl:
+            cache_key = self._cache_key(endpoint, params)
+            cached = self._get_cached_response(cache_key)
+            if cached is not None:
+                return cached
+        
+        weight = request_weight(endpoint, params)
         
         for attempt in range(max_retries):
+            # Limite de peso compartilhado por todo o processo (substitui as pausas fixas)
+            self.limiter.acquire(weight)
+            request_start = time.perf_counter()
             try:
                 url = f"{self.base_url}{endpoint}"
                 headers = {'X-MBX-APIKEY': self.api_key} if auth else {}
@@ -166,20 +211,25 @@ class BinanceClient:
                 # Fazer a requisição com timeout maior
                 # No método make_request, linha ~165
                 if method == 'GET':
-                    response = requests.get(url, params=request_params, headers=headers, timeout=60)  # Aumentar de 30s para 60s
+                    response = self.session.get(url, params=request_params, headers=headers, timeout=60)  # Aumentar de 30s para 60s
                 else:
-                    response = requests.post(url, json=request_params, headers=headers, timeout=60)
+                    response = self.session.post(url, json=request_params, headers=headers, timeout=60)
+                BINANCE_REQUEST_SECONDS.observe(time.perf_counter() - request_start, endpoint, str(response.status_code))
                 
-                # Também otimizar o rate limiting
-                time.sleep(0.01)  # Reduzir de 0.02 para 0.01 (10ms)
+                used_weight = response.headers.get('X-MBX-USED-WEIGHT-1M')
+                if used_weight:
+                    self.limiter.sync_used_weight(int(used_weight))
                 
                 # Verificar resposta
                 if response.status_code == 200:
-                    return response.json()
-                elif response.status_code == 429:  # Rate limit
+                    data = response.json()
+                    if cache_ttl:
+                        self._set_cached_response(cache_key, data, cache_ttl)
+                    return data
+                elif response.status_code in (418, 429):  # Rate limit / banimento temporário
                     retry_after = int(response.headers.get('Retry-After', retry_delay))
                     self.logger.warning(f"Rate limit atingido. Aguardando {retry_after}s")
-                    time.sleep(retry_after)
+                    self.limiter.block_for(retry_after)
                 elif response.status_code == 400 and 'Timestamp for this request' in response.text:
                     # Erro de timestamp, resincronizar e tentar novamente
                     self.logger.warning("Erro de timestamp detectado, resincronizando...")
@@ -192,15 +242,36 @@ class BinanceClient:
                     time.sleep(retry_delay * (attempt + 1))
                     
             except requests.exceptions.Timeout:
+                BINANCE_REQUEST_SECONDS.observe(time.perf_counter() - request_start, endpoint, 'timeout')
                 self.logger.error(f"Timeout na requisição para {endpoint}")
                 time.sleep(retry_delay * (attempt + 1))
             except Exception as e:
+                BINANCE_REQUEST_SECONDS.observe(time.perf_counter() - request_start, endpoint, 'error')
                 self.logger.error(f"Erro na requisição: {e}")
                 if attempt < max_retries - 1:
                     time.sleep(retry_delay * (attempt + 1))
                     
         return None
         
+    @staticmethod
+    def _cache_key(endpoint: str, params: Optional[Dict]) -> str:
+        stable = sorted((key, str(value)) for key, value in (params or {}).items() if key not in _VOLATILE_PARAMS)
+        return endpoint + '?' + '&'.join(f'{key}={value}' for key, value in stable)
+        
+    def _get_cached_response(self, key: str) -> Optional[Any]:
+        with self._response_cache_lock:
+            entry = self._response_cache.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.time():
+                del self._response_cache[key]
+                return None
+            return entry[1]
+        
+    def _set_cached_response(self, key: str, data: Any, ttl: float) -> None:
+        with self._response_cache_lock:
+            self._response_cache[key] = (time.time() + ttl, data)
+        
     def get_exchange_info(self) -> Optional[Dict]:
         """Get exchange information with validation"""
         if not self._check_api_enabled():
@@ -222,7 +293,8 @@ class BinanceClient:
             return {}
             
         try:
-            params: Dict[str, Any] = {'timestamp': self.get_timestamp()}
+            # timestamp/assinatura são adicionados por make_request (só se a resposta não estiver em cache)
+            params: Dict[str, Any] = {}
             if symbol is not None:
                 params['symbol'] = str(symbol)
             
@@ -297,6 +369,41 @@ class BinanceClient:
             self.logger.error(f"Erro ao obter dados 24h: {e}")
             return {}
             
+    def get_all_prices(self) -> Dict[str, float]:
+        """Obtém o último preço de todos os pares futuros em uma única requisição"""
+        if not self._check_api_enabled():
+            return {}
+            
+        try:
+            response = self.make_request('/fapi/v1/ticker/price')
+            if not response:
+                return {}
+                
+            return {
+                item['symbol']: float(item['price'])
+                for item in response
+                if 'symbol' in item and 'price' in item
+            }
+            
+        except Exception as e:
+            self.logger.error(f"Erro ao obter preços: {e}")
+            return {}
+            
+    def get_symbol_price(self, symbol: str) -> Optional[float]:
+        """Obtém o último preço de um único par"""
+        if not self._check_api_enabled():
+            return None
+            
+        try:
+            response = self.make_request('/fapi/v1/ticker/price', params={'symbol': symbol})
+            if not response or 'price' not in response:
+                return None
+            return float(response['price'])
+            
+        except Exception as e:
+            self.logger.error(f"Erro ao obter preço de {symbol}: {e}")
+            return None
+            
     def filter_high_leverage_pairs(self, pairs: List[str]) -> List[str]:
         """Filtra pares com alavancagem >= 50x"""
         if not self._check_api_enabled():
@@ -395,4 +502,26 @@ class BinanceClient:
             return klines_data
         except Exception as e:
             self.logger.error(f"Erro ao obter klines para {symbol}: {e}")
-            return []
\ No newline at end of file
+            return []
+
+
+# Cliente compartilhado pelo processo (sessão HTTP, limitador e cache únicos)
+_shared_client: Optional[BinanceClient] = None
+_shared_client_lock = threading.Lock()
+
+
+def get_binance_client() -> BinanceClient:
+    """Retorna o BinanceClient compartilhado, criando-o no primeiro uso (sem rede)"""
+    global _shared_client
+    if _shared_client is None:
+        with _shared_client_lock:
+            if _shared_client is None:
+                _shared_client = BinanceClient()
+    return _shared_client
+
+
+def set_binance_client(client: Optional[BinanceClient]) -> None:
+    """Substitui o cliente compartilhado (ex.: ReplayBinanceClient em testes); None recria no próximo uso"""
+    global _shared_client
+    with _shared_client_lock:
+        _shared_client = client
@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+"""
+Limitador de Peso de Requisições da Binance
+Contador compartilhado por todo o processo do peso gasto no minuto corrente,
+na mesma janela que a Binance usa (REQUEST_WEIGHT por minuto de relógio).
+Sincroniza com o cabeçalho X-MBX-USED-WEIGHT-1M e respeita Retry-After de
+respostas 429/418 para todas as threads ao mesmo tempo.
+
+Faixas de prioridade (confirmation > monitoring > scan > housekeeping): quem
+espera numa faixa mais alta é atendido antes ao virar a janela, e scan e
+housekeeping não usam a última fatia do peso, reservada às verificações
+sensíveis a tempo. A faixa vem do contexto da thread (request_lane /
+set_request_lane), sem mudar as assinaturas do BinanceClient.
+"""
+
+import contextvars
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+from .logger import setup_logger
+from .metrics import BINANCE_QUEUE_WAIT_SECONDS
+
+logger = setup_logger('core.binance_limiter')
+
+# Da mais prioritária para a menos
+LANES = ('confirmation', 'monitoring', 'scan', 'housekeeping')
+# Requisições sem faixa (rotas da API, scripts) contam como monitoring
+DEFAULT_LANE = 'monitoring'
+# Fração do peso da janela que cada faixa pode ocupar
+LANE_SHARES = {'confirmation': 1.0, 'monitoring': 1.0, 'scan': 0.9, 'housekeeping': 0.8}
+
+_current_lane: contextvars.ContextVar = contextvars.ContextVar('binance_request_lane', default=DEFAULT_LANE)
+
+
+def _validate_lane(lane: str) -> str:
+    if lane not in LANE_SHARES:
+        raise ValueError(f"Faixa desconhecida: {lane} (use uma de {', '.join(LANES)})")
+    return lane
+
+
+def set_request_lane(lane: str) -> None:
+    """Define a faixa das requisições da thread atual (loops dedicados, como _confirmation_loop)"""
+    _current_lane.set(_validate_lane(lane))
+
+
+def current_lane() -> str:
+    return _current_lane.get()
+
+
+@contextmanager
+def request_lane(lane: str) -> Iterator[None]:
+    """
+    Executa o bloco com as requisições à Binance na faixa `lane`
+
+    Threads novas (ThreadPoolExecutor) não herdam a faixa: defina-a dentro da tarefa.
+    """
+    token = _current_lane.set(_validate_lane(lane))
+    try:
+        yield
+    finally:
+        _current_lane.reset(token)
+
+
+def request_weight(endpoint: str, params: Optional[Dict[str, Any]] = None) -> int:
+    """
+    Peso de uma requisição segundo a documentação da API de futuros
+
+    Args:
+        endpoint: Caminho (ex: /fapi/v1/klines)
+        params: Parâmetros da requisição
+
+    Returns:
+        int: Peso estimado (1 para endpoints não mapeados)
+    """
+    params = params or {}
+    if endpoint == '/fapi/v1/klines':
+        limit = int(params.get('limit', 500))
+        if limit < 100:
+            return 1
+        if limit < 500:
+            return 2
+        return 5 if limit <= 1000 else 10
+    if endpoint == '/fapi/v1/ticker/24hr':
+        return 1 if 'symbol' in params else 40
+    if endpoint == '/fapi/v1/ticker/price':
+        return 1 if 'symbol' in params else 2
+    return 1
+
+
+class RequestWeightLimiter:
+    """Limite de peso por minuto compartilhado entre threads e clientes"""
+
+    def __init__(self, weight_per_minute: Optional[int] = None, window_seconds: float = 60.0):
+        """
+        Args:
+            weight_per_minute: Peso máximo por janela (padrão: BINANCE_WEIGHT_PER_MINUTE ou 2000,
+                               abaixo do limite de 2400 da Binance)
+            window_seconds: Duração da janela (60s; menor apenas em testes)
+        """
+        self.weight_per_minute = weight_per_minute or int(os.getenv('BINANCE_WEIGHT_PER_MINUTE', '2000'))
+        self.window_seconds = window_seconds
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+        self._window = -1
+        self._used = 0
+        self._blocked_until = 0.0
+        self._waiting = {lane: 0 for lane in LANES}
+        self.stats = {'requests': 0, 'weight': 0, 'waits': 0, 'wait_ms_total': 0.0, 'blocks': 0}
+        self.lane_stats = {lane: {'requests': 0, 'weight': 0, 'waits': 0, 'wait_ms_total': 0.0, 'max_wait_ms': 0.0}
+                           for lane in LANES}
+
+    def _roll(self, now: float) -> None:
+        window = int(now // self.window_seconds)
+        if window != self._window:
+            self._window = window
+            self._used = 0
+
+    def _higher_lane_waiting(self, lane: str) -> bool:
+        return any(self._waiting[other] for other in LANES[:LANES.index(lane)])
+
+    def acquire(self, weight: int = 1, lane: Optional[str] = None) -> float:
+        """
+        Reserva `weight` na janela atual, aguardando a próxima se necessário
+
+        Args:
+            weight: Peso da requisição (request_weight)
+            lane: Faixa de prioridade (padrão: a do contexto atual, ver request_lane)
+
+        Returns:
+            float: Tempo aguardado em segundos
+        """
+        lane = _validate_lane(lane or _current_lane.get())
+        limit = self.weight_per_minute * LANE_SHARES[lane]
+        start = time.perf_counter()
+        waited = False
+        with self._cond:
+            self._waiting[lane] += 1
+            try:
+                while True:
+                    now = time.time()
+                    self._roll(now)
+                    window_end = (self._window + 1) * self.window_seconds
+                    if now < self._blocked_until:
+                        wait = self._blocked_until - now
+                    elif self._higher_lane_waiting(lane):
+                        # Cede a vez: quem está numa faixa acima é atendido primeiro
+                        wait = window_end - now
+                    elif self._used + weight <= limit or self._used == 0:
+                        break
+                    else:
+                        wait = window_end - now
+                    waited = True
+                    self._cond.wait(max(wait, 0.001))
+            finally:
+                self._waiting[lane] -= 1
+
+            elapsed = time.perf_counter() - start if waited else 0.0
+            self._used += weight
+            for stats in (self.stats, self.lane_stats[lane]):
+                stats['requests'] += 1
+                stats['weight'] += weight
+                if waited:
+                    stats['waits'] += 1
+                    stats['wait_ms_total'] += elapsed * 1000
+            self.lane_stats[lane]['max_wait_ms'] = max(self.lane_stats[lane]['max_wait_ms'], elapsed * 1000)
+            # Faixas abaixo que cederam a vez podem reavaliar
+            self._cond.notify_all()
+
+        BINANCE_QUEUE_WAIT_SECONDS.observe(elapsed, lane)
+        return elapsed
+
+    def sync_used_weight(self, used_weight: int) -> None:
+        """Ajusta o contador ao peso informado pela Binance (inclui outros processos no mesmo IP)"""
+        with self._lock:
+            self._roll(time.time())
+            self._used = max(self._used, int(used_weight))
+
+    def block_for(self, seconds: float) -> None:
+        """Suspende todas as requisições por `seconds` (429/418 com Retry-After)"""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.time() + seconds)
+            self.stats['blocks'] += 1
+        logger.warning("⚠️ Requisições à Binance suspensas por %.0fs (limite atingido)", seconds)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Peso usado na janela atual, totais acumulados e espera por faixa"""
+        with self._lock:
+            self._roll(time.time())
+            return {
+                'weight_per_minute': self.weight_per_minute,
+                'used_weight': self._used,
+                'blocked_seconds': round(max(0.0, self._blocked_until - time.time()), 1),
+                **self.stats,
+                'waiting': dict(self._waiting),
+                'lanes': {lane: dict(stats) for lane, stats in self.lane_stats.items()}
+            }
+
+
+# Instância global: o limite da Binance é por IP, então todos os clientes compartilham
+binance_limiter = RequestWeightLimiter()
@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+"""
+Gravação e Reprodução de Tráfego REST da Binance
+Captura pares requisição/resposta de BinanceClient.make_request (klines,
+ticker 24hr, exchangeInfo, leverage brackets, preços) em um arquivo e os serve
+de volta offline com latência simulada, para benchmarks determinísticos de
+varreduras, ciclos de confirmação e de monitoramento.
+
+Gravar (com acesso à API):
+    client = BinanceClient()
+    recorder = BinanceRecorder()
+    recorder.attach(client)
+    ...  # varredura / ciclos normais
+    recorder.save('cassettes/scan_100.json.gz')
+
+Reproduzir (offline):
+    client = ReplayBinanceClient(ReplayTransport('cassettes/scan_100.json.gz', latency_ms=80))
+"""
+
+import gzip
+import json
+import random
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from .binance_client import BinanceClient
+from .logger import setup_logger
+
+# Parâmetros que mudam a cada requisição assinada e não identificam a consulta
+VOLATILE_PARAMS = {'timestamp', 'signature', 'recvWindow'}
+
+CASSETTE_VERSION = 1
+
+
+def request_key(endpoint: str, method: str = 'GET', params: Optional[Dict] = None) -> str:
+    """
+    Chave estável de uma requisição (método, endpoint e parâmetros ordenados)
+
+    Args:
+        endpoint: Caminho da API, com ou sem query string
+        method: Método HTTP
+        params: Parâmetros da requisição
+
+    Returns:
+        str: Ex. "GET /fapi/v1/klines?interval=1h&limit=100&symbol=BTCUSDT"
+    """
+    path, _, query = endpoint.partition('?')
+    items = {}
+    for pair in filter(None, query.split('&')):
+        name, _, value = pair.partition('=')
+        items[name] = value
+    for name, value in (params or {}).items():
+        items[name] = str(value)
+    query = '&'.join(f'{k}={v}' for k, v in sorted(items.items()) if k not in VOLATILE_PARAMS)
+    return f"{method.upper()} {path}" + (f"?{query}" if query else '')
+
+
+def _open(path: str, mode: str):
+    if path.endswith('.gz'):
+        return gzip.open(path, mode + 't', encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+
+class BinanceRecorder:
+    """Grava as respostas de make_request de um ou mais clientes"""
+
+    def __init__(self):
+        # chave -> lista de respostas (JSON serializado) na ordem em que chegaram
+        self.entries: Dict[str, List[str]] = {}
+        self.latencies_ms: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def attach(self, client: BinanceClient) -> BinanceClient:
+        """
+        Passa a gravar as requisições do cliente (substitui make_request da instância)
+
+        Args:
+            client: BinanceClient conectado
+
+        Returns:
+            O próprio cliente
+        """
+        original = client.make_request
+
+        def recording_make_request(endpoint: str, method: str = 'GET', params: Optional[Dict] = None,
+                                   auth: bool = False):
+            key = request_key(endpoint, method, dict(params or {}))
+            start = time.time()
+            response = original(endpoint, method, params, auth)
+            self.record(key, response, (time.time() - start) * 1000)
+            return response
+
+        client.make_request = recording_make_request
+        return client
+
+    def record(self, key: str, response: Any, latency_ms: float = 0.0) -> None:
+        """Adiciona uma resposta à gravação (respostas None não são gravadas)"""
+        if response is None:
+            return
+        body = json.dumps(response, separators=(',', ':'))
+        with self._lock:
+            self.entries.setdefault(key, []).append(body)
+            self.latencies_ms.setdefault(key, []).append(round(latency_ms, 2))
+
+    def save(self, path: str) -> str:
+        """Salva a gravação (comprimida se o caminho terminar em .gz)"""
+        with self._lock:
+            payload = {
+                'version': CASSETTE_VERSION,
+                'recorded_at': datetime.now().strftime('%d/%m/%Y %H:%M:%S'),
+                'entries': self.entries,
+                'latencies_ms': self.latencies_ms
+            }
+        with _open(path, 'w') as f:
+            json.dump(payload, f, separators=(',', ':'))
+        print(f"💾 Gravação Binance salva: {path} ({len(payload['entries'])} requisições distintas)")
+        return path
+
+
+class ReplayTransport:
+    """Serve respostas gravadas com latência simulada"""
+
+    def __init__(self, path: str, latency_ms: Optional[float] = 0.0, jitter_ms: float = 0.0,
+                 seed: int = 42):
+        """
+        Args:
+            path: Arquivo gerado por BinanceRecorder.save
+            latency_ms: Latência fixa por requisição; None usa a latência gravada
+            jitter_ms: Variação uniforme (±) somada à latência
+            seed: Semente do jitter (reprodutível)
+        """
+        with _open(path, 'r') as f:
+            payload = json.load(f)
+        if payload.get('version') != CASSETTE_VERSION:
+            raise ValueError(f"Versão de gravação não suportada: {payload.get('version')}")
+
+        self.path = path
+        self.entries: Dict[str, List[str]] = payload['entries']
+        self.recorded_latencies: Dict[str, List[float]] = payload.get('latencies_ms', {})
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self._random = random.Random(seed)
+        self._positions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+        self.stats = {'requests': 0, 'misses': 0, 'simulated_latency_ms': 0.0}
+
+    def reset(self) -> None:
+        """Volta todas as sequências para a primeira resposta gravada"""
+        with self._lock:
+            self._positions.clear()
+            self.stats = {'requests': 0, 'misses': 0, 'simulated_latency_ms': 0.0}
+
+    def _next_body(self, key: str):
+        """Próxima resposta da sequência; a última se repete quando a gravação acaba"""
+        with self._lock:
+            self.stats['requests'] += 1
+            bodies = self.entries.get(key)
+            if not bodies:
+                self.stats['misses'] += 1
+                return None, 0.0
+            position = self._positions.get(key, 0)
+            self._positions[key] = position + 1
+            index = min(position, len(bodies) - 1)
+
+            if self.latency_ms is None:
+                recorded = self.recorded_latencies.get(key) or [0.0]
+                latency = recorded[min(index, len(recorded) - 1)]
+            else:
+                latency = self.latency_ms
+            if self.jitter_ms:
+                latency += self._random.uniform(-self.jitter_ms, self.jitter_ms)
+            latency = max(0.0, latency)
+            self.stats['simulated_latency_ms'] += latency
+            return bodies[index], latency
+
+    def request(self, endpoint: str, method: str = 'GET', params: Optional[Dict] = None) -> Optional[Any]:
+        """
+        Responde uma requisição a partir da gravação
+
+        Returns:
+            Resposta desserializada (como response.json()) ou None se não gravada
+        """
+        body, latency = self._next_body(request_key(endpoint, method, params))
+        if latency:
+            time.sleep(latency / 1000)
+        return json.loads(body) if body is not None else None
+
+
+class ReplayBinanceClient(BinanceClient):
+    """BinanceClient que usa um ReplayTransport no lugar da rede"""
+
+    def __init__(self, transport: ReplayTransport):
+        # Sem chamar BinanceClient.__init__: nada de chaves, rede ou sincronização de tempo
+        self.transport = transport
+        self.use_binance_api = True
+        self.base_url = 'replay://binance'
+        self.ws_base_url = ''
+        self.api_key = 'replay'
+        self.api_secret = 'replay'
+        self.time_offset = 0
+        self.logger = setup_logger('core.binance_replay')
+
+    def _init_time_offset(self) -> None:
+        self.time_offset = 0
+
+    def make_request(self, endpoint: str, method: str = 'GET', params: Optional[Dict] = None,
+                     auth: bool = False) -> Optional[Dict]:
+        """Mesma assinatura de BinanceClient.make_request, servida pela gravação"""
+        response = self.transport.request(endpoint, method, params)
+        if response is None:
+            self.logger.warning(f"Requisição não gravada: {request_key(endpoint, method, params)}")
+        return response
+
+
+def record_market_session(client: BinanceClient, path: str, pairs: int = 100,
+                          intervals: tuple = ('4h', '1h'), price_snapshots: int = 3,
+                          snapshot_interval: float = 5.0) -> str:
+    """
+    Grava o tráfego de uma sessão típica: seleção de pares, klines de cada par,
+    e snapshots sucessivos de preço/ticker para ciclos de monitoramento
+
+    Args:
+        client: BinanceClient conectado à API
+        path: Arquivo de saída
+        pairs: Quantidade de pares (get_top_pairs)
+        intervals: Timeframes de klines gravados por par
+        price_snapshots: Quantos snapshots de preço gravar (um por ciclo reproduzido)
+        snapshot_interval: Intervalo (s) entre snapshots de preço
+
+    Returns:
+        str: Caminho do arquivo salvo
+    """
+    recorder = BinanceRecorder()
+    recorder.attach(client)
+
+    symbols = client.get_top_pairs(limit=pairs)
+    print(f"📊 Gravando {len(symbols)} pares, timeframes {', '.join(intervals)}...")
+    for symbol in symbols + ['BTCUSDT']:
+        for interval in intervals:
+            client.get_klines(symbol, interval, 100)
+
+    for i in range(price_snapshots):
+        client.get_all_prices()
+        client.get_24h_ticker_data(symbols)
+        if i < price_snapshots - 1:
+            time.sleep(snapshot_interval)
+
+    return recorder.save(path)
+
+
+if __name__ == '__main__':
+    import sys
+    output = sys.argv[1] if len(sys.argv) > 1 else 'binance_session.json.gz'
+    record_market_session(BinanceClient(), output, pairs=int(sys.argv[2]) if len(sys.argv) > 2 else 100)
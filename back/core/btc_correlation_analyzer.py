@@ -14,6 +14,8 @@ from ta.volatility import AverageTrueRange
 import time
 import traceback
 from .binance_client import BinanceClient
+from .event_bus import event_bus
+from .metrics import STAGE_SECONDS, timed
 
 class BTCCorrelationAnalyzer:
     """
@@ -52,6 +54,9 @@ class BTCCorrelationAnalyzer:
             'low_correlation_threshold': 0.2
         }
         
+        # Última tendência publicada no barramento de eventos
+        self._last_published_trend: Optional[str] = None
+        
         print("✅ BTCCorrelationAnalyzer inicializado com sucesso!")
     
     def get_btc_price_data(self) -> Dict[str, Any]:
@@ -150,6 +155,7 @@ class BTCCorrelationAnalyzer:
                 return self.btc_cache['current_analysis']
             
             # Obter análises
+            analysis_start = time.perf_counter()
             btc_4h = self.get_btc_analysis('4h')
             btc_1h = self.get_btc_analysis('1h')
             
@@ -158,16 +164,30 @@ class BTCCorrelationAnalyzer:
             
             # Consolidar análises
             consolidated = self._consolidate_btc_analysis(btc_4h, btc_1h)
+            STAGE_SECONDS.observe(time.perf_counter() - analysis_start, 'btc_correlation')
             
             # Atualizar cache
             self.btc_cache['current_analysis'] = consolidated
             
+            # Notificar assinantes apenas quando a tendência mudar
+            trend = consolidated.get('trend')
+            if trend != self._last_published_trend:
+                previous_trend = self._last_published_trend
+                self._last_published_trend = trend
+                event_bus.publish('btc_trend', {
+                    'trend': trend,
+                    'previous_trend': previous_trend,
+                    'strength': consolidated.get('strength'),
+                    'momentum_aligned': consolidated.get('momentum_aligned')
+                })
+            
             return consolidated
             
         except Exception as e:
             print(f"❌ Erro na análise BTC consolidada: {e}")
             return self._get_default_btc_analysis()
     
+    @timed(STAGE_SECONDS, 'btc_symbol_correlation')
     def calculate_symbol_btc_correlation(self, symbol: str, timeframe: str = '1h', 
                                        periods: int = 100) -> float:
         """
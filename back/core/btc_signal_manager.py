@@ -4,14 +4,22 @@ from datetime import datetime, timedelta
 import time
 import threading
 import uuid
+import json
+import hashlib
 import pytz
 from .database import Database
-from .binance_client import BinanceClient
+from .binance_client import get_binance_client
+from .binance_limiter import set_request_lane
 from .btc_correlation_analyzer import BTCCorrelationAnalyzer
 from .telegram_notifier import TelegramNotifier
+from .event_bus import event_bus
+from .logger import setup_logger
+from .metrics import STAGE_SECONDS
 from config import server
 import traceback
 
+logger = setup_logger('core.btc_signal_manager')
+
 class SignalState:
     """Estados possíveis de um sinal"""
     PENDING = "pending"           # Aguardando confirmação
@@ -66,7 +74,7 @@ class BTCSignalManager:
         
         # Dependências principais
         self.db = db_instance
-        self.binance = BinanceClient()
+        self.binance = get_binance_client()
         self.btc_analyzer = BTCCorrelationAnalyzer(self.binance)
         
         # Configurações do sistema
@@ -76,7 +84,8 @@ class BTCSignalManager:
             'max_confirmation_attempts': 12, # Máximo 12 tentativas (1 hora)
             'min_breakout_percentage': 0.5,  # 0.5% mínimo para rompimento
             'min_volume_increase': 1.2,      # 20% aumento mínimo no volume
-            'btc_alignment_threshold': 0.3   # Threshold para alinhamento BTC
+            'btc_alignment_threshold': 0.3,  # Threshold para alinhamento BTC
+            'confirmed_view_sync_interval': 60  # Reconciliação da view de confirmados com Supabase (segundos)
         }
         
         # Estados dos sinais
@@ -88,6 +97,14 @@ class BTCSignalManager:
         self.daily_confirmed_signals: set = set()  # (symbol, type) confirmados hoje
         self.last_reset_date = datetime.now().date()  # Data do último reset
         
+        # View materializada de sinais confirmados (Supabase + memória), servida pela API
+        self._confirmed_view: List[Dict[str, Any]] = []
+        self._confirmed_view_etag: str = ''
+        self._supabase_confirmed_cache: List[Dict[str, Any]] = []
+        self._confirmed_view_lock = threading.RLock()
+        self._confirmed_view_synced_at: Optional[datetime] = None
+        self._confirmed_view_thread: Optional[threading.Thread] = None
+        
         # Controle de thread
         self.is_monitoring: bool = False
         self.monitoring_thread: Optional[threading.Thread] = None
@@ -224,6 +241,10 @@ class BTCSignalManager:
         if self.monitoring_thread and self.monitoring_thread.is_alive():
             self.monitoring_thread.join(timeout=5)
         
+        # Entregar notificações ainda na fila do Telegram
+        if self.notifier:
+            self.notifier.delivery_queue.stop()
+        
         print("✅ Monitoramento de confirmações parado")
     
     def add_pending_signal(self, signal_data: Dict[str, Any]) -> str:
@@ -235,8 +256,8 @@ class BTCSignalManager:
             # Verificar se já foi confirmado hoje (regra de não duplicação)
             signal_key = (symbol, signal_type)
             if signal_key in self.daily_confirmed_signals:
-                print(f"🚫 Sinal {symbol} ({signal_type}) já confirmado hoje - ignorando duplicata")
-                print(f"   📅 Sinais confirmados hoje: {len(self.daily_confirmed_signals)}")
+                logger.debug("🚫 Sinal %s (%s) já confirmado hoje - ignorando duplicata (%d confirmados hoje)",
+                             symbol, signal_type, len(self.daily_confirmed_signals), extra={'symbol': symbol})
                 return ""
             
             # Verificar se já existe um sinal pendente para o mesmo símbolo e tipo
@@ -247,7 +268,8 @@ class BTCSignalManager:
             )
             
             if existing_signal:
-                print(f"⚠️ Sinal {symbol} ({signal_type}) já existe pendente (ID: {existing_signal['id'][:8]}) - ignorando duplicata")
+                logger.debug("⚠️ Sinal %s (%s) já existe pendente (ID: %s) - ignorando duplicata",
+                             symbol, signal_type, existing_signal['id'][:8], extra={'symbol': symbol})
                 return existing_signal['id']
             
             # Gerar ID único para o sinal
@@ -284,16 +306,17 @@ class BTCSignalManager:
             # Adicionar à lista de pendentes
             self.pending_signals.append(pending_signal)
             
-            print(f"⏳ Sinal {symbol} ({signal_type}) adicionado para confirmação (ID: {signal_id[:8]})")
+            logger.info("⏳ Sinal %s (%s) adicionado para confirmação (ID: %s)", symbol, signal_type, signal_id[:8])
             
             # Salvar no banco de dados
             self._save_pending_signal_to_db(pending_signal)
             
+            self._publish_signal_event('signal_pending', pending_signal)
+            
             return signal_id
             
         except Exception as e:
-            print(f"❌ Erro ao adicionar sinal pendente: {e}")
-            traceback.print_exc()
+            logger.exception("❌ Erro ao adicionar sinal pendente: %s", e)
             return ""
     
     def _confirmation_loop(self) -> None:
@@ -302,6 +325,9 @@ class BTCSignalManager:
         print("🔄 INICIANDO MONITORAMENTO DE CONFIRMAÇÕES BTC")
         print("="*60)
         
+        # Verificações de sinais pendentes têm prioridade máxima no limitador da Binance
+        set_request_lane('confirmation')
+        
         while self.is_monitoring:
             try:
                 cycle_start = time.time()
@@ -310,8 +336,8 @@ class BTCSignalManager:
                 current_time = datetime.now(sao_paulo_tz)
                 
                 if self.pending_signals:
-                    print(f"\n⏰ {current_time.strftime('%d/%m/%Y %H:%M:%S')}")
-                    print(f"🔍 Verificando {len(self.pending_signals)} sinais pendentes...")
+                    logger.info("⏰ %s - 🔍 Verificando %d sinais pendentes...",
+                                current_time.strftime('%d/%m/%Y %H:%M:%S'), len(self.pending_signals))
                     
                     # Verificar cada sinal pendente
                     signals_to_remove = []
@@ -332,13 +358,15 @@ class BTCSignalManager:
                             # Se action == 'wait', continua pendente
                             
                         except Exception as e:
-                            print(f"❌ Erro ao verificar sinal {signal['symbol']}: {e}")
+                            logger.warning("❌ Erro ao verificar sinal %s: %s", signal['symbol'], e)
                             continue
                     
                     # Remover sinais processados
                     for signal in signals_to_remove:
                         if signal in self.pending_signals:
                             self.pending_signals.remove(signal)
+                    
+                    STAGE_SECONDS.observe(time.time() - cycle_start, 'confirmation_cycle')
                 
                 # Calcular tempo de espera
                 cycle_duration = time.time() - cycle_start
@@ -348,8 +376,7 @@ class BTCSignalManager:
                 self._interruptible_sleep(wait_time)
                 
             except Exception as e:
-                print(f"❌ Erro no ciclo de confirmação: {e}")
-                traceback.print_exc()
+                logger.exception("❌ Erro no ciclo de confirmação: %s", e)
                 self._interruptible_sleep(30)  # Aguardar 30s em caso de erro
     
     def _check_signal_confirmation(self, signal: PendingSignal) -> Dict[str, Any]:
@@ -438,7 +465,7 @@ class BTCSignalManager:
                 }
             
         except Exception as e:
-            print(f"❌ Erro na verificação de confirmação: {e}")
+            logger.warning("❌ Erro na verificação de confirmação: %s", e)
             return {'action': 'wait', 'reasons': []}
     
     def _record_confirmation_check(self, signal: PendingSignal, current_data: Dict[str, Any], 
@@ -527,11 +554,12 @@ class BTCSignalManager:
             signal['confirmation_checks'].append(check_record)
             
             # Log para debug
-            print(f"📋 [{signal['symbol']}] Verificação #{signal['confirmation_attempts']}: "
-                  f"{len(confirmations)} confirmações, {len(rejections)} rejeições")
+            logger.info("📋 [%s] Verificação #%d: %d confirmações, %d rejeições",
+                        signal['symbol'], signal['confirmation_attempts'], len(confirmations), len(rejections),
+                        extra={'symbol': signal['symbol']})
             
         except Exception as e:
-            print(f"❌ Erro ao registrar verificação: {e}")
+            logger.warning("❌ Erro ao registrar verificação: %s", e)
             # Adicionar registro básico em caso de erro
             sao_paulo_tz = pytz.timezone('America/Sao_Paulo')
             signal['confirmation_checks'].append({
@@ -585,7 +613,7 @@ class BTCSignalManager:
             }
             
         except Exception as e:
-            print(f"❌ Erro ao obter dados do símbolo {symbol}: {e}")
+            logger.warning("❌ Erro ao obter dados do símbolo %s: %s", symbol, e)
             return None
     
     def _check_price_breakout(self, signal: PendingSignal, current_data: Dict[str, Any]) -> Dict[str, bool]:
@@ -620,7 +648,7 @@ class BTCSignalManager:
             return {'confirmed': False, 'rejected': False}
             
         except Exception as e:
-            print(f"❌ Erro na verificação de breakout: {e}")
+            logger.warning("❌ Erro na verificação de breakout: %s", e)
             return {'confirmed': False, 'rejected': False}
     
     def _check_volume_confirmation(self, signal: PendingSignal, current_data: Dict[str, Any]) -> Dict[str, bool]:
@@ -644,7 +672,7 @@ class BTCSignalManager:
             return {'confirmed': False, 'rejected': False}
             
         except Exception as e:
-            print(f"❌ Erro na verificação de volume: {e}")
+            logger.warning("❌ Erro na verificação de volume: %s", e)
             return {'confirmed': False, 'rejected': False}
     
     def _check_btc_alignment(self, signal: PendingSignal) -> Dict[str, bool]:
@@ -669,7 +697,7 @@ class BTCSignalManager:
             return {'confirmed': False, 'rejected': False}
             
         except Exception as e:
-            print(f"❌ Erro na verificação de alinhamento BTC: {e}")
+            logger.warning("❌ Erro na verificação de alinhamento BTC: %s", e)
             return {'confirmed': False, 'rejected': False}
     
     def _check_momentum_sustainability(self, signal: PendingSignal, current_data: Dict[str, Any]) -> Dict[str, bool]:
@@ -701,14 +729,13 @@ class BTCSignalManager:
             return {'confirmed': False, 'rejected': False}
             
         except Exception as e:
-            print(f"❌ Erro na verificação de momentum: {e}")
+            logger.warning("❌ Erro na verificação de momentum: %s", e)
             return {'confirmed': False, 'rejected': False}
     
     def _confirm_signal(self, signal: PendingSignal, reasons: List[str]) -> None:
         """Confirma um sinal e o envia para o dashboard"""
         try:
-            print(f"✅ CONFIRMANDO SINAL: {signal['symbol']} - {signal['type']}")
-            print(f"   🎯 Motivos: {', '.join(reasons)}")
+            logger.info("✅ CONFIRMANDO SINAL: %s - %s | 🎯 Motivos: %s", signal['symbol'], signal['type'], ', '.join(reasons))
             
             # Capturar motivos finais da confirmação
             signal['final_decision_reason'] = self._capture_final_decision_reason(
@@ -718,8 +745,7 @@ class BTCSignalManager:
             # Adicionar à lista de sinais confirmados hoje (controle de duplicação)
             signal_key = (signal['symbol'], signal['type'])
             self.daily_confirmed_signals.add(signal_key)
-            print(f"   📅 Adicionado à lista de confirmados hoje: {signal_key}")
-            print(f"   📊 Total de sinais únicos confirmados hoje: {len(self.daily_confirmed_signals)}")
+            logger.debug("📅 %s adicionado aos confirmados hoje (total: %d)", signal_key, len(self.daily_confirmed_signals))
             
             # Criar sinal confirmado com todos os campos necessários
             confirmed_signal = signal['original_data'].copy()
@@ -736,14 +762,19 @@ class BTCSignalManager:
                 'status': 'CONFIRMED'
             })
             
-            # Adicionar à lista de confirmados
+            # Adicionar à lista de confirmados e atualizar a view servida pela API
             self.confirmed_signals.append(confirmed_signal)
+            self._rebuild_confirmed_view()
+            self._publish_signal_event('signal_confirmed', signal, {
+                'confirmed_at': confirmed_signal['confirmed_at'],
+                'reasons': reasons
+            })
             
             # Salvar sinal confirmado no banco (usando o sistema existente)
             from .gerenciar_sinais import GerenciadorSinais
             gerenciador = GerenciadorSinais(self.db)
             gerenciador.save_signal(confirmed_signal)
-            print(f"✅ Sinal {signal['symbol']} salvo no banco com motivos: {', '.join(reasons)}")
+            logger.debug("✅ Sinal %s salvo no banco com motivos: %s", signal['symbol'], ', '.join(reasons))
             
             # NOVO: Adicionar automaticamente ao sistema de monitoramento
             self._add_to_monitoring_system(confirmed_signal)
@@ -760,20 +791,17 @@ class BTCSignalManager:
                         signal['target_price']
                     )
                 except Exception as e:
-                    print(f"⚠️ Erro ao enviar notificação de confirmação: {e}")
+                    logger.warning("⚠️ Erro ao enviar notificação de confirmação: %s", e)
             
-            print(f"✅ Sinal {signal['symbol']} confirmado e enviado para dashboard!")
-            print(f"📊 Sinal adicionado ao sistema de monitoramento para avaliação quantitativa")
+            logger.info("✅ Sinal %s confirmado, enviado para dashboard e adicionado ao monitoramento", signal['symbol'])
             
         except Exception as e:
-            print(f"❌ Erro ao confirmar sinal: {e}")
-            traceback.print_exc()
+            logger.exception("❌ Erro ao confirmar sinal: %s", e)
     
     def _reject_signal(self, signal: PendingSignal, reasons: List[str]) -> None:
         """Rejeita um sinal"""
         try:
-            print(f"❌ REJEITANDO SINAL: {signal['symbol']} - {signal['type']}")
-            print(f"   🚫 Motivos: {', '.join(reasons)}")
+            logger.info("❌ REJEITANDO SINAL: %s - %s | 🚫 Motivos: %s", signal['symbol'], signal['type'], ', '.join(reasons))
             
             # Capturar motivos finais da rejeição
             signal['final_decision_reason'] = self._capture_final_decision_reason(
@@ -804,9 +832,31 @@ class BTCSignalManager:
             # Salvar no banco como rejeitado
             self._save_rejected_signal_to_db(rejected_signal)
             
+            # Expiração por timeout também passa por aqui
+            event_type = 'signal_expired' if ConfirmationReason.TIMEOUT_EXPIRED in reasons else 'signal_rejected'
+            self._publish_signal_event(event_type, signal, {'reasons': reasons})
+            
         except Exception as e:
-            print(f"❌ Erro ao rejeitar sinal: {e}")
-            traceback.print_exc()
+            logger.exception("❌ Erro ao rejeitar sinal: %s", e)
+    
+    def _publish_signal_event(self, event_type: str, signal: PendingSignal,
+                              extra: Optional[Dict[str, Any]] = None) -> None:
+        """Publica no barramento de eventos apenas o delta do sinal (sem derrubar o chamador)"""
+        try:
+            data = {
+                'id': signal['id'],
+                'symbol': signal['symbol'],
+                'type': signal['type'],
+                'entry_price': signal['entry_price'],
+                'target_price': signal.get('target_price'),
+                'quality_score': signal['quality_score'],
+                'signal_class': signal['signal_class']
+            }
+            if extra:
+                data.update(extra)
+            event_bus.publish(event_type, data)
+        except Exception as e:
+            print(f"⚠️ Erro ao publicar evento {event_type}: {e}")
     
     def _capture_final_decision_reason(self, signal: PendingSignal, decision: str, 
                                       reasons: List[str]) -> Dict[str, Any]:
@@ -1037,14 +1087,13 @@ class BTCSignalManager:
     def _expire_signal(self, signal: PendingSignal) -> None:
         """Expira um sinal por timeout"""
         try:
-            print(f"⏰ EXPIRANDO SINAL: {signal['symbol']} - {signal['type']} (Timeout)")
+            logger.info("⏰ EXPIRANDO SINAL: %s - %s (Timeout)", signal['symbol'], signal['type'])
             
             # Tratar como rejeição por timeout
             self._reject_signal(signal, [ConfirmationReason.TIMEOUT_EXPIRED])
             
         except Exception as e:
-            print(f"❌ Erro ao expirar sinal: {e}")
-            traceback.print_exc()
+            logger.exception("❌ Erro ao expirar sinal: %s", e)
     
     def _interruptible_sleep(self, duration: float) -> None:
         """Sleep que pode ser interrompido"""
@@ -1147,108 +1196,139 @@ class BTCSignalManager:
         } for signal in recent_rejected]
     
     def get_confirmed_signals(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
-        """Retorna lista de sinais confirmados para a API (busca do Supabase + memória)"""
+        """Retorna lista de sinais confirmados para a API (view materializada Supabase + memória)"""
+        signals, _ = self.get_confirmed_view()
+        
+        if limit is not None:
+            signals = signals[:limit]
+        
+        return signals
+    
+    def get_confirmed_view(self) -> tuple:
+        """
+        Retorna a view de sinais confirmados e seu ETag.
+        
+        A view é atualizada em _confirm_signal e reconciliada com o Supabase
+        em segundo plano, então a leitura não faz nenhuma chamada externa.
+        
+        Returns:
+            Tupla (lista de sinais ordenada por confirmação, etag da versão atual)
+        """
+        self._ensure_confirmed_view_sync()
+        
+        with self._confirmed_view_lock:
+            return list(self._confirmed_view), self._confirmed_view_etag
+    
+    def _format_confirmed_signal(self, signal: Dict[str, Any]) -> Dict[str, Any]:
+        """Converte um sinal confirmado em memória para o formato padrão da API"""
+        return {
+            'id': signal.get('confirmation_id', signal.get('id', '')),
+            'symbol': signal['symbol'],
+            'type': signal['type'],
+            'entry_price': signal['entry_price'],
+            'target_price': signal['target_price'],
+            'projection_percentage': signal['projection_percentage'],
+            'quality_score': signal['quality_score'],
+            'signal_class': signal['signal_class'],
+            'created_at': signal.get('timestamp', signal.get('created_at', '')),
+            'confirmed_at': signal.get('confirmed_at', ''),
+            'confirmation_reasons': signal.get('confirmation_reasons', []),
+            'confirmation_attempts': signal.get('confirmation_attempts', 0),
+            'btc_correlation': signal.get('btc_correlation', 0),
+            'btc_trend': signal.get('btc_trend', 'NEUTRAL')
+        }
+    
+    def _rebuild_confirmed_view(self) -> None:
+        """Recalcula a view de confirmados a partir do cache do Supabase e da memória"""
         try:
-            # Buscar sinais confirmados do Supabase
-            supabase_signals = self._get_confirmed_signals_from_supabase(limit)
-            
-            # Combinar com sinais em memória (para sinais recém-confirmados)
-            memory_signals = sorted(self.confirmed_signals, 
-                                  key=lambda x: x.get('confirmed_at', ''), reverse=True)
-            
-            # Aplicar limite aos sinais em memória se especificado
-            if limit is not None:
-                memory_signals = memory_signals[:limit]
-            
-            # Converter sinais em memória para o formato padrão
-            memory_formatted = [{
-                'id': signal.get('confirmation_id', signal.get('id', '')),
-                'symbol': signal['symbol'],
-                'type': signal['type'],
-                'entry_price': signal['entry_price'],
-                'target_price': signal['target_price'],
-                'projection_percentage': signal['projection_percentage'],
-                'quality_score': signal['quality_score'],
-                'signal_class': signal['signal_class'],
-                'created_at': signal.get('timestamp', signal.get('created_at', '')),
-                'confirmed_at': signal.get('confirmed_at', ''),
-                'confirmation_reasons': signal.get('confirmation_reasons', []),
-                'confirmation_attempts': signal.get('confirmation_attempts', 0),
-                'btc_correlation': signal.get('btc_correlation', 0),
-                'btc_trend': signal.get('btc_trend', 'NEUTRAL')
-            } for signal in memory_signals]
-            
-            # Combinar e remover duplicatas (priorizar Supabase)
-            all_signals = supabase_signals + memory_formatted
-            
-            # Remover duplicatas baseado no símbolo e tipo
-            seen = set()
-            unique_signals = []
-            for signal in all_signals:
-                key = (signal['symbol'], signal['type'])
-                if key not in seen:
-                    seen.add(key)
-                    unique_signals.append(signal)
-            
-            # Ordenar por data de confirmação (mais recente primeiro)
-            unique_signals.sort(key=lambda x: x.get('confirmed_at', ''), reverse=True)
-            
-            # Aplicar limite final se especificado
-            if limit is not None:
-                unique_signals = unique_signals[:limit]
-            
-            print(f"📊 Retornando {len(unique_signals)} sinais confirmados ({len(supabase_signals)} do Supabase, {len(memory_formatted)} da memória)")
-            return unique_signals
-            
+            with self._confirmed_view_lock:
+                # Sinais em memória (recém-confirmados), mais recentes primeiro
+                memory_signals = sorted(self.confirmed_signals,
+                                      key=lambda x: x.get('confirmed_at', ''), reverse=True)
+                memory_formatted = []
+                for signal in memory_signals:
+                    try:
+                        memory_formatted.append(self._format_confirmed_signal(signal))
+                    except KeyError as e:
+                        print(f"⚠️ Sinal confirmado sem campo {e}, ignorado na view")
+                
+                # Combinar e remover duplicatas por símbolo e tipo (priorizar Supabase)
+                seen = set()
+                unique_signals = []
+                for signal in self._supabase_confirmed_cache + memory_formatted:
+                    key = (signal['symbol'], signal['type'])
+                    if key not in seen:
+                        seen.add(key)
+                        unique_signals.append(signal)
+                
+                # Ordenar por data de confirmação (mais recente primeiro)
+                unique_signals.sort(key=lambda x: x.get('confirmed_at', ''), reverse=True)
+                
+                payload = json.dumps(unique_signals, sort_keys=True, default=str)
+                self._confirmed_view = unique_signals
+                self._confirmed_view_etag = hashlib.sha1(payload.encode('utf-8')).hexdigest()
+                
         except Exception as e:
-            print(f"❌ Erro ao buscar sinais confirmados: {e}")
-            # Fallback para sinais em memória apenas
-            recent_confirmed = sorted(self.confirmed_signals, 
-                                    key=lambda x: x.get('confirmed_at', ''), reverse=True)
+            print(f"❌ Erro ao atualizar view de sinais confirmados: {e}")
+            traceback.print_exc()
+    
+    def sync_confirmed_view(self) -> bool:
+        """Reconcilia a view de confirmados com o Supabase"""
+        supabase_signals = self._get_confirmed_signals_from_supabase()
+        
+        with self._confirmed_view_lock:
+            # Em caso de falha mantém o último estado conhecido do Supabase
+            if supabase_signals is not None:
+                self._supabase_confirmed_cache = supabase_signals
+            self._confirmed_view_synced_at = datetime.now()
+            self._rebuild_confirmed_view()
+        
+        return supabase_signals is not None
+    
+    def _ensure_confirmed_view_sync(self) -> None:
+        """Garante a carga inicial da view e a thread de reconciliação"""
+        if self._confirmed_view_thread and self._confirmed_view_thread.is_alive():
+            return
+        
+        with self._confirmed_view_lock:
+            if self._confirmed_view_thread and self._confirmed_view_thread.is_alive():
+                return
             
-            if limit is not None:
-                recent_confirmed = recent_confirmed[:limit]
+            if self._confirmed_view_synced_at is None:
+                self.sync_confirmed_view()
             
-            return [{
-                'id': signal.get('confirmation_id', signal.get('id', '')),
-                'symbol': signal['symbol'],
-                'type': signal['type'],
-                'entry_price': signal['entry_price'],
-                'target_price': signal['target_price'],
-                'projection_percentage': signal['projection_percentage'],
-                'quality_score': signal['quality_score'],
-                'signal_class': signal['signal_class'],
-                'created_at': signal.get('timestamp', signal.get('created_at', '')),
-                'confirmed_at': signal.get('confirmed_at', ''),
-                'confirmation_reasons': signal.get('confirmation_reasons', []),
-                'confirmation_attempts': signal.get('confirmation_attempts', 0),
-                'btc_correlation': signal.get('btc_correlation', 0),
-                'btc_trend': signal.get('btc_trend', 'NEUTRAL')
-            } for signal in recent_confirmed]
+            self._confirmed_view_thread = threading.Thread(
+                target=self._confirmed_view_sync_loop,
+                daemon=True
+            )
+            self._confirmed_view_thread.start()
+    
+    def _confirmed_view_sync_loop(self) -> None:
+        """Loop de reconciliação periódica da view de confirmados com o Supabase"""
+        while True:
+            time.sleep(self.config['confirmed_view_sync_interval'])
+            try:
+                self.sync_confirmed_view()
+            except Exception as e:
+                print(f"❌ Erro na reconciliação de sinais confirmados: {e}")
+                traceback.print_exc()
     
-    def _get_confirmed_signals_from_supabase(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
-        """Busca sinais confirmados diretamente do Supabase"""
+    def _get_confirmed_signals_from_supabase(self, limit: Optional[int] = None) -> Optional[List[Dict[str, Any]]]:
+        """Busca sinais confirmados diretamente do Supabase (None em caso de erro)"""
         try:
-            # Importar Supabase
-            import os
-            from supabase import create_client, Client
-            
-            supabase_url = os.getenv('SUPABASE_URL')
-            supabase_key = os.getenv('SUPABASE_ANON_KEY')
+            from .supabase_client import supabase_db
             
-            if not supabase_url or not supabase_key:
-                print("⚠️ Supabase não configurado para buscar sinais confirmados")
+            if not supabase_db.is_configured:
                 return []
             
-            supabase: Client = create_client(supabase_url, supabase_key)
-            
             # Buscar sinais confirmados, ordenados por data de confirmação
-            query = supabase.table('signals').select('*').eq('status', 'CONFIRMED').order('confirmed_at', desc=True)
+            def build_query(table):
+                query = table.select('*').eq('status', 'CONFIRMED').order('confirmed_at', desc=True)
+                if limit is not None:
+                    query = query.limit(limit)
+                return query
             
-            if limit is not None:
-                query = query.limit(limit)
-            
-            result = query.execute()
+            result = supabase_db.execute('signals', 'select_confirmed', build_query)
             
             if not result.data:
                 return []
@@ -1278,12 +1358,11 @@ class BTCSignalManager:
                     print(f"⚠️ Erro ao formatar sinal {signal.get('id', 'unknown')}: {e}")
                     continue
             
-            print(f"📊 Encontrados {len(formatted_signals)} sinais confirmados no Supabase")
             return formatted_signals
             
         except Exception as e:
             print(f"❌ Erro ao buscar sinais confirmados do Supabase: {e}")
-            return []
+            return None
     
     def get_confirmation_metrics(self) -> Dict[str, Any]:
         """Retorna métricas de confirmação para a API"""
@@ -1308,7 +1387,8 @@ class BTCSignalManager:
                 'pending_signals': int(pending_count),
                 'confirmation_rate': float(round(confirmation_rate, 1)),
                 'average_confirmation_time_minutes': float(round(avg_confirmation_time, 1)),
-                'system_status': 'active' if bool(self.is_monitoring) else 'inactive'
+                'system_status': 'active' if bool(self.is_monitoring) else 'inactive',
+                'telegram_delivery': self.notifier.get_delivery_metrics() if self.notifier else None
             }
             
         except Exception as e:
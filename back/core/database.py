@@ -9,6 +9,8 @@ import traceback
 import csv # Importa o módulo csv
 import numpy as np # Adicione esta importação para usar numpy.nan_to_num
 import uuid # Adicionado para gerar tokens únicos
+from .token_compactor import tokens_file_lock, get_auth_token_index
+from .metrics import CSV_IO_SECONDS
 
 def snake_to_camel_case(snake_str: str) -> str:
     """Converte uma string de snake_case para camelCase."""
@@ -16,6 +18,16 @@ def snake_to_camel_case(snake_str: str) -> str:
     # Capitaliza a primeira letra de cada componente, exceto o primeiro, e os une
     return components[0] + ''.join(x.title() for x in components[1:])
 
+def read_csv(file_path: str, **kwargs) -> pd.DataFrame:
+    """pd.read_csv com tempo registrado em csv_io_duration_seconds."""
+    with CSV_IO_SECONDS.time(os.path.basename(file_path), 'read'):
+        return pd.read_csv(file_path, **kwargs)
+
+def write_csv(df: pd.DataFrame, file_path: str, **kwargs) -> None:
+    """DataFrame.to_csv com tempo registrado em csv_io_duration_seconds."""
+    with CSV_IO_SECONDS.time(os.path.basename(file_path), 'write'):
+        df.to_csv(file_path, **kwargs)
+
 class Database:
     def __init__(self):
         # Define os caminhos dos arquivos CSV
@@ -72,7 +84,7 @@ class Database:
         config_data = {}
         if os.path.exists(self.config_file):
             try:
-                df = pd.read_csv(self.config_file)
+                df = read_csv(self.config_file)
                 if not df.empty:
                     # Converte o DataFrame para um dicionário
                     # Garante que não há NaNs antes de converter para int/str
@@ -104,7 +116,7 @@ class Database:
             # Converte o dicionário de volta para DataFrame e salva
             # Explicitamente criar um pd.Index para as colunas para satisfazer o type checker
             df = pd.DataFrame(list(self.config.items()), columns=pd.Index(['key', 'value']))
-            df.to_csv(self.config_file, index=False)
+            write_csv(df, self.config_file, index=False)
             print(f"✅ Configuração '{key}' salva.")
         except Exception as e:
             print(f"❌ Erro ao salvar configuração no {self.config_file}: {e}")
@@ -138,7 +150,7 @@ class Database:
             # Verifica se o arquivo existe e tem conteúdo
             if os.path.exists(self.signals_list_file) and os.path.getsize(self.signals_list_file) > 0:
                 # Lê o arquivo existente
-                existing_df = pd.read_csv(self.signals_list_file)
+                existing_df = read_csv(self.signals_list_file)
 
                 # Converte a coluna entry_time do DataFrame existente para datetime
                 existing_df['entry_time'] = pd.to_datetime(existing_df['entry_time'])
@@ -162,7 +174,7 @@ class Database:
             updated_df['entry_time'] = pd.to_datetime(updated_df['entry_time'])
 
             # Salva o DataFrame atualizado de volta no arquivo
-            updated_df.to_csv(self.signals_list_file, index=False)
+            write_csv(updated_df, self.signals_list_file, index=False)
             print(f"✅ Sinal adicionado para {signal_data.get('symbol')}")
             return True # Sinal adicionado com sucesso
 
@@ -171,13 +183,21 @@ class Database:
             traceback.print_exc()
             return False
 
+    def _write_auth_tokens(self, df: pd.DataFrame) -> None:
+        """
+        Grava o auth_tokens.csv e invalida o índice em memória (chamar com tokens_file_lock).
+        A invalidação explícita cobre reescritas com o mesmo tamanho dentro da resolução do mtime.
+        """
+        write_csv(df, self.auth_tokens_file, index=False)
+        get_auth_token_index(self.auth_tokens_file).invalidate()
+
     def get_auth_token(self, token: str) -> Optional[Dict[str, Any]]:
         """Busca um token de autenticação no banco de dados"""
         try:
             if not os.path.exists(self.auth_tokens_file):
                 return None
                 
-            df = pd.read_csv(self.auth_tokens_file)
+            df = read_csv(self.auth_tokens_file)
             if df.empty:
                 return None
                 
@@ -197,48 +217,43 @@ class Database:
 
     def remove_auth_token(self, token: str) -> bool:
         """Remove um token de autenticação do banco de dados"""
-        try:
-            if not os.path.exists(self.auth_tokens_file):
-                return False
+        with tokens_file_lock:
+            try:
+                if not os.path.exists(self.auth_tokens_file):
+                    return False
                 
-            df = pd.read_csv(self.auth_tokens_file)
-            if df.empty:
-                return False
+                df = read_csv(self.auth_tokens_file)
+                if df.empty:
+                    return False
                 
-            # Remover token específico
-            df_filtered = df[df['token'] != token]
+                # Remover token específico
+                df_filtered = df[df['token'] != token]
             
-            # Salvar de volta
-            df_filtered.to_csv(self.auth_tokens_file, index=False)
-            print(f"✅ Token de autenticação removido: {token[:8]}...")
-            return True
+                # Salvar de volta
+                self._write_auth_tokens(df_filtered)
+                print(f"✅ Token de autenticação removido: {token[:8]}...")
+                return True
             
-        except Exception as e:
-            print(f"❌ Erro ao remover token de autenticação: {e}")
-            traceback.print_exc()
-            return False
+            except Exception as e:
+                print(f"❌ Erro ao remover token de autenticação: {e}")
+                traceback.print_exc()
+                return False
     
     def _save_to_supabase(self, signal_data: Dict[str, Any]) -> bool:
         """Salva o sinal no banco de dados Supabase"""
         try:
-            # Verificar se as variáveis de ambiente do Supabase estão configuradas
-            supabase_url = os.getenv('SUPABASE_URL')
-            supabase_key = os.getenv('SUPABASE_ANON_KEY')
+            from .supabase_client import supabase_db
             
-            if not supabase_url or not supabase_key:
+            # Verificar se as variáveis de ambiente do Supabase estão configuradas
+            if not supabase_db.is_configured:
                 print("⚠️ Supabase não configurado, salvando apenas em CSV")
                 return False
             
-            # Importar Supabase apenas quando necessário
-            try:
-                from supabase import create_client, Client
-            except ImportError:
+            # Cliente compartilhado (None se a biblioteca não estiver instalada)
+            if supabase_db.get_client() is None:
                 print("⚠️ Biblioteca Supabase não instalada, salvando apenas em CSV")
                 return False
             
-            # Criar cliente Supabase
-            supabase: Client = create_client(supabase_url, supabase_key)
-            
             # Preparar dados para o Supabase (apenas campos que existem na tabela)
             from datetime import timezone
             import pytz
@@ -275,7 +290,7 @@ class Database:
             }
             
             # Inserir no Supabase
-            result = supabase.table('signals').insert(supabase_data).execute()
+            result = supabase_db.execute('signals', 'insert', lambda table: table.insert(supabase_data))
             
             if result.data:
                 return True
@@ -292,7 +307,7 @@ class Database:
         """Verifica se um token de autenticação é válido e retorna o user_id"""
         try:
             if os.path.exists(self.auth_tokens_file):
-                df = pd.read_csv(self.auth_tokens_file)
+                df = read_csv(self.auth_tokens_file)
                 
                 # Buscar token
                 token_row = df[df['token'] == token]
@@ -316,34 +331,38 @@ class Database:
 
     def save_auth_token(self, token: str, user_id: int, expires_at: datetime):
         """Salva um token de autenticação no arquivo CSV"""
-        try:
-            # Lê o arquivo existente ou cria um DataFrame vazio
+        with tokens_file_lock:
             try:
-                tokens_df = pd.read_csv(self.auth_tokens_file)
-            except (pd.errors.EmptyDataError, FileNotFoundError):
-                tokens_df = pd.DataFrame(columns=['token', 'user_id', 'created_at', 'expires_at'])
+                # Lê o arquivo existente ou cria um DataFrame vazio
+                try:
+                    tokens_df = read_csv(self.auth_tokens_file)
+                except (pd.errors.EmptyDataError, FileNotFoundError):
+                    tokens_df = pd.DataFrame(columns=['token', 'user_id', 'created_at', 'expires_at'])
             
-            # Remove tokens antigos para o mesmo usuário
-            tokens_df = tokens_df[tokens_df['user_id'] != user_id]
+                # Remove tokens antigos para o mesmo usuário
+                tokens_df = tokens_df[tokens_df['user_id'] != user_id]
+
+                # Descarta tokens já expirados para manter o arquivo compacto
+                tokens_df = tokens_df[pd.to_datetime(tokens_df['expires_at'], errors='coerce') > datetime.now()]
+
+                # Adiciona o novo token
+                new_token_data = pd.DataFrame([{
+                    'token': token,
+                    'user_id': user_id,
+                    'created_at': datetime.now().isoformat(),
+                    'expires_at': expires_at.isoformat()
+                }])
             
-            # Adiciona o novo token
-            new_token_data = pd.DataFrame([{
-                'token': token,
-                'user_id': user_id,
-                'created_at': datetime.now().isoformat(),
-                'expires_at': expires_at.isoformat()
-            }])
+                tokens_df = pd.concat([tokens_df, new_token_data], ignore_index=True)
+                self._write_auth_tokens(tokens_df)
             
-            tokens_df = pd.concat([tokens_df, new_token_data], ignore_index=True)
-            tokens_df.to_csv(self.auth_tokens_file, index=False)
-            
-            print(f"✅ Token de autenticação salvo para usuário {user_id}")
-            return True
+                print(f"✅ Token de autenticação salvo para usuário {user_id}")
+                return True
             
-        except Exception as e:
-            print(f"❌ Erro ao salvar token de autenticação: {e}")
-            traceback.print_exc()
-            return False # Indica que ocorreu um erro
+            except Exception as e:
+                print(f"❌ Erro ao salvar token de autenticação: {e}")
+                traceback.print_exc()
+                return False # Indica que ocorreu um erro
 
     def update_signal_status(self, symbol: str, entry_time: str, status: str, exit_price: Optional[float] = None, variation: Optional[float] = None, result: Optional[str] = None) -> None:
         """Atualiza o status de um sinal no sinais_lista.csv e move para signals_history.csv se fechado."""
@@ -352,7 +371,7 @@ class Database:
                 print(f"❌ Arquivo de sinais {self.signals_list_file} não encontrado.")
                 return
 
-            df = pd.read_csv(self.signals_list_file)
+            df = read_csv(self.signals_list_file)
 
             # Encontra a linha do sinal a ser atualizado
             # Usamos symbol e entry_time para identificar unicamente o sinal
@@ -377,7 +396,7 @@ class Database:
 
                 # Adiciona ao arquivo de histórico
                 if os.path.exists(self.signals_history_file) and os.path.getsize(self.signals_history_file) > 0:
-                    history_df = pd.read_csv(self.signals_history_file)
+                    history_df = read_csv(self.signals_history_file)
                     # Garante que as colunas do histórico correspondem
                     # Pode ser necessário mapear colunas se forem diferentes
                     # Exemplo simples:
@@ -401,7 +420,7 @@ class Database:
                             closed_signal[col] = np.nan
                     history_df = closed_signal[history_headers]
 
-                history_df.to_csv(self.signals_history_file, index=False)
+                write_csv(history_df, self.signals_history_file, index=False)
                 print(f"✅ Sinal {symbol} movido para histórico.")
 
                 # Remove o sinal do arquivo de sinais ativos
@@ -409,7 +428,7 @@ class Database:
                 print(f"✅ Sinal {symbol} removido da lista de sinais ativos.")
 
             # Salva o DataFrame atualizado de volta no sinais_lista.csv
-            df.to_csv(self.signals_list_file, index=False)
+            write_csv(df, self.signals_list_file, index=False)
             print(f"✅ Status do sinal {symbol} atualizado para '{status}'.")
 
         except Exception as e:
@@ -421,7 +440,7 @@ class Database:
         if not os.path.exists(self.signals_list_file) or os.path.getsize(self.signals_list_file) == 0:
             return []
         try:
-            df = pd.read_csv(self.signals_list_file)
+            df = read_csv(self.signals_list_file)
             # Converte o DataFrame para uma lista de dicionários
             # Substitui NaN por None para melhor representação em JSON
             return df.replace({np.nan: None}).to_dict(orient='records')
@@ -443,7 +462,7 @@ class Database:
         if not os.path.exists(self.users_file) or os.path.getsize(self.users_file) == 0:
             return []
         try:
-            df = pd.read_csv(self.users_file)
+            df = read_csv(self.users_file)
             # Garante que a coluna 'id' é tratada como string para evitar problemas com UUIDs
             df['id'] = df['id'].astype(str)
             # Converte is_admin para boolean explicitamente
@@ -487,7 +506,7 @@ class Database:
             new_user_df = pd.DataFrame([user_data])
 
             if os.path.exists(self.users_file) and os.path.getsize(self.users_file) > 0:
-                existing_df = pd.read_csv(self.users_file)
+                existing_df = read_csv(self.users_file)
                 # Verifica se o usuário já existe pelo username ou id
                 if user_data['username'] in existing_df['username'].values:
                     print(f"⚠️ Usuário '{user_data['username']}' já existe.")
@@ -500,7 +519,7 @@ class Database:
             else:
                 updated_df = new_user_df
 
-            updated_df.to_csv(self.users_file, index=False)
+            write_csv(updated_df, self.users_file, index=False)
             print(f"✅ Usuário '{user_data['username']}' adicionado.")
             return True
         except Exception as e:
@@ -540,7 +559,7 @@ class Database:
                 print(f"❌ Arquivo de usuários {self.users_file} não encontrado.")
                 return False
 
-            df = pd.read_csv(self.users_file)
+            df = read_csv(self.users_file)
             # print(f"DEBUG DB: DataFrame de usuários lido. Colunas: {df.columns.tolist()}") # Removed debug print
             # print(f"DEBUG DB: Primeiras linhas do DataFrame:\n{df.head()}") # Removed debug print
 
@@ -557,7 +576,7 @@ class Database:
                 return False
 
             df.loc[user_index, 'password'] = new_password_hash
-            df.to_csv(self.users_file, index=False)
+            write_csv(df, self.users_file, index=False)
             print(f"✅ Senha do usuário com ID '{user_id}' atualizada com sucesso.")
             return True
         except Exception as e:
@@ -570,30 +589,31 @@ class Database:
         Cria e armazena um token de redefinição de senha para um user_id.
         Retorna o token gerado ou None em caso de erro.
         """
-        try:
-            token = str(uuid.uuid4())
-            expiration_time = (datetime.now() + timedelta(hours=1)).strftime('%Y-%m-%d %H:%M:%S') # Token válido por 1 hora
-            token_data = {
-                'user_id': user_id,
-                'token': token,
-                'expiration_time': expiration_time,
-                'used': False
-            }
-            new_token_df = pd.DataFrame([token_data])
-
-            if os.path.exists(self.password_reset_tokens_file) and os.path.getsize(self.password_reset_tokens_file) > 0:
-                existing_df = pd.read_csv(self.password_reset_tokens_file)
-                updated_df = pd.concat([existing_df, new_token_df], ignore_index=True)
-            else:
-                updated_df = new_token_df
+        with tokens_file_lock:
+            try:
+                token = str(uuid.uuid4())
+                expiration_time = (datetime.now() + timedelta(hours=1)).strftime('%Y-%m-%d %H:%M:%S') # Token válido por 1 hora
+                token_data = {
+                    'user_id': user_id,
+                    'token': token,
+                    'expiration_time': expiration_time,
+                    'used': False
+                }
+                new_token_df = pd.DataFrame([token_data])
+
+                if os.path.exists(self.password_reset_tokens_file) and os.path.getsize(self.password_reset_tokens_file) > 0:
+                    existing_df = read_csv(self.password_reset_tokens_file)
+                    updated_df = pd.concat([existing_df, new_token_df], ignore_index=True)
+                else:
+                    updated_df = new_token_df
 
-            updated_df.to_csv(self.password_reset_tokens_file, index=False)
-            print(f"✅ Token de redefinição de senha criado para o usuário {user_id}.")
-            return token
-        except Exception as e:
-            print(f"❌ Erro ao criar token de redefinição de senha: {e}")
-            traceback.print_exc()
-            return None
+                write_csv(updated_df, self.password_reset_tokens_file, index=False)
+                print(f"✅ Token de redefinição de senha criado para o usuário {user_id}.")
+                return token
+            except Exception as e:
+                print(f"❌ Erro ao criar token de redefinição de senha: {e}")
+                traceback.print_exc()
+                return None
 
     def get_password_reset_token(self, token: str) -> Optional[Dict[str, Any]]:
         """
@@ -604,7 +624,7 @@ class Database:
             if not os.path.exists(self.password_reset_tokens_file) or os.path.getsize(self.password_reset_tokens_file) == 0:
                 return None
 
-            df = pd.read_csv(self.password_reset_tokens_file)
+            df = read_csv(self.password_reset_tokens_file)
             # Garante que a coluna 'used' é booleana
             df['used'] = df['used'].astype(bool)
             # Garante que a coluna 'user_id' é tratada como string
@@ -633,33 +653,34 @@ class Database:
         """
         Marca um token de redefinição de senha como usado.
         """
-        try:
-            if not os.path.exists(self.password_reset_tokens_file):
-                print(f"❌ Arquivo de tokens de redefinição de senha {self.password_reset_tokens_file} não encontrado.")
-                return False
+        with tokens_file_lock:
+            try:
+                if not os.path.exists(self.password_reset_tokens_file):
+                    print(f"❌ Arquivo de tokens de redefinição de senha {self.password_reset_tokens_file} não encontrado.")
+                    return False
 
-            df = pd.read_csv(self.password_reset_tokens_file)
-            token_index = df[df['token'] == token].index
+                df = read_csv(self.password_reset_tokens_file)
+                token_index = df[df['token'] == token].index
 
-            if token_index.empty:
-                print(f"❌ Token '{token}' não encontrado para marcar como usado.")
-                return False
+                if token_index.empty:
+                    print(f"❌ Token '{token}' não encontrado para marcar como usado.")
+                    return False
 
-            df.loc[token_index, 'used'] = True
-            df.to_csv(self.password_reset_tokens_file, index=False)
-            print(f"✅ Token '{token}' marcado como usado.")
-            return True
-        except Exception as e:
-            print(f"❌ Erro ao marcar token como usado: {e}")
-            traceback.print_exc()
-            return False
+                df.loc[token_index, 'used'] = True
+                write_csv(df, self.password_reset_tokens_file, index=False)
+                print(f"✅ Token '{token}' marcado como usado.")
+                return True
+            except Exception as e:
+                print(f"❌ Erro ao marcar token como usado: {e}")
+                traceback.print_exc()
+                return False
 
     def get_all_tickers(self) -> List[Dict[str, Any]]:
         """Retorna todos os tickers do tickers.csv."""
         if not os.path.exists(self.tickers_file) or os.path.getsize(self.tickers_file) == 0:
             return []
         try:
-            df = pd.read_csv(self.tickers_file)
+            df = read_csv(self.tickers_file)
             return df.replace({np.nan: None}).to_dict(orient='records')
         except Exception as e:
             print(f"❌ Erro ao carregar tickers: {e}")
@@ -672,7 +693,7 @@ class Database:
             new_ticker_df = pd.DataFrame([ticker_data])
 
             if os.path.exists(self.tickers_file) and os.path.getsize(self.tickers_file) > 0:
-                existing_df = pd.read_csv(self.tickers_file)
+                existing_df = read_csv(self.tickers_file)
                 if ticker_data['symbol'] in existing_df['symbol'].values:
                     print(f"⚠️ Ticker '{ticker_data['symbol']}' já existe.")
                     return False
@@ -680,7 +701,7 @@ class Database:
             else:
                 updated_df = new_ticker_df
 
-            updated_df.to_csv(self.tickers_file, index=False)
+            write_csv(updated_df, self.tickers_file, index=False)
             print(f"✅ Ticker '{ticker_data['symbol']}' adicionado.")
             return True
         except Exception as e:
@@ -695,7 +716,7 @@ class Database:
                 print(f"❌ Arquivo de tickers {self.tickers_file} não encontrado.")
                 return False
 
-            df = pd.read_csv(self.tickers_file)
+            df = read_csv(self.tickers_file)
             initial_rows = len(df)
             df = df[df['symbol'] != symbol]
 
@@ -703,7 +724,7 @@ class Database:
                 print(f"❌ Ticker '{symbol}' não encontrado para exclusão.")
                 return False
 
-            df.to_csv(self.tickers_file, index=False)
+            write_csv(df, self.tickers_file, index=False)
             print(f"✅ Ticker '{symbol}' excluído com sucesso.")
             return True
         except Exception as e:
@@ -721,26 +742,30 @@ class Database:
         Armazena um token de autenticação para um usuário com um tempo de expiração.
         Remove tokens antigos para o mesmo usuário para garantir apenas um token ativo por vez.
         """
-        try:
-            tokens_df = pd.read_csv(self.auth_tokens_file)
-        except pd.errors.EmptyDataError:
-            # Correção para o erro de tipagem do Pyright: explicitamente usando pd.Index para as colunas
-            tokens_df = pd.DataFrame([], columns=pd.Index(['token', 'user_id', 'created_at', 'expires_at']))
-
-        # Remover quaisquer tokens existentes para este user_id para garantir apenas um token ativo por usuário
-        tokens_df = tokens_df[tokens_df['user_id'] != user_id]
-
-        created_at = datetime.now()
-        expires_at = created_at + timedelta(minutes=expires_in_minutes)
-
-        new_token_data = pd.DataFrame([{
-            'token': token,
-            'user_id': user_id,
-            'created_at': created_at.isoformat(),
-            'expires_at': expires_at.isoformat()
-        }])
-        tokens_df = pd.concat([tokens_df, new_token_data], ignore_index=True)
-        tokens_df.to_csv(self.auth_tokens_file, index=False)
+        with tokens_file_lock:
+            try:
+                tokens_df = read_csv(self.auth_tokens_file)
+            except pd.errors.EmptyDataError:
+                # Correção para o erro de tipagem do Pyright: explicitamente usando pd.Index para as colunas
+                tokens_df = pd.DataFrame([], columns=pd.Index(['token', 'user_id', 'created_at', 'expires_at']))
+
+            # Remover quaisquer tokens existentes para este user_id para garantir apenas um token ativo por usuário
+            tokens_df = tokens_df[tokens_df['user_id'] != user_id]
+
+            created_at = datetime.now()
+            expires_at = created_at + timedelta(minutes=expires_in_minutes)
+
+            # Aproveitar a reescrita para descartar tokens já expirados
+            tokens_df = tokens_df[pd.to_datetime(tokens_df['expires_at'], errors='coerce') > created_at]
+
+            new_token_data = pd.DataFrame([{
+                'token': token,
+                'user_id': user_id,
+                'created_at': created_at.isoformat(),
+                'expires_at': expires_at.isoformat()
+            }])
+            tokens_df = pd.concat([tokens_df, new_token_data], ignore_index=True)
+            self._write_auth_tokens(tokens_df)
         return True
     
     def get_user_by_token(self, token: str):
@@ -748,46 +773,66 @@ class Database:
         Recupera os dados do usuário com base em um token de autenticação, verificando a expiração.
         Retorna os dados do usuário se o token for válido e não expirado, caso contrário, None.
         """
-        # print(f"DEBUG DB: get_user_by_token chamado com token: {token}") # Removido
         try:
-            tokens_df = pd.read_csv(self.auth_tokens_file)
-            # print(f"DEBUG DB: auth_tokens.csv lido. Conteúdo:\n{tokens_df}") # Removido
-        except pd.errors.EmptyDataError:
-            # print("DEBUG DB: auth_tokens.csv está vazio.") # Removido
-            return None
-        except FileNotFoundError:
-            # print("DEBUG DB: auth_tokens.csv não encontrado.") # Removido
-            return None
+            # Consulta ao índice em memória (recarregado apenas quando o CSV muda)
+            user_id = get_auth_token_index(self.auth_tokens_file).lookup(token)
         except Exception as e:
             print(f"❌ Erro ao ler auth_tokens.csv: {e}") # Mantido para erros críticos
             traceback.print_exc()
             return None
 
-        now = datetime.now()
-        # print(f"DEBUG DB: Hora atual para verificação de expiração: {now}") # Removido
-        
-        # Garante que 'expires_at' é do tipo datetime para comparação
-        tokens_df['expires_at'] = pd.to_datetime(tokens_df['expires_at'])
-
-        # Filtrar pelo token e garantir que não está expirado
-        valid_tokens = tokens_df[
-            (tokens_df['token'] == token) &
-            (tokens_df['expires_at'] > now)
-        ]
-        # print(f"DEBUG DB: Tokens válidos encontrados após filtragem:\n{valid_tokens}") # Removido
-
-        if not valid_tokens.empty:
-            token_record = valid_tokens.iloc[0]
-            user_id = str(token_record['user_id']) # Converte explicitamente para string
-            # print(f"DEBUG DB: Token válido encontrado. user_id associado: {user_id} (type: {type(user_id)})") # Removido
-            
-            user_data = self.get_user_by_id(user_id)
-            # print(f"DEBUG DB: Resultado de get_user_by_id para user_id {user_id}: {user_data}") # Removido
-            return user_data 
-        else:
-            # print(f"DEBUG DB: Nenhum token válido encontrado para '{token}' ou token expirado.") # Removido
-            pass # Não é necessário imprimir nada aqui se o token não for encontrado/válido
-        return None
+        if user_id is None:
+            return None
+
+        return self.get_user_by_id(user_id)
+
+    def compact_auth_tokens(self) -> Dict[str, int]:
+        """
+        Remove do auth_tokens.csv os tokens expirados e duplicados.
+        Retorna a contagem de tokens antes/depois da compactação.
+        """
+        with tokens_file_lock:
+            try:
+                tokens_df = read_csv(self.auth_tokens_file)
+            except (pd.errors.EmptyDataError, FileNotFoundError):
+                return {'before': 0, 'after': 0, 'removed': 0}
+
+            before = len(tokens_df)
+            expires_at = pd.to_datetime(tokens_df['expires_at'], errors='coerce')
+            tokens_df = tokens_df[expires_at > datetime.now()]
+            tokens_df = tokens_df.drop_duplicates(subset=['token'], keep='last')
+            after = len(tokens_df)
+
+            if after != before:
+                self._write_auth_tokens(tokens_df)
+
+        return {'before': before, 'after': after, 'removed': before - after}
+
+    def compact_password_reset_tokens(self) -> Dict[str, int]:
+        """
+        Remove do password_reset_tokens.csv os tokens expirados ou já utilizados.
+        Retorna a contagem de tokens antes/depois da compactação.
+        """
+        with tokens_file_lock:
+            if not os.path.exists(self.password_reset_tokens_file) or os.path.getsize(self.password_reset_tokens_file) == 0:
+                return {'before': 0, 'after': 0, 'removed': 0}
+
+            try:
+                df = read_csv(self.password_reset_tokens_file)
+            except pd.errors.EmptyDataError:
+                return {'before': 0, 'after': 0, 'removed': 0}
+
+            before = len(df)
+            # 'used' pode vir como bool ou como texto ('True'/'False') do CSV
+            used = df['used'].astype(str).str.lower().isin(['true', '1'])
+            expiration_time = pd.to_datetime(df['expiration_time'], format='%Y-%m-%d %H:%M:%S', errors='coerce')
+            df = df[~used & (expiration_time > datetime.now())]
+            after = len(df)
+
+            if after != before:
+                write_csv(df, self.password_reset_tokens_file, index=False)
+
+        return {'before': before, 'after': after, 'removed': before - after}
 
     def save_signal_to_database(self, signal_data):
         """
@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+"""
+Barramento de Eventos em Processo
+Distribui eventos de sinais/BTC/monitoramento para assinantes (ex.: stream SSE)
+sem bloquear quem publica. Cada assinante tem uma fila limitada e o número de
+assinantes simultâneos também é limitado.
+"""
+
+import itertools
+import os
+import queue
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+
+class Subscription:
+    """Assinatura de um consumidor do barramento"""
+
+    def __init__(self, subscriber_id: int, max_queue: int):
+        self.id = subscriber_id
+        self.queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self.created_at = time.time()
+        self.last_seen = self.created_at
+        self.dropped = 0
+
+    def get(self, timeout: float) -> Optional[Dict[str, Any]]:
+        """Aguarda o próximo evento (None em caso de timeout)"""
+        self.last_seen = time.time()
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class EventBus:
+    """Barramento publish/subscribe não bloqueante"""
+
+    def __init__(self, max_subscribers: Optional[int] = None, max_queue: int = 500,
+                 history_size: int = 200, stale_after: float = 60.0):
+        self.max_subscribers = max_subscribers or int(os.getenv('SSE_MAX_SUBSCRIBERS', '8'))
+        self.max_queue = max_queue
+        # Assinantes que não leem há mais que isso são considerados abandonados
+        self.stale_after = stale_after
+
+        self._lock = threading.Lock()
+        self._subscribers: Dict[int, Subscription] = {}
+        self._subscriber_ids = itertools.count(1)
+        self._event_ids = itertools.count(1)
+
+        # Últimos eventos para reenvio em reconexões (Last-Event-ID)
+        self._history: deque = deque(maxlen=history_size)
+
+        self.published = 0
+        self.rejected_subscriptions = 0
+
+    def publish(self, event_type: str, data: Dict[str, Any]) -> int:
+        """
+        Publica um evento para todos os assinantes.
+
+        Nunca bloqueia: se a fila de um assinante estiver cheia, o evento mais
+        antigo dela é descartado.
+
+        Returns:
+            ID do evento publicado
+        """
+        with self._lock:
+            event = {
+                'id': next(self._event_ids),
+                'type': event_type,
+                'data': data,
+                'timestamp': time.time()
+            }
+            self._history.append(event)
+            self.published += 1
+            subscribers = list(self._subscribers.values())
+
+        for subscription in subscribers:
+            try:
+                subscription.queue.put_nowait(event)
+            except queue.Full:
+                try:
+                    subscription.queue.get_nowait()
+                except queue.Empty:
+                    pass
+                subscription.dropped += 1
+                try:
+                    subscription.queue.put_nowait(event)
+                except queue.Full:
+                    pass
+
+        return event['id']
+
+    def subscribe(self, last_event_id: Optional[int] = None) -> Optional[Subscription]:
+        """
+        Registra um novo assinante.
+
+        Args:
+            last_event_id: Último evento recebido pelo cliente (reenvia os posteriores)
+
+        Returns:
+            Subscription ou None se o limite de assinantes foi atingido
+        """
+        with self._lock:
+            if len(self._subscribers) >= self.max_subscribers:
+                # Liberar vagas de conexões que nunca foram encerradas corretamente
+                now = time.time()
+                for sub_id, sub in list(self._subscribers.items()):
+                    if now - sub.last_seen > self.stale_after:
+                        del self._subscribers[sub_id]
+
+            if len(self._subscribers) >= self.max_subscribers:
+                self.rejected_subscriptions += 1
+                return None
+
+            subscription = Subscription(next(self._subscriber_ids), self.max_queue)
+            self._subscribers[subscription.id] = subscription
+
+            if last_event_id is not None:
+                for event in self._history:
+                    if event['id'] > last_event_id:
+                        subscription.queue.put_nowait(event)
+
+            return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Remove um assinante"""
+        with self._lock:
+            self._subscribers.pop(subscription.id, None)
+
+    def get_recent_events(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """Retorna os eventos mais recentes"""
+        with self._lock:
+            return list(self._history)[-limit:]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna estatísticas do barramento"""
+        with self._lock:
+            return {
+                'subscribers': len(self._subscribers),
+                'max_subscribers': self.max_subscribers,
+                'published': self.published,
+                'rejected_subscriptions': self.rejected_subscriptions,
+                'queues': {
+                    sub_id: {'pending': sub.queue.qsize(), 'dropped': sub.dropped}
+                    for sub_id, sub in self._subscribers.items()
+                }
+            }
+
+
+# Instância global para uso em outros módulos
+event_bus = EventBus()
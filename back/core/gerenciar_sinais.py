@@ -6,7 +6,7 @@ from datetime import datetime, timedelta
 import pytz  # Adicionar esta importação
 from typing import Dict, List, Optional, Union, Any
 from pandas import DataFrame, Series
-from .database import Database
+from .database import Database, read_csv, write_csv
 
 class GerenciadorSinais:
     def __init__(self, db_instance):
@@ -85,13 +85,13 @@ class GerenciadorSinais:
     def clean_scalping_signals(self):
         """Limpa todos os sinais de scalping à meia-noite"""
         try:
-            df = pd.read_csv(self.signals_file)
+            df = read_csv(self.signals_file)
             
             # Manter apenas sinais não-scalping
             df = df[~df['is_scalping']]
             
             # Salvar arquivo atualizado
-            df.to_csv(self.signals_file, index=False)
+            write_csv(df, self.signals_file, index=False)
             print("✨ Sinais de scalping limpos com sucesso")
             
         except Exception as e:
@@ -114,7 +114,7 @@ class GerenciadorSinais:
     def processar_sinais_abertos(self) -> DataFrame:
         """Processa sinais abertos baseado no horário atual de limpeza"""
         try:
-            df = pd.read_csv(self.signals_file)
+            df = read_csv(self.signals_file)
             
             # Converter entry_time para datetime
             df['entry_time'] = pd.to_datetime(df['entry_time'])
@@ -174,7 +174,7 @@ class GerenciadorSinais:
 
     def gerar_relatorio(self) -> dict:
         try:
-            df = pd.read_csv(self.signals_file)
+            df = read_csv(self.signals_file)
             df['entry_time'] = pd.to_datetime(df['entry_time'])
             
             cutoff = datetime.now() - timedelta(hours=24)
@@ -206,7 +206,7 @@ class GerenciadorSinais:
     def atualizar_sinal(self, symbol: str, exit_price: float, variation: float) -> bool:
         """Atualiza um sinal com informações de saída"""
         try:
-            df = pd.read_csv(self.signals_file)
+            df = read_csv(self.signals_file)
             mask = (df['symbol'] == symbol) & (df['status'] == 'OPEN')
             
             if not mask.any():
@@ -219,7 +219,7 @@ class GerenciadorSinais:
             df.loc[mask, 'result'] = 'WIN' if variation > 0 else 'LOSS'
             df.loc[mask, 'exit_time'] = datetime.now(self.timezone).strftime('%Y-%m-%d %H:%M:%S')
             
-            df.to_csv(self.signals_file, index=False)
+            write_csv(df, self.signals_file, index=False)
             print(f"✅ Sinal atualizado: {symbol}")
             return True
             
@@ -231,7 +231,7 @@ class GerenciadorSinais:
         try:
             if not os.path.exists(self.signals_file):
                 df = pd.DataFrame(columns=self.SIGNAL_COLUMNS)
-                df.to_csv(self.signals_file, index=False)
+                write_csv(df, self.signals_file, index=False)
                 print("✅ Arquivo de sinais criado")
             return True
         except Exception as e:
@@ -245,7 +245,7 @@ class GerenciadorSinais:
                 print("⚠️ Arquivo de sinais não encontrado para limpeza.")
                 return
 
-            df = pd.read_csv(self.signals_file)
+            df = read_csv(self.signals_file)
             
             # Converter entry_time para datetime
             df['entry_time'] = pd.to_datetime(df['entry_time'])
@@ -272,7 +272,7 @@ class GerenciadorSinais:
             #     print(f"✨ {len(old_open_signals)} sinais 'OPEN' antigos migrados para histórico.")
 
             # Salvar o DataFrame limpo de volta no arquivo de sinais
-            df_cleaned.to_csv(self.signals_file, index=False)
+            write_csv(df_cleaned, self.signals_file, index=False)
             print("✨ Sinais 'OPEN' do dia anterior limpos com sucesso.")
 
         except Exception as e:
@@ -286,7 +286,7 @@ class GerenciadorSinais:
                 print("⚠️ Arquivo de sinais não encontrado para limpeza.")
                 return
 
-            df = pd.read_csv(self.signals_file)
+            df = read_csv(self.signals_file)
             
             # Converter entry_time para datetime
             df['entry_time'] = pd.to_datetime(df['entry_time'])
@@ -309,7 +309,7 @@ class GerenciadorSinais:
             ].copy()
     
             # Salvar o DataFrame limpo
-            df_cleaned.to_csv(self.signals_file, index=False)
+            write_csv(df_cleaned, self.signals_file, index=False)
             
             print(f"✨ {len(sinais_para_remover)} sinais OPEN anteriores às 10:00 foram removidos.")
             print(f"📊 {len(df_cleaned[df_cleaned['status'] == 'OPEN'])} sinais OPEN restantes (gerados após 10:00).")
@@ -325,7 +325,7 @@ class GerenciadorSinais:
                 print("⚠️ Arquivo de sinais não encontrado para limpeza.")
                 return
 
-            df = pd.read_csv(self.signals_file)
+            df = read_csv(self.signals_file)
             
             # Converter entry_time para datetime
             df['entry_time'] = pd.to_datetime(df['entry_time'])
@@ -348,7 +348,7 @@ class GerenciadorSinais:
             ].copy()
     
             # Salvar o DataFrame limpo
-            df_cleaned.to_csv(self.signals_file, index=False)
+            write_csv(df_cleaned, self.signals_file, index=False)
             
             print(f"✨ {len(sinais_para_remover)} sinais OPEN anteriores às 21:00 foram removidos.")
             print(f"📊 {len(df_cleaned[df_cleaned['status'] == 'OPEN'])} sinais OPEN restantes (gerados após 21:00).")
@@ -360,7 +360,7 @@ class GerenciadorSinais:
     def limpar_sinais_antigos(self) -> None:
         """Remove sinais OPEN de dias anteriores."""
         try:
-            df = pd.read_csv(self.signals_file)
+            df = read_csv(self.signals_file)
             df['entry_time'] = pd.to_datetime(df['entry_time'])
             
             # Define o início do dia atual
@@ -373,7 +373,7 @@ class GerenciadorSinais:
             ]
             
             # Salva o DataFrame limpo
-            df_limpo.to_csv(self.signals_file, index=False)
+            write_csv(df_limpo, self.signals_file, index=False)
             print("✅ Sinais antigos removidos com sucesso")
             
         except Exception as e:
@@ -384,14 +384,14 @@ class GerenciadorSinais:
         try:
             if not os.path.exists(self.signals_file):
                 return
-            df = pd.read_csv(self.signals_file)
+            df = read_csv(self.signals_file)
             df['entry_time'] = pd.to_datetime(df['entry_time'])
             cutoff_date = datetime.now() - timedelta(days=30)
             old_signals = df[df['entry_time'] < cutoff_date]
             if not old_signals.empty:
-                old_signals.to_csv(self.history_file, mode='a', header=False, index=False)
+                write_csv(old_signals, self.history_file, mode='a', header=False, index=False)
                 df = df[df['entry_time'] >= cutoff_date]
-                df.to_csv(self.signals_file, index=False)
+                write_csv(df, self.signals_file, index=False)
         except Exception as e:
             print(f"❌ Erro ao migrar sinais: {e}")
 
@@ -406,11 +406,11 @@ class GerenciadorSinais:
             if not os.path.exists(self.signals_file):
                 print(f"Arquivo de sinais não encontrado: {self.signals_file}")
                 # Criar um arquivo vazio com cabeçalhos se não existir
-                self._empty_df.to_csv(self.signals_file, index=False)
+                write_csv(self._empty_df, self.signals_file, index=False)
                 print(f"Arquivo de sinais vazio criado: {self.signals_file}")
                 return
 
-            df = pd.read_csv(self.signals_file)
+            df = read_csv(self.signals_file)
 
             initial_count = len(df)
             cleaned_count = 0
@@ -436,7 +436,7 @@ class GerenciadorSinais:
                 return # Não salva se o status for inválido
 
             # Salvar arquivo atualizado
-            df_cleaned.to_csv(self.signals_file, index=False)
+            write_csv(df_cleaned, self.signals_file, index=False)
 
             print(f"✅ Limpeza concluída. {cleaned_count} sinais removidos.")
 
@@ -446,7 +446,7 @@ class GerenciadorSinais:
     def limpar_sinais_futuros(self) -> None:
         """Remove todos os sinais com datas futuras."""
         try:
-            df = pd.read_csv(self.signals_file)
+            df = read_csv(self.signals_file)
             df['entry_time'] = pd.to_datetime(df['entry_time'])
             
             agora = datetime.now()
@@ -457,7 +457,7 @@ class GerenciadorSinais:
             if sinais_futuros.any():
                 # Manter apenas sinais com datas válidas
                 df = df[~sinais_futuros]
-                df.to_csv(self.signals_file, index=False)
+                write_csv(df, self.signals_file, index=False)
                 print(f"✅ {sinais_futuros.sum()} sinais com datas futuras foram removidos")
             else:
                 print("✨ Nenhum sinal com data futura encontrado")
@@ -473,7 +473,7 @@ class GerenciadorSinais:
                 print(f"⚠️ Arquivo de sinais não encontrado: {self.signals_file}")
                 return []
             
-            df = pd.read_csv(self.signals_file)
+            df = read_csv(self.signals_file)
             
             if df.empty:
                 print("📭 Arquivo de sinais está vazio")
@@ -526,7 +526,7 @@ class GerenciadorSinais:
             else:
                 updated_df = existing_df.copy()
                 
-            df.to_csv(self.signals_file, index=False)
+            write_csv(df, self.signals_file, index=False)
             print(f"✅ Sinal atualizado: {symbol}")
             return True
             
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+Provider JSON do Flask para payloads com NumPy/pandas
+Serializa escalares e arrays NumPy direto no jsonify, sem pré-processamento
+recursivo nas rotas. Todos os outros tipos (datetime/pd.Timestamp, date,
+Decimal, UUID, dataclasses) e a ordenação de chaves seguem o
+DefaultJSONProvider do Flask.
+
+orjson é opcional e só é usado com JSON_USE_ORJSON=true: nesse caminho NaN e
+Infinity viram null, enquanto o encoder padrão emite NaN/Infinity.
+
+O formato de data do antigo make_serializable ('%d/%m/%Y %H:%M:%S') é aplicado
+apenas na rota que o usava, via format_legacy_values.
+"""
+
+import os
+from datetime import datetime
+from typing import Any
+
+import numpy as np
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # orjson é opcional
+    orjson = None
+
+# Formato usado pela rota de métricas antes do provider (make_serializable)
+LEGACY_DATETIME_FORMAT = '%d/%m/%Y %H:%M:%S'
+USE_ORJSON = os.getenv('JSON_USE_ORJSON', 'false').lower() == 'true'
+
+
+def _default(obj: Any) -> Any:
+    """Converte tipos NumPy; o resto fica com o DefaultJSONProvider do Flask"""
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    return DefaultJSONProvider.default(obj)
+
+
+def format_legacy_values(obj: Any) -> Any:
+    """
+    Aplica o formato de saída do antigo make_serializable a um payload
+
+    Datetimes (inclusive pd.Timestamp) viram '%d/%m/%Y %H:%M:%S' e tipos
+    desconhecidos viram str(); números, NumPy e estruturas seguem para o provider.
+    """
+    if isinstance(obj, dict):
+        return {key: format_legacy_values(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [format_legacy_values(item) for item in obj]
+    if isinstance(obj, datetime):
+        return obj.strftime(LEGACY_DATETIME_FORMAT)
+    if obj is None or isinstance(obj, (str, int, float, np.generic, np.ndarray)):
+        return obj
+    return str(obj)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """JSON provider com suporte a NumPy/pandas e caminho opcional via orjson"""
+
+    default = staticmethod(_default)
+
+    # Datetimes, dates e dataclasses passam pelo default do Flask, como no encoder padrão
+    ORJSON_OPTIONS = (
+        (orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME |
+         orjson.OPT_PASSTHROUGH_DATACLASS)
+        if orjson else 0
+    )
+
+    def _orjson_enabled(self) -> bool:
+        return orjson is not None and USE_ORJSON
+
+    def _orjson_options(self) -> int:
+        return self.ORJSON_OPTIONS | (orjson.OPT_SORT_KEYS if self.sort_keys else 0)
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        # Sem opções específicas do json padrão (indent, etc.), usar orjson
+        if self._orjson_enabled() and not kwargs:
+            try:
+                return orjson.dumps(obj, default=_default, option=self._orjson_options()).decode('utf-8')
+            except (TypeError, orjson.JSONEncodeError):
+                pass  # ex.: inteiros > 64 bits; cai no encoder padrão
+        return super().dumps(obj, **kwargs)
+
+    def response(self, *args: Any, **kwargs: Any):
+        if not self._orjson_enabled() or self._pretty_print():
+            return super().response(*args, **kwargs)
+
+        obj = self._prepare_response_obj(args, kwargs)
+        try:
+            body = orjson.dumps(obj, default=_default, option=self._orjson_options())
+        except (TypeError, orjson.JSONEncodeError):
+            return super().response(*args, **kwargs)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+    def _pretty_print(self) -> bool:
+        return self.compact is False or (self.compact is None and self._app.debug)
+
+
+def init_json_provider(app) -> None:
+    """Instala o provider JSON na aplicação Flask"""
+    app.json_provider_class = FastJSONProvider
+    app.json = FastJSONProvider(app)
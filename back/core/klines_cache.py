@@ -9,6 +9,7 @@ import time
 import threading
 from typing import Dict, Optional, Tuple
 from datetime import datetime
+from .metrics import CACHE_LOOKUPS_TOTAL
 
 class KlinesCache:
     """
@@ -279,9 +280,11 @@ class CacheManager:
         if data is not None:
             self.stats['cache_hits'] += 1
             self.stats['api_calls_saved'] += 1
+            CACHE_LOOKUPS_TOTAL.inc(f'klines_{interval}', 'hit')
             return data, True
         else:
             self.stats['cache_misses'] += 1
+            CACHE_LOOKUPS_TOTAL.inc(f'klines_{interval}', 'miss')
             return None, False
     
     def set_klines(self, symbol: str, interval: str, data: pd.DataFrame, limit: int = 100) -> None:
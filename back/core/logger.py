@@ -1,43 +1,176 @@
+import atexit
+import itertools
 import logging
 import os
-from logging.handlers import RotatingFileHandler
-from datetime import datetime
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Dict, Optional
+
+# Formato padrão de todas as saídas
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Fila única: quem loga só enfileira, a escrita em stdout/arquivo fica na thread do listener
+_log_queue: 'queue.Queue[logging.LogRecord]' = queue.Queue(-1)
+_listener: Optional[QueueListener] = None
+_listener_lock = threading.Lock()
+
+
+def _parse_level(value: str, default: int = logging.INFO) -> int:
+    level = logging.getLevelName(str(value).strip().upper())
+    return level if isinstance(level, int) else default
+
+
+def _parse_module_levels(spec: str) -> Dict[str, int]:
+    """
+    Interpreta LOG_LEVELS no formato "core.technical_analysis=WARNING,api_routes=INFO"
+
+    Args:
+        spec: Pares modulo=nivel separados por vírgula
+
+    Returns:
+        Dict com prefixo de logger -> nível
+    """
+    levels = {}
+    for item in spec.split(','):
+        if '=' not in item:
+            continue
+        name, value = item.split('=', 1)
+        if name.strip():
+            levels[name.strip()] = _parse_level(value)
+    return levels
+
+
+DEFAULT_LEVEL = _parse_level(os.getenv('LOG_LEVEL', 'INFO'))
+MODULE_LEVELS = _parse_module_levels(os.getenv('LOG_LEVELS', ''))
+
+
+def resolve_level(name: str, level: Optional[int] = None) -> int:
+    """Nível efetivo: LOG_LEVELS (prefixo mais longo) > nível explícito > LOG_LEVEL"""
+    matches = [prefix for prefix in MODULE_LEVELS if name == prefix or name.startswith(prefix + '.')]
+    if matches:
+        return MODULE_LEVELS[max(matches, key=len)]
+    return level if level is not None else DEFAULT_LEVEL
+
+
+class SymbolSamplingFilter(logging.Filter):
+    """
+    Amostragem de linhas por símbolo
+
+    Registros com extra={'symbol': ...} abaixo de WARNING passam apenas 1 a
+    cada `rate`; avisos, erros e linhas sem símbolo passam sempre. Roda antes
+    do enfileiramento, então linhas descartadas não custam formatação.
+    """
+
+    def __init__(self, rate: int = 1):
+        super().__init__()
+        self.rate = max(1, rate)
+        self._counter = itertools.count()
+        self.dropped = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.rate == 1 or record.levelno >= logging.WARNING or getattr(record, 'symbol', None) is None:
+            return True
+        if next(self._counter) % self.rate == 0:
+            return True
+        self.dropped += 1
+        return False
+
+
+symbol_sampler = SymbolSamplingFilter(int(os.getenv('LOG_SYMBOL_SAMPLE_RATE', '10')))
+
+
+def _stream_open(handler: logging.Handler) -> bool:
+    """False quando o stream do handler já foi fechado (ex.: stderr no fim do processo)"""
+    stream = getattr(handler, 'stream', None)
+    return stream is None or not getattr(stream, 'closed', False)
+
+
+class _RoutingHandler(logging.Handler):
+    """Handler do listener: console para todos, arquivo por logger configurado"""
+
+    def __init__(self):
+        super().__init__()
+        self.console = logging.StreamHandler()
+        self.console.setFormatter(logging.Formatter(LOG_FORMAT))
+        self.file_handlers: Dict[str, logging.Handler] = {}
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if _stream_open(self.console):
+            self.console.handle(record)
+        file_handler = self.file_handlers.get(record.name)
+        if file_handler is not None and _stream_open(file_handler):
+            file_handler.handle(record)
+
+    def flush(self) -> None:
+        for handler in [self.console, *self.file_handlers.values()]:
+            if _stream_open(handler):
+                handler.flush()
+
+
+_router = _RoutingHandler()
+
+
+def _ensure_listener() -> None:
+    global _listener
+    with _listener_lock:
+        if _listener is None:
+            _listener = QueueListener(_log_queue, _router, respect_handler_level=False)
+            _listener.start()
+            atexit.register(stop_logging)
+
+
+def stop_logging() -> None:
+    """Esvazia a fila e para a thread de escrita (chamado no atexit)"""
+    global _listener
+    with _listener_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+            try:
+                _router.flush()
+            except (ValueError, OSError):
+                pass  # stream fechado entre a verificação e o flush
+
+
+def set_module_level(name: str, level: int) -> None:
+    """Altera em tempo de execução o nível de um logger e dos seus filhos já criados"""
+    MODULE_LEVELS[name] = level
+    for logger_name, logger in list(logging.Logger.manager.loggerDict.items()):
+        if isinstance(logger, logging.Logger) and (logger_name == name or logger_name.startswith(name + '.')):
+            logger.setLevel(level)
+
+
+def setup_logger(name: str, log_file: str = None, level: Optional[int] = None):
+    """Configurar logger assíncrono (QueueHandler) com rotação de arquivos em produção"""
 
-def setup_logger(name: str, log_file: str = None, level: int = logging.INFO):
-    """Configurar logger para produção com rotação de arquivos"""
-    
     logger = logging.getLogger(name)
-    logger.setLevel(level)
-    
+    logger.setLevel(resolve_level(name, level))
+
     # Evitar duplicação de handlers
     if logger.handlers:
         return logger
-    
-    # Formatter
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
-    
-    # Console handler
-    console_handler = logging.StreamHandler()
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
-    
+
+    queue_handler = QueueHandler(_log_queue)
+    queue_handler.addFilter(symbol_sampler)
+    logger.addHandler(queue_handler)
+
     # File handler (apenas em produção)
     if os.getenv('FLASK_ENV') == 'production' and log_file:
         # Criar diretório de logs se não existir
         log_dir = os.path.dirname(log_file)
         if log_dir and not os.path.exists(log_dir):
             os.makedirs(log_dir)
-        
+
         # Rotating file handler (10MB, 5 backups)
         file_handler = RotatingFileHandler(
             log_file, maxBytes=10*1024*1024, backupCount=5
         )
-        file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
-    
+        file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        _router.file_handlers[name] = file_handler
+
+    _ensure_listener()
     return logger
 
 # Logger principal da aplicação
-app_logger = setup_logger('crypto_signals', '/app/logs/app.log')
\ No newline at end of file
+app_logger = setup_logger('crypto_signals', '/app/logs/app.log')
@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+"""
+Métricas de Desempenho por Etapa (formato texto do Prometheus)
+Histogramas e contadores em memória para requisições Binance, caches,
+indicadores, pontuação, correlação BTC, ciclos de confirmação/monitoramento,
+Supabase e leitura/escrita de CSV, expostos em /metrics.
+
+Desabilitadas por padrão (METRICS_ENABLED=true para ligar): com o registro
+desligado, observe/inc retornam na primeira linha e time() devolve um
+context manager compartilhado que não mede nada.
+
+Exemplo:
+    with STAGE_SECONDS.time('scoring'):
+        scores = self._calculate_signal_scores(...)
+
+    @timed(STAGE_SECONDS, 'trend_indicators')
+    def analyze_trend_df(self, df):
+        ...
+"""
+
+import bisect
+import os
+import threading
+import time
+from functools import wraps
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Limites padrão dos buckets (segundos): de 0,5ms (cache, indicadores) a 60s (ciclos)
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+                                      0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _NoopTimer:
+    """Context manager vazio usado quando as métricas estão desligadas"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP_TIMER = _NoopTimer()
+
+
+class _Timer:
+    """Mede o bloco e registra no histograma (também em caso de exceção)"""
+
+    __slots__ = ('histogram', 'labels', 'start')
+
+    def __init__(self, histogram: 'Histogram', labels: Tuple[str, ...]):
+        self.histogram = histogram
+        self.labels = labels
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start, *self.labels)
+        return False
+
+
+class Counter:
+    """Contador monotônico com rótulos"""
+
+    kind = 'counter'
+
+    def __init__(self, registry: 'MetricsRegistry', name: str, documentation: str,
+                 labelnames: Sequence[str] = ()):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        """Incrementa a série dos rótulos informados (na ordem de labelnames)"""
+        if not self.registry.enabled:
+            return
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def samples(self) -> List[Tuple[str, Tuple[str, ...], float]]:
+        with self._lock:
+            return [(self.name, labels, value) for labels, value in sorted(self._values.items())]
+
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} counter']
+        for name, labels, value in self.samples():
+            lines.append(f'{name}{_format_labels(self.labelnames, labels)} {_format_value(value)}')
+        return lines
+
+
+class Histogram:
+    """Histograma com buckets fixos, soma e contagem por combinação de rótulos"""
+
+    kind = 'histogram'
+
+    def __init__(self, registry: 'MetricsRegistry', name: str, documentation: str,
+                 labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # rótulos -> [contagens por bucket (+Inf no fim), soma, total]
+        self._series: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        """Registra uma observação (segundos) na série dos rótulos informados"""
+        if not self.registry.enabled:
+            return
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = [[0] * (len(self.buckets) + 1), 0.0, 0]
+                self._series[labels] = series
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def time(self, *labels: str):
+        """Context manager que mede o bloco (sem custo com métricas desligadas)"""
+        if not self.registry.enabled:
+            return _NOOP_TIMER
+        return _Timer(self, labels)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+    def snapshot(self) -> Dict[Tuple[str, ...], Dict[str, float]]:
+        """Contagem e soma por série (usado em testes e diagnósticos)"""
+        with self._lock:
+            return {labels: {'count': series[2], 'sum': series[1]} for labels, series in self._series.items()}
+
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            series_list = [(labels, list(series[0]), series[1], series[2])
+                           for labels, series in sorted(self._series.items())]
+        for labels, counts, total, count in series_list:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                le = '+Inf' if bound == float('inf') else _format_value(float(bound))
+                bucket_labels = _format_labels(self.labelnames, labels, 'le="%s"' % le)
+                lines.append(f'{self.name}_bucket{bucket_labels} {cumulative}')
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f'{self.name}_sum{label_text} {_format_value(float(total))}')
+            lines.append(f'{self.name}_count{label_text} {count}')
+        return lines
+
+
+class MetricsRegistry:
+    """Registro de métricas do processo"""
+
+    def __init__(self, enabled: Optional[bool] = None):
+        """
+        Args:
+            enabled: Liga a coleta (padrão: variável METRICS_ENABLED)
+        """
+        if enabled is None:
+            enabled = os.getenv('METRICS_ENABLED', 'false').lower() == 'true'
+        self.enabled = enabled
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if existing.kind != metric.kind or existing.labelnames != metric.labelnames:
+                    raise ValueError(f"Métrica {metric.name} já registrada com outro tipo/rótulos")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Cria (ou reaproveita) um contador"""
+        return self._register(Counter(self, name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        """Cria (ou reaproveita) um histograma"""
+        return self._register(Histogram(self, name, documentation, labelnames, buckets))
+
+    def enable(self) -> None:
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def reset(self) -> None:
+        """Zera todas as séries (mantém as métricas registradas)"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            metric.reset()
+
+    def render(self) -> str:
+        """Todas as métricas no formato de exposição texto do Prometheus (0.0.4)"""
+        with self._lock:
+            metrics = [self._metrics[name] for name in sorted(self._metrics)]
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+def timed(histogram: Histogram, *labels: str) -> Callable:
+    """Decorator que mede cada chamada da função no histograma"""
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not histogram.registry.enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                histogram.observe(time.perf_counter() - start, *labels)
+        return wrapper
+    return decorator
+
+
+# Instância global para uso em outros módulos
+metrics_registry = MetricsRegistry()
+
+BINANCE_REQUEST_SECONDS = metrics_registry.histogram(
+    'binance_request_duration_seconds', 'Duração de cada chamada HTTP à API Binance', ('endpoint', 'status'))
+BINANCE_QUEUE_WAIT_SECONDS = metrics_registry.histogram(
+    'binance_queue_wait_seconds', 'Espera no limitador de peso da Binance por faixa de prioridade', ('lane',))
+CACHE_LOOKUPS_TOTAL = metrics_registry.counter(
+    'cache_lookups_total', 'Consultas aos caches por resultado', ('cache', 'result'))
+STAGE_SECONDS = metrics_registry.histogram(
+    'pipeline_stage_duration_seconds',
+    'Duração das etapas de análise (indicadores, pontuação, correlação BTC, ciclos)', ('stage',))
+SUPABASE_QUERY_SECONDS = metrics_registry.histogram(
+    'supabase_query_duration_seconds', 'Duração das consultas ao Supabase', ('table', 'operation', 'status'))
+CSV_IO_SECONDS = metrics_registry.histogram(
+    'csv_io_duration_seconds', 'Duração da leitura/escrita dos arquivos CSV', ('file', 'operation'))
+SCAN_PAIRS_TOTAL = metrics_registry.counter(
+    'scan_pairs_total', 'Pares por faixa de prioridade analisados ou adiados no escaneamento', ('tier', 'action'))
@@ -0,0 +1,272 @@
+# -*- coding: utf-8 -*-
+"""
+Persistência Local do Monitoramento de Sinais
+Guarda sinais monitorados/expirados como snapshot + log de deltas:
+
+- snapshot.npz: metadados de todos os sinais (JSON embutido) + histórico de
+  preços em float64 concatenado (ids, contagens, linhas)
+- deltas.jsonl: uma linha por ciclo com os campos alterados e apenas as novas
+  linhas de histórico (float64 em base64)
+
+A recarga lê o snapshot e reaplica os deltas; periodicamente o log é
+compactado em um novo snapshot (escrita atômica via os.replace).
+
+Escalares NumPy são gravados como números/booleanos nativos e datetimes como
+{"__datetime__": "<iso>"}, para voltarem com o mesmo tipo na recarga.
+"""
+
+import base64
+import json
+import os
+import threading
+import time
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+
+def _json_default(obj: Any) -> Any:
+    """Converte tipos não nativos do json preservando o tipo na recarga"""
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, datetime):  # inclui pd.Timestamp
+        return {'__datetime__': obj.isoformat()}
+    if isinstance(obj, date):
+        return {'__date__': obj.isoformat()}
+    return str(obj)
+
+
+def _json_object_hook(obj: Dict[str, Any]) -> Any:
+    """Reconstrói os datetimes marcados por _json_default"""
+    if len(obj) == 1:
+        if '__datetime__' in obj:
+            return datetime.fromisoformat(obj['__datetime__'])
+        if '__date__' in obj:
+            return date.fromisoformat(obj['__date__'])
+    return obj
+
+
+class MonitoringStateStore:
+    """Armazena o estado do SignalMonitoringSystem em disco"""
+
+    SNAPSHOT_VERSION = 1
+
+    def __init__(self, state_dir: Optional[str] = None, compact_every: int = 24,
+                 max_delta_bytes: int = 20 * 1024 * 1024, history_capacity: int = 100):
+        """
+        Args:
+            state_dir: Diretório dos arquivos (padrão: env MONITORING_STATE_DIR ou back/monitoring_state)
+            compact_every: Número de deltas antes de gerar novo snapshot
+            max_delta_bytes: Tamanho máximo do log de deltas antes de compactar
+            history_capacity: Entradas de histórico mantidas por sinal
+        """
+        self.state_dir = state_dir or os.getenv(
+            'MONITORING_STATE_DIR',
+            os.path.join(os.path.dirname(__file__), '..', 'monitoring_state')
+        )
+        self.snapshot_file = os.path.join(self.state_dir, 'snapshot.npz')
+        self.deltas_file = os.path.join(self.state_dir, 'deltas.jsonl')
+        self.compact_every = compact_every
+        self.max_delta_bytes = max_delta_bytes
+        self.history_capacity = history_capacity
+
+        self._lock = threading.RLock()
+        self._seq = 0
+        self._deltas_since_snapshot = 0
+        # Quantas entradas de histórico de cada sinal já estão em disco
+        self._persisted_appended: Dict[str, int] = {}
+
+        self.stats = {
+            'last_load_ms': None,
+            'last_snapshot_ms': None,
+            'last_delta_ms': None,
+            'snapshots_written': 0,
+            'deltas_written': 0
+        }
+
+        os.makedirs(self.state_dir, exist_ok=True)
+
+    # ------------------------------------------------------------------
+    # Escrita
+    # ------------------------------------------------------------------
+
+    def record(self, signals: Iterable[Any]) -> int:
+        """
+        Anexa um delta com o estado atual dos sinais informados.
+
+        Args:
+            signals: Sinais alterados (MonitoredSignal)
+
+        Returns:
+            Número de sinais gravados no delta
+        """
+        with self._lock:
+            start = time.time()
+            entries = []
+            for signal in signals:
+                history = signal.price_history
+                persisted = self._persisted_appended.get(signal.id, 0)
+                new_rows = min(history.appended - persisted, len(history))
+                entries.append({
+                    'record': signal.to_record(),
+                    'appended': history.appended,
+                    'rows': self._encode_rows(history.tail(new_rows))
+                })
+                self._persisted_appended[signal.id] = history.appended
+
+            if not entries:
+                return 0
+
+            self._seq += 1
+            line = json.dumps({'seq': self._seq, 'ts': time.time(), 'signals': entries},
+                              default=_json_default, separators=(',', ':'))
+            with open(self.deltas_file, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+
+            self._deltas_since_snapshot += 1
+            self.stats['deltas_written'] += 1
+            self.stats['last_delta_ms'] = round((time.time() - start) * 1000, 2)
+            return len(entries)
+
+    def needs_compaction(self) -> bool:
+        """Indica se o log de deltas deve ser compactado em um snapshot"""
+        if self._deltas_since_snapshot >= self.compact_every:
+            return True
+        try:
+            return os.path.getsize(self.deltas_file) > self.max_delta_bytes
+        except OSError:
+            return False
+
+    def write_snapshot(self, signals: Iterable[Any]) -> int:
+        """
+        Grava um snapshot completo e descarta o log de deltas.
+
+        Args:
+            signals: Todos os sinais (monitorados e expirados)
+
+        Returns:
+            Número de sinais no snapshot
+        """
+        with self._lock:
+            start = time.time()
+            records, appended, ids, counts, blocks = [], {}, [], [], []
+            for signal in signals:
+                rows = signal.price_history.to_array()
+                records.append(signal.to_record())
+                appended[signal.id] = signal.price_history.appended
+                ids.append(signal.id)
+                counts.append(len(rows))
+                blocks.append(rows)
+
+            meta = json.dumps({
+                'version': self.SNAPSHOT_VERSION,
+                'seq': self._seq,
+                'created_at': time.time(),
+                'signals': records,
+                'appended': appended
+            }, default=_json_default, separators=(',', ':')).encode('utf-8')
+
+            tmp_file = self.snapshot_file + '.tmp'
+            with open(tmp_file, 'wb') as f:
+                np.savez(
+                    f,
+                    meta=np.frombuffer(meta, dtype=np.uint8),
+                    ids=np.array(ids, dtype=str),
+                    counts=np.array(counts, dtype=np.int32),
+                    rows=np.concatenate(blocks) if blocks else np.empty((0, 4), dtype=np.float64)
+                )
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, self.snapshot_file)
+
+            # Deltas anteriores já estão no snapshot
+            open(self.deltas_file, 'w').close()
+            self._deltas_since_snapshot = 0
+            self._persisted_appended = dict(appended)
+
+            self.stats['snapshots_written'] += 1
+            self.stats['last_snapshot_ms'] = round((time.time() - start) * 1000, 2)
+            return len(records)
+
+    # ------------------------------------------------------------------
+    # Leitura
+    # ------------------------------------------------------------------
+
+    def load(self) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, np.ndarray], Dict[str, int]]:
+        """
+        Carrega snapshot + deltas.
+
+        Returns:
+            (registros por id, histórico (n, 4) por id, total de entradas adicionadas por id)
+        """
+        with self._lock:
+            start = time.time()
+            records: Dict[str, Dict[str, Any]] = {}
+            history: Dict[str, np.ndarray] = {}
+            appended: Dict[str, int] = {}
+            snapshot_seq = 0
+
+            if os.path.exists(self.snapshot_file):
+                with np.load(self.snapshot_file, allow_pickle=False) as data:
+                    meta = json.loads(data['meta'].tobytes().decode('utf-8'), object_hook=_json_object_hook)
+                    rows = data['rows']
+                    offsets = np.concatenate(([0], np.cumsum(data['counts'])))
+                    for i, signal_id in enumerate(data['ids'].tolist()):
+                        history[signal_id] = rows[offsets[i]:offsets[i + 1]]
+                snapshot_seq = meta.get('seq', 0)
+                records = {record['id']: record for record in meta.get('signals', [])}
+                appended = {k: int(v) for k, v in meta.get('appended', {}).items()}
+
+            self._seq = snapshot_seq
+            self._deltas_since_snapshot = 0
+            if os.path.exists(self.deltas_file):
+                with open(self.deltas_file, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        try:
+                            delta = json.loads(line, object_hook=_json_object_hook)
+                        except ValueError:
+                            # Última linha incompleta (processo interrompido durante a escrita)
+                            continue
+                        if delta['seq'] <= snapshot_seq:
+                            continue
+                        for entry in delta['signals']:
+                            record = entry['record']
+                            signal_id = record['id']
+                            records[signal_id] = record
+                            appended[signal_id] = entry['appended']
+                            new_rows = self._decode_rows(entry['rows'])
+                            if len(new_rows):
+                                previous = history.get(signal_id)
+                                combined = new_rows if previous is None else np.concatenate((previous, new_rows))
+                                history[signal_id] = combined[-self.history_capacity:]
+                        self._seq = max(self._seq, delta['seq'])
+                        self._deltas_since_snapshot += 1
+
+            self._persisted_appended = dict(appended)
+            self.stats['last_load_ms'] = round((time.time() - start) * 1000, 2)
+            return records, history, appended
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna estatísticas da persistência"""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['deltas_since_snapshot'] = self._deltas_since_snapshot
+            stats['state_dir'] = os.path.abspath(self.state_dir)
+            for name, path in (('snapshot_bytes', self.snapshot_file), ('deltas_bytes', self.deltas_file)):
+                stats[name] = os.path.getsize(path) if os.path.exists(path) else 0
+            return stats
+
+    @staticmethod
+    def _encode_rows(rows: np.ndarray) -> str:
+        if not len(rows):
+            return ''
+        return base64.b64encode(np.ascontiguousarray(rows, dtype=np.float64).tobytes()).decode('ascii')
+
+    @staticmethod
+    def _decode_rows(encoded: str) -> np.ndarray:
+        if not encoded:
+            return np.empty((0, 4), dtype=np.float64)
+        return np.frombuffer(base64.b64decode(encoded), dtype=np.float64).reshape(-1, 4)
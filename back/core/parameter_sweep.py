@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+"""
+Varredura Paralela de Parâmetros de Confirmação e Pontuação
+Avalia conjuntos de parâmetros do BTCSignalManager (min_breakout_percentage,
+min_volume_increase, check_interval, max_confirmation_attempts) e o corte de
+qualidade do analyze_symbol sobre dados de mercado gravados, num pool de
+processos, e devolve uma tabela ordenada de taxa de confirmação x acerto do alvo.
+
+Os indicadores são calculados uma única vez (compute_features), gravados em
+.npy e mapeados em memória por todos os processos; cada conjunto de
+parâmetros só refaz a etapa barata de run_backtest.
+
+    python -m core.parameter_sweep data/klines \\
+        --grid min_breakout_percentage=0.3,0.5,0.8 --grid quality_score_minimum=65,70,75 --workers 4
+"""
+
+import itertools
+import os
+import random
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import pandas as pd
+
+from .backtest import DEFAULT_BACKTEST_CONFIG, load_features, run_backtest, save_features
+from .logger import setup_logger
+
+logger = setup_logger('core.parameter_sweep')
+
+# Grade padrão em torno dos valores atuais
+DEFAULT_GRID: Dict[str, List[Any]] = {
+    'quality_score_minimum': [65.0, 70.0, 75.0],
+    'min_breakout_percentage': [0.3, 0.5, 0.8, 1.2],
+    'min_volume_increase': [1.0, 1.2, 1.5],
+    'max_confirmation_attempts': [12, 24, 48]
+}
+
+RANK_COLUMNS = ['hit_rate_confirmed', 'confirmation_rate', 'confirmed', 'confirmed_per_day',
+                'hit_rate_rejected', 'hit_rate_all']
+
+# Features compartilhadas do processo de trabalho (carregadas uma vez por processo)
+_worker_features: Optional[Dict[str, Any]] = None
+
+
+def _validate(params: Dict[str, Any]) -> Dict[str, Any]:
+    unknown = set(params) - set(DEFAULT_BACKTEST_CONFIG)
+    if unknown:
+        raise ValueError(f"Parâmetros não suportados: {', '.join(sorted(unknown))}")
+    return params
+
+
+def grid_parameter_sets(grid: Dict[str, Sequence[Any]]) -> List[Dict[str, Any]]:
+    """Produto cartesiano da grade {parametro: [valores]}"""
+    _validate(grid)
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+
+def random_parameter_sets(space: Dict[str, Union[Sequence[Any], Tuple[float, float]]], count: int,
+                          seed: int = 42) -> List[Dict[str, Any]]:
+    """
+    Sorteia conjuntos de parâmetros
+
+    Args:
+        space: {parametro: lista de valores} ou {parametro: (mínimo, máximo)};
+               intervalos com limites inteiros sorteiam inteiros
+        count: Quantidade de conjuntos
+        seed: Semente (reprodutível)
+    """
+    _validate(space)
+    rng = random.Random(seed)
+    sets = []
+    for _ in range(count):
+        params = {}
+        for name, values in space.items():
+            if isinstance(values, tuple) and len(values) == 2:
+                low, high = values
+                if isinstance(low, int) and isinstance(high, int):
+                    params[name] = rng.randint(low, high)
+                else:
+                    params[name] = round(rng.uniform(low, high), 3)
+            else:
+                params[name] = rng.choice(list(values))
+        sets.append(params)
+    return sets
+
+
+def _summarize(params: Dict[str, Any], report: Dict[str, Any]) -> Dict[str, Any]:
+    """Linha da tabela: parâmetros + métricas gerais + acerto dos confirmados por classe"""
+    overall = report['overall']
+    evaluated = [overall[f'hit_rate_{result}'] for result in ('confirmed', 'rejected', 'expired')]
+    counts = [overall[result] for result in ('confirmed', 'rejected', 'expired')]
+    weighted = [(rate, count) for rate, count in zip(evaluated, counts) if rate is not None and count]
+    days = max(report['period']['hours'] / 24, 1)
+    row = dict(params)
+    row.update({
+        'signals': overall['signals'],
+        'confirmed': overall['confirmed'],
+        'confirmation_rate': overall['confirmation_rate'],
+        'confirmed_per_day': round(overall['confirmed'] / days, 2),
+        'hit_rate_confirmed': overall['hit_rate_confirmed'],
+        'hit_rate_rejected': overall['hit_rate_rejected'],
+        'hit_rate_all': round(sum(rate * count for rate, count in weighted) / sum(c for _, c in weighted), 1)
+        if weighted else None,
+        'checks_per_signal': report['checks_per_signal']
+    })
+    for name, summary in report['by_class'].items():
+        row[f'hit_rate_confirmed_{name}'] = summary['hit_rate_confirmed']
+    return row
+
+
+def _init_worker(features_dir: str) -> None:
+    global _worker_features
+    _worker_features = load_features(features_dir)
+
+
+def _evaluate(params: Dict[str, Any]) -> Dict[str, Any]:
+    return _summarize(params, run_backtest(_worker_features, params))
+
+
+def run_sweep(features: Dict[str, Any], parameter_sets: List[Dict[str, Any]], workers: Optional[int] = None,
+              features_dir: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Avalia os conjuntos de parâmetros em paralelo sobre as mesmas features
+
+    Args:
+        features: Saída de compute_features
+        parameter_sets: Conjuntos a avaliar (chaves de DEFAULT_BACKTEST_CONFIG)
+        workers: Processos (padrão: CPUs; 1 = no próprio processo)
+        features_dir: Onde gravar as features compartilhadas (padrão: temporário)
+
+    Returns:
+        List[Dict]: Uma linha por conjunto, na ordem de parameter_sets
+    """
+    for params in parameter_sets:
+        _validate(params)
+    workers = workers or os.cpu_count() or 1
+    start_time = time.time()
+
+    if workers == 1 or len(parameter_sets) == 1:
+        rows = [_summarize(params, run_backtest(features, params)) for params in parameter_sets]
+    else:
+        temporary = features_dir is None
+        features_dir = features_dir or tempfile.mkdtemp(prefix='sweep_features_')
+        try:
+            save_features(features, features_dir)
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(features_dir,)) as executor:
+                rows = list(executor.map(_evaluate, parameter_sets, chunksize=max(1, len(parameter_sets) // (workers * 4))))
+        finally:
+            if temporary:
+                shutil.rmtree(features_dir, ignore_errors=True)
+
+    logger.info("🔬 %d conjuntos de parâmetros avaliados em %.1fs (%d processos)",
+                len(rows), time.time() - start_time, workers)
+    return rows
+
+
+def rank_results(rows: List[Dict[str, Any]], rank_by: str = 'hit_rate_confirmed',
+                 min_confirmed: int = 30) -> pd.DataFrame:
+    """
+    Tabela ordenada (melhor primeiro); conjuntos com poucos confirmados vão para o fim
+
+    Args:
+        rows: Saída de run_sweep
+        rank_by: Métrica de ordenação (maior é melhor)
+        min_confirmed: Mínimo de sinais confirmados para a métrica ser confiável
+    """
+    table = pd.DataFrame(rows)
+    if table.empty:
+        return table
+    table['reliable'] = table['confirmed'] >= min_confirmed
+    table = table.sort_values(['reliable', rank_by, 'confirmed'], ascending=[False, False, False],
+                              na_position='last').reset_index(drop=True)
+    table.index = table.index + 1
+    return table
+
+
+def format_table(table: pd.DataFrame, top: int = 20) -> str:
+    """Tabela de texto com parâmetros e métricas principais"""
+    if table.empty:
+        return "⚠️ Nenhum resultado"
+    params = [col for col in table.columns if col in DEFAULT_BACKTEST_CONFIG]
+    columns = params + [col for col in RANK_COLUMNS if col in table.columns] + ['reliable']
+    return table[columns].head(top).to_string(float_format=lambda value: f'{value:.2f}')
+
+
+if __name__ == '__main__':
+    import argparse
+
+    from .backtest import MarketHistory, compute_features
+
+    def parse_grid(items: List[str]) -> Dict[str, List[Any]]:
+        grid = {}
+        for item in items:
+            name, _, values = item.partition('=')
+            cast = type(DEFAULT_BACKTEST_CONFIG.get(name, 0.0))
+            grid[name] = [cast(value) for value in values.split(',') if value]
+        return grid
+
+    parser = argparse.ArgumentParser(prog='python -m core.parameter_sweep', description='Varredura de parâmetros')
+    parser.add_argument('data_dir', help='Diretório com {SYMBOL}_1h.csv (download_history)')
+    parser.add_argument('--grid', action='append', default=[], help='parametro=v1,v2,... (repetível)')
+    parser.add_argument('--random', type=int, default=0, help='Sorteia N conjuntos dos valores da grade')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--rank-by', default='hit_rate_confirmed')
+    parser.add_argument('--min-confirmed', type=int, default=30)
+    parser.add_argument('--top', type=int, default=20)
+    parser.add_argument('--csv', default=None, help='Salva a tabela completa em CSV')
+    args = parser.parse_args()
+
+    grid = parse_grid(args.grid) or DEFAULT_GRID
+    parameter_sets = random_parameter_sets(grid, args.random) if args.random else grid_parameter_sets(grid)
+
+    started = time.time()
+    market_features = compute_features(MarketHistory.from_csv_dir(args.data_dir))
+    ranked = rank_results(run_sweep(market_features, parameter_sets, args.workers),
+                          args.rank_by, args.min_confirmed)
+    print(format_table(ranked, args.top))
+    print(f"⏱️ {len(parameter_sets)} conjuntos em {time.time() - started:.1f}s")
+    if args.csv:
+        ranked.to_csv(args.csv, index_label='rank')
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+Snapshot Compartilhado de Preços da Binance
+Mantém um único dicionário símbolo -> preço atualizado com cadência curta.
+Todas as requisições leem o mesmo snapshot; no máximo uma chamada a
+/fapi/v1/ticker/price é feita por intervalo, independente do número de
+usuários do dashboard.
+"""
+
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional
+
+
+class PriceSnapshot:
+    """Preços de todos os pares futuros com atualização single-flight"""
+
+    def __init__(self, binance_client=None, refresh_interval: Optional[float] = None, max_stale: float = 60.0):
+        """
+        Args:
+            binance_client: Cliente com get_all_prices()
+            refresh_interval: Idade (s) a partir da qual o snapshot é atualizado
+            max_stale: Idade máxima (s) para servir o snapshot anterior se a atualização falhar
+        """
+        self.binance_client = binance_client
+        self.refresh_interval = refresh_interval if refresh_interval is not None else float(
+            os.getenv('PRICE_SNAPSHOT_INTERVAL', '2')
+        )
+        self.max_stale = max_stale
+
+        self._prices: Dict[str, float] = {}
+        self._updated_at = 0.0
+        self._next_attempt = 0.0
+        self._refresh_lock = threading.Lock()
+
+        self.stats = {
+            'refreshes': 0,
+            'refresh_errors': 0,
+            'reads': 0,
+            'last_refresh_ms': 0.0
+        }
+
+    @property
+    def age(self) -> Optional[float]:
+        """Idade do snapshot em segundos (None se nunca carregado)"""
+        if not self._updated_at:
+            return None
+        return time.time() - self._updated_at
+
+    def _is_fresh(self) -> bool:
+        age = self.age
+        if age is not None and age < self.refresh_interval:
+            return True
+        # Após uma falha, aguardar um intervalo antes de tentar de novo
+        return time.time() < self._next_attempt
+
+    def _refresh_if_needed(self) -> None:
+        if self._is_fresh():
+            return
+
+        # Single-flight: quem chega durante a atualização espera e reutiliza o resultado
+        with self._refresh_lock:
+            if self._is_fresh():
+                return
+
+            start = time.time()
+            try:
+                prices = self.binance_client.get_all_prices() if self.binance_client else {}
+            except Exception as e:
+                print(f"⚠️ Erro ao atualizar snapshot de preços: {e}")
+                prices = {}
+
+            if prices:
+                # Troca de referência: leitores nunca veem um dicionário parcial
+                self._prices = prices
+                self._updated_at = time.time()
+                self.stats['refreshes'] += 1
+            else:
+                self._next_attempt = time.time() + self.refresh_interval
+                self.stats['refresh_errors'] += 1
+            self.stats['last_refresh_ms'] = round((time.time() - start) * 1000, 2)
+
+    def get_prices(self, symbols: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """
+        Retorna preços do snapshot
+
+        Args:
+            symbols: Símbolos desejados (None para todos)
+
+        Returns:
+            Dict com prices, missing, age_ms, updated_at e available
+            (False se não há snapshot válido)
+        """
+        self._refresh_if_needed()
+        self.stats['reads'] += 1
+
+        prices, updated_at = self._prices, self._updated_at
+        age = time.time() - updated_at if updated_at else None
+        available = age is not None and age <= self.max_stale
+
+        missing = []
+        if symbols is not None and available:
+            selected = {}
+            for symbol in symbols:
+                price = prices.get(symbol)
+                if price is None:
+                    missing.append(symbol)
+                else:
+                    selected[symbol] = price
+            prices = selected
+
+        return {
+            'available': available,
+            'prices': prices if available else {},
+            'missing': missing,
+            'age_ms': round(age * 1000) if age is not None else None,
+            'updated_at': updated_at or None
+        }
+
+    def get_price(self, symbol: str) -> Dict[str, Any]:
+        """Retorna o preço de um símbolo no formato de get_prices"""
+        return self.get_prices([symbol])
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna estatísticas de atualização e idade do snapshot"""
+        age = self.age
+        return {
+            **self.stats,
+            'symbols': len(self._prices),
+            'age_ms': round(age * 1000) if age is not None else None,
+            'refresh_interval': self.refresh_interval
+        }
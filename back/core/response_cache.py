@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+"""
+Cache de Respostas das Rotas Públicas
+Decorator com TTL por rota, recomputação single-flight (apenas uma requisição
+recalcula uma chave expirada; as concorrentes aguardam e reutilizam o
+resultado) e, opcionalmente, Redis compartilhado via DatabaseConfig.
+
+Exemplo:
+    @bp.route('/metrics')
+    @response_cache.cached(ttl=10)
+    def metrics():
+        ...
+"""
+
+import json
+import os
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from flask import Response, make_response, request
+
+from .metrics import CACHE_LOOKUPS_TOTAL
+
+# Rótulo de resultado em cache_lookups_total para cada contador interno
+_LOOKUP_RESULTS = {'hits': 'hit', 'redis_hits': 'redis_hit', 'coalesced': 'coalesced',
+                   'misses': 'miss', 'errors': 'error'}
+
+
+class ResponseCache:
+    """Cache em memória (LRU limitado) com Redis opcional"""
+
+    def __init__(self, max_entries: int = 512, lock_stripes: int = 64, use_redis: Optional[bool] = None):
+        """
+        Args:
+            max_entries: Máximo de respostas mantidas em memória
+            lock_stripes: Número de locks para o single-flight (limita memória com chaves arbitrárias)
+            use_redis: Usa Redis via DatabaseConfig (padrão: quando REDIS_URL está definida)
+        """
+        self.max_entries = max_entries
+        self.enabled = os.getenv('RESPONSE_CACHE_ENABLED', 'true').lower() != 'false'
+        self.use_redis = bool(os.getenv('REDIS_URL')) if use_redis is None else use_redis
+
+        # chave -> (expira_em, status, corpo, mimetype)
+        self._entries: 'OrderedDict[str, Tuple[float, int, bytes, str]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._stripes = [threading.Lock() for _ in range(lock_stripes)]
+        self._redis = None
+        self._redis_checked = False
+
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    # ------------------------------------------------------------------
+    # Armazenamento
+    # ------------------------------------------------------------------
+
+    def _get_redis(self):
+        """Obtém DatabaseConfig com Redis conectado (import tardio, uma única tentativa)"""
+        if not self.use_redis:
+            return None
+        if not self._redis_checked:
+            self._redis_checked = True
+            try:
+                from .db_config import db_config
+                self._redis = db_config if db_config.redis_client else None
+            except Exception as e:
+                print(f"⚠️ Redis indisponível para cache de respostas: {e}")
+                self._redis = None
+        return self._redis
+
+    def _get_local(self, key: str) -> Optional[Tuple[float, int, bytes, str]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def _set_local(self, key: str, entry: Tuple[float, int, bytes, str]) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _get_remote(self, key: str) -> Optional[Tuple[float, int, bytes, str]]:
+        redis_db = self._get_redis()
+        if redis_db is None:
+            return None
+        raw = redis_db.cache_get(f'response_cache:{key}')
+        if not raw:
+            return None
+        try:
+            data = json.loads(raw)
+            return (data['expires_at'], data['status'], data['body'].encode('utf-8'), data['mimetype'])
+        except (ValueError, KeyError):
+            return None
+
+    def _set_remote(self, key: str, entry: Tuple[float, int, bytes, str], ttl: int) -> None:
+        redis_db = self._get_redis()
+        if redis_db is None:
+            return
+        try:
+            payload = json.dumps({
+                'expires_at': entry[0],
+                'status': entry[1],
+                'body': entry[2].decode('utf-8'),
+                'mimetype': entry[3]
+            })
+        except UnicodeDecodeError:
+            return
+        redis_db.cache_set(f'response_cache:{key}', payload, expire=max(1, int(ttl)))
+
+    # ------------------------------------------------------------------
+    # Estatísticas
+    # ------------------------------------------------------------------
+
+    def _record(self, route: str, outcome: str, elapsed_ms: float = 0.0) -> None:
+        CACHE_LOOKUPS_TOTAL.inc('response', _LOOKUP_RESULTS[outcome])
+        with self._lock:
+            stats = self._stats.setdefault(route, {
+                'hits': 0, 'redis_hits': 0, 'coalesced': 0, 'misses': 0,
+                'errors': 0, 'compute_ms_total': 0.0
+            })
+            stats[outcome] += 1
+            stats['compute_ms_total'] += elapsed_ms
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna hit ratio por rota e ocupação do cache"""
+        with self._lock:
+            routes = {}
+            for route, stats in self._stats.items():
+                served = stats['hits'] + stats['redis_hits'] + stats['coalesced']
+                total = served + stats['misses']
+                routes[route] = {
+                    'hits': int(stats['hits']),
+                    'redis_hits': int(stats['redis_hits']),
+                    'coalesced': int(stats['coalesced']),
+                    'misses': int(stats['misses']),
+                    'errors': int(stats['errors']),
+                    'hit_ratio': round(served / total, 4) if total else 0.0,
+                    'avg_compute_ms': round(stats['compute_ms_total'] / stats['misses'], 2) if stats['misses'] else 0.0
+                }
+            return {
+                'enabled': self.enabled,
+                'redis': self._redis is not None,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'routes': routes
+            }
+
+    def clear(self) -> None:
+        """Remove todas as respostas em memória"""
+        with self._lock:
+            self._entries.clear()
+
+    # ------------------------------------------------------------------
+    # Decorator
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _request_key() -> str:
+        query = '&'.join(f'{k}={v}' for k, v in sorted(request.args.items(multi=True)))
+        return f'{request.path}?{query}'
+
+    @staticmethod
+    def _to_response(entry: Tuple[float, int, bytes, str], state: str) -> Response:
+        response = Response(entry[2], status=entry[1], mimetype=entry[3])
+        response.headers['X-Cache'] = state
+        return response
+
+    def cached(self, ttl: int) -> Callable:
+        """
+        Decorator de cache de resposta
+
+        Apenas respostas 200 são armazenadas; erros são sempre recalculados.
+
+        Args:
+            ttl: Tempo de vida da resposta em segundos
+        """
+        def decorator(view: Callable) -> Callable:
+            route = view.__name__
+
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return view(*args, **kwargs)
+
+                key = self._request_key()
+
+                entry = self._get_local(key)
+                if entry is not None:
+                    self._record(route, 'hits')
+                    return self._to_response(entry, 'HIT')
+
+                # Single-flight: só uma requisição por chave recalcula
+                with self._stripes[zlib.crc32(key.encode('utf-8')) % len(self._stripes)]:
+                    entry = self._get_local(key)
+                    if entry is not None:
+                        self._record(route, 'coalesced')
+                        return self._to_response(entry, 'HIT')
+
+                    entry = self._get_remote(key)
+                    if entry is not None and entry[0] > time.time():
+                        self._set_local(key, entry)
+                        self._record(route, 'redis_hits')
+                        return self._to_response(entry, 'HIT')
+
+                    start = time.time()
+                    try:
+                        response = make_response(view(*args, **kwargs))
+                    except Exception:
+                        self._record(route, 'errors')
+                        raise
+                    elapsed_ms = (time.time() - start) * 1000
+                    self._record(route, 'misses', elapsed_ms)
+
+                    if response.status_code == 200 and not response.is_streamed:
+                        entry = (time.time() + ttl, response.status_code, response.get_data(), response.mimetype)
+                        self._set_local(key, entry)
+                        self._set_remote(key, entry, ttl)
+
+                    response.headers['X-Cache'] = 'MISS'
+                    return response
+
+            return wrapper
+        return decorator
+
+
+# Instância global para uso em outros módulos
+response_cache = ResponseCache()
@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+"""
+Escalonador Adaptativo do Escaneamento de Mercado
+Em vez de reanalisar todos os top_pairs a cada ciclo com a mesma prioridade,
+classifica cada par em faixas:
+
+- hot:  pontuação do ciclo anterior perto do mínimo de qualidade, entre os
+        maiores ATR relativos ou entre os mais ativos do ticker 24h
+        (volume + amplitude) -> todo ciclo
+- warm: pontuação intermediária ou atividade acima da mediana -> a cada 2 ciclos
+- cold: pares parados e longe do mínimo -> a cada 4 ciclos
+
+Pares ainda não analisados entram sempre. Ao fim de cada ciclo o relatório
+mostra a cobertura efetiva (pares com análise dentro do prazo da sua faixa)
+por peso de API gasto, comparável ao escaneamento completo.
+"""
+
+import math
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from .logger import setup_logger
+from .metrics import SCAN_PAIRS_TOTAL
+
+logger = setup_logger('core.scan_scheduler')
+
+TIERS = ('hot', 'warm', 'cold')
+
+DEFAULT_SCHEDULER_CONFIG = {
+    'tier_intervals': {'hot': 1, 'warm': 2, 'cold': 4},  # ciclos entre análises
+    'near_threshold_margin': 10.0,    # pontos abaixo do mínimo que ainda contam como "perto"
+    'hot_atr_quantile': 0.8,          # top 20% de ATR/preço (1h) entre os pares
+    'hot_activity_quantile': 0.8,     # top 20% de atividade no ticker 24h
+    'warm_activity_quantile': 0.5,
+    'ticker_refresh_interval': 300    # segundos entre consultas ao ticker 24h (peso 40)
+}
+
+
+def _percentile_ranks(values: Dict[str, float]) -> Dict[str, float]:
+    """Posição relativa de cada chave (1/n para o menor valor, 1.0 para o maior)"""
+    ranked = sorted(values, key=values.get)
+    return {key: (i + 1) / len(ranked) for i, key in enumerate(ranked)}
+
+
+class AdaptiveScanScheduler:
+    """Escolhe quais pares analisar em cada ciclo do _monitoring_loop"""
+
+    def __init__(self, quality_score_minimum: float = 65.0, config: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            quality_score_minimum: Pontuação mínima para gerar sinal (referência do "perto")
+            config: Sobrescreve chaves de DEFAULT_SCHEDULER_CONFIG
+        """
+        self.quality_score_minimum = quality_score_minimum
+        self.config = {**DEFAULT_SCHEDULER_CONFIG, **(config or {})}
+        self._lock = threading.Lock()
+        self._scores: Dict[str, Dict[str, float]] = {}
+        self._last_scanned: Dict[str, int] = {}
+        self._activity_rank: Dict[str, float] = {}
+        self._atr_rank: Dict[str, float] = {}
+        self._ticker_updated_at = 0.0
+        self._cycle = 0
+        self._selected: Dict[str, str] = {}
+        self._last_report: Dict[str, Any] = {}
+        self._totals = {'cycles': 0, 'scanned': 0, 'skipped': 0, 'weight_spent': 0}
+
+    def needs_ticker_refresh(self) -> bool:
+        return time.time() - self._ticker_updated_at >= self.config['ticker_refresh_interval']
+
+    def update_ticker(self, ticker_data: Dict[str, Dict[str, float]]) -> None:
+        """
+        Atualiza a atividade de cada par a partir do snapshot do ticker 24h
+
+        Um snapshot vazio (falha na consulta) é ignorado: a atividade anterior
+        é mantida e a consulta é repetida no próximo ciclo.
+
+        Args:
+            ticker_data: Retorno de BinanceClient.get_24h_ticker_data
+                         (volume em USDT, priceChangePercent, volatility em %)
+        """
+        activity = {}
+        for symbol, data in (ticker_data or {}).items():
+            try:
+                volume = float(data.get('volume', 0))
+                volatility = float(data.get('volatility', abs(float(data.get('priceChangePercent', 0)))))
+            except (TypeError, ValueError):
+                continue
+            # Mesma combinação de _create_top_pairs: volume (70%) + volatilidade (30%)
+            activity[symbol] = (math.log10(volume + 1) if volume > 0 else 0) * 0.7 + volatility * 0.3
+
+        if not activity:
+            logger.warning("⚠️ Ticker 24h sem pares válidos; atividade anterior mantida")
+            return
+        with self._lock:
+            self._activity_rank = _percentile_ranks(activity)
+            self._ticker_updated_at = time.time()
+
+    def record_score(self, symbol: str, quality_score: float, atr_ratio: Optional[float] = None) -> None:
+        """Guarda a pontuação (e o ATR relativo) da última análise do par"""
+        with self._lock:
+            self._scores[symbol] = {'score': float(quality_score), 'atr_ratio': float(atr_ratio or 0.0)}
+
+    def tier_for(self, symbol: str) -> str:
+        """Faixa de prioridade do par com base no ciclo anterior e no ticker 24h"""
+        with self._lock:
+            self._rank_atr(self._scores)
+            return self._tier(symbol)
+
+    def _rank_atr(self, symbols) -> None:
+        self._atr_rank = _percentile_ranks({symbol: self._scores[symbol]['atr_ratio']
+                                            for symbol in symbols if symbol in self._scores})
+
+    def _tier(self, symbol: str) -> str:
+        if symbol not in self._last_scanned:
+            return 'hot'
+        last = self._scores.get(symbol)
+        activity = self._activity_rank.get(symbol, 0.0)
+        margin = self.config['near_threshold_margin']
+        if last and last['score'] >= self.quality_score_minimum - margin:
+            return 'hot'
+        if self._atr_rank.get(symbol, 0.0) > self.config['hot_atr_quantile']:
+            return 'hot'
+        if activity > self.config['hot_activity_quantile']:
+            return 'hot'
+        if last and last['score'] >= self.quality_score_minimum - 2 * margin:
+            return 'warm'
+        if activity > self.config['warm_activity_quantile']:
+            return 'warm'
+        return 'cold'
+
+    def _is_due(self, symbol: str, tier: str) -> bool:
+        last = self._last_scanned.get(symbol)
+        return last is None or self._cycle - last >= self.config['tier_intervals'][tier]
+
+    def select(self, pairs: List[str]) -> List[str]:
+        """
+        Inicia um ciclo e retorna os pares a analisar, dos mais prioritários aos menos
+
+        Args:
+            pairs: Todos os pares monitorados (top_pairs)
+
+        Returns:
+            List[str]: Subconjunto de `pairs` devido neste ciclo
+        """
+        order = {tier: i for i, tier in enumerate(TIERS)}
+        with self._lock:
+            self._cycle += 1
+            self._rank_atr(pairs)
+            tiers = {symbol: self._tier(symbol) for symbol in pairs}
+            selected = [symbol for symbol in pairs if self._is_due(symbol, tiers[symbol])]
+            selected.sort(key=lambda symbol: (order[tiers[symbol]], -self._scores.get(symbol, {}).get('score', 0.0)))
+            for symbol in selected:
+                self._last_scanned[symbol] = self._cycle
+            self._selected = tiers
+
+        due = set(selected)
+        for symbol, tier in tiers.items():
+            SCAN_PAIRS_TOTAL.inc(tier, 'scanned' if symbol in due else 'skipped')
+        return selected
+
+    def finish_cycle(self, weight_spent: int) -> Dict[str, Any]:
+        """
+        Fecha o ciclo e calcula a cobertura por peso de API
+
+        Args:
+            weight_spent: Peso consumido no ciclo pela faixa scan do binance_limiter
+
+        Returns:
+            Dict com pares por faixa, cobertura do ciclo, cobertura efetiva e pares por 100 de peso
+        """
+        with self._lock:
+            tiers = dict(self._selected)
+            cycle = self._cycle
+            intervals = self.config['tier_intervals']
+            by_tier = {tier: {'pairs': 0, 'scanned': 0} for tier in TIERS}
+            fresh = 0
+            for symbol, tier in tiers.items():
+                by_tier[tier]['pairs'] += 1
+                last = self._last_scanned.get(symbol)
+                if last == cycle:
+                    by_tier[tier]['scanned'] += 1
+                if last is not None and cycle - last < intervals[tier]:
+                    fresh += 1
+
+        total = len(tiers)
+        scanned = sum(row['scanned'] for row in by_tier.values())
+        weight_per_pair = weight_spent / scanned if scanned else 0.0
+        report = {
+            'cycle': cycle,
+            'total_pairs': total,
+            'scanned': scanned,
+            'skipped': total - scanned,
+            'by_tier': by_tier,
+            'weight_spent': weight_spent,
+            'coverage_pct': round(scanned / total * 100, 1) if total else 0.0,
+            'effective_coverage_pct': round(fresh / total * 100, 1) if total else 0.0,
+            'effective_pairs_per_100_weight': round(fresh / weight_spent * 100, 1) if weight_spent else 0.0,
+            'estimated_weight_saved': round((total - scanned) * weight_per_pair)
+        }
+        with self._lock:
+            self._last_report = report
+            self._totals['cycles'] += 1
+            self._totals['scanned'] += scanned
+            self._totals['skipped'] += total - scanned
+            self._totals['weight_spent'] += weight_spent
+
+        logger.info(
+            "🎯 Escalonador: %d/%d pares (hot %d/%d, warm %d/%d, cold %d/%d) | cobertura efetiva %.1f%% | "
+            "peso %d (%.1f pares/100 de peso) | ~%d de peso economizado",
+            scanned, total, by_tier['hot']['scanned'], by_tier['hot']['pairs'],
+            by_tier['warm']['scanned'], by_tier['warm']['pairs'],
+            by_tier['cold']['scanned'], by_tier['cold']['pairs'],
+            report['effective_coverage_pct'], weight_spent, report['effective_pairs_per_100_weight'],
+            report['estimated_weight_saved']
+        )
+        return report
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Relatório do último ciclo e totais acumulados"""
+        with self._lock:
+            return {'last_cycle': dict(self._last_report), 'totals': dict(self._totals)}
@@ -11,7 +11,7 @@ from datetime import datetime, timedelta
 import pytz
 import os
 from typing import Optional
-from supabase import create_client, Client
+from .supabase_client import supabase_db
 
 class SignalCleanup:
     """Sistema de limpeza automática de sinais baseado no horário de São Paulo"""
@@ -22,9 +22,13 @@ class SignalCleanup:
         self.is_running = False
         self.cleanup_thread: Optional[threading.Thread] = None
         
-        # Configurar Supabase
-        self.supabase_url = os.getenv('SUPABASE_URL')
-        self.supabase_key = os.getenv('SUPABASE_ANON_KEY')
+        # Acesso compartilhado ao Supabase
+        self.supabase = supabase_db
+        
+        # Paginação e tamanho dos lotes de remoção
+        self.page_size = 1000
+        self.delete_batch_size = 200
+        self.last_cleanup_report: dict = {}
         
         print("🧹 Sistema de Limpeza de Sinais inicializado")
     
@@ -84,11 +88,10 @@ class SignalCleanup:
     def cleanup_old_signals(self) -> None:
         """Remove apenas sinais pendentes e rejeitados antigos, preservando sinais confirmados até às 21:00"""
         try:
-            if not self.supabase_url or not self.supabase_key:
+            if not self.supabase.is_configured:
                 print("⚠️ Supabase não configurado para limpeza")
                 return
             
-            supabase: Client = create_client(self.supabase_url, self.supabase_key)
             now_sp = datetime.now(self.sao_paulo_tz)
             
             # Definir horário de corte para sinais pendentes/rejeitados (24h atrás)
@@ -109,48 +112,47 @@ class SignalCleanup:
             print(f"🗑️ Removendo sinais pendentes/rejeitados anteriores a: {cutoff_time_pending.strftime('%d/%m/%Y %H:%M')} (SP)")
             print(f"🗑️ Removendo sinais confirmados anteriores a: {yesterday_21h.strftime('%d/%m/%Y %H:%M')} (SP)")
             
-            # 1. Buscar e remover sinais pendentes e rejeitados antigos
-            old_pending_signals = supabase.table('signals').select('id, symbol, status, created_at').in_('status', ['PENDING', 'REJECTED']).lt('created_at', cutoff_time_pending_utc.isoformat()).execute()
-            
-            pending_removed = 0
-            if old_pending_signals.data:
-                print(f"📊 Encontrados {len(old_pending_signals.data)} sinais pendentes/rejeitados para remoção")
-                
-                for signal in old_pending_signals.data:
-                    try:
-                        supabase.table('signals').delete().eq('id', signal['id']).execute()
-                        print(f"🗑️ Removido {signal['status']}: {signal['symbol']} (ID: {signal['id']})")
-                        pending_removed += 1
-                    except Exception as e:
-                        print(f"❌ Erro ao remover sinal {signal['id']}: {e}")
+            cleanup_start = time.perf_counter()
+            report = {
+                'started_at': now_sp.strftime('%d/%m/%Y %H:%M:%S'),
+                'phases': {}
+            }
             
-            # 2. Buscar e remover apenas sinais confirmados muito antigos (anteriores ao horário de corte)
-            old_confirmed_signals = supabase.table('signals').select('id, symbol, status, created_at').eq('status', 'CONFIRMED').lt('created_at', cutoff_time_confirmed_utc.isoformat()).execute()
+            # 1. Remover sinais pendentes e rejeitados antigos (em lotes)
+            pending_phase = self._delete_in_batches(
+                lambda query: query.in_('status', ['PENDING', 'REJECTED']).lt('created_at', cutoff_time_pending_utc.isoformat())
+            )
+            report['phases']['pending_rejected'] = pending_phase
+            pending_removed = pending_phase['deleted']
             
-            confirmed_removed = 0
-            if old_confirmed_signals.data:
-                print(f"📊 Encontrados {len(old_confirmed_signals.data)} sinais confirmados antigos para remoção")
-                
-                for signal in old_confirmed_signals.data:
-                    try:
-                        supabase.table('signals').delete().eq('id', signal['id']).execute()
-                        print(f"🗑️ Removido CONFIRMED: {signal['symbol']} (ID: {signal['id']})")
-                        confirmed_removed += 1
-                    except Exception as e:
-                        print(f"❌ Erro ao remover sinal confirmado {signal['id']}: {e}")
+            # 2. Remover apenas sinais confirmados muito antigos (anteriores ao horário de corte)
+            confirmed_phase = self._delete_in_batches(
+                lambda query: query.eq('status', 'CONFIRMED').lt('created_at', cutoff_time_confirmed_utc.isoformat())
+            )
+            report['phases']['confirmed'] = confirmed_phase
+            confirmed_removed = confirmed_phase['deleted']
             
             total_removed = pending_removed + confirmed_removed
             print(f"✅ Limpeza concluída: {total_removed} sinais removidos ({pending_removed} pendentes/rejeitados, {confirmed_removed} confirmados antigos)")
             
-            # Estatísticas finais
-            remaining_signals = supabase.table('signals').select('id', count='exact').execute()
+            # Estatísticas finais (limit(1): apenas o total do Content-Range, sem transferir as linhas)
+            count_start = time.perf_counter()
+            remaining_signals = self.supabase.execute('signals', 'count', lambda table: table.select('id', count='exact').limit(1))
             total_remaining = remaining_signals.count if remaining_signals.count else 0
             
             # Contar sinais confirmados restantes
-            confirmed_remaining = supabase.table('signals').select('id', count='exact').eq('status', 'CONFIRMED').execute()
+            confirmed_remaining = self.supabase.execute('signals', 'count', lambda table: table.select('id', count='exact').eq('status', 'CONFIRMED').limit(1))
             confirmed_count = confirmed_remaining.count if confirmed_remaining.count else 0
+            report['phases']['count'] = {'duration_ms': round((time.perf_counter() - count_start) * 1000, 2)}
+            
+            report['total_removed'] = total_removed
+            report['remaining'] = total_remaining
+            report['confirmed_remaining'] = confirmed_count
+            report['total_duration_ms'] = round((time.perf_counter() - cleanup_start) * 1000, 2)
+            self.last_cleanup_report = report
             
             print(f"📊 Sinais restantes no sistema: {total_remaining} (sendo {confirmed_count} confirmados)")
+            print(f"⏱️ Limpeza executada em {report['total_duration_ms']:.0f}ms")
             print(f"✅ Sinais confirmados preservados até às 21:00 conforme solicitado")
             
         except Exception as e:
@@ -158,6 +160,71 @@ class SignalCleanup:
             import traceback
             traceback.print_exc()
     
+    def _delete_in_batches(self, apply_filters) -> dict:
+        """
+        Remove sinais que atendem aos filtros usando paginação por id e deletes em lote.
+        
+        Args:
+            apply_filters: Função que aplica os filtros da fase a uma query do Supabase
+            
+        Returns:
+            Dict com contagens e tempos (ms) de select/delete da fase
+        """
+        phase = {
+            'selected': 0,
+            'deleted': 0,
+            'pages': 0,
+            'batches': 0,
+            'errors': 0,
+            'select_ms': 0.0,
+            'delete_ms': 0.0
+        }
+        last_id = None
+        
+        while True:
+            # Paginação por chave (id > último id): estável mesmo removendo linhas entre páginas
+            def build_select(table):
+                query = apply_filters(table.select('id, status'))
+                if last_id is not None:
+                    query = query.gt('id', last_id)
+                return query.order('id').limit(self.page_size)
+            
+            select_start = time.perf_counter()
+            page = self.supabase.execute('signals', 'select_cleanup', build_select).data or []
+            phase['select_ms'] += (time.perf_counter() - select_start) * 1000
+            
+            if not page:
+                break
+            
+            phase['pages'] += 1
+            phase['selected'] += len(page)
+            last_id = page[-1]['id']
+            ids = [signal['id'] for signal in page]
+            
+            for i in range(0, len(ids), self.delete_batch_size):
+                chunk = ids[i:i + self.delete_batch_size]
+                delete_start = time.perf_counter()
+                try:
+                    self.supabase.execute('signals', 'delete_batch', lambda table: table.delete().in_('id', chunk))
+                    phase['deleted'] += len(chunk)
+                except Exception as e:
+                    phase['errors'] += 1
+                    print(f"❌ Erro ao remover lote de {len(chunk)} sinais: {e}")
+                phase['delete_ms'] += (time.perf_counter() - delete_start) * 1000
+                phase['batches'] += 1
+            
+            if len(page) < self.page_size:
+                break
+        
+        phase['select_ms'] = round(phase['select_ms'], 2)
+        phase['delete_ms'] = round(phase['delete_ms'], 2)
+        
+        if phase['selected']:
+            print(f"🗑️ {phase['deleted']}/{phase['selected']} sinais removidos em {phase['batches']} lotes "
+                  f"(select {phase['select_ms']:.0f}ms, delete {phase['delete_ms']:.0f}ms)")
+        
+        return phase
+    
     def update_system_stats(self) -> None:
         """Atualiza estatísticas do sistema após restart"""
         try:
@@ -287,7 +354,8 @@ class SignalCleanup:
             'current_time_sp': now_sp.strftime('%d/%m/%Y %H:%M:%S'),
             'next_restart': self.get_next_restart_time(),
             'time_until_restart': time_until,
-            'timezone': str(self.sao_paulo_tz)
+            'timezone': str(self.sao_paulo_tz),
+            'last_cleanup': self.last_cleanup_report
         }
     
     def get_next_restart_time(self) -> str:
@@ -5,18 +5,112 @@ Sistema de Monitoramento de Sinais
 Acompanha sinais por até 15 dias calculando lucros baseados na alavancagem máxima
 """
 
+import base64
+import bisect
+import heapq
+import json
 import time
 import threading
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, asdict
+from typing import Dict, Iterable, List, Optional, Any, Tuple
+from dataclasses import dataclass
+import numpy as np
 from .leverage_detector import LeverageDetector
 from .binance_client import BinanceClient
+from .binance_limiter import set_request_lane
 from .database import Database
-import json
+from .event_bus import event_bus
+from .metrics import STAGE_SECONDS
+from .monitoring_store import MonitoringStateStore
 import traceback
 
-@dataclass
+class PriceHistoryBuffer:
+    """
+    Histórico de preços de capacidade fixa em buffer circular NumPy
+
+    Cada linha guarda (epoch em segundos, preço, percentual, lucro). A conversão
+    para a lista de dicts da API só acontece em to_list().
+    """
+
+    __slots__ = ('capacity', '_data', '_next', '_size', 'appended')
+
+    TIMESTAMP_FORMAT = '%d/%m/%Y %H:%M:%S'
+
+    def __init__(self, capacity: int = 100):
+        self.capacity = capacity
+        # Alocado apenas no primeiro append (sinais recém-criados não ocupam memória)
+        self._data: Optional[np.ndarray] = None
+        self._next = 0
+        self._size = 0
+        # Total de entradas já adicionadas (usado na persistência incremental)
+        self.appended = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, timestamp: float, price: float, percentage: float, profit: float) -> None:
+        """Adiciona uma entrada, sobrescrevendo a mais antiga quando cheio"""
+        if self._data is None:
+            self._data = np.empty((self.capacity, 4), dtype=np.float64)
+        self._data[self._next] = (timestamp, price, percentage, profit)
+        self._next = (self._next + 1) % self.capacity
+        if self._size < self.capacity:
+            self._size += 1
+        self.appended += 1
+
+    def to_array(self) -> np.ndarray:
+        """Retorna cópia ordenada (mais antiga primeiro) com shape (n, 4)"""
+        if self._data is None or self._size == 0:
+            return np.empty((0, 4), dtype=np.float64)
+        if self._size < self.capacity:
+            return self._data[:self._size].copy()
+        return np.concatenate((self._data[self._next:], self._data[:self._next]))
+
+    def tail(self, count: int) -> np.ndarray:
+        """Retorna as últimas `count` entradas (mais antiga primeiro)"""
+        if count <= 0:
+            return np.empty((0, 4), dtype=np.float64)
+        return self.to_array()[-count:]
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        """Serializa no formato legado da API (timestamp formatado)"""
+        return [
+            {
+                'timestamp': datetime.fromtimestamp(row[0]).strftime(self.TIMESTAMP_FORMAT),
+                'price': float(row[1]),
+                'percentage': float(row[2]),
+                'profit': float(row[3])
+            }
+            for row in self.to_array()
+        ]
+
+    @classmethod
+    def from_array(cls, rows: np.ndarray, capacity: int = 100, appended: Optional[int] = None) -> 'PriceHistoryBuffer':
+        """Reconstrói o buffer a partir de um array (n, 4) ordenado"""
+        buffer = cls(capacity)
+        rows = rows[-capacity:]
+        if len(rows):
+            buffer._data = np.empty((capacity, 4), dtype=np.float64)
+            buffer._data[:len(rows)] = rows
+            buffer._size = len(rows)
+            buffer._next = len(rows) % capacity
+        buffer.appended = len(rows) if appended is None else appended
+        return buffer
+
+    @classmethod
+    def from_list(cls, entries: List[Dict[str, Any]], capacity: int = 100) -> 'PriceHistoryBuffer':
+        """Reconstrói o buffer a partir da lista de dicts da API"""
+        buffer = cls(capacity)
+        for entry in entries[-capacity:]:
+            timestamp = entry.get('timestamp')
+            if isinstance(timestamp, str):
+                timestamp = datetime.strptime(timestamp, cls.TIMESTAMP_FORMAT).timestamp()
+            buffer.append(float(timestamp or 0), float(entry.get('price', 0)),
+                          float(entry.get('percentage', 0)), float(entry.get('profit', 0)))
+        return buffer
+
+
+@dataclass(slots=True)
 class MonitoredSignal:
     """
     Classe que representa um sinal sendo monitorado com simulação de trading de $1.000 USD
@@ -37,8 +131,8 @@ class MonitoredSignal:
     status: str = 'MONITORING'  # MONITORING, COMPLETED, EXPIRED
     last_updated: str = ''
     days_monitored: int = 0
-    price_history: List[Dict] = None
-    
+    price_history: PriceHistoryBuffer = None
+
     # Campos de simulação financeira com $1.000 USD
     simulation_investment: float = 1000.0  # Investimento fixo de $1.000
     simulation_current_value: float = 1000.0  # Valor atual da posição
@@ -47,13 +141,171 @@ class MonitoredSignal:
     simulation_max_value_reached: float = 1000.0  # Maior valor atingido
     simulation_target_value: float = 4000.0  # Meta de $4.000 (300% de lucro)
     simulation_position_size: float = 0.0  # Tamanho da posição (quantidade de moedas)
-    
+
     def __post_init__(self):
         if self.price_history is None:
-            self.price_history = []
+            self.price_history = PriceHistoryBuffer()
+        elif isinstance(self.price_history, list):
+            self.price_history = PriceHistoryBuffer.from_list(self.price_history)
         if not self.last_updated:
             self.last_updated = datetime.now().strftime('%d/%m/%Y %H:%M:%S')
 
+    def to_record(self) -> Dict[str, Any]:
+        """Retorna os campos escalares (sem o histórico de preços)"""
+        return {name: getattr(self, name) for name in self.__dataclass_fields__ if name != 'price_history'}
+
+    def to_dict(self, fields: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """
+        Serializa no formato de dict usado pela API
+
+        Args:
+            fields: Campos desejados (None = todos, incluindo price_history)
+        """
+        if fields is None:
+            data = self.to_record()
+            data['price_history'] = self.price_history.to_list()
+            return data
+        return {
+            name: self.price_history.to_list() if name == 'price_history' else getattr(self, name)
+            for name in fields
+        }
+
+class MonitoringAggregates:
+    """
+    Agregados das avaliações finalizadas (COMPLETED/EXPIRED)
+
+    Atualizados a cada transição de status, para que os relatórios não precisem
+    percorrer todo o histórico de sinais expirados.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Zera todos os contadores"""
+        with self._lock:
+            self.total_evaluated = 0
+            self.success_count = 0
+            self.failure_count = 0
+            self.successful_profit_sum = 0.0
+            self.successful_profit_count = 0
+            self.successful_days_sum = 0
+            self.max_profit_achieved = 0.0
+            self.by_type: Dict[str, Dict[str, int]] = {}
+            self.by_leverage: Dict[int, Dict[str, float]] = {}
+
+    def add(self, signal: MonitoredSignal) -> None:
+        """Contabiliza um sinal que acabou de sair do monitoramento"""
+        with self._lock:
+            successful = signal.status == 'COMPLETED'
+            self.total_evaluated += 1
+            if successful:
+                self.success_count += 1
+                self.successful_days_sum += signal.days_monitored
+                if signal.max_profit_reached > 0:
+                    self.successful_profit_sum += signal.max_profit_reached
+                    self.successful_profit_count += 1
+            elif signal.status == 'EXPIRED':
+                self.failure_count += 1
+
+            if self.total_evaluated == 1 or signal.max_profit_reached > self.max_profit_achieved:
+                self.max_profit_achieved = signal.max_profit_reached
+
+            type_bucket = self.by_type.setdefault(signal.signal_type, {'total': 0, 'successful': 0})
+            type_bucket['total'] += 1
+            type_bucket['successful'] += int(successful)
+
+            leverage_bucket = self.by_leverage.setdefault(
+                signal.max_leverage, {'total': 0, 'successful': 0, 'profit_sum': 0.0, 'current_profit_sum': 0.0}
+            )
+            leverage_bucket['total'] += 1
+            leverage_bucket['successful'] += int(successful)
+            leverage_bucket['profit_sum'] += signal.max_profit_reached
+            leverage_bucket['current_profit_sum'] += signal.current_profit
+
+    def rebuild(self, signals: List[MonitoredSignal]) -> None:
+        """Recalcula os agregados a partir dos sinais expirados (usado na carga)"""
+        self.reset()
+        for signal in signals:
+            self.add(signal)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Retorna cópia consistente dos agregados"""
+        with self._lock:
+            return {
+                'total_evaluated': self.total_evaluated,
+                'success_count': self.success_count,
+                'failure_count': self.failure_count,
+                'successful_profit_sum': self.successful_profit_sum,
+                'successful_profit_count': self.successful_profit_count,
+                'successful_days_sum': self.successful_days_sum,
+                'max_profit_achieved': self.max_profit_achieved,
+                'by_type': {k: dict(v) for k, v in self.by_type.items()},
+                'by_leverage': {k: dict(v) for k, v in self.by_leverage.items()}
+            }
+
+
+def encode_cursor(key: Tuple[float, str]) -> str:
+    """Codifica a posição (chave do índice) em um cursor opaco"""
+    return base64.urlsafe_b64encode(json.dumps(list(key)).encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[float, str]]:
+    """Decodifica um cursor (None se ausente ou inválido)"""
+    if not cursor:
+        return None
+    try:
+        value, signal_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        return (float(value), str(signal_id))
+    except (ValueError, TypeError):
+        return None
+
+
+class SortedSignalIndex:
+    """
+    Índice de sinais ordenado por um atributo (maior primeiro) para paginação por cursor
+
+    As chaves são (-valor, id), então a ordem é estável e um cursor é apenas a
+    última chave entregue. As listas são substituídas (copy-on-write) para que
+    leitores nunca vejam um índice parcialmente alterado.
+    """
+
+    def __init__(self, attribute: str):
+        self.attribute = attribute
+        self._keys: List[Tuple[float, str]] = []
+        self._lock = threading.Lock()
+        self.value_sum = 0.0
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _key(self, signal: MonitoredSignal) -> Tuple[float, str]:
+        return (-float(getattr(signal, self.attribute) or 0), signal.id)
+
+    def rebuild(self, signals: List[MonitoredSignal]) -> None:
+        """Reconstrói o índice inteiro (uma ordenação por ciclo de monitoramento)"""
+        keys = sorted(self._key(signal) for signal in signals)
+        with self._lock:
+            self._keys = keys
+            self.value_sum = -sum(key[0] for key in keys)
+
+    def insert(self, signal: MonitoredSignal) -> None:
+        """Insere um sinal mantendo a ordenação"""
+        key = self._key(signal)
+        with self._lock:
+            keys = list(self._keys)
+            bisect.insort(keys, key)
+            self._keys = keys
+            self.value_sum -= key[0]
+
+    def page(self, after: Optional[Tuple[float, str]], limit: Optional[int]) -> List[Tuple[float, str]]:
+        """Retorna até `limit` chaves posteriores ao cursor (todas se limit for None)"""
+        keys = self._keys
+        start = bisect.bisect_right(keys, after) if after is not None else 0
+        return keys[start:] if limit is None else keys[start:start + limit]
+
+
 class SignalMonitoringSystem:
     """
     Sistema principal de monitoramento de sinais
@@ -61,17 +313,25 @@ class SignalMonitoringSystem:
     """
     
     _instance = None
+    _instance_lock = threading.Lock()
     
     @classmethod
     def get_instance(cls, database: Database, binance_client: BinanceClient = None):
-        """Retorna instância singleton do sistema de monitoramento"""
-        if cls._instance is None:
-            if binance_client is None:
-                # Criar cliente Binance se não fornecido
-                from .binance_client import BinanceClient
-                binance_client = BinanceClient()
-            cls._instance = cls(binance_client, database)
-        return cls._instance
+        """
+        Retorna instância singleton do sistema de monitoramento
+        
+        Rotas e BTCSignalManager precisam da mesma instância: cada uma teria seu
+        próprio MonitoringStateStore no mesmo diretório e um snapshot de uma
+        apagaria os deltas da outra.
+        """
+        with cls._instance_lock:
+            if cls._instance is None:
+                if binance_client is None:
+                    # Usar o cliente Binance compartilhado se não fornecido
+                    from .binance_client import get_binance_client
+                    binance_client = get_binance_client()
+                cls._instance = cls(binance_client, database)
+            return cls._instance
     
     def __init__(self, binance_client: BinanceClient, database: Database):
         """
@@ -101,6 +361,21 @@ class SignalMonitoringSystem:
             'price_check_interval': 60  # 1 minuto para verificar preços
         }
         
+        # Métricas do último ciclo de atualização de preços
+        self.last_cycle_stats: Dict[str, Any] = {}
+        
+        # Persistência local (snapshot + deltas) e sinais alterados desde o último delta
+        self.state_store = MonitoringStateStore()
+        self._dirty_ids: set = set()
+        
+        # Agregados das avaliações finalizadas (relatórios em O(1))
+        self.aggregates = MonitoringAggregates()
+        
+        # Índices pré-ordenados para paginação das rotas da API
+        self.active_by_value = SortedSignalIndex('simulation_current_value')
+        self.expired_by_value = SortedSignalIndex('simulation_current_value')
+        self.expired_by_profit = SortedSignalIndex('max_profit_reached')
+        
         print("📊 SignalMonitoringSystem inicializado")
         
         # Carregar sinais existentes do banco
@@ -174,6 +449,7 @@ class SignalMonitoringSystem:
             
             # Adicionar ao monitoramento
             self.monitored_signals[signal_id] = monitored_signal
+            self.active_by_value.insert(monitored_signal)
             
             # Salvar no banco
             self._save_signal_to_database(monitored_signal)
@@ -224,6 +500,9 @@ class SignalMonitoringSystem:
         if self.monitoring_thread and self.monitoring_thread.is_alive():
             self.monitoring_thread.join(timeout=5)
         
+        # Snapshot final para recarga rápida no próximo início
+        self._save_monitoring_state(force_snapshot=True)
+        
         print("✅ Monitoramento parado")
     
     def _monitoring_loop(self):
@@ -231,6 +510,7 @@ class SignalMonitoringSystem:
         Loop principal de monitoramento
         """
         print("🔄 Loop de monitoramento iniciado")
+        set_request_lane('monitoring')
         
         while self.is_monitoring:
             try:
@@ -250,6 +530,7 @@ class SignalMonitoringSystem:
                 
                 # Aguardar próximo ciclo
                 cycle_duration = time.time() - cycle_start
+                STAGE_SECONDS.observe(cycle_duration, 'monitoring_cycle')
                 sleep_time = max(0, self.config['update_interval'] - cycle_duration)
                 
                 if sleep_time > 0:
@@ -263,28 +544,71 @@ class SignalMonitoringSystem:
     def _update_all_signals(self):
         """
         Atualiza preços e métricas de todos os sinais monitorados
+        
+        Todos os preços vêm de um único snapshot (/fapi/v1/ticker/price) por ciclo,
+        independente da quantidade de sinais monitorados.
         """
         if not self.monitored_signals:
             return
         
+        cycle_start = time.time()
         print(f"🔄 Atualizando {len(self.monitored_signals)} sinais monitorados...")
         
-        for signal_id, signal in self.monitored_signals.items():
+        prices = self.binance.get_all_prices()
+        fetch_ms = (time.time() - cycle_start) * 1000
+        if not prices:
+            print("⚠️ Snapshot de preços indisponível - ciclo ignorado")
+        
+        updates = []
+        missing = 0
+        now_str = datetime.now().strftime('%d/%m/%Y %H:%M:%S')
+        for signal_id, signal in list(self.monitored_signals.items()):
             try:
-                # Obter preço atual
-                current_price = self._get_current_price(signal.symbol)
-                if current_price:
-                    signal.current_price = current_price
-                    self._update_signal_metrics(signal)
-                    
-                    # Adicionar ao histórico de preços
-                    self._add_price_to_history(signal, current_price)
-                    
-                    # Atualizar timestamp
-                    signal.last_updated = datetime.now().strftime('%d/%m/%Y %H:%M:%S')
+                current_price = prices.get(signal.symbol)
+                if not current_price:
+                    missing += 1
+                    continue
+                
+                signal.current_price = current_price
+                self._update_signal_metrics(signal)
+                
+                # Adicionar ao histórico de preços
+                self._add_price_to_history(signal, current_price)
+                
+                # Atualizar timestamp
+                signal.last_updated = now_str
+                self._dirty_ids.add(signal_id)
+                
+                updates.append({
+                    'id': signal_id,
+                    'symbol': signal.symbol,
+                    'current_price': signal.current_price,
+                    'current_percentage': signal.current_percentage,
+                    'current_profit': signal.current_profit,
+                    'status': signal.status
+                })
                     
             except Exception as e:
                 print(f"❌ Erro ao atualizar sinal {signal.symbol}: {e}")
+        
+        self.last_cycle_stats = {
+            'signals': len(self.monitored_signals),
+            'updated': len(updates),
+            'missing_prices': missing,
+            'prices_in_snapshot': len(prices),
+            'fetch_ms': round(fetch_ms, 2),
+            'duration_ms': round((time.time() - cycle_start) * 1000, 2),
+            'finished_at': now_str
+        }
+        print(f"✅ {len(updates)} sinais atualizados em {self.last_cycle_stats['duration_ms']:.0f}ms "
+              f"(snapshot: {fetch_ms:.0f}ms, sem preço: {missing})")
+        
+        # Valores da simulação mudaram: reordenar o índice uma vez por ciclo
+        self.active_by_value.rebuild(list(self.monitored_signals.values()))
+        
+        # Um único evento por ciclo com os deltas de preço
+        if updates:
+            event_bus.publish('monitoring_prices', {'signals': updates})
     
     def _update_signal_metrics(self, signal: MonitoredSignal):
         """
@@ -353,8 +677,7 @@ class SignalMonitoringSystem:
             Optional[float]: Preço atual ou None se erro
         """
         try:
-            ticker = self.binance.client.get_symbol_ticker(symbol=symbol)
-            return float(ticker['price'])
+            return self.binance.get_symbol_price(symbol)
         except Exception as e:
             print(f"⚠️ Erro ao obter preço de {symbol}: {e}")
             return None
@@ -367,20 +690,7 @@ class SignalMonitoringSystem:
             signal: Sinal monitorado
             price: Preço atual
         """
-        timestamp = datetime.now().strftime('%d/%m/%Y %H:%M:%S')
-        
-        price_entry = {
-            'timestamp': timestamp,
-            'price': price,
-            'percentage': signal.current_percentage,
-            'profit': signal.current_profit
-        }
-        
-        signal.price_history.append(price_entry)
-        
-        # Manter apenas últimas 100 entradas para economizar memória
-        if len(signal.price_history) > 100:
-            signal.price_history = signal.price_history[-100:]
+        signal.price_history.append(time.time(), price, signal.current_percentage, signal.current_profit)
     
     def _check_expired_signals(self):
         """
@@ -391,15 +701,13 @@ class SignalMonitoringSystem:
         for signal_id, signal in self.monitored_signals.items():
             if signal.days_monitored >= self.config['monitoring_days']:
                 signal.status = 'EXPIRED'
-                self.expired_signals[signal_id] = signal
                 expired_ids.append(signal_id)
                 
                 print(f"⏰ Sinal {signal.symbol} expirado após {signal.days_monitored} dias")
                 print(f"   Lucro máximo atingido: {signal.max_profit_reached:.2f}%")
         
         # Remover da lista de monitoramento
-        for signal_id in expired_ids:
-            del self.monitored_signals[signal_id]
+        self._move_to_history(expired_ids)
     
     def _check_completed_signals(self):
         """
@@ -423,60 +731,112 @@ class SignalMonitoringSystem:
                 print(f"   📅 Dias para atingir: {signal.days_monitored}")
         
         # Mover para expirados (sinais completados também vão para histórico)
-        for signal_id in completed_ids:
-            self.expired_signals[signal_id] = self.monitored_signals[signal_id]
-            del self.monitored_signals[signal_id]
+        self._move_to_history(completed_ids)
+    
+    def _move_to_history(self, signal_ids: List[str]):
+        """
+        Move sinais finalizados (COMPLETED/EXPIRED) para o histórico
+        
+        Atualiza agregados, índices ordenados e a lista de alterações a persistir.
+        
+        Args:
+            signal_ids: IDs dos sinais a mover
+        """
+        if not signal_ids:
+            return
+        
+        for signal_id in signal_ids:
+            signal = self.monitored_signals.pop(signal_id)
+            self.expired_signals[signal_id] = signal
+            self.aggregates.add(signal)
+            self.expired_by_value.insert(signal)
+            self.expired_by_profit.insert(signal)
+            self._dirty_ids.add(signal_id)
+        
+        self.active_by_value.rebuild(list(self.monitored_signals.values()))
     
     def _save_signal_to_database(self, signal: MonitoredSignal):
         """
-        Salva um sinal no banco de dados
+        Persiste um sinal recém-adicionado no armazenamento local
         
         Args:
             signal: Sinal a ser salvo
         """
         try:
-            # Converter para dicionário
-            signal_dict = asdict(signal)
-            signal_dict['price_history'] = json.dumps(signal.price_history)
-            
-            # Salvar no banco (implementar conforme estrutura do banco)
-            # Por enquanto, apenas log
-            print(f"💾 Salvando sinal {signal.symbol} no banco")
+            self.state_store.record([signal])
+            self._dirty_ids.discard(signal.id)
+            print(f"💾 Sinal {signal.symbol} salvo no estado de monitoramento")
             
         except Exception as e:
             print(f"❌ Erro ao salvar sinal no banco: {e}")
+            traceback.print_exc()
     
-    def _save_monitoring_state(self):
+    def _all_signals(self) -> List[MonitoredSignal]:
+        """Retorna todos os sinais (monitorados e expirados)"""
+        return list(self.monitored_signals.values()) + list(self.expired_signals.values())
+    
+    def _save_monitoring_state(self, force_snapshot: bool = False):
         """
         Salva o estado atual do monitoramento
+        
+        Grava um delta com os sinais alterados no ciclo e, periodicamente,
+        compacta tudo em um novo snapshot.
+        
+        Args:
+            force_snapshot: Gera snapshot completo independente do tamanho do log
         """
         try:
-            # Salvar estado em arquivo temporário ou banco
-            state = {
-                'monitored_count': len(self.monitored_signals),
-                'expired_count': len(self.expired_signals),
-                'last_update': datetime.now().strftime('%d/%m/%Y %H:%M:%S')
-            }
+            dirty_ids, self._dirty_ids = self._dirty_ids, set()
+            changed = []
+            for signal_id in dirty_ids:
+                signal = self.monitored_signals.get(signal_id) or self.expired_signals.get(signal_id)
+                if signal is not None:
+                    changed.append(signal)
+            
+            if force_snapshot or self.state_store.needs_compaction():
+                total = self.state_store.write_snapshot(self._all_signals())
+                print(f"💾 Snapshot do monitoramento salvo: {total} sinais "
+                      f"({self.state_store.stats['last_snapshot_ms']}ms)")
+            elif changed:
+                self.state_store.record(changed)
             
-            # Log do estado
             if len(self.monitored_signals) > 0:
-                print(f"📊 Estado: {state['monitored_count']} monitorados, {state['expired_count']} expirados")
+                print(f"📊 Estado: {len(self.monitored_signals)} monitorados, {len(self.expired_signals)} expirados")
             
         except Exception as e:
             print(f"❌ Erro ao salvar estado: {e}")
+            traceback.print_exc()
     
     def _load_existing_signals(self):
         """
-        Carrega sinais existentes do banco de dados
+        Carrega sinais salvos no armazenamento local (snapshot + deltas)
         """
         try:
-            # Implementar carregamento do banco
-            print("📂 Carregando sinais existentes do banco...")
-            # Por enquanto, apenas log
-            print("✅ Sinais carregados")
+            print("📂 Carregando sinais existentes do estado local...")
+            records, history, appended = self.state_store.load()
+            
+            for signal_id, record in records.items():
+                signal = MonitoredSignal(**record)
+                signal.price_history = PriceHistoryBuffer.from_array(
+                    history.get(signal_id, np.empty((0, 4))),
+                    appended=appended.get(signal_id)
+                )
+                if signal.status == 'MONITORING':
+                    self.monitored_signals[signal_id] = signal
+                else:
+                    self.expired_signals[signal_id] = signal
+            
+            self.aggregates.rebuild(list(self.expired_signals.values()))
+            self.active_by_value.rebuild(list(self.monitored_signals.values()))
+            self.expired_by_value.rebuild(list(self.expired_signals.values()))
+            self.expired_by_profit.rebuild(list(self.expired_signals.values()))
+            
+            print(f"✅ Sinais carregados: {len(self.monitored_signals)} monitorados, "
+                  f"{len(self.expired_signals)} expirados em {self.state_store.stats['last_load_ms']}ms")
             
         except Exception as e:
             print(f"❌ Erro ao carregar sinais: {e}")
+            traceback.print_exc()
     
     def get_monitoring_stats(self) -> Dict[str, Any]:
         """
@@ -496,17 +856,20 @@ class SignalMonitoringSystem:
             max_profit = max(profits) if profits else 0
             
             # Sinais que atingiram objetivo
-            completed_signals = [s for s in self.expired_signals.values() if s.status == 'COMPLETED']
-            success_rate = (len(completed_signals) / total_expired * 100) if total_expired > 0 else 0
+            aggregates = self.aggregates.snapshot()
+            completed_count = aggregates['success_count']
+            success_rate = (completed_count / total_expired * 100) if total_expired > 0 else 0
             
             return {
                 'total_monitored': total_monitored,
                 'total_expired': total_expired,
-                'total_completed': len(completed_signals),
+                'total_completed': completed_count,
                 'success_rate': round(success_rate, 2),
                 'average_profit': round(avg_profit, 2),
                 'max_profit': round(max_profit, 2),
                 'is_monitoring': self.is_monitoring,
+                'last_cycle': self.last_cycle_stats,
+                'persistence': self.state_store.get_stats(),
                 'last_update': datetime.now().strftime('%d/%m/%Y %H:%M:%S')
             }
             
@@ -521,7 +884,49 @@ class SignalMonitoringSystem:
         Returns:
             List: Lista de sinais monitorados
         """
-        return [asdict(signal) for signal in self.monitored_signals.values()]
+        return [signal.to_dict() for signal in self.monitored_signals.values()]
+    
+    def query_signals(self, scope: str = 'active', limit: Optional[int] = 100,
+                      cursor: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Página de sinais a partir dos índices pré-ordenados
+        
+        Args:
+            scope: 'active' (por valor da simulação), 'expired' (por lucro máximo)
+                   ou 'simulation' (ativos + expirados por valor da simulação)
+            limit: Tamanho máximo da página (None retorna todos a partir do cursor)
+            cursor: Cursor retornado pela página anterior
+            
+        Returns:
+            Dict com 'signals' (MonitoredSignal), 'next_cursor' e 'total'
+        """
+        indexes = {
+            'active': [self.active_by_value],
+            'expired': [self.expired_by_profit],
+            'simulation': [self.active_by_value, self.expired_by_value]
+        }[scope]
+        
+        after = decode_cursor(cursor)
+        if limit is None:
+            keys = list(heapq.merge(*(index.page(after, None) for index in indexes)))
+            has_more = False
+        else:
+            # Uma chave extra indica se existe próxima página
+            keys = list(heapq.merge(*(index.page(after, limit + 1) for index in indexes)))[:limit + 1]
+            has_more = len(keys) > limit
+            keys = keys[:limit]
+        
+        signals = []
+        for _, signal_id in keys:
+            signal = self.monitored_signals.get(signal_id) or self.expired_signals.get(signal_id)
+            if signal is not None:
+                signals.append(signal)
+        
+        return {
+            'signals': signals,
+            'next_cursor': encode_cursor(keys[-1]) if has_more and keys else None,
+            'total': sum(len(index) for index in indexes)
+        }
     
     def get_expired_signals(self) -> List[Dict[str, Any]]:
         """
@@ -530,7 +935,7 @@ class SignalMonitoringSystem:
         Returns:
             List: Lista de sinais expirados
         """
-        return [asdict(signal) for signal in self.expired_signals.values()]
+        return [signal.to_dict() for signal in self.expired_signals.values()]
     
     def get_system_statistics(self) -> Dict[str, Any]:
         """
@@ -540,58 +945,43 @@ class SignalMonitoringSystem:
             Dict: Estatísticas detalhadas para avaliação quantitativa
         """
         try:
-            # Sinais ativos
-            active_signals = list(self.monitored_signals.values())
-            expired_signals = list(self.expired_signals.values())
-            
-            # Sinais que atingiram 300% de lucro
-            successful_signals = [s for s in expired_signals if s.status == 'COMPLETED']
-            failed_signals = [s for s in expired_signals if s.status == 'EXPIRED']
+            aggregates = self.aggregates.snapshot()
             
             # Cálculos estatísticos
-            total_evaluated = len(expired_signals)
-            success_count = len(successful_signals)
-            failure_count = len(failed_signals)
+            total_evaluated = aggregates['total_evaluated']
+            success_count = aggregates['success_count']
+            failure_count = aggregates['failure_count']
             
             success_rate = (success_count / total_evaluated * 100) if total_evaluated > 0 else 0
             
             # Lucros médios
-            successful_profits = [s.max_profit_reached for s in successful_signals if s.max_profit_reached > 0]
-            avg_successful_profit = sum(successful_profits) / len(successful_profits) if successful_profits else 0
+            avg_successful_profit = (aggregates['successful_profit_sum'] / aggregates['successful_profit_count']
+                                     if aggregates['successful_profit_count'] else 0)
             
             # Tempo médio para sucesso
-            successful_days = [s.days_monitored for s in successful_signals]
-            avg_days_to_success = sum(successful_days) / len(successful_days) if successful_days else 0
+            avg_days_to_success = aggregates['successful_days_sum'] / success_count if success_count else 0
             
             # Análise por tipo de sinal
-            buy_signals = [s for s in expired_signals if s.signal_type == 'COMPRA']
-            sell_signals = [s for s in expired_signals if s.signal_type == 'VENDA']
+            buy_bucket = aggregates['by_type'].get('COMPRA', {'total': 0, 'successful': 0})
+            sell_bucket = aggregates['by_type'].get('VENDA', {'total': 0, 'successful': 0})
             
-            buy_success_rate = (len([s for s in buy_signals if s.status == 'COMPLETED']) / len(buy_signals) * 100) if buy_signals else 0
-            sell_success_rate = (len([s for s in sell_signals if s.status == 'COMPLETED']) / len(sell_signals) * 100) if sell_signals else 0
+            buy_success_rate = (buy_bucket['successful'] / buy_bucket['total'] * 100) if buy_bucket['total'] else 0
+            sell_success_rate = (sell_bucket['successful'] / sell_bucket['total'] * 100) if sell_bucket['total'] else 0
             
             # Análise por alavancagem
-            leverage_analysis = {}
-            for signal in expired_signals:
-                leverage = signal.max_leverage
-                if leverage not in leverage_analysis:
-                    leverage_analysis[leverage] = {'total': 0, 'successful': 0, 'avg_profit': 0, 'profits': []}
-                
-                leverage_analysis[leverage]['total'] += 1
-                if signal.status == 'COMPLETED':
-                    leverage_analysis[leverage]['successful'] += 1
-                leverage_analysis[leverage]['profits'].append(signal.max_profit_reached)
-            
-            # Calcular médias por alavancagem
-            for leverage, data in leverage_analysis.items():
-                if data['profits']:
-                    data['avg_profit'] = sum(data['profits']) / len(data['profits'])
-                data['success_rate'] = (data['successful'] / data['total'] * 100) if data['total'] > 0 else 0
-                del data['profits']  # Remover lista para economizar espaço
+            leverage_analysis = {
+                leverage: {
+                    'total': data['total'],
+                    'successful': data['successful'],
+                    'avg_profit': data['profit_sum'] / data['total'] if data['total'] else 0,
+                    'success_rate': (data['successful'] / data['total'] * 100) if data['total'] else 0
+                }
+                for leverage, data in aggregates['by_leverage'].items()
+            }
             
             return {
                 # Estatísticas gerais
-                'total_active_signals': len(active_signals),
+                'total_active_signals': len(self.monitored_signals),
                 'total_evaluated_signals': total_evaluated,
                 'successful_signals': success_count,
                 'failed_signals': failure_count,
@@ -600,13 +990,13 @@ class SignalMonitoringSystem:
                 # Análise de performance
                 'average_successful_profit': round(avg_successful_profit, 2),
                 'average_days_to_success': round(avg_days_to_success, 1),
-                'max_profit_achieved': max([s.max_profit_reached for s in expired_signals], default=0),
+                'max_profit_achieved': aggregates['max_profit_achieved'],
                 
                 # Análise por tipo
                 'buy_signals_success_rate': round(buy_success_rate, 2),
                 'sell_signals_success_rate': round(sell_success_rate, 2),
-                'buy_signals_count': len(buy_signals),
-                'sell_signals_count': len(sell_signals),
+                'buy_signals_count': buy_bucket['total'],
+                'sell_signals_count': sell_bucket['total'],
                 
                 # Análise por alavancagem
                 'leverage_analysis': leverage_analysis,
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""
+Profiler por Amostragem de Pilhas
+Amostra periodicamente as pilhas de todas as threads do processo em execução
+(waitress, _monitoring_loop, _confirmation_loop, loop do SignalMonitoringSystem)
+via sys._current_frames(), sem reiniciar e sem instrumentar o código.
+
+O resultado sai no formato "collapsed" (uma pilha por linha, da raiz para a
+folha, seguida da contagem), aceito por flamegraph.pl, speedscope e inferno.
+
+Custo limitado: a duração é limitada a MAX_DURATION_SECONDS, só um perfil roda
+por vez e o intervalo entre amostras cresce sozinho se a coleta de uma amostra
+ultrapassar MAX_OVERHEAD da janela.
+"""
+
+import math
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from .logger import setup_logger
+
+logger = setup_logger('core.stack_profiler')
+
+MAX_DURATION_SECONDS = 60.0
+MIN_INTERVAL_MS = 5.0
+MAX_DEPTH = 128
+# Fração máxima do tempo de parede gasta coletando amostras
+MAX_OVERHEAD = 0.05
+
+_profile_lock = threading.Lock()
+
+
+class ProfilerBusyError(RuntimeError):
+    """Já existe um perfil em andamento"""
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _walk(frame) -> List[str]:
+    """Pilha da raiz para a folha (limitada a MAX_DEPTH quadros a partir da folha)"""
+    labels = []
+    while frame is not None and len(labels) < MAX_DEPTH:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.reverse()
+    return labels
+
+
+def sample_stacks(duration: float = 10.0, interval_ms: float = 10.0,
+                  thread_filter: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Amostra as pilhas de todas as threads durante `duration` segundos
+
+    Args:
+        duration: Duração em segundos (limitada a MAX_DURATION_SECONDS)
+        interval_ms: Intervalo alvo entre amostras (mínimo MIN_INTERVAL_MS)
+        thread_filter: Só amostra threads cujo nome contém este texto
+
+    Returns:
+        Dict com stacks (pilha collapsed -> contagem), amostras, threads vistas,
+        duração real, intervalo efetivo e sobrecarga medida
+
+    Raises:
+        ValueError: Se duration ou interval_ms não forem números finitos
+        ProfilerBusyError: Se outro perfil já estiver rodando
+    """
+    duration, interval_ms = float(duration), float(interval_ms)
+    # nan passa por min/max sem ser limitado e o laço nunca terminaria
+    if not (math.isfinite(duration) and math.isfinite(interval_ms)):
+        raise ValueError('duration e interval_ms devem ser números finitos')
+    duration = min(max(duration, 0.1), MAX_DURATION_SECONDS)
+    interval = min(max(interval_ms, MIN_INTERVAL_MS), duration * 1000) / 1000
+
+    if not _profile_lock.acquire(blocking=False):
+        raise ProfilerBusyError('Já existe um perfil em andamento')
+
+    try:
+        own_ident = threading.get_ident()
+        stacks: Counter = Counter()
+        threads_seen: Counter = Counter()
+        samples = 0
+        sampling_time = 0.0
+
+        logger.info("🔍 Perfil por amostragem iniciado (%.1fs, intervalo %.0fms)", duration, interval * 1000)
+        started = time.perf_counter()
+        deadline = started + duration
+        while True:
+            sample_start = time.perf_counter()
+            if sample_start >= deadline:
+                break
+
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident:
+                    continue
+                name = names.get(ident, f'thread-{ident}')
+                if thread_filter and thread_filter not in name:
+                    continue
+                stacks[';'.join([name] + _walk(frame))] += 1
+                threads_seen[name] += 1
+            samples += 1
+
+            cost = time.perf_counter() - sample_start
+            sampling_time += cost
+            # Mantém a coleta abaixo de MAX_OVERHEAD do tempo de parede
+            wait = max(interval, cost / MAX_OVERHEAD) - cost
+            time.sleep(max(0.0, min(wait, deadline - time.perf_counter())))
+
+        elapsed = time.perf_counter() - started
+    finally:
+        _profile_lock.release()
+
+    result = {
+        'stacks': dict(stacks),
+        'samples': samples,
+        'threads': dict(threads_seen),
+        'duration_seconds': round(elapsed, 3),
+        'interval_ms': round(elapsed / samples * 1000, 2) if samples else 0.0,
+        'overhead_pct': round(sampling_time / elapsed * 100, 2) if elapsed else 0.0
+    }
+    logger.info("✅ Perfil concluído: %d amostras, %d pilhas distintas, sobrecarga %.2f%%",
+                samples, len(stacks), result['overhead_pct'])
+    return result
+
+
+def to_collapsed(stacks: Dict[str, int]) -> str:
+    """Formato collapsed ("raiz;...;folha contagem"), das pilhas mais frequentes para as menos"""
+    lines = [f"{stack} {count}" for stack, count in sorted(stacks.items(), key=lambda item: (-item[1], item[0]))]
+    return '\n'.join(lines) + ('\n' if lines else '')
+
+
+def top_functions(stacks: Dict[str, int], limit: int = 20) -> List[Dict[str, Any]]:
+    """
+    Funções mais presentes nas amostras
+
+    Returns:
+        Lista com função, amostras na folha (self) e amostras em qualquer nível (total)
+    """
+    self_counts: Counter = Counter()
+    total_counts: Counter = Counter()
+    for stack, count in stacks.items():
+        frames = stack.split(';')[1:]
+        if not frames:
+            continue
+        self_counts[frames[-1]] += count
+        for label in set(frames):
+            total_counts[label] += count
+    ranked = sorted(total_counts, key=lambda label: (-self_counts[label], -total_counts[label], label))
+    return [{'function': label, 'self': self_counts[label], 'total': total_counts[label]}
+            for label in ranked[:limit]]
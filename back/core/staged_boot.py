@@ -0,0 +1,306 @@
+# -*- coding: utf-8 -*-
+"""
+Inicialização em Estágios do Backend
+O servidor passa a escutar antes dos subsistemas pesados existirem: enquanto
+blueprints, TechnicalAnalysis, BTCSignalManager e SignalMonitoringSystem são
+montados numa thread de fundo, um app WSGI mínimo responde /api/health (200),
+/api/ready (503 com o progresso dos estágios) e 503 com Retry-After nas demais
+rotas. Quando o app completo fica pronto, todas as requisições passam a ele.
+
+Inclui a verificação de orçamento de importação: mede `python -X importtime`
+de um módulo e aponta módulos pesados carregados no import.
+"""
+
+import json
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .logger import setup_logger
+
+logger = setup_logger('core.staged_boot')
+
+PENDING = 'pending'
+RUNNING = 'running'
+READY = 'ready'
+FAILED = 'failed'
+
+# Módulos que não devem ser carregados só por importar o app
+HEAVY_MODULES = ('pandas', 'ta', 'cryptocompare', 'supabase', 'dash', 'binance', 'scipy')
+# Orçamento padrão para `import app_supabase` (ms)
+DEFAULT_IMPORT_BUDGET_MS = float(os.getenv('IMPORT_BUDGET_MS', '400'))
+# Sugestão de nova tentativa enviada nas respostas 503 durante o aquecimento
+RETRY_AFTER_SECONDS = 5
+# Estágio registrado quando a montagem em fundo (start_background) falha
+BUILD_STAGE = 'build'
+
+_IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+
+class BootTracker:
+    """Registra o estado e a duração de cada estágio da inicialização"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stages: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self._started = time.time()
+        self._finished_at: Optional[float] = None
+        self._thread: Optional[threading.Thread] = None
+        # Enquanto a montagem em fundo não entrega o app, mark_finished() de dentro dela é ignorado
+        self._building = False
+        self._build_error: Optional[str] = None
+
+    def run_stage(self, name: str, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Executa um estágio registrando início, duração e resultado
+
+        Args:
+            name: Nome do estágio (ex: 'bot', 'blueprints')
+            func: Função do estágio
+
+        Returns:
+            O retorno de `func`, ou None se o estágio falhar (o erro fica registrado)
+        """
+        with self._lock:
+            stage = self._stages.setdefault(name, {'name': name})
+            stage.update({'state': RUNNING, 'started_at': datetime.now().isoformat(),
+                          'duration_ms': None, 'error': None})
+
+        start = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+            state, error = READY, None
+        except Exception as e:
+            result, state, error = None, FAILED, str(e)
+            logger.error("❌ Estágio de inicialização '%s' falhou: %s", name, e)
+
+        duration_ms = round((time.perf_counter() - start) * 1000, 1)
+        with self._lock:
+            stage.update({'state': state, 'duration_ms': duration_ms, 'error': error})
+        logger.info("⏱️ Estágio '%s': %s em %.0fms", name, state, duration_ms)
+        return result
+
+    def add_stages(self, names: Iterable[str]) -> None:
+        """Declara estágios ainda não iniciados para aparecerem como pending no status"""
+        with self._lock:
+            for name in names:
+                self._stages.setdefault(name, {'name': name, 'state': PENDING, 'started_at': None,
+                                               'duration_ms': None, 'error': None})
+
+    def start_background(self, build: Callable[[], Any],
+                         on_ready: Optional[Callable[[Any], None]] = None) -> threading.Thread:
+        """
+        Roda `build` numa thread de fundo e marca a inicialização como concluída ao final
+
+        A inicialização só fica pronta depois que `on_ready` recebe o app. Se `build`
+        levantar exceção ou não retornar nada, o erro vira o estágio BUILD_STAGE com
+        estado FAILED e a fase geral passa a 'failed' (nunca 'ready').
+
+        Args:
+            build: Função que monta o app completo (chama run_stage para cada estágio)
+            on_ready: Recebe o retorno de `build` (ex: StagedBootApp.set_target)
+        """
+        def runner():
+            try:
+                result = build()
+                if result is None:
+                    raise RuntimeError('montagem do app não retornou a aplicação')
+                if on_ready:
+                    on_ready(result)
+            except Exception as e:
+                logger.error("❌ Inicialização em fundo falhou: %s", e)
+                self._record_build_failure(e)
+            finally:
+                with self._lock:
+                    self._building = False
+                self.mark_finished()
+
+        with self._lock:
+            self._building = True
+        self._thread = threading.Thread(target=runner, name='staged-boot', daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def _record_build_failure(self, error: Exception) -> None:
+        with self._lock:
+            self._build_error = str(error)
+            stage = self._stages.setdefault(BUILD_STAGE, {'name': BUILD_STAGE, 'started_at': None,
+                                                          'duration_ms': None})
+            stage.update({'state': FAILED, 'error': str(error)})
+
+    def mark_finished(self) -> None:
+        """Marca a inicialização como concluída (idempotente)"""
+        with self._lock:
+            if self._finished_at is not None or self._building:
+                return
+            self._finished_at = time.time()
+        status = self.get_status()
+        logger.info("✅ Inicialização concluída em %.1fs (%s)", status['boot_seconds'], status['phase'])
+
+    def is_ready(self) -> bool:
+        with self._lock:
+            return self._finished_at is not None and self._build_error is None
+
+    def get_status(self) -> Dict[str, Any]:
+        """Fase geral (starting/ready/degraded/failed), tempo de boot e estado de cada estágio"""
+        with self._lock:
+            stages = [dict(stage) for stage in self._stages.values()]
+            finished_at = self._finished_at
+            build_error = self._build_error
+        failed = [stage['name'] for stage in stages if stage['state'] == FAILED]
+        if finished_at is None:
+            phase = 'starting'
+        elif build_error is not None:
+            phase = 'failed'
+        else:
+            phase = 'degraded' if failed else 'ready'
+        return {
+            'ready': finished_at is not None and build_error is None,
+            'phase': phase,
+            'boot_seconds': round((finished_at or time.time()) - self._started, 2),
+            'failed_stages': failed,
+            'stages': stages
+        }
+
+    def reset(self) -> None:
+        """Limpa os estágios (usado em testes)"""
+        with self._lock:
+            self._stages.clear()
+            self._started = time.time()
+            self._finished_at = None
+            self._building = False
+            self._build_error = None
+
+
+class StagedBootApp:
+    """App WSGI que responde o básico durante o aquecimento e depois delega ao app completo"""
+
+    def __init__(self, tracker: BootTracker, service: str = 'krypton-bot-supabase'):
+        self.tracker = tracker
+        self.service = service
+        self._target = None
+
+    def set_target(self, app: Callable) -> None:
+        """Passa a encaminhar todas as requisições para o app completo"""
+        self._target = app
+
+    def __call__(self, environ: Dict[str, Any], start_response: Callable):
+        target = self._target
+        if target is not None:
+            return target(environ, start_response)
+        return self._warming_up(environ, start_response)
+
+    def _warming_up(self, environ: Dict[str, Any], start_response: Callable):
+        path = environ.get('PATH_INFO', '')
+        phase = self.tracker.get_status()['phase']
+        if path == '/api/health':
+            # Montagem falhou: o app completo nunca vai assumir, health deixa de ser 200
+            healthy = phase != 'failed'
+            status = '200 OK' if healthy else '503 Service Unavailable'
+            body = {'status': 'healthy' if healthy else 'unhealthy', 'service': self.service,
+                    'phase': phase, 'timestamp': datetime.now().isoformat()}
+        elif path == '/api/ready':
+            body = self.tracker.get_status()
+            status = '200 OK' if body['ready'] else '503 Service Unavailable'
+        else:
+            message = ('Falha na inicialização do servidor' if phase == 'failed'
+                       else 'Servidor inicializando, tente novamente em instantes')
+            status, body = '503 Service Unavailable', {'success': False, 'message': message, 'phase': phase}
+
+        payload = json.dumps(body).encode('utf-8')
+        headers = [('Content-Type', 'application/json'), ('Content-Length', str(len(payload)))]
+        if not status.startswith('200'):
+            headers.append(('Retry-After', str(RETRY_AFTER_SECONDS)))
+        if path.startswith('/api/'):
+            headers.append(('Access-Control-Allow-Origin', '*'))
+        start_response(status, headers)
+        return [payload]
+
+
+def measure_import(module: str, cwd: Optional[str] = None, top: int = 10) -> Dict[str, Any]:
+    """
+    Mede o tempo de importação de um módulo num processo novo (`python -X importtime`)
+
+    Args:
+        module: Módulo a importar (ex: 'app_supabase')
+        cwd: Diretório de execução (padrão: back/)
+        top: Quantidade de módulos mais caros no relatório
+
+    Returns:
+        Dict com total_ms, módulos pesados carregados e os mais caros (tempo acumulado)
+    """
+    cwd = cwd or os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE='1')
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                               cwd=cwd, env=env, capture_output=True, text=True, timeout=120)
+    if completed.returncode != 0:
+        raise RuntimeError(f"Falha ao importar {module}: {completed.stderr.strip().splitlines()[-1:]}")
+
+    rows = []
+    for line in completed.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            rows.append({'module': name, 'self_ms': int(self_us) / 1000,
+                         'cumulative_ms': int(cumulative_us) / 1000, 'depth': len(indent) // 2})
+
+    total_ms = next((row['cumulative_ms'] for row in reversed(rows) if row['module'] == module), 0.0)
+    loaded = {row['module'] for row in rows}
+    heavy = [name for name in HEAVY_MODULES if name in loaded]
+    # Só módulos diretos do app e de terceiros de primeiro nível: evita repetir a mesma cadeia
+    slowest = sorted((row for row in rows if row['depth'] <= 1 and row['module'] != module),
+                     key=lambda row: -row['cumulative_ms'])[:top]
+    return {'module': module, 'total_ms': round(total_ms, 1), 'heavy_modules': heavy,
+            'slowest': [{'module': row['module'], 'cumulative_ms': round(row['cumulative_ms'], 1)}
+                        for row in slowest]}
+
+
+def check_import_budget(module: str = 'app_supabase', budget_ms: float = DEFAULT_IMPORT_BUDGET_MS,
+                        cwd: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Verifica se importar `module` cabe no orçamento e não carrega HEAVY_MODULES
+
+    Returns:
+        Resultado de measure_import com budget_ms, ok e a lista de violações
+    """
+    report = measure_import(module, cwd=cwd)
+    violations = []
+    if report['total_ms'] > budget_ms:
+        violations.append(f"importação levou {report['total_ms']:.0f}ms (orçamento {budget_ms:.0f}ms)")
+    if report['heavy_modules']:
+        violations.append(f"módulos pesados carregados no import: {', '.join(report['heavy_modules'])}")
+    report.update({'budget_ms': budget_ms, 'ok': not violations, 'violations': violations})
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Verifica o orçamento de tempo de importação do backend')
+    parser.add_argument('module', nargs='?', default='app_supabase')
+    parser.add_argument('--budget-ms', type=float, default=DEFAULT_IMPORT_BUDGET_MS)
+    args = parser.parse_args(argv)
+
+    report = check_import_budget(args.module, args.budget_ms)
+    print(f"⏱️ import {report['module']}: {report['total_ms']:.0f}ms (orçamento {report['budget_ms']:.0f}ms)")
+    for row in report['slowest']:
+        print(f"   {row['cumulative_ms']:8.1f}ms  {row['module']}")
+    for violation in report['violations']:
+        print(f"❌ {violation}")
+    if report['ok']:
+        print("✅ Dentro do orçamento")
+    return 0 if report['ok'] else 1
+
+
+# Instância global para uso em outros módulos
+boot_tracker = BootTracker()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""
+Camada de Acesso ao Supabase
+Cliente único por processo (reaproveita a conexão HTTP), limite de consultas
+simultâneas e métricas de latência por tabela/operação.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Optional
+
+from .metrics import SUPABASE_QUERY_SECONDS
+
+
+class SupabaseAccess:
+    """Acesso compartilhado ao Supabase para todo o processo"""
+
+    def __init__(self, url: Optional[str] = None, key: Optional[str] = None,
+                 max_concurrency: Optional[int] = None):
+        # Credenciais explícitas; se ausentes, lidas do ambiente no primeiro uso
+        self.url = url
+        self.key = key
+        self.max_concurrency = max_concurrency or int(os.getenv('SUPABASE_MAX_CONCURRENCY', '4'))
+
+        self._client = None
+        self._client_lock = threading.Lock()
+        self._semaphore = threading.BoundedSemaphore(self.max_concurrency)
+
+        # Métricas por (tabela, operação)
+        self._metrics: Dict[str, Dict[str, Any]] = {}
+        self._metrics_lock = threading.Lock()
+        self.clients_created = 0
+
+    @property
+    def is_configured(self) -> bool:
+        """Indica se URL e chave do Supabase estão definidas"""
+        if not self.url:
+            self.url = os.getenv('SUPABASE_URL')
+        if not self.key:
+            self.key = os.getenv('SUPABASE_ANON_KEY')
+        return bool(self.url and self.key)
+
+    def configure(self, url: str, key: str) -> None:
+        """Redefine as credenciais e descarta o cliente atual (usado em testes)"""
+        with self._client_lock:
+            self.url = url
+            self.key = key
+            self._client = None
+
+    def get_client(self):
+        """
+        Retorna o cliente Supabase compartilhado, criando-o na primeira chamada.
+
+        Returns:
+            Cliente Supabase ou None se não configurado/biblioteca ausente
+        """
+        if self._client is not None:
+            return self._client
+
+        if not self.is_configured:
+            return None
+
+        with self._client_lock:
+            if self._client is None:
+                try:
+                    from supabase import create_client
+                except ImportError:
+                    print("⚠️ Biblioteca Supabase não instalada")
+                    return None
+
+                self._client = create_client(self.url, self.key)
+                self.clients_created += 1
+                print("✅ Cliente Supabase compartilhado criado")
+
+            return self._client
+
+    def execute(self, table: str, operation: str, build_query: Callable[[Any], Any]) -> Any:
+        """
+        Executa uma consulta com limite de concorrência e registro de latência.
+
+        Args:
+            table: Nome da tabela
+            operation: Rótulo da operação para métricas ('select', 'insert', 'delete', ...)
+            build_query: Função que recebe o builder da tabela e retorna a query pronta
+
+        Returns:
+            Resultado de query.execute()
+
+        Raises:
+            RuntimeError: Se o Supabase não estiver configurado
+        """
+        client = self.get_client()
+        if client is None:
+            raise RuntimeError('Supabase não configurado')
+
+        wait_start = time.perf_counter()
+        with self._semaphore:
+            start = time.perf_counter()
+            wait_ms = (start - wait_start) * 1000
+            try:
+                result = build_query(client.table(table)).execute()
+            except Exception:
+                self._record(table, operation, (time.perf_counter() - start) * 1000, wait_ms, error=True)
+                raise
+
+        self._record(table, operation, (time.perf_counter() - start) * 1000, wait_ms)
+        return result
+
+    def _record(self, table: str, operation: str, duration_ms: float, wait_ms: float,
+                error: bool = False) -> None:
+        """Registra uma execução nas métricas da tabela/operação"""
+        SUPABASE_QUERY_SECONDS.observe(duration_ms / 1000, table, operation, 'error' if error else 'ok')
+        key = f'{table}.{operation}'
+        with self._metrics_lock:
+            metric = self._metrics.get(key)
+            if metric is None:
+                metric = {
+                    'calls': 0,
+                    'errors': 0,
+                    'total_ms': 0.0,
+                    'max_ms': 0.0,
+                    'total_wait_ms': 0.0,
+                    'recent_ms': deque(maxlen=200)
+                }
+                self._metrics[key] = metric
+
+            metric['calls'] += 1
+            metric['total_ms'] += duration_ms
+            metric['total_wait_ms'] += wait_ms
+            metric['max_ms'] = max(metric['max_ms'], duration_ms)
+            metric['recent_ms'].append(duration_ms)
+            if error:
+                metric['errors'] += 1
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Retorna métricas de latência por tabela/operação"""
+        with self._metrics_lock:
+            operations = {}
+            for key, metric in self._metrics.items():
+                recent = sorted(metric['recent_ms'])
+                calls = metric['calls']
+                operations[key] = {
+                    'calls': calls,
+                    'errors': metric['errors'],
+                    'avg_ms': round(metric['total_ms'] / calls, 2) if calls else 0.0,
+                    'p95_ms': round(recent[int(len(recent) * 0.95) - 1], 2) if recent else 0.0,
+                    'max_ms': round(metric['max_ms'], 2),
+                    'avg_wait_ms': round(metric['total_wait_ms'] / calls, 2) if calls else 0.0
+                }
+
+        return {
+            'configured': self.is_configured,
+            'client_ready': self._client is not None,
+            'clients_created': self.clients_created,
+            'max_concurrency': self.max_concurrency,
+            'operations': operations
+        }
+
+
+# Instância global para uso em outros módulos
+supabase_db = SupabaseAccess()
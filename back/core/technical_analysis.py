@@ -15,22 +15,30 @@ import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from .database import Database
 from colorama import Fore, Style, init
-from .binance_client import BinanceClient
+from .binance_client import get_binance_client
 from .gerenciar_sinais import GerenciadorSinais
 from .telegram_notifier import TelegramNotifier
 from .btc_correlation_analyzer import BTCCorrelationAnalyzer
 from .klines_cache import CacheManager
+from .binance_limiter import binance_limiter, request_lane, set_request_lane
+from .scan_scheduler import AdaptiveScanScheduler
+from .logger import setup_logger
+from .metrics import STAGE_SECONDS, timed
 # from .coin_ranking import coin_ranking  # Removido - sistema de ranking desabilitado
 
 # Initialize colorama
 init()
 
+# Linhas por par usam extra={'symbol': ...} e são amostradas (LOG_SYMBOL_SAMPLE_RATE)
+logger = setup_logger('core.technical_analysis')
+
 class TechnicalAnalysisConfig(TypedDict):
     trend_timeframe: str
     entry_timeframe: str
     quality_score_minimum: float
     scan_interval: int
     pairs_update_interval: int
+    adaptive_scan: bool
 
 class TechnicalAnalysis:
     """Sistema principal de análise técnica e monitoramento de mercado"""
@@ -41,7 +49,7 @@ class TechnicalAnalysis:
         
         # Dependências principais
         self.db = db_instance
-        self.binance = BinanceClient()
+        self.binance = get_binance_client()
         self.gerenciador = GerenciadorSinais(db_instance)
         
         # Configurações do sistema
@@ -52,7 +60,8 @@ class TechnicalAnalysis:
             'scan_interval': 60,  # 60 segundos
             'pairs_update_interval': 1200,  # 20 minutos
             'target_percentage_min': 6.0,
-            'max_pairs': 100
+            'max_pairs': 100,
+            'adaptive_scan': True  # Monitoramento prioriza pares voláteis/perto do mínimo
         }
         
         # Estado do sistema
@@ -68,6 +77,9 @@ class TechnicalAnalysis:
         # Inicializar sistema de cache
         self.cache_manager = CacheManager()
         
+        # Escalonador adaptativo do monitoramento (pontuações do ciclo anterior + ticker 24h)
+        self.scan_scheduler = AdaptiveScanScheduler(self.config['quality_score_minimum'])
+        
         # Inicializar sistema de confirmação BTC
         from .btc_signal_manager import BTCSignalManager
         self.btc_signal_manager = BTCSignalManager(db_instance)
@@ -140,6 +152,9 @@ class TechnicalAnalysis:
         print(f"🔍 Thread ID: {threading.current_thread().ident}")
         print("="*70)
         
+        # Varredura cede a vez a confirmações e monitoramento no limitador da Binance
+        set_request_lane('scan')
+        
         while self.is_monitoring:
             try:
                 cycle_start = time.time()
@@ -149,7 +164,7 @@ class TechnicalAnalysis:
                 print("🔍 Iniciando nova varredura...")
                 
                 # Executar varredura do mercado
-                signals = self.scan_market(verbose=True)
+                signals = self.scan_market(verbose=True, adaptive=self.config['adaptive_scan'])
                 
                 # Processar sinais encontrados
                 if signals:
@@ -310,44 +325,70 @@ class TechnicalAnalysis:
             traceback.print_exc()
             return False
     
-    def scan_market(self, verbose: bool = False) -> List[Dict[str, Any]]:
-        """Executa varredura completa do mercado com processamento paralelo"""
+    @staticmethod
+    def _scan_lane_weight() -> int:
+        """Peso acumulado da faixa scan no limitador compartilhado da Binance"""
+        return binance_limiter.get_stats()['lanes']['scan']['weight']
+    
+    def scan_market(self, verbose: bool = False, adaptive: bool = False) -> List[Dict[str, Any]]:
+        """
+        Executa varredura do mercado com processamento paralelo
+        
+        Args:
+            verbose: Mantido por compatibilidade (detalhes vão para o logger)
+            adaptive: Analisa só os pares devidos segundo o scan_scheduler
+                      (padrão: varredura completa, como no escaneamento manual)
+        """
         try:
             scan_start_time = time.time()
             current_time = datetime.now().strftime('%d/%m/%Y %H:%M:%S')
             
-            print(f"\n{'='*80}")
-            print(f"🔍 INICIANDO ESCANEAMENTO DE MERCADO - {current_time}")
-            print(f"{'='*80}")
+            logger.info("🔍 INICIANDO ESCANEAMENTO DE MERCADO - %s", current_time)
             
             # Carregar pares se ainda não estiverem carregados (primeira execução)
             if not self.top_pairs:
-                print("🔄 Carregando pares iniciais...")
-                print(f"🔍 Estado atual: top_pairs={len(self.top_pairs)}, all_usdt_pairs={len(self.all_usdt_pairs)}")
-                if not self._initialize_pairs():
-                    print("❌ Falha ao carregar pares iniciais")
+                logger.info("🔄 Carregando pares iniciais (top_pairs=%d, all_usdt_pairs=%d)...",
+                            len(self.top_pairs), len(self.all_usdt_pairs))
+                with request_lane('housekeeping'):
+                    pairs_loaded = self._initialize_pairs()
+                if not pairs_loaded:
+                    logger.error("❌ Falha ao carregar pares iniciais")
                     return []
-                print(f"✅ Pares carregados: {len(self.top_pairs)} pares disponíveis")
+                logger.info("✅ Pares carregados: %d pares disponíveis", len(self.top_pairs))
             
-            print(f"📊 Analisando {len(self.top_pairs)} pares de criptomoedas...")
-            print(f"⚡ Processamento paralelo: Máximo 10 threads")
+            logger.info("📊 Analisando %d pares de criptomoedas (máximo 10 threads)...", len(self.top_pairs))
             
             # Verificar se precisa atualizar lista de pares
             if time.time() - self.pairs_last_update >= self.config['pairs_update_interval']:
-                print("🔄 Atualizando lista de pares top 100...")
-                self._create_top_pairs()
+                logger.info("🔄 Atualizando lista de pares top 100...")
+                with request_lane('housekeeping'):
+                    self._create_top_pairs()
+            
+            # Só a faixa scan: confirmações e monitoramento no mesmo processo não entram na conta
+            weight_before = self._scan_lane_weight()
+            pairs_to_scan = self.top_pairs
+            if adaptive:
+                if self.scan_scheduler.needs_ticker_refresh():
+                    with request_lane('scan'):
+                        ticker_data = self.binance.get_24h_ticker_data(self.top_pairs)
+                    if ticker_data:
+                        self.scan_scheduler.update_ticker(ticker_data)
+                    else:
+                        logger.warning("⚠️ Ticker 24h vazio; mantendo a atividade anterior dos pares")
+                pairs_to_scan = self.scan_scheduler.select(self.top_pairs)
+                logger.info("🎯 %d/%d pares devidos neste ciclo", len(pairs_to_scan), len(self.top_pairs))
             
             # Processamento paralelo com ThreadPoolExecutor
             signals = []
             analyzed_pairs = []
             rejected_pairs = []
-            max_workers = min(10, len(self.top_pairs))  # Máximo 10 threads
+            max_workers = max(1, min(10, len(pairs_to_scan)))  # Máximo 10 threads
             
             with ThreadPoolExecutor(max_workers=max_workers) as executor:
                 # Submeter todas as análises para execução paralela
                 future_to_symbol = {
                     executor.submit(self._analyze_symbol_safe, symbol): symbol 
-                    for symbol in self.top_pairs
+                    for symbol in pairs_to_scan
                 }
                 
                 # Processar resultados conforme completam
@@ -362,62 +403,60 @@ class TechnicalAnalysis:
                         
                         if signal:
                             # Sinal foi enviado para confirmação BTC
-                            print(f"⏳ PRÉ-SINAL DETECTADO: {symbol} - {signal['type']} - Score: {signal['quality_score']:.1f} - Classe: {signal['signal_class']} (Aguardando confirmação BTC)")
+                            logger.info("⏳ PRÉ-SINAL DETECTADO: %s - %s - Score: %.1f - Classe: %s (Aguardando confirmação BTC)",
+                                        symbol, signal['type'], signal['quality_score'], signal['signal_class'])
                             # Não adicionar à lista de sinais - será processado pelo BTCSignalManager
                         else:
                             rejected_pairs.append(symbol)
                         
                         # Mostrar progresso a cada 25 pares
                         if completed % 25 == 0:
-                            print(f"📈 Progresso: {completed}/{len(self.top_pairs)} pares analisados ({(completed/len(self.top_pairs)*100):.1f}%)")
+                            logger.debug("📈 Progresso: %d/%d pares analisados (%.1f%%)",
+                                         completed, len(pairs_to_scan), completed / len(pairs_to_scan) * 100)
                             
                     except Exception as e:
-                        print(f"❌ Erro ao analisar {symbol}: {e}")
+                        logger.warning("❌ Erro ao analisar %s: %s", symbol, e, extra={'symbol': symbol})
                         rejected_pairs.append(symbol)
                         continue
             
             # Estatísticas finais
             scan_duration = time.time() - scan_start_time
+            STAGE_SECONDS.observe(scan_duration, 'scan')
             cache_stats = self.cache_manager.get_performance_stats()
-            
-            print(f"\n{'='*80}")
-            print(f"📊 RESULTADO DO ESCANEAMENTO")
-            print(f"{'='*80}")
-            print(f"⏱️ Tempo total: {scan_duration:.2f}s")
-            print(f"📊 Pares analisados: {len(analyzed_pairs)}/{len(self.top_pairs)}")
-            print(f"✨ Sinais encontrados: {len(signals)}")
-            print(f"❌ Pares rejeitados: {len(rejected_pairs)}")
-            print(f"⚡ Threads utilizadas: {max_workers}")
-            print(f"🗄️ Cache Hit Rate: {cache_stats['cache_hit_rate']:.1f}%")
-            print(f"💾 API Calls Saved: {cache_stats['api_calls_saved']}")
-            print(f"🚀 Performance: {len(self.top_pairs)/scan_duration:.1f} pares/segundo")
+            if adaptive:
+                self.scan_scheduler.finish_cycle(self._scan_lane_weight() - weight_before)
+            
+            logger.info(
+                "📊 RESULTADO DO ESCANEAMENTO: ⏱️ %.2fs | 📊 %d/%d pares analisados | ✨ %d sinais | "
+                "❌ %d rejeitados | ⚡ %d threads | 🗄️ Cache Hit Rate %.1f%% | 💾 API Calls Saved %s | 🚀 %.1f pares/s",
+                scan_duration, len(analyzed_pairs), len(pairs_to_scan), len(signals), len(rejected_pairs),
+                max_workers, cache_stats['cache_hit_rate'], cache_stats['api_calls_saved'],
+                len(pairs_to_scan) / scan_duration
+            )
             
             # Obter estatísticas do BTCSignalManager
             btc_stats = self.btc_signal_manager.get_confirmation_metrics()
             
-            print(f"\n🎯 ESTATÍSTICAS BTC:")
-            print(f"   ⏳ Sinais Pendentes: {btc_stats['pending_signals']}")
-            print(f"   ✅ Taxa Confirmação: {btc_stats['confirmation_rate']}%")
-            print(f"   ⏱️ Tempo Médio: {btc_stats['average_confirmation_time_minutes']:.1f}min")
-            
-            if not signals:
-                print(f"\n📭 Nenhum pré-sinal detectado neste ciclo")
-            
-            print(f"{'='*80}\n")
+            logger.info(
+                "🎯 ESTATÍSTICAS BTC: ⏳ %s pendentes | ✅ Taxa Confirmação %s%% | ⏱️ Tempo Médio %.1fmin",
+                btc_stats['pending_signals'], btc_stats['confirmation_rate'],
+                btc_stats['average_confirmation_time_minutes']
+            )
             
             return signals
             
         except Exception as e:
-            print(f"❌ Erro na varredura paralela: {e}")
-            traceback.print_exc()
+            logger.exception("❌ Erro na varredura paralela: %s", e)
             return []
     
     def _analyze_symbol_safe(self, symbol: str) -> Optional[Dict[str, Any]]:
         """Versão thread-safe do analyze_symbol para processamento paralelo"""
         try:
-            return self.analyze_symbol(symbol)
+            # Threads do pool não herdam a faixa da thread que submeteu
+            with request_lane('scan'):
+                return self.analyze_symbol(symbol)
         except Exception as e:
-            print(f"❌ Erro thread-safe ao analisar {symbol}: {e}")
+            logger.warning("❌ Erro thread-safe ao analisar %s: %s", symbol, e, extra={'symbol': symbol})
             return None
     
     def analyze_symbol(self, symbol: str) -> Optional[Dict[str, Any]]:
@@ -449,10 +488,12 @@ class TechnicalAnalysis:
             )
             
             quality_score = sum(scores.values())
+            self.scan_scheduler.record_score(symbol, quality_score, entry_analysis.get('atr_ratio'))
             
             # 4.5. Sistema de ranking removido - todas as moedas são elegíveis
             # Mantendo apenas a pontuação base da análise técnica
-            print(f"   📊 {symbol}: Pontuação base: {quality_score:.1f} pts (sem filtro de ranking)")
+            logger.info("   📊 %s: Pontuação base: %.1f pts (sem filtro de ranking)", symbol, quality_score,
+                        extra={'symbol': symbol})
             
             # 5. Filtro de qualidade básico (AJUSTADO PARA EQUILIBRIO)
             if quality_score < 65.0:  # Threshold ajustado para 65 pontos
@@ -521,7 +562,7 @@ class TechnicalAnalysis:
             return None
             
         except Exception as e:
-            print(f"❌ Erro ao analisar {symbol}: {e}")
+            logger.warning("❌ Erro ao analisar %s: %s", symbol, e, extra={'symbol': symbol})
             return None
     
     def _capture_generation_reasons(self, symbol: str, signal_type: str, scores: Dict[str, float],
@@ -620,7 +661,7 @@ class TechnicalAnalysis:
             }
             
         except Exception as e:
-            print(f"❌ Erro ao capturar motivos de geração: {e}")
+            logger.warning("❌ Erro ao capturar motivos de geração: %s", e)
             return {
                 'timestamp': datetime.now(),
                 'error': str(e),
@@ -667,6 +708,7 @@ class TechnicalAnalysis:
         else:
             return 'Americana'
     
+    @timed(STAGE_SECONDS, 'scoring')
     def _calculate_signal_scores(self, trend_analysis: Dict, entry_analysis: Dict, 
                            signal_type: str, entry_df: pd.DataFrame) -> Dict[str, float]:
         """Calcula pontuação detalhada do sinal (100 pontos total - sem BTC)"""
@@ -820,13 +862,14 @@ class TechnicalAnalysis:
             return target_price
             
         except Exception as e:
-            print(f"❌ Erro no cálculo do alvo: {e}")
+            logger.warning("❌ Erro no cálculo do alvo: %s", e)
             # Fallback para 6% mínimo
             if signal_type == 'COMPRA':
                 return entry_price * 1.06
             else:
                 return entry_price * 0.94
 
+    @timed(STAGE_SECONDS, 'support_resistance')
     def calculate_support_resistance_levels(self, df: pd.DataFrame, current_price: float) -> Dict[str, float]:
         """Calcula níveis de suporte e resistência"""
         try:
@@ -891,7 +934,7 @@ class TechnicalAnalysis:
             }
                 
         except Exception as e:
-            print(f"❌ Erro ao calcular suporte/resistência: {e}")
+            logger.warning("❌ Erro ao calcular suporte/resistência: %s", e)
             return {
                 'support': current_price * 0.98,
                 'resistance': current_price * 1.02,
@@ -940,9 +983,10 @@ class TechnicalAnalysis:
                 return None
             
         except Exception as e:
-            print(f"❌ Erro ao obter klines para {symbol}: {e}")
+            logger.warning("❌ Erro ao obter klines para %s: %s", symbol, e, extra={'symbol': symbol})
             return None
     
+    @timed(STAGE_SECONDS, 'trend_indicators')
     def analyze_trend_df(self, df: pd.DataFrame) -> Optional[Dict]:
         """Analisa tendência do DataFrame"""
         try:
@@ -982,9 +1026,10 @@ class TechnicalAnalysis:
             }
             
         except Exception as e:
-            print(f"❌ Erro na análise de tendência: {e}")
+            logger.warning("❌ Erro na análise de tendência: %s", e)
             return None
     
+    @timed(STAGE_SECONDS, 'entry_indicators')
     def analyze_entry_df(self, df: pd.DataFrame) -> Dict[str, Any]:
         """Analisa condições de entrada no timeframe menor"""
         try:
@@ -1029,7 +1074,7 @@ class TechnicalAnalysis:
             }
             
         except Exception as e:
-            print(f"❌ Erro na análise de entrada: {e}")
+            logger.warning("❌ Erro na análise de entrada: %s", e)
             return {
                 'is_uptrend': False,
                 'is_downtrend': False,
@@ -1,14 +1,207 @@
 import requests
 import json
 import os
-from typing import Optional
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime
+from requests.adapters import HTTPAdapter
 from .database import Database
 
+# Limite de caracteres por mensagem da API do Telegram
+TELEGRAM_MAX_MESSAGE_LENGTH = 4096
+
+
+class TelegramDeliveryQueue:
+    """
+    Fila de entrega em background para o Telegram
+    
+    Mensagens enfileiradas em rajada (ex.: várias confirmações no mesmo ciclo)
+    são agrupadas em um único envio. Falhas temporárias (rede, 5xx, 429) são
+    reenviadas com backoff exponencial sem bloquear quem enfileirou.
+    """
+    
+    def __init__(self, notifier: 'TelegramNotifier', max_size: int = 200, coalesce_window: float = 2.0,
+                 max_batch: int = 10, max_retries: int = 4, backoff_base: float = 1.0):
+        """
+        Args:
+            notifier: TelegramNotifier usado para o envio HTTP
+            max_size: Capacidade da fila (mensagens mais antigas são descartadas quando cheia)
+            coalesce_window: Tempo (s) aguardando mais mensagens antes de enviar um lote
+            max_batch: Máximo de mensagens por lote
+            max_retries: Tentativas extras por lote
+            backoff_base: Espera inicial (s) entre tentativas, dobrada a cada falha
+        """
+        self.notifier = notifier
+        self.coalesce_window = coalesce_window
+        self.max_batch = max_batch
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        
+        self._queue: 'queue.Queue[Tuple[float, str]]' = queue.Queue(maxsize=max_size)
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._lock = threading.Lock()
+        
+        self.metrics = {
+            'enqueued': 0,
+            'dropped': 0,
+            'delivered_messages': 0,
+            'delivered_batches': 0,
+            'failed_messages': 0,
+            'retries': 0,
+            'latency_ms_total': 0.0,
+            'max_latency_ms': 0.0,
+            'last_error': None
+        }
+    
+    def start(self) -> None:
+        """Inicia a thread de entrega (idempotente)"""
+        with self._lock:
+            if self._running and self._thread and self._thread.is_alive():
+                return
+            self._running = True
+            self._thread = threading.Thread(target=self._worker, name='telegram-delivery', daemon=True)
+            self._thread.start()
+    
+    def stop(self, timeout: float = 10.0) -> None:
+        """Para a thread após entregar o que já está na fila"""
+        self._running = False
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=timeout)
+    
+    def enqueue(self, message: str) -> bool:
+        """
+        Enfileira uma mensagem sem bloquear
+        
+        Args:
+            message: Texto HTML da mensagem
+            
+        Returns:
+            bool: True se enfileirada
+        """
+        self.start()
+        item = (time.time(), message)
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            # Fila cheia: descarta a mais antiga para manter as notificações recentes
+            try:
+                self._queue.get_nowait()
+                self.metrics['dropped'] += 1
+            except queue.Empty:
+                pass
+            try:
+                self._queue.put_nowait(item)
+            except queue.Full:
+                self.metrics['dropped'] += 1
+                return False
+        self.metrics['enqueued'] += 1
+        return True
+    
+    def _next_batch(self) -> List[Tuple[float, str]]:
+        try:
+            batch = [self._queue.get(timeout=0.5)]
+        except queue.Empty:
+            return []
+        
+        # Janela de agrupamento a partir da primeira mensagem
+        deadline = time.time() + self.coalesce_window
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+    
+    @staticmethod
+    def _build_chunks(batch: List[Tuple[float, str]]) -> List[Tuple[str, List[Tuple[float, str]]]]:
+        """
+        Junta as mensagens respeitando o limite de tamanho do Telegram
+        
+        Returns:
+            Lista de (texto do envio, itens do lote contidos nele)
+        """
+        chunks, text, items = [], '', []
+        for item in batch:
+            message = item[1]
+            candidate = f"{text}\n\n{message}" if text else message
+            if len(candidate) > TELEGRAM_MAX_MESSAGE_LENGTH and text:
+                chunks.append((text, items))
+                candidate, items = message, []
+            text = candidate
+            items.append(item)
+        if text:
+            chunks.append((text, items))
+        return chunks
+    
+    def _deliver(self, text: str) -> bool:
+        for attempt in range(self.max_retries + 1):
+            ok, retryable, retry_after = self.notifier._post_message(text)
+            if ok:
+                return True
+            if not retryable or attempt == self.max_retries:
+                return False
+            self.metrics['retries'] += 1
+            time.sleep(retry_after if retry_after is not None else self.backoff_base * (2 ** attempt))
+        return False
+    
+    def _worker(self) -> None:
+        while self._running or not self._queue.empty():
+            batch = self._next_batch()
+            if not batch:
+                continue
+            
+            # Cada envio é contabilizado separadamente: a falha de um não descarta os demais
+            delivered, failed = 0, 0
+            for text, items in self._build_chunks(batch):
+                if not self._deliver(text):
+                    failed += len(items)
+                    continue
+                delivered += len(items)
+                now = time.time()
+                for enqueued_at, _ in items:
+                    latency_ms = (now - enqueued_at) * 1000
+                    self.metrics['latency_ms_total'] += latency_ms
+                    self.metrics['max_latency_ms'] = max(self.metrics['max_latency_ms'], round(latency_ms, 1))
+            
+            self.metrics['delivered_messages'] += delivered
+            self.metrics['failed_messages'] += failed
+            if delivered:
+                self.metrics['delivered_batches'] += 1
+            if failed:
+                print(f"❌ Telegram: {failed} de {len(batch)} notificações do lote não foram entregues")
+            elif len(batch) > 1:
+                print(f"📤 Telegram: {len(batch)} notificações entregues em um lote")
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """Retorna profundidade da fila e latência de entrega"""
+        delivered = self.metrics['delivered_messages']
+        return {
+            **self.metrics,
+            'queue_depth': self._queue.qsize(),
+            'running': bool(self._thread and self._thread.is_alive()),
+            'avg_latency_ms': round(self.metrics['latency_ms_total'] / delivered, 1) if delivered else 0.0,
+            'latency_ms_total': round(self.metrics['latency_ms_total'], 1)
+        }
+
+
 class TelegramNotifier:
+    # (connect, read) em segundos: um Telegram lento nunca trava quem chama
+    REQUEST_TIMEOUT = (3.05, 10)
+    
     def __init__(self, token: Optional[str] = None, chat_id: Optional[str] = None):
         self.db = Database()
         
+        # Sessão com pool de conexões reutilizada por todos os envios
+        self.session = requests.Session()
+        self.session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=4))
+        self.delivery_queue = TelegramDeliveryQueue(self)
+        
         # Tentar obter configurações do banco, usar variáveis de ambiente como fallback
         try:
             self.token = token or self.db.get_config_value('telegram_token') or os.getenv('TELEGRAM_TOKEN')
@@ -40,38 +233,79 @@ class TelegramNotifier:
             print(f"❌ Erro ao configurar credenciais: {e}")
             return False
     
+    def _post_message(self, message: str) -> Tuple[bool, bool, Optional[float]]:
+        """
+        Faz o POST em sendMessage
+        
+        Returns:
+            Tuple (enviada, pode_tentar_novamente, retry_after em segundos)
+        """
+        url = f"{self.base_url}/sendMessage"
+        data = {
+            "chat_id": self.chat_id,
+            "text": message,
+            "parse_mode": "HTML"
+        }
+        
+        try:
+            response = self.session.post(url, json=data, timeout=self.REQUEST_TIMEOUT)
+        except requests.RequestException as e:
+            self.delivery_queue.metrics['last_error'] = str(e)
+            print(f"❌ Erro ao enviar mensagem: {e}")
+            return False, True, None
+        
+        if response.status_code == 200:
+            return True, False, None
+        
+        self.delivery_queue.metrics['last_error'] = f"HTTP {response.status_code}"
+        print(f"❌ Erro ao enviar mensagem. Status code: {response.status_code}")
+        print(f"Resposta: {response.text}")
+        
+        if response.status_code == 429:
+            try:
+                retry_after = float(response.json().get('parameters', {}).get('retry_after', 1))
+            except (ValueError, AttributeError):
+                retry_after = 1.0
+            return False, True, retry_after
+        return False, response.status_code >= 500, None
+    
     def send_message(self, message: str) -> bool:
-        """Envia mensagem para o Telegram"""
+        """Envia mensagem para o Telegram (síncrono, com timeout)"""
         try:
             if not self.token or not self.chat_id:
                 print("❌ Token ou Chat ID não configurados")
                 return False
-                
-            url = f"{self.base_url}/sendMessage"
-            data = {
-                "chat_id": self.chat_id,
-                "text": message,
-                "parse_mode": "HTML"
-            }
             
             print(f"📤 Tentando enviar mensagem para {self.chat_id}")
-            response = requests.post(url, json=data)
+            sent, _, _ = self._post_message(message)
             
-            if response.status_code == 200:
+            if sent:
                 print("✅ Mensagem enviada com sucesso")
-                return True
-            else:
-                print(f"❌ Erro ao enviar mensagem. Status code: {response.status_code}")
-                print(f"Resposta: {response.text}")
-                return False
+            return sent
             
         except Exception as e:
             print(f"❌ Erro ao enviar mensagem: {e}")
             return False
+    
+    def enqueue_message(self, message: str) -> bool:
+        """Enfileira mensagem para entrega em background (não bloqueia)"""
+        if not self.token or not self.chat_id:
+            print("❌ Token ou Chat ID não configurados")
+            return False
+        return self.delivery_queue.enqueue(message)
+    
+    def get_delivery_metrics(self) -> Dict[str, Any]:
+        """Métricas da fila de entrega (profundidade, latência, falhas)"""
+        return self.delivery_queue.get_metrics()
 
     def send_signal(self, symbol, signal_type, price, quality_score, timeframe='4h', tp_price=None,
-                trend_score=0.0, confirmation_score=0.0, rsi_score=0.0, pattern_score=0.0):
-        """Envia sinal para o Telegram no formato simplificado solicitado"""
+                trend_score=0.0, confirmation_score=0.0, rsi_score=0.0, pattern_score=0.0, wait=False):
+        """
+        Envia sinal para o Telegram no formato simplificado solicitado
+        
+        Por padrão a mensagem vai para a fila de entrega em background; use
+        wait=True para envio síncrono.
+        """
         try:
             # Garantir que quality_score seja numérico
             try:
@@ -142,7 +376,7 @@ class TelegramNotifier:
                 f"🕒{current_time}"
             )
     
-            return self.send_message(message)
+            return self.send_message(message) if wait else self.enqueue_message(message)
     
         except Exception as e:
             print(f"❌ Erro ao enviar sinal: {e}")
@@ -0,0 +1,265 @@
+# -*- coding: utf-8 -*-
+"""
+Sistema de Compactação de Tokens
+Remove tokens de autenticação expirados e tokens de redefinição de senha
+expirados/usados dos arquivos CSV, e mantém um índice em memória ordenado
+por expiração para que get_user_by_token não precise ler o CSV a cada requisição.
+"""
+
+import bisect
+import os
+import threading
+import time
+import traceback
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+# Lock compartilhado para leituras/escritas dos arquivos de tokens
+tokens_file_lock = threading.RLock()
+
+# Sentinela maior que qualquer token, usada nas buscas binárias por expiração
+_MAX_TOKEN = chr(0x10FFFF)
+
+
+class AuthTokenIndex:
+    """Índice em memória do auth_tokens.csv, ordenado por data de expiração"""
+
+    def __init__(self, tokens_file: str):
+        self.tokens_file = tokens_file
+        self._lock = threading.RLock()
+
+        # token -> (user_id, expires_at)
+        self._tokens: Dict[str, Tuple[str, datetime]] = {}
+        # Lista ordenada de (expires_at, token) para poda e contagem rápidas
+        self._by_expiry: List[Tuple[datetime, str]] = []
+        # Assinatura do arquivo (mtime, tamanho, inode) usada para detectar alterações feitas
+        # fora do Database; as escritas do Database chamam invalidate() explicitamente
+        self._file_signature: Optional[Tuple[int, int, int]] = None
+        self._stale = True
+
+        # Métricas de consulta
+        self._latencies_ms = deque(maxlen=1000)
+        self.lookups = 0
+        self.hits = 0
+        self.reloads = 0
+        self.last_reload: Optional[datetime] = None
+
+    def _get_file_signature(self) -> Optional[Tuple[int, int, int]]:
+        """Retorna (mtime_ns, tamanho, inode) do arquivo ou None se não existir"""
+        try:
+            stat = os.stat(self.tokens_file)
+            return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        except OSError:
+            return None
+
+    def _reload_if_changed(self) -> None:
+        """Recarrega o índice se o CSV foi alterado desde a última leitura"""
+        if not self._stale and self._get_file_signature() == self._file_signature:
+            return
+
+        tokens: Dict[str, Tuple[str, datetime]] = {}
+        with tokens_file_lock:
+            # Limpa a marca antes de ler: uma escrita posterior volta a invalidar o índice
+            self._stale = False
+            signature = self._get_file_signature()
+            try:
+                df = (pd.read_csv(self.tokens_file, dtype={'token': str, 'user_id': str})
+                      if signature is not None else None)
+            except pd.errors.EmptyDataError:
+                df = None
+
+        if df is not None and not df.empty:
+            expires = pd.to_datetime(df['expires_at'], errors='coerce')
+            for token, user_id, expires_at in zip(df['token'], df['user_id'], expires):
+                if pd.isna(token) or pd.isna(expires_at):
+                    continue
+                expires_dt = expires_at.to_pydatetime().replace(tzinfo=None)
+                current = tokens.get(token)
+                if current is None or current[1] < expires_dt:
+                    tokens[token] = (str(user_id), expires_dt)
+
+        self._tokens = tokens
+        self._by_expiry = sorted((expires_at, token) for token, (_, expires_at) in tokens.items())
+        self._file_signature = signature
+        self.reloads += 1
+        self.last_reload = datetime.now()
+
+    def lookup(self, token: str) -> Optional[str]:
+        """Retorna o user_id de um token válido (não expirado) ou None"""
+        start = time.perf_counter()
+        try:
+            with self._lock:
+                self._reload_if_changed()
+                entry = self._tokens.get(token)
+                user_id = None
+                if entry is not None and entry[1] > datetime.now():
+                    user_id = entry[0]
+
+                self.lookups += 1
+                if user_id is not None:
+                    self.hits += 1
+                return user_id
+        finally:
+            self._latencies_ms.append((time.perf_counter() - start) * 1000)
+
+    def invalidate(self) -> None:
+        """
+        Força a releitura do CSV na próxima consulta
+
+        Sem adquirir self._lock: é chamada pelas escritas do Database com
+        tokens_file_lock já adquirido (lookup adquire os dois na ordem inversa).
+        """
+        self._stale = True
+
+    def prune_expired(self, now: Optional[datetime] = None) -> int:
+        """Remove do índice os tokens expirados (início da lista ordenada)"""
+        now = now or datetime.now()
+        with self._lock:
+            cut = bisect.bisect_right(self._by_expiry, (now, _MAX_TOKEN))
+            for expires_at, token in self._by_expiry[:cut]:
+                entry = self._tokens.get(token)
+                if entry is not None and entry[1] == expires_at:
+                    del self._tokens[token]
+            del self._by_expiry[:cut]
+            return cut
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna contagem de tokens e latência das consultas"""
+        with self._lock:
+            now = datetime.now()
+            expired = bisect.bisect_right(self._by_expiry, (now, _MAX_TOKEN))
+            latencies = sorted(self._latencies_ms)
+            next_expiry = self._by_expiry[expired][0] if expired < len(self._by_expiry) else None
+
+            return {
+                'indexed_tokens': len(self._tokens),
+                'valid_tokens': len(self._by_expiry) - expired,
+                'expired_tokens': expired,
+                'next_expiry': next_expiry.isoformat() if next_expiry else None,
+                'lookups': self.lookups,
+                'hits': self.hits,
+                'reloads': self.reloads,
+                'last_reload': self.last_reload.isoformat() if self.last_reload else None,
+                'lookup_latency_ms': {
+                    'samples': len(latencies),
+                    'avg': round(sum(latencies) / len(latencies), 4) if latencies else 0.0,
+                    'p95': round(latencies[int(len(latencies) * 0.95) - 1], 4) if latencies else 0.0,
+                    'max': round(latencies[-1], 4) if latencies else 0.0
+                }
+            }
+
+
+_indexes: Dict[str, AuthTokenIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_auth_token_index(tokens_file: str) -> AuthTokenIndex:
+    """Retorna o índice compartilhado para o arquivo de tokens informado"""
+    path = os.path.abspath(tokens_file)
+    with _indexes_lock:
+        index = _indexes.get(path)
+        if index is None:
+            index = AuthTokenIndex(path)
+            _indexes[path] = index
+        return index
+
+
+class TokenCompactor:
+    """Agendador que compacta periodicamente os arquivos de tokens"""
+
+    def __init__(self, interval: Optional[int] = None):
+        self.interval = interval or int(os.getenv('TOKEN_COMPACTION_INTERVAL', '900'))  # 15 minutos
+        self.is_running = False
+        self.compaction_thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self.db = None
+
+        self.runs = 0
+        self.last_run: Optional[datetime] = None
+        self.last_report: Dict[str, Any] = {}
+
+        print("🔑 Sistema de Compactação de Tokens inicializado")
+
+    def run_compaction(self) -> Dict[str, Any]:
+        """Executa uma compactação completa dos arquivos de tokens"""
+        report: Dict[str, Any] = {}
+        if self.db is None:
+            return report
+
+        try:
+            start = time.perf_counter()
+            report['auth_tokens'] = self.db.compact_auth_tokens()
+            report['auth_tokens']['duration_ms'] = round((time.perf_counter() - start) * 1000, 2)
+
+            start = time.perf_counter()
+            report['password_reset_tokens'] = self.db.compact_password_reset_tokens()
+            report['password_reset_tokens']['duration_ms'] = round((time.perf_counter() - start) * 1000, 2)
+
+            get_auth_token_index(self.db.auth_tokens_file).prune_expired()
+
+            self.runs += 1
+            self.last_run = datetime.now()
+            report['finished_at'] = self.last_run.isoformat()
+            self.last_report = report
+
+            removed = report['auth_tokens']['removed'] + report['password_reset_tokens']['removed']
+            if removed:
+                print(f"🔑 Compactação de tokens: {removed} tokens removidos "
+                      f"({report['auth_tokens']['removed']} auth, {report['password_reset_tokens']['removed']} reset)")
+
+        except Exception as e:
+            print(f"❌ Erro na compactação de tokens: {e}")
+            traceback.print_exc()
+
+        return report
+
+    def start_scheduler(self, db) -> None:
+        """Inicia a compactação periódica em thread separada"""
+        if self.is_running:
+            print("⚠️ Compactação de tokens já está rodando")
+            return
+
+        self.db = db
+        self.is_running = True
+        self._stop_event.clear()
+
+        def run_scheduler():
+            while self.is_running:
+                self.run_compaction()
+                if self._stop_event.wait(self.interval):
+                    break
+
+        self.compaction_thread = threading.Thread(target=run_scheduler, daemon=True)
+        self.compaction_thread.start()
+
+        print(f"✅ Compactação de tokens ativa (intervalo: {self.interval}s)")
+
+    def stop_scheduler(self) -> None:
+        """Para a compactação periódica"""
+        self.is_running = False
+        self._stop_event.set()
+
+        if self.compaction_thread and self.compaction_thread.is_alive():
+            self.compaction_thread.join(timeout=5)
+
+        print("🛑 Compactação de tokens parada")
+
+    def get_status(self, db=None) -> Dict[str, Any]:
+        """Retorna status da compactação e estatísticas do índice de tokens"""
+        db = db or self.db
+        return {
+            'is_running': self.is_running,
+            'thread_active': self.compaction_thread.is_alive() if self.compaction_thread else False,
+            'interval_seconds': self.interval,
+            'runs': self.runs,
+            'last_run': self.last_run.isoformat() if self.last_run else None,
+            'last_report': self.last_report,
+            'auth_token_index': get_auth_token_index(db.auth_tokens_file).get_stats() if db else None
+        }
+
+
+# Instância global para uso em outros módulos
+token_compactor = TokenCompactor()
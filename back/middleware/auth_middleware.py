@@ -26,29 +26,57 @@ def jwt_required(f):
         if not token:
             return jsonify({'message': 'Token de autenticação ausente.'}), 401
 
-        try:
-            # Usar o sistema de tokens do banco de dados
-            bot_instance: Any = getattr(current_app, 'bot_instance', None)
-            if not bot_instance:
-                return jsonify({'message': 'Sistema não inicializado.'}), 500
-            
-            # Verificar token no banco de dados
-            user_data = bot_instance.db.get_user_by_token(token)
-            
-            if not user_data:
-                current_app.logger.warning("Token inválido ou expirado.")
-                return jsonify({'message': 'Token inválido ou expirado.'}), 403
-            
-            current_app.logger.debug(f"Token validado com sucesso para usuário: {user_data.get('username')}")
-            
-            # Armazenar os dados do usuário no objeto 'g' do Flask
-            g.user_data = user_data
-            
-            return f(*args, **kwargs)
+        return _authenticate(token, f, *args, **kwargs)
+
+    return decorated_function
+
+
+def _authenticate(token: str, f, *args, **kwargs):
+    """Valida o token no banco de dados e executa a rota com o usuário em 'g'"""
+    try:
+        # Usar o sistema de tokens do banco de dados
+        bot_instance: Any = getattr(current_app, 'bot_instance', None)
+        if not bot_instance:
+            return jsonify({'message': 'Sistema não inicializado.'}), 500
+
+        # Verificar token no banco de dados
+        user_data = bot_instance.db.get_user_by_token(token)
+
+        if not user_data:
+            current_app.logger.warning("Token inválido ou expirado.")
+            return jsonify({'message': 'Token inválido ou expirado.'}), 403
+
+        current_app.logger.debug(f"Token validado com sucesso para usuário: {user_data.get('username')}")
+
+        # Armazenar os dados do usuário no objeto 'g' do Flask
+        g.user_data = user_data
+
+        return f(*args, **kwargs)
+
+    except Exception as e:
+        current_app.logger.error(f"Erro na verificação do token: {str(e)}", exc_info=True)
+        return jsonify({'message': 'Erro interno na verificação do token.'}), 500
+
+
+def sse_jwt_required(f):
+    """
+    Decorador de autenticação para streams SSE
+
+    EventSource não envia cabeçalhos, então além de 'Authorization: Bearer' o
+    token é aceito no parâmetro de query 'token' e validado como no jwt_required.
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        auth_header = request.headers.get('Authorization')
+        if auth_header and auth_header.startswith('Bearer '):
+            token = auth_header.split(' ')[1]
+        else:
+            token = request.args.get('token')
+
+        if not token or token.lower() == 'null' or token.strip() == '':
+            return jsonify({'message': 'Token de autenticação ausente.'}), 401
 
-        except Exception as e:
-            current_app.logger.error(f"Erro na verificação do token: {str(e)}", exc_info=True)
-            return jsonify({'message': 'Erro interno na verificação do token.'}), 500
+        return _authenticate(token, f, *args, **kwargs)
 
     return decorated_function
 
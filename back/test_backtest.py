@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste do Backtest Vetorizado
+Compara, em instantes sorteados, o que o backtest calcula com o que os métodos
+ao vivo (analyze_trend_df, analyze_entry_df, _calculate_signal_scores,
+calculate_target_price e _check_signal_confirmation) calculam sobre as mesmas
+janelas de klines, e mede um ano x 100 pares sintéticos
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytz
+
+from benchmarks.synthetic import build_signal_manager, synthetic_history
+from core.backtest import (
+    BTC_BEARISH, BTC_BULLISH, SIGNAL_CLASSES, H4_MS, MarketHistory, compute_features, format_report, run_backtest
+)
+from core.btc_correlation_analyzer import BTCCorrelationAnalyzer
+from core.technical_analysis import TechnicalAnalysis
+
+WINDOW = 100
+
+
+def _frame(candles, rows, col):
+    return pd.DataFrame({name: candles[name][rows, col] for name in ('open', 'high', 'low', 'close', 'volume')})
+
+
+def _live_windows(history: MarketHistory, row: int, col: int, candles=None):
+    """Janelas 1h e 4h (última vela 4h em formação) como o get_klines ao vivo devolveria"""
+    candles = candles or history.candles
+    listed = np.flatnonzero(~np.isnan(candles['close'][:row + 1, col]))
+    first = listed[0]
+    entry_df = _frame(candles, np.arange(max(first, row - WINDOW + 1), row + 1), col)
+
+    rows = np.arange(first, row + 1)
+    bucket = history.open_time[rows] // H4_MS
+    grouped = _frame(candles, rows, col).groupby(bucket)
+    trend_df = pd.DataFrame({
+        'open': grouped['open'].first(), 'high': grouped['high'].max(), 'low': grouped['low'].min(),
+        'close': grouped['close'].last(), 'volume': grouped['volume'].sum()
+    }).tail(WINDOW).reset_index(drop=True)
+    return entry_df, trend_df
+
+
+class HistoryClient:
+    """Cliente Binance que responde com o histórico até uma linha da grade"""
+
+    def __init__(self, history: MarketHistory):
+        self.history = history
+        self.row = 0
+
+    def get_klines(self, symbol, interval='1h', limit=100):
+        if symbol == 'BTCUSDT':
+            entry_df, trend_df = _live_windows(self.history, self.row, 0, self.history.btc)
+        else:
+            entry_df, trend_df = _live_windows(self.history, self.row, self.history.symbols.index(symbol))
+        df = (trend_df if interval == '4h' else entry_df).tail(limit)
+        return df.to_dict(orient='records')
+
+    def get_24h_ticker_data(self, symbols):
+        return {symbol: {'volume': 1.0, 'priceChangePercent': 0.0} for symbol in symbols}
+
+
+def test_scoring_parity() -> bool:
+    """Testa que pontuação e alvo do backtest batem com os métodos ao vivo"""
+    print("🔍 === TESTE DE PARIDADE DA PONTUAÇÃO ===")
+
+    history = synthetic_history(pairs=12, hours=1200, seed=5)
+    features = compute_features(history, window=WINDOW)
+
+    analyzer = TechnicalAnalysis.__new__(TechnicalAnalysis)
+    analyzer.config = {'target_percentage_min': 6.0}
+
+    rng = np.random.default_rng(1)
+    valid_rows, valid_cols = np.nonzero(features['valid'])
+    sample = rng.choice(len(valid_rows), 60, replace=False)
+    for i in sample:
+        row, col = int(valid_rows[i]), int(valid_cols[i])
+        entry_df, trend_df = _live_windows(history, row, col)
+        trend = analyzer.analyze_trend_df(trend_df)
+        entry = analyzer.analyze_entry_df(entry_df)
+        signal_type = 'COMPRA' if trend['is_uptrend'] else 'VENDA'
+        scores = analyzer._calculate_signal_scores(trend, entry, signal_type, entry_df)
+        quality = sum(scores.values())
+        target = analyzer.calculate_target_price(float(entry_df['close'].iloc[-1]), signal_type, trend, entry, quality)
+
+        assert features['is_buy'][row, col] == trend['is_uptrend'], (row, col)
+        for name, key in (('trend_score', 'trend'), ('entry_score', 'entry'),
+                          ('rsi_score', 'rsi'), ('pattern_score', 'pattern')):
+            assert abs(features[name][row, col] - scores[key]) < 1e-6, (row, col, name, scores)
+        assert abs(features['quality_score'][row, col] - quality) < 1e-6
+        assert abs(features['target_price'][row, col] - target) / target < 1e-9
+        assert SIGNAL_CLASSES[features['signal_class'][row, col]] == analyzer._get_signal_classification(quality)
+
+    print(f"   ✅ {len(sample)} instantes idênticos (tendência, entrada, RSI, padrões, alvo e classe)")
+    return True
+
+
+def test_confirmation_parity() -> bool:
+    """Testa que as verificações de confirmação vetorizadas batem com _check_signal_confirmation"""
+    print("\n₿ === TESTE DE PARIDADE DA CONFIRMAÇÃO ===")
+
+    history = synthetic_history(pairs=12, hours=1200, seed=9)
+    features = compute_features(history, window=WINDOW)
+    report = run_backtest(features, return_events=True)
+    events = report['events']
+
+    client = HistoryClient(history)
+    manager = build_signal_manager(client)
+    manager.btc_analyzer = BTCCorrelationAnalyzer(client)
+    now_sp = datetime.now(pytz.timezone('America/Sao_Paulo'))
+
+    btc_directional = 0
+    sample = events.sample(40, random_state=3)
+    for _, event in sample.iterrows():
+        row = int(np.searchsorted(history.open_time, event['open_time']))
+        client.row = row + 1
+        manager.btc_analyzer.btc_cache.update({'current_analysis': None, 'last_update': 0,
+                                               'analysis_4h': None, 'analysis_1h': None})
+        signal = {
+            'id': 'x', 'symbol': event['symbol'], 'type': event['type'], 'entry_price': event['entry_price'],
+            'quality_score': event['quality_score'], 'signal_class': event['signal_class'],
+            'created_at': now_sp, 'expires_at': now_sp + timedelta(hours=4), 'confirmation_attempts': 0,
+            'confirmation_checks': []
+        }
+        result = manager._check_signal_confirmation(signal)
+        expected = {'confirm': 'confirmed', 'reject': 'rejected', 'wait': 'expired'}[result['action']]
+        assert expected == event['decision'], (event.to_dict(), result)
+        btc_directional += features['btc_trend'][row + 1] in (BTC_BULLISH, BTC_BEARISH)
+
+    decisions = events['decision'].value_counts().to_dict()
+    print(f"   ✅ {len(sample)} decisões idênticas ({btc_directional} com BTC direcional); amostra total: {decisions}")
+    return True
+
+
+def test_year_of_100_pairs() -> bool:
+    """Mede um ano de velas 1h x 100 pares e a reavaliação com outros limites"""
+    print("\n⏱️ === TESTE DE DESEMPENHO (1 ano x 100 pares) ===")
+
+    start = time.time()
+    history = synthetic_history(pairs=100, hours=365 * 24)
+    features = compute_features(history)
+    features_s = time.time() - start
+    report = run_backtest(features)
+    strict = run_backtest(features, {'quality_score_minimum': 75.0, 'min_breakout_percentage': 1.0})
+    total_s = time.time() - start
+
+    print(format_report(report))
+    assert report['overall']['signals'] > 0 and strict['pre_signals'] < report['pre_signals']
+    assert sum(row['signals'] for row in report['by_class'].values()) == report['overall']['signals']
+    assert total_s < 120, total_s
+    print(f"   ✅ Features em {features_s:.1f}s, cada reavaliação em ~{report['elapsed_ms']:.0f}ms "
+          f"(total {total_s:.1f}s)")
+    return True
+
+
+if __name__ == "__main__":
+    ok = test_scoring_parity() and test_confirmation_parity() and test_year_of_100_pairs()
+    print("\n✅ Todos os testes passaram!" if ok else "\n❌ Falhas nos testes")
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste da Suíte de Benchmarks do Pipeline de Varredura
+Roda a suíte em tamanho reduzido sobre o mercado sintético, valida o
+determinismo do transporte, a gravação/leitura de baseline e a detecção de
+regressões (limite global, limite por métrica, piso de ruído e código de saída)
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import shutil
+import tempfile
+
+from benchmarks.__main__ import main
+from benchmarks.suite import compare, load_baseline, run_suite, save_baseline
+from benchmarks.synthetic import SyntheticTransport
+
+WORK_DIR = tempfile.mkdtemp(prefix='benchmark_suite_')
+
+
+def test_synthetic_market() -> bool:
+    """Testa que o mercado sintético é determinístico e consistente entre limits"""
+    print("📊 === TESTE DO MERCADO SINTÉTICO ===")
+
+    first, second = SyntheticTransport(10), SyntheticTransport(10)
+    params = {'symbol': 'PAIR3USDT', 'interval': '1h', 'limit': 100}
+    assert first.request('/fapi/v1/klines', params=params) == second.request('/fapi/v1/klines', params=params)
+
+    # As últimas velas coincidem para qualquer limit (como na API real)
+    short = first.request('/fapi/v1/klines', params={**params, 'limit': 5})
+    assert [k[4] for k in short] == [k[4] for k in first.request('/fapi/v1/klines', params=params)[-5:]]
+
+    assert first.request('/fapi/v1/unknown') is None and first.stats['misses'] == 1
+    print("   ✅ Respostas determinísticas por requisição")
+    return True
+
+
+def test_suite_and_regressions() -> bool:
+    """Testa a suíte reduzida e a comparação com baseline"""
+    print("\n⏱️ === TESTE DA SUÍTE E DETECÇÃO DE REGRESSÕES ===")
+
+    results = run_suite(pairs_list=(10,), repeats=1)
+    expected = {'scan_cold_ms', 'scan_warm_ms', 'trend_per_pair_ms', 'entry_per_pair_ms', 'levels_per_pair_ms',
+                'klines_cache_op_ms', 'confirmation_cycle_ms', 'token_lookup_ms'}
+    assert set(results) == {f'{name}@10' for name in expected}, results
+    assert all(value > 0 for value in results.values())
+
+    path = save_baseline(os.path.join(WORK_DIR, 'baseline.json'), results, {'pairs': [10]},
+                         thresholds={'scan_cold_ms': 80.0})
+    baseline = load_baseline(path)
+    assert baseline['metrics'] == results and load_baseline(os.path.join(WORK_DIR, 'missing.json')) is None
+
+    assert not any(row['regressed'] for row in compare(results, baseline))
+
+    slower = dict(results)
+    slower['scan_warm_ms@10'] *= 1.5      # acima dos 25% padrão
+    slower['scan_cold_ms@10'] *= 1.5      # abaixo do limite próprio de 80%
+    slower['klines_cache_op_ms@10'] *= 2  # diferença absoluta abaixo do piso de ruído
+    regressed = {row['metric'] for row in compare(slower, baseline, threshold_pct=25) if row['regressed']}
+    assert regressed == {'scan_warm_ms@10'}, regressed
+
+    print(f"   ✅ {len(results)} métricas medidas; regressão detectada apenas em {sorted(regressed)}")
+    return True
+
+
+def test_cli_exit_codes() -> bool:
+    """Testa o código de saída da CLI contra baselines rápido e lento"""
+    print("\n🚦 === TESTE DA CLI ===")
+
+    path = os.path.join(WORK_DIR, 'cli.json')
+    args = ['--pairs', '5', '--repeats', '1', '--baseline', path]
+    assert main(args) == 0 and os.path.exists(path)  # sem baseline: grava
+
+    baseline = load_baseline(path)
+    fast = {name: value / 10 for name, value in baseline['metrics'].items()}
+    save_baseline(path, fast, baseline['config'])
+    assert main(args) == 1
+
+    save_baseline(path, {name: value * 10 for name, value in baseline['metrics'].items()}, baseline['config'])
+    assert main(args) == 0
+
+    print("   ✅ Saída 1 com regressão, 0 sem regressão")
+    return True
+
+
+if __name__ == "__main__":
+    try:
+        ok = test_synthetic_market() and test_suite_and_regressions() and test_cli_exit_codes()
+        print("\n✅ Todos os testes passaram!" if ok else "\n❌ Falhas nos testes")
+    finally:
+        shutil.rmtree(WORK_DIR, ignore_errors=True)
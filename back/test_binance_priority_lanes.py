@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste das Faixas de Prioridade do Limitador da Binance
+Valida a faixa por contexto de thread, a reserva de peso que a varredura não
+pode ocupar, a ordem de atendimento ao virar a janela (confirmation antes de
+scan) e as métricas de espera por faixa
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from core.binance_limiter import (DEFAULT_LANE, RequestWeightLimiter, binance_limiter, current_lane,
+                                  request_lane, set_request_lane)
+from core.metrics import metrics_registry
+from test_binance_shared_client import _client, _start_server
+
+WINDOW = 0.4
+
+
+def _align_window():
+    """Começa logo após o início de uma janela"""
+    time.sleep(WINDOW - time.time() % WINDOW + 0.01)
+
+
+def test_lane_context() -> bool:
+    """Testa faixa padrão, bloco aninhado, threads do pool e faixa inválida"""
+    print("🚦 === TESTE DA FAIXA POR CONTEXTO ===")
+
+    assert current_lane() == DEFAULT_LANE == 'monitoring'
+    with request_lane('scan'):
+        assert current_lane() == 'scan'
+        with request_lane('confirmation'):
+            assert current_lane() == 'confirmation'
+        assert current_lane() == 'scan'
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            assert executor.submit(current_lane).result() == DEFAULT_LANE  # não herda
+    assert current_lane() == DEFAULT_LANE
+
+    def dedicated_loop(result):
+        set_request_lane('housekeeping')
+        result.append(current_lane())
+
+    result = []
+    worker = threading.Thread(target=dedicated_loop, args=(result,))
+    worker.start()
+    worker.join()
+    assert result == ['housekeeping'] and current_lane() == DEFAULT_LANE
+
+    try:
+        request_lane('urgent').__enter__()
+        return False
+    except ValueError:
+        pass
+
+    print("   ✅ Faixa por thread/bloco; threads do pool começam na faixa padrão")
+    return True
+
+
+def test_reserved_headroom() -> bool:
+    """Testa que a varredura não ocupa a fatia reservada às confirmações"""
+    print("\n🛡️ === TESTE DA RESERVA DE PESO ===")
+
+    limiter = RequestWeightLimiter(weight_per_minute=10, window_seconds=WINDOW)
+    _align_window()
+    assert sum(limiter.acquire(1, 'scan') for _ in range(9)) == 0   # 90% da janela
+    assert limiter.acquire(1, 'confirmation') == 0                   # reserva livre para confirmação
+    assert limiter.acquire(1, 'scan') > 0.2                          # varredura espera a próxima janela
+
+    stats = limiter.get_stats()['lanes']
+    assert stats['scan']['requests'] == 10 and stats['scan']['waits'] == 1
+    assert stats['confirmation']['waits'] == 0
+
+    print(f"   ✅ Confirmação passou com a varredura no limite; scan esperou "
+          f"{stats['scan']['max_wait_ms']:.0f}ms")
+    return True
+
+
+def test_priority_order() -> bool:
+    """Testa que, com a janela esgotada, a confirmação é atendida antes das varreduras na fila"""
+    print("\n⏱️ === TESTE DA ORDEM DE ATENDIMENTO ===")
+
+    metrics_registry.enable()
+    metrics_registry.reset()
+    limiter = RequestWeightLimiter(weight_per_minute=4, window_seconds=WINDOW)
+    _align_window()
+    for _ in range(4):
+        limiter.acquire(1, 'confirmation')  # janela esgotada
+
+    waits = {'scan': [], 'housekeeping': [], 'confirmation': []}
+
+    def request(lane):
+        waited = limiter.acquire(1, lane)
+        waits[lane].append(waited)
+
+    threads = [threading.Thread(target=request, args=('scan',)) for _ in range(6)]
+    threads.append(threading.Thread(target=request, args=('housekeeping',)))
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)  # varreduras já na fila quando a confirmação chega
+    confirmation = threading.Thread(target=request, args=('confirmation',))
+    confirmation.start()
+    for thread in threads + [confirmation]:
+        thread.join()
+
+    # Próxima janela: confirmação + 2 scans (90% de 4 = 3,6); o resto vai para as seguintes
+    confirmation_wait = waits['confirmation'][0]
+    assert confirmation_wait < WINDOW, confirmation_wait
+    assert sum(1 for wait in waits['scan'] if wait < WINDOW) == 2, waits['scan']
+    assert waits['housekeeping'][0] > WINDOW * 2 - 0.05, waits  # menor faixa sai por último
+
+    rendered = metrics_registry.render()
+    assert 'binance_queue_wait_seconds_count{lane="confirmation"} 5' in rendered, rendered
+    assert 'binance_queue_wait_seconds_count{lane="scan"} 6' in rendered
+    metrics_registry.disable()
+
+    print(f"   ✅ Confirmação esperou {confirmation_wait * 1000:.0f}ms; "
+          f"scans {sorted(round(w * 1000) for w in waits['scan'])}ms; "
+          f"housekeeping {waits['housekeeping'][0] * 1000:.0f}ms")
+    return True
+
+
+def test_client_uses_lane(base_url: str) -> bool:
+    """Testa que BinanceClient.make_request contabiliza na faixa do contexto"""
+    print("\n🌐 === TESTE DO CLIENTE NA FAIXA DO CONTEXTO ===")
+
+    client = _client(base_url)
+    client._response_cache.clear()
+    before = binance_limiter.get_stats()['lanes']['confirmation']['requests']
+    with request_lane('confirmation'):
+        assert client.get_24h_ticker_data(['BTCUSDT'])
+    assert binance_limiter.get_stats()['lanes']['confirmation']['requests'] == before + 1
+
+    print("   ✅ Requisição contabilizada na faixa confirmation")
+    return True
+
+
+if __name__ == "__main__":
+    server, url = _start_server()
+    try:
+        ok = test_lane_context() and test_reserved_headroom() and test_priority_order() and test_client_uses_lane(url)
+        print("\n✅ Todos os testes passaram!" if ok else "\n❌ Falhas nos testes")
+    finally:
+        server.shutdown()
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste da Gravação/Reprodução de Tráfego da Binance
+Grava uma sessão de mercado sintética via BinanceRecorder, reproduz com
+ReplayBinanceClient e valida respostas idênticas, sequências de snapshots,
+latência simulada e uma varredura determinística do scan_market (sem rede)
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import logging
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+from core.binance_client import BinanceClient
+from core.binance_replay import (
+    ReplayBinanceClient, ReplayTransport, record_market_session, request_key
+)
+
+PAIRS = 40
+WORK_DIR = tempfile.mkdtemp(prefix='binance_replay_')
+
+
+class SyntheticUpstream:
+    """Responde os endpoints REST usados pelo sistema com dados sintéticos"""
+
+    def __init__(self, pairs: int, seed: int = 7):
+        self.symbols = [f'PAIR{i}USDT' for i in range(pairs)] + ['BTCUSDT']
+        self.rng = np.random.default_rng(seed)
+        self.price_calls = 0
+
+    def make_request(self, endpoint, method='GET', params=None, auth=False):
+        params = params or {}
+        if endpoint == '/fapi/v1/exchangeInfo':
+            return {'symbols': [{'symbol': s, 'status': 'TRADING', 'contractType': 'PERPETUAL'} for s in self.symbols]}
+        if endpoint == '/fapi/v1/leverageBracket':
+            return [{'symbol': s, 'brackets': [{'bracket': 1, 'initialLeverage': 75}]} for s in self.symbols]
+        if endpoint == '/fapi/v1/ticker/24hr':
+            return [{'symbol': s, 'volume': '1000000', 'lastPrice': str(100 + i), 'priceChangePercent': '1.5',
+                     'highPrice': str(105 + i), 'lowPrice': str(95 + i)} for i, s in enumerate(self.symbols)]
+        if endpoint == '/fapi/v1/ticker/price':
+            self.price_calls += 1
+            return [{'symbol': s, 'price': str(100 + i + self.price_calls)} for i, s in enumerate(self.symbols)]
+        if endpoint == '/fapi/v1/klines':
+            limit = int(params.get('limit', 100))
+            close = 100 * np.exp(np.cumsum(self.rng.normal(0, 0.01, limit)))
+            return [[i, c * 0.999, c * 1.005, c * 0.995, c, float(self.rng.integers(1_000, 100_000)), i]
+                    for i, c in enumerate(close.tolist())]
+        return None
+
+
+def _upstream_client(upstream: SyntheticUpstream) -> BinanceClient:
+    client = BinanceClient.__new__(BinanceClient)
+    client.use_binance_api = True
+    client.logger = logging.getLogger('binance_replay_test')
+    client.make_request = upstream.make_request
+    return client
+
+
+def test_record_and_replay() -> bool:
+    """Testa que a reprodução devolve exatamente o que foi gravado"""
+    print(f"💾 === TESTE DE GRAVAÇÃO E REPRODUÇÃO ({PAIRS} pares) ===")
+
+    upstream = SyntheticUpstream(PAIRS)
+    live = _upstream_client(upstream)
+    path = record_market_session(live, os.path.join(WORK_DIR, 'session.json.gz'), pairs=PAIRS,
+                                 price_snapshots=3, snapshot_interval=0)
+    print(f"   📦 Arquivo: {os.path.getsize(path) / 1024:.0f} KB")
+
+    replay = ReplayBinanceClient(ReplayTransport(path))
+    top_pairs = replay.get_top_pairs(limit=PAIRS)
+    assert len(top_pairs) == PAIRS
+
+    klines = replay.get_klines('PAIR3USDT', '1h', 100)
+    assert len(klines) == 100 and klines[0]['close'] > 0
+
+    # Snapshots sucessivos de preço são reproduzidos em ordem; o último se repete
+    snapshots = [replay.get_all_prices()['PAIR0USDT'] for _ in range(4)]
+    assert snapshots == [101.0, 102.0, 103.0, 103.0], snapshots
+
+    assert replay.get_klines('UNKNOWNUSDT', '1h', 100) == []
+    assert replay.transport.stats['misses'] == 1
+
+    # Parâmetros de assinatura não fazem parte da chave
+    assert request_key('/fapi/v1/leverageBracket', params={'timestamp': 1, 'signature': 'x'}) == \
+        request_key('/fapi/v1/leverageBracket')
+
+    print(f"   ✅ {replay.transport.stats['requests']} requisições reproduzidas offline")
+    return True
+
+
+def test_simulated_latency() -> bool:
+    """Testa latência fixa com jitter reprodutível"""
+    print("\n⏱️ === TESTE DE LATÊNCIA SIMULADA ===")
+
+    path = os.path.join(WORK_DIR, 'session.json.gz')
+    transport = ReplayTransport(path, latency_ms=20, jitter_ms=5, seed=1)
+    replay = ReplayBinanceClient(transport)
+
+    start = time.time()
+    for i in range(10):
+        replay.get_klines(f'PAIR{i}USDT', '4h', 100)
+    elapsed_ms = (time.time() - start) * 1000
+
+    simulated = transport.stats['simulated_latency_ms']
+    assert 150 <= simulated <= 250 and elapsed_ms >= simulated * 0.95, (simulated, elapsed_ms)
+
+    again = ReplayTransport(path, latency_ms=20, jitter_ms=5, seed=1)
+    ReplayBinanceClient(again).get_klines('PAIR0USDT', '4h', 100)
+    first = ReplayTransport(path, latency_ms=20, jitter_ms=5, seed=1)
+    ReplayBinanceClient(first).get_klines('PAIR0USDT', '4h', 100)
+    assert again.stats['simulated_latency_ms'] == first.stats['simulated_latency_ms']
+
+    print(f"   ✅ 10 requisições: {simulated:.0f}ms simulados, {elapsed_ms:.0f}ms medidos")
+    return True
+
+
+def test_deterministic_scan() -> bool:
+    """Testa que duas varreduras reproduzidas geram os mesmos pré-sinais"""
+    print("\n🔍 === TESTE DE VARREDURA DETERMINÍSTICA ===")
+
+    from test_logging_benchmark import FakeBTCSignalManager
+    from core.klines_cache import CacheManager
+    from core.scan_scheduler import AdaptiveScanScheduler
+    from core.technical_analysis import TechnicalAnalysis
+
+    class RecordingManager(FakeBTCSignalManager):
+        def __init__(self):
+            super().__init__()
+            self.signals = []
+
+        def add_pending_signal(self, signal):
+            self.signals.append((signal['symbol'], signal['type'], round(signal['quality_score'], 4)))
+            return super().add_pending_signal(signal)
+
+    path = os.path.join(WORK_DIR, 'session.json.gz')
+    results = []
+    for _ in range(2):
+        analyzer = TechnicalAnalysis.__new__(TechnicalAnalysis)
+        analyzer.config = {
+            'trend_timeframe': '4h', 'entry_timeframe': '1h', 'quality_score_minimum': 65.0,
+            'scan_interval': 60, 'pairs_update_interval': 1200, 'target_percentage_min': 6.0, 'max_pairs': PAIRS
+        }
+        analyzer.binance = ReplayBinanceClient(ReplayTransport(path, latency_ms=2))
+        analyzer.top_pairs = analyzer.binance.get_top_pairs(limit=PAIRS)
+        analyzer.all_usdt_pairs = list(analyzer.top_pairs)
+        analyzer.pairs_last_update = time.time()
+        analyzer.cache_manager = CacheManager()
+        analyzer.scan_scheduler = AdaptiveScanScheduler()
+        analyzer.btc_signal_manager = RecordingManager()
+
+        start = time.time()
+        analyzer.scan_market()
+        results.append((sorted(analyzer.btc_signal_manager.signals), time.time() - start))
+
+    assert results[0][0] == results[1][0]
+    print(f"   ✅ {len(results[0][0])} pré-sinais idênticos nas duas varreduras "
+          f"({results[0][1]:.2f}s / {results[1][1]:.2f}s)")
+    return True
+
+
+if __name__ == "__main__":
+    try:
+        ok = test_record_and_replay() and test_simulated_latency() and test_deterministic_scan()
+        print("\n✅ Todos os testes passaram!" if ok else "\n❌ Falhas nos testes")
+    finally:
+        shutil.rmtree(WORK_DIR, ignore_errors=True)
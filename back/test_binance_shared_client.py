@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste do BinanceClient Compartilhado
+Usa um servidor HTTP local no lugar da Binance para medir o tempo de
+inicialização (antes: um /fapi/v1/time bloqueante por componente; agora:
+nenhum), validar a sincronização de tempo só na primeira requisição
+assinada, o cache de respostas e o limitador de peso compartilhado
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault('USE_BINANCE_API', 'true')
+os.environ.setdefault('BINANCE_API_KEY', 'test-key')
+os.environ.setdefault('BINANCE_SECRET_KEY', 'test-secret')
+
+import json
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+from core.binance_client import BinanceClient, get_binance_client, set_binance_client
+from core.binance_limiter import RequestWeightLimiter, binance_limiter, request_weight
+
+TIME_LATENCY = 0.15
+COMPONENTS = 5  # TechnicalAnalysis, BTCSignalManager, SignalMonitoringSystem, binance_prices, app_supabase
+
+
+class FakeBinance(BaseHTTPRequestHandler):
+    calls: Counter = Counter()
+    rate_limited = 0
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body, headers=None):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        FakeBinance.calls[path] += 1
+        if path == '/fapi/v1/time':
+            time.sleep(TIME_LATENCY)
+            self._send(200, {'serverTime': int(time.time() * 1000) + 1500})
+        elif path == '/fapi/v1/ticker/24hr':
+            if FakeBinance.rate_limited:
+                FakeBinance.rate_limited -= 1
+                self._send(429, {'code': -1003}, {'Retry-After': '1'})
+                return
+            self._send(200, [{'symbol': 'BTCUSDT', 'volume': '10', 'lastPrice': '100', 'priceChangePercent': '1',
+                              'highPrice': '110', 'lowPrice': '90'}], {'X-MBX-USED-WEIGHT-1M': '120'})
+        elif path == '/fapi/v1/leverageBracket':
+            self._send(200, [{'symbol': 'BTCUSDT', 'brackets': [{'initialLeverage': 125}]}])
+        else:
+            self._send(404, {'code': -1})
+
+
+def _start_server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), FakeBinance)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd, f'http://127.0.0.1:{httpd.server_address[1]}'
+
+
+def _client(base_url: str) -> BinanceClient:
+    client = BinanceClient()
+    client.base_url = base_url
+    return client
+
+
+def test_cold_start(base_url: str) -> bool:
+    """Mede a inicialização antiga (sincronização por componente) contra o cliente compartilhado"""
+    print("⏱️ === TESTE DE INICIALIZAÇÃO ===")
+
+    FakeBinance.calls.clear()
+    start = time.perf_counter()
+    for _ in range(COMPONENTS):
+        _client(base_url)._init_time_offset()  # o que cada BinanceClient() fazia no construtor
+    legacy_s = time.perf_counter() - start
+    assert FakeBinance.calls['/fapi/v1/time'] == COMPONENTS
+
+    FakeBinance.calls.clear()
+    set_binance_client(None)
+    start = time.perf_counter()
+    clients = [get_binance_client() for _ in range(COMPONENTS)]
+    shared_s = time.perf_counter() - start
+    assert all(client is clients[0] for client in clients)
+    assert sum(FakeBinance.calls.values()) == 0, FakeBinance.calls
+
+    print(f"   ✅ {COMPONENTS} componentes: {legacy_s * 1000:.0f}ms → {shared_s * 1000:.1f}ms, "
+          f"nenhuma requisição na inicialização")
+    return True
+
+
+def test_lazy_time_sync_and_cache(base_url: str) -> bool:
+    """Testa sincronização só na primeira requisição assinada e o cache de respostas"""
+    print("\n🕒 === TESTE DA SINCRONIZAÇÃO ADIADA E DO CACHE ===")
+
+    FakeBinance.calls.clear()
+    client = _client(base_url)
+
+    first = client.get_24h_ticker_data(['BTCUSDT'])
+    second = client.get_24h_ticker_data(['BTCUSDT'])
+    assert first == second and FakeBinance.calls['/fapi/v1/ticker/24hr'] == 1
+    assert FakeBinance.calls['/fapi/v1/time'] == 0  # requisição pública não sincroniza
+    assert binance_limiter.get_stats()['used_weight'] >= 120  # sincronizado pelo cabeçalho
+
+    workers = [threading.Thread(target=client.get_leverage_brackets) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    assert FakeBinance.calls['/fapi/v1/time'] == 1, FakeBinance.calls
+    assert 1000 <= client.time_offset <= 2000, client.time_offset
+    assert client.get_leverage_brackets()['BTCUSDT'][0]['initialLeverage'] == 125
+    assert FakeBinance.calls['/fapi/v1/leverageBracket'] <= 4
+
+    print(f"   ✅ Uma sincronização (offset {client.time_offset}ms) para 5 chamadas assinadas; "
+          f"ticker 24h servido do cache")
+    return True
+
+
+def test_rate_limit(base_url: str) -> bool:
+    """Testa o limite de peso por janela e a suspensão em 429"""
+    print("\n🚦 === TESTE DO LIMITADOR DE PESO ===")
+
+    assert request_weight('/fapi/v1/klines', {'limit': 100}) == 2
+    assert request_weight('/fapi/v1/ticker/24hr') == 40 and request_weight('/fapi/v1/ticker/price') == 2
+
+    limiter = RequestWeightLimiter(weight_per_minute=5, window_seconds=0.5)
+    time.sleep(0.5 - time.time() % 0.5 + 0.01)  # começa no início de uma janela
+    assert sum(limiter.acquire(1) for _ in range(5)) == 0
+    waited = limiter.acquire(1)
+    assert 0.3 < waited < 0.6, waited
+
+    limiter.block_for(0.3)
+    assert limiter.acquire(1) >= 0.25
+
+    client = _client(base_url)
+    client._response_cache.clear()
+    FakeBinance.rate_limited = 1
+    start = time.perf_counter()
+    assert client.get_24h_ticker_data(['BTCUSDT'])
+    assert time.perf_counter() - start >= 0.9 and binance_limiter.get_stats()['blocks'] >= 1
+
+    print(f"   ✅ Espera de {waited * 1000:.0f}ms ao esgotar a janela; 429 respeitado com Retry-After")
+    return True
+
+
+if __name__ == "__main__":
+    server, url = _start_server()
+    try:
+        ok = test_cold_start(url) and test_lazy_time_sync_and_cache(url) and test_rate_limit(url)
+        print("\n✅ Todos os testes passaram!" if ok else "\n❌ Falhas nos testes")
+    finally:
+        server.shutdown()
+        set_binance_client(None)
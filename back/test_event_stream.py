@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste do Barramento de Eventos e do Stream SSE
+Valida publicação/assinatura sem bloqueio, o reenvio por Last-Event-ID, o
+limite de assinantes (503) e a autenticação de /api/events/stream por
+cabeçalho ou parâmetro 'token' (Flask test client, sem rede)
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import json
+
+from flask import Flask
+
+import api_routes.events as events_routes
+from api_routes.events import events_bp
+from core.event_bus import EventBus
+
+
+class _FakeDatabase:
+    users = {'user-token': {'username': 'user', 'is_admin': False}}
+
+    def get_user_by_token(self, token):
+        return self.users.get(token)
+
+
+class _FakeBot:
+    db = _FakeDatabase()
+
+
+def _parse_sse(chunk: str) -> dict:
+    """Converte um bloco SSE ('campo: valor' por linha) em dict"""
+    fields = {}
+    for line in chunk.strip().split('\n'):
+        name, _, value = line.partition(': ')
+        fields[name] = value
+    return fields
+
+
+def test_event_bus() -> bool:
+    """Testa publicação, fila limitada, replay e limite de assinantes do barramento"""
+    print("📡 === TESTE DO BARRAMENTO DE EVENTOS ===")
+
+    bus = EventBus(max_subscribers=2, max_queue=3, history_size=5)
+    first_id = bus.publish('signal_confirmed', {'symbol': 'BTCUSDT'})
+
+    subscription = bus.subscribe()
+    assert subscription.get(timeout=0.01) is None  # sem replay sem Last-Event-ID
+
+    for i in range(5):
+        bus.publish('monitoring_prices', {'seq': i})
+    # Fila cheia descarta os mais antigos sem bloquear quem publica
+    received = [subscription.get(timeout=0.01)['data']['seq'] for _ in range(3)]
+    assert received == [2, 3, 4] and subscription.dropped == 2, (received, subscription.dropped)
+
+    replay = bus.subscribe(last_event_id=first_id + 2)
+    replayed = [replay.get(timeout=0.01)['id'] for _ in range(3)]
+    assert replayed == [first_id + 3, first_id + 4, first_id + 5], replayed
+
+    assert bus.subscribe() is None
+    stats = bus.get_stats()
+    assert stats['subscribers'] == 2 and stats['rejected_subscriptions'] == 1, stats
+
+    bus.unsubscribe(replay)
+    assert bus.subscribe() is not None
+
+    print(f"   ✅ {stats['published']} eventos publicados, replay após {first_id + 2} e limite de 2 assinantes")
+    return True
+
+
+def test_stream_route() -> bool:
+    """Testa autenticação, framing SSE, Last-Event-ID e 503 no limite de conexões"""
+    print("\n🌐 === TESTE DA ROTA /api/events/stream ===")
+
+    bus = EventBus(max_subscribers=1)
+    original_bus = events_routes.event_bus
+    events_routes.event_bus = bus
+
+    app = Flask(__name__)
+    app.bot_instance = _FakeBot()
+    app.register_blueprint(events_bp)
+    client = app.test_client()
+
+    try:
+        assert client.get('/api/events/stream').status_code == 401
+        assert client.get('/api/events/stream?token=null').status_code == 401
+        assert client.get('/api/events/stream?token=wrong').status_code == 403
+        assert bus.get_stats()['subscribers'] == 0  # sem autenticação não ocupa vaga
+
+        event_ids = [bus.publish('signal_confirmed', {'symbol': f'COIN{i}USDT', 'entry_price': 1.5 + i})
+                     for i in range(3)]
+
+        response = client.get('/api/events/stream?token=user-token',
+                              headers={'Last-Event-ID': str(event_ids[0])}, buffered=False)
+        assert response.status_code == 200
+        assert response.mimetype == 'text/event-stream'
+        assert response.headers['Cache-Control'] == 'no-cache'
+
+        chunks = iter(response.response)
+        assert next(chunks).decode() == f"retry: {events_routes.RETRY_MS}\n\n"
+
+        replayed = [_parse_sse(next(chunks).decode()) for _ in range(2)]
+        assert [int(e['id']) for e in replayed] == event_ids[1:], replayed
+        assert replayed[0]['event'] == 'signal_confirmed'
+        assert json.loads(replayed[0]['data']) == {'symbol': 'COIN1USDT', 'entry_price': 2.5}
+
+        live_id = bus.publish('signal_expired', {'symbol': 'COIN9USDT'})
+        live = next(chunks).decode()
+        assert live.endswith('\n\n') and _parse_sse(live)['id'] == str(live_id), live
+
+        # Limite de assinantes atingido: cliente deve voltar ao polling
+        busy = client.get('/api/events/stream', headers={'Authorization': 'Bearer user-token'})
+        assert busy.status_code == 503 and busy.headers['Retry-After'] == '30'
+        assert busy.get_json()['success'] is False
+
+        response.close()
+        assert bus.get_stats()['subscribers'] == 0  # encerrar a conexão libera a vaga
+    finally:
+        events_routes.event_bus = original_bus
+
+    print("   ✅ 401/403 sem token válido, replay por Last-Event-ID, evento ao vivo e 503 no limite")
+    return True
+
+
+if __name__ == "__main__":
+    ok = test_event_bus() and test_stream_route()
+    print("\n✅ Todos os testes passaram!" if ok else "\n❌ Falhas nos testes")
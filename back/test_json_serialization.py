@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark de Serialização JSON
+Compara o pré-processamento recursivo antigo (make_serializable + jsonify) com
+o FastJSONProvider (json padrão e orjson, se instalado) em um payload no
+formato de /api/btc-signals/metrics, e garante que fora dessa rota o provider
+mantém o comportamento padrão do Flask
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import json
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+from flask import Flask, jsonify
+
+from core import json_provider
+from core.json_provider import init_json_provider, format_legacy_values
+
+ITERATIONS = 2000
+
+
+def _timeframe_analysis(seed: int) -> dict:
+    """Análise de timeframe no formato de BTCCorrelationAnalyzer.get_btc_analysis"""
+    rng = np.random.default_rng(seed)
+    return {
+        'trend': 'BULLISH',
+        'strength': np.float64(rng.random() * 100),
+        'ema_alignment': np.bool_(True),
+        'pivot_broken': np.bool_(False),
+        'momentum_aligned': np.bool_(True),
+        'rsi': np.float64(rng.random() * 100),
+        'macd': np.float64(rng.normal()),
+        'atr_percentage': np.float64(rng.random() * 3),
+        'ema_values': {'ema_20': np.float64(65000.5), 'ema_50': np.float64(64000.1), 'ema_200': np.float64(60000.9)},
+        'support_resistance': np.round(rng.random(10) * 70000, 2),
+        'volumes': [np.int64(v) for v in rng.integers(1_000, 1_000_000, 50)],
+        'candle_time': pd.Timestamp('2025-01-02 10:00:00'),
+    }
+
+
+def _metrics_payload() -> dict:
+    """Payload equivalente ao retornado por /api/btc-signals/metrics"""
+    return {
+        'success': True,
+        'data': {
+            'confirmation_metrics': {
+                'total_signals': 120, 'confirmed_signals': 45, 'rejected_signals': 60,
+                'pending_signals': 15, 'confirmation_rate': np.float64(42.86),
+                'average_confirmation_time_minutes': 7.5,
+                'confirmation_reasons': {f'REASON_{i}': np.int64(i * 3) for i in range(8)},
+                'rejection_reasons': {f'REASON_{i}': np.int64(i * 2) for i in range(8)}
+            },
+            'btc_analysis': {
+                'trend': 'BULLISH', 'strength': np.float64(71.3), 'momentum_aligned': np.bool_(True),
+                'volatility': np.float64(1.8), 'pivot_broken': False,
+                'timeframes': {'4h': _timeframe_analysis(1), '1h': _timeframe_analysis(2)}
+            },
+            'btc_price_data': {
+                'price': np.float64(65123.45), 'change_24h': np.float64(-1.23), 'volume_24h': np.float64(1.2e10),
+                'last_updated': datetime.now().strftime('%d/%m/%Y %H:%M:%S')
+            },
+            'system_status': {'btc_manager_active': True, 'last_updated': datetime.now().strftime('%d/%m/%Y %H:%M:%S')}
+        }
+    }
+
+
+def make_serializable(obj):
+    """Pré-processamento recursivo usado anteriormente na rota de métricas"""
+    if isinstance(obj, dict):
+        return {k: make_serializable(v) for k, v in obj.items()}
+    elif isinstance(obj, (list, tuple)):
+        return [make_serializable(item) for item in obj]
+    elif isinstance(obj, (np.integer, np.floating)):
+        return obj.item()
+    elif isinstance(obj, np.ndarray):
+        return obj.tolist()
+    elif isinstance(obj, (np.bool_, bool)):
+        return bool(obj)
+    elif isinstance(obj, (pd.Timestamp, datetime)):
+        return obj.strftime('%d/%m/%Y %H:%M:%S')
+    elif hasattr(obj, 'item'):
+        return obj.item()
+    elif isinstance(obj, (int, float, str, type(None))):
+        return obj
+    return str(obj)
+
+
+def _bench(app: Flask, build) -> float:
+    """Tempo médio (ms) para gerar a resposta dentro de um app context"""
+    payload = _metrics_payload()
+    with app.app_context():
+        build(payload)  # aquecimento
+        start = time.perf_counter()
+        for _ in range(ITERATIONS):
+            build(payload).get_data()
+        return (time.perf_counter() - start) / ITERATIONS * 1000
+
+
+def _provider_app(name: str, use_orjson: bool) -> Flask:
+    """App com o FastJSONProvider; o caminho orjson é lido a cada resposta"""
+    json_provider.USE_ORJSON = use_orjson
+    app = Flask(name)
+    init_json_provider(app)
+    return app
+
+
+def _backends() -> list:
+    """Caminhos do provider disponíveis neste ambiente"""
+    backends = [('json padrão', False)]
+    if json_provider.orjson is not None:
+        backends.append(('orjson', True))
+    return backends
+
+
+def test_serialization_benchmark() -> bool:
+    """Compara custo de serialização do payload de métricas"""
+    print(f"\n⚡ === BENCHMARK DE SERIALIZAÇÃO ({ITERATIONS} respostas) ===")
+
+    legacy_app = Flask('legacy')
+    legacy_ms = _bench(legacy_app, lambda p: jsonify(make_serializable(p)))
+    print(f"   📊 make_serializable + jsonify:        {legacy_ms:.3f}ms")
+
+    use_orjson = json_provider.USE_ORJSON
+    results = {}
+    try:
+        for name, enabled in _backends():
+            app = _provider_app(name, enabled)
+            results[name] = _bench(app, lambda p: jsonify(format_legacy_values(p)))
+            print(f"   📊 format_legacy_values + {name:<12} {results[name]:.3f}ms "
+                  f"({legacy_ms / results[name]:.1f}x)")
+    finally:
+        json_provider.USE_ORJSON = use_orjson
+
+    if json_provider.orjson is None:
+        print("   ⚠️ orjson não instalado - caminho opcional não medido")
+
+    assert results['json padrão'] < legacy_ms * 1.5, (legacy_ms, results)
+    return True
+
+
+def test_equivalent_output() -> bool:
+    """Garante que a rota de métricas mantém a saída do make_serializable"""
+    print("\n🔍 === TESTE DE EQUIVALÊNCIA (MÉTRICAS) ===")
+
+    payload = _metrics_payload()
+    payload['data']['btc_price_data']['updated_at'] = datetime(2025, 1, 2, 10, 30, 5)
+    payload['data']['btc_price_data']['tick_size'] = Decimal('0.01')  # antes caía no str()
+    legacy_output = json.loads(json.dumps(make_serializable(payload)))
+
+    use_orjson = json_provider.USE_ORJSON
+    try:
+        for name, enabled in _backends():
+            app = _provider_app('check', enabled)
+            with app.app_context():
+                provider_output = json.loads(jsonify(format_legacy_values(payload)).get_data())
+
+            assert provider_output == legacy_output, name
+            timeframes = provider_output['data']['btc_analysis']['timeframes']
+            assert timeframes['4h']['candle_time'] == '02/01/2025 10:00:00', timeframes['4h']['candle_time']
+            assert provider_output['data']['btc_price_data']['updated_at'] == '02/01/2025 10:30:05'
+            assert provider_output['data']['btc_price_data']['tick_size'] == '0.01'
+            print(f"   ✅ Saída idêntica ({name})")
+    finally:
+        json_provider.USE_ORJSON = use_orjson
+    return True
+
+
+@dataclass
+class _Quote:
+    symbol: str
+    price: float
+
+
+def test_flask_defaults() -> bool:
+    """Garante que as demais rotas mantêm o comportamento padrão do Flask"""
+    print("\n🧪 === TESTE DE COMPATIBILIDADE COM O FLASK ===")
+
+    payload = {
+        'zeta': 1,
+        'alpha': np.int64(2),
+        'created_at': datetime(2025, 1, 2, 10, 30, 5),
+        'quote': _Quote('BTCUSDT', 65000.5),
+        'tick_size': Decimal('0.01'),
+        'levels': np.array([1.5, 2.5]),
+        'ratio': np.float64(0.25)
+    }
+
+    default_app = Flask('default')
+    with default_app.app_context():
+        expected = json.loads(jsonify({k: v for k, v in payload.items()
+                                       if not isinstance(v, (np.generic, np.ndarray))}).get_data())
+        expected_keys = list(json.loads(jsonify({'zeta': 1, 'alpha': 2}).get_data(as_text=True)))
+
+    use_orjson = json_provider.USE_ORJSON
+    try:
+        for name, enabled in _backends():
+            app = _provider_app('defaults', enabled)
+            with app.app_context():
+                body = jsonify(payload).get_data(as_text=True)
+                nan_body = jsonify({'value': float('nan')}).get_data(as_text=True)
+            output = json.loads(body)
+
+            for key, value in expected.items():
+                assert output[key] == value, (name, key, output[key], value)
+            assert output['created_at'] == 'Thu, 02 Jan 2025 10:30:05 GMT', output['created_at']
+            assert output['quote'] == {'symbol': 'BTCUSDT', 'price': 65000.5}
+            assert output['alpha'] == 2 and output['ratio'] == 0.25 and output['levels'] == [1.5, 2.5]
+            assert list(output) == sorted(output) and expected_keys == ['alpha', 'zeta'], (name, list(output))
+            if not enabled:
+                assert nan_body.strip() == '{"value":NaN}', nan_body
+            print(f"   ✅ Datas HTTP, dataclasses, Decimal e chaves ordenadas como no Flask ({name})")
+    finally:
+        json_provider.USE_ORJSON = use_orjson
+    return True
+
+
+if __name__ == "__main__":
+    ok = test_equivalent_output() and test_flask_defaults() and test_serialization_benchmark()
+    print("\n✅ Todos os testes passaram!" if ok else "\n❌ Falhas nos testes")
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark do Logging no scan_market
+Mede o tempo de uma varredura de 100 pares com o pipeline de logging
+assíncrono em INFO (todas as linhas por símbolo), INFO com amostragem e
+desligado (WARNING). Klines sintéticos e BTCSignalManager falso, sem rede.
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import logging
+import statistics
+import time
+
+import numpy as np
+
+from core import logger as logger_module
+from core.klines_cache import CacheManager
+from core.scan_scheduler import AdaptiveScanScheduler
+from core.technical_analysis import TechnicalAnalysis
+
+PAIRS = 100
+ROUNDS = 5
+
+
+class FakeBinanceClient:
+    """Klines sintéticos (passeio aleatório) no formato de BinanceClient.get_klines"""
+
+    def get_klines(self, symbol, interval='1h', limit=100):
+        rng = np.random.default_rng(abs(hash((symbol, interval))) % (2 ** 32))
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, limit)))
+        return [
+            {'open_time': i, 'open': c * 0.999, 'high': c * 1.005, 'low': c * 0.995,
+             'close': c, 'volume': float(rng.integers(1_000, 100_000)), 'close_time': i}
+            for i, c in enumerate(close)
+        ]
+
+
+class FakeBTCAnalyzer:
+    def calculate_symbol_btc_correlation(self, symbol):
+        return 0.5
+
+    def get_current_btc_analysis(self):
+        return {'trend': 'NEUTRAL'}
+
+
+class FakeBTCSignalManager:
+    """Recebe os pré-sinais sem confirmar nada"""
+
+    def __init__(self):
+        self.btc_analyzer = FakeBTCAnalyzer()
+        self.pending = 0
+
+    def add_pending_signal(self, signal):
+        self.pending += 1
+        return ''
+
+    def get_confirmation_metrics(self):
+        return {'pending_signals': self.pending, 'confirmation_rate': 0.0, 'average_confirmation_time_minutes': 0.0}
+
+
+def _build_analyzer() -> TechnicalAnalysis:
+    analyzer = TechnicalAnalysis.__new__(TechnicalAnalysis)
+    analyzer.config = {
+        'trend_timeframe': '4h', 'entry_timeframe': '1h', 'quality_score_minimum': 65.0,
+        'scan_interval': 60, 'pairs_update_interval': 1200, 'target_percentage_min': 6.0, 'max_pairs': PAIRS
+    }
+    analyzer.top_pairs = [f'PAIR{i}USDT' for i in range(PAIRS)]
+    analyzer.all_usdt_pairs = list(analyzer.top_pairs)
+    analyzer.pairs_last_update = time.time()
+    analyzer.binance = FakeBinanceClient()
+    analyzer.cache_manager = CacheManager()
+    analyzer.scan_scheduler = AdaptiveScanScheduler()
+    analyzer.btc_signal_manager = FakeBTCSignalManager()
+    return analyzer
+
+
+def _median_scan(analyzer: TechnicalAnalysis) -> float:
+    durations = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        analyzer.scan_market()
+        durations.append(time.perf_counter() - start)
+        logger_module.stop_logging()  # espera a fila esvaziar entre rodadas
+    return statistics.median(durations) * 1000
+
+
+def test_scan_logging_overhead() -> bool:
+    """Compara o tempo de varredura com logging ligado, amostrado e desligado"""
+    print(f"📝 === BENCHMARK DE LOGGING NO SCAN ({PAIRS} pares, mediana de {ROUNDS}) ===")
+
+    # Saída do listener descartada para medir só o custo de quem loga
+    devnull = open(os.devnull, 'w')
+    original_stream = logger_module._router.console.setStream(devnull)
+    original_rate = logger_module.symbol_sampler.rate
+
+    analyzer = _build_analyzer()
+    analyzer.scan_market()  # aquecimento do cache de klines
+
+    try:
+        results = {}
+        for label, level, rate in (('INFO (todas as linhas)', logging.INFO, 1),
+                                   ('INFO (amostragem 1/10)', logging.INFO, 10),
+                                   ('desligado (WARNING)', logging.WARNING, 1)):
+            logger_module.set_module_level('core.technical_analysis', level)
+            logger_module.symbol_sampler.rate = rate
+            logger_module._ensure_listener()
+            results[label] = _median_scan(analyzer)
+            print(f"   📊 {label:<24} {results[label]:8.1f}ms")
+    finally:
+        logger_module._router.console.setStream(original_stream)
+        logger_module.symbol_sampler.rate = original_rate
+        logger_module.set_module_level('core.technical_analysis', logger_module.DEFAULT_LEVEL)
+        devnull.close()
+
+    on, off = results['INFO (todas as linhas)'], results['desligado (WARNING)']
+    print(f"   ✅ Custo do logging: {on - off:+.1f}ms por varredura ({(on - off) / PAIRS * 1000:+.1f}µs por par)")
+    assert logger_module.symbol_sampler.dropped > 0
+    return True
+
+
+def test_propagation_and_shutdown() -> bool:
+    """Testa que os registros chegam aos handlers do root e o atexit tolera stream fechado"""
+    print("\n🔌 === TESTE DE PROPAGAÇÃO E ENCERRAMENTO ===")
+
+    class Capture(logging.Handler):
+        def __init__(self):
+            super().__init__()
+            self.messages = []
+
+        def emit(self, record):
+            self.messages.append(record.getMessage())
+
+    capture = Capture()
+    root = logging.getLogger()
+    root.addHandler(capture)
+    closed = open(os.devnull, 'w')
+    original_stream = logger_module._router.console.setStream(closed)
+    try:
+        logger = logger_module.setup_logger('core.test_propagation')
+        logger.warning("⚠️ aviso %s", 'propagado')
+        assert capture.messages == ['⚠️ aviso propagado'], capture.messages
+
+        closed.close()  # como o stderr já fechado no fim do processo
+        logger.warning("depois do fechamento")
+        logger_module.stop_logging()
+    finally:
+        root.removeHandler(capture)
+        logger_module._router.console.stream = original_stream  # setStream faria flush no fechado
+        logger_module._ensure_listener()
+
+    print("   ✅ Registro propagado ao root; stop_logging sem erro com o stream fechado")
+    return True
+
+
+if __name__ == "__main__":
+    ok = test_scan_logging_overhead() and test_propagation_and_shutdown()
+    print("\n✅ Todos os testes passaram!" if ok else "\n❌ Falhas nos testes")
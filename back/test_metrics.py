@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste das Métricas por Etapa
+Valida o formato de exposição do Prometheus, o custo com métricas desligadas,
+os pontos instrumentados (cache de klines, indicadores, pontuação, Supabase,
+CSV) e a rota /metrics (Flask test client, sem rede)
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import shutil
+import tempfile
+import time
+
+import pandas as pd
+from flask import Flask
+
+from api_routes.metrics import metrics_bp
+from benchmarks.synthetic import build_client, build_technical_analysis, symbols_for
+from core.database import read_csv, write_csv
+from core.metrics import (
+    CACHE_LOOKUPS_TOTAL, CSV_IO_SECONDS, STAGE_SECONDS, SUPABASE_QUERY_SECONDS, MetricsRegistry, metrics_registry, timed
+)
+from core.supabase_client import SupabaseAccess
+
+
+def test_exposition_format() -> bool:
+    """Testa buckets cumulativos, soma/contagem, rótulos escapados e contadores"""
+    print("📊 === TESTE DO FORMATO PROMETHEUS ===")
+
+    registry = MetricsRegistry(enabled=True)
+    histogram = registry.histogram('demo_seconds', 'Demo', ('stage',), buckets=(0.1, 1.0))
+    counter = registry.counter('demo_total', 'Demo', ('result',))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value, 'a"b')
+    counter.inc('hit')
+    counter.inc('hit', amount=2)
+
+    text = registry.render()
+    for line in ('# TYPE demo_seconds histogram',
+                 'demo_seconds_bucket{stage="a\\"b",le="0.1"} 2',
+                 'demo_seconds_bucket{stage="a\\"b",le="1.0"} 3',
+                 'demo_seconds_bucket{stage="a\\"b",le="+Inf"} 4',
+                 'demo_seconds_sum{stage="a\\"b"} 3.65',
+                 'demo_seconds_count{stage="a\\"b"} 4',
+                 '# TYPE demo_total counter',
+                 'demo_total{result="hit"} 3'):
+        assert line in text.splitlines(), (line, text)
+
+    assert registry.histogram('demo_seconds', 'Demo', ('stage',)) is histogram
+    try:
+        registry.counter('demo_seconds', 'Demo')
+        return False
+    except ValueError:
+        pass
+
+    print("   ✅ Buckets cumulativos, +Inf, soma, contagem e escape de rótulos")
+    return True
+
+
+def test_disabled_overhead() -> bool:
+    """Testa que com o registro desligado nada é gravado e o custo é desprezível"""
+    print("\n⏱️ === TESTE DO CUSTO COM MÉTRICAS DESLIGADAS ===")
+
+    registry = MetricsRegistry(enabled=False)
+    histogram = registry.histogram('off_seconds', 'Off', ('stage',))
+
+    @timed(histogram, 'call')
+    def work():
+        return 1
+
+    calls = 200000
+    start = time.perf_counter()
+    for _ in range(calls):
+        histogram.observe(0.01, 'x')
+        with histogram.time('x'):
+            pass
+        work()
+    per_call_us = (time.perf_counter() - start) / calls * 1e6
+
+    assert histogram.snapshot() == {} and registry.render().count('_bucket') == 0
+    assert per_call_us < 5, per_call_us
+
+    registry.enable()
+    work()
+    assert histogram.snapshot()[('call',)]['count'] == 1
+
+    print(f"   ✅ Nenhuma série gravada; ~{per_call_us:.2f}µs por observe+time+decorator")
+    return True
+
+
+def test_instrumented_stages() -> bool:
+    """Testa os pontos instrumentados com o registro global ligado"""
+    print("\n🔍 === TESTE DOS PONTOS INSTRUMENTADOS ===")
+
+    work_dir = tempfile.mkdtemp(prefix='metrics_')
+    metrics_registry.enable()
+    metrics_registry.reset()
+    try:
+        analyzer = build_technical_analysis(build_client(5), 5)
+        for symbol in symbols_for(5):
+            analyzer.analyze_symbol(symbol)
+            analyzer.analyze_symbol(symbol)
+
+        stages = {labels[0]: value['count'] for labels, value in STAGE_SECONDS.snapshot().items()}
+        assert stages.get('trend_indicators') == 10 and stages.get('entry_indicators') == 10, stages
+        lookups = dict(((cache, result), value) for _, (cache, result), value in CACHE_LOOKUPS_TOTAL.samples())
+        assert lookups[('klines_4h', 'miss')] == 5 and lookups[('klines_4h', 'hit')] == 5, lookups
+
+        access = SupabaseAccess(url='http://localhost', key='x')
+        access._record('signals', 'select', 12.0, 0.0)
+        access._record('signals', 'select', 30.0, 0.0, error=True)
+        supabase = SUPABASE_QUERY_SECONDS.snapshot()
+        assert supabase[('signals', 'select', 'ok')]['count'] == 1
+        assert abs(supabase[('signals', 'select', 'error')]['sum'] - 0.03) < 1e-9
+
+        path = os.path.join(work_dir, 'users.csv')
+        write_csv(pd.DataFrame({'id': [1, 2]}), path, index=False)
+        assert list(read_csv(path)['id']) == [1, 2]
+        csv_io = CSV_IO_SECONDS.snapshot()
+        assert csv_io[('users.csv', 'write')]['count'] == 1 and csv_io[('users.csv', 'read')]['count'] == 1
+
+        text = metrics_registry.render()
+        assert 'pipeline_stage_duration_seconds_count{stage="trend_indicators"} 10' in text
+        print(f"   ✅ Etapas medidas: {sorted(stages)}")
+    finally:
+        metrics_registry.disable()
+        metrics_registry.reset()
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return True
+
+
+def test_metrics_route() -> bool:
+    """Testa a rota /metrics desligada, ligada e com token"""
+    print("\n🌐 === TESTE DA ROTA /metrics ===")
+
+    app = Flask(__name__)
+    app.register_blueprint(metrics_bp)
+    client = app.test_client()
+
+    assert client.get('/metrics').status_code == 404
+
+    metrics_registry.enable()
+    try:
+        STAGE_SECONDS.observe(0.2, 'scan')
+        response = client.get('/metrics')
+        assert response.status_code == 200
+        assert response.headers['Content-Type'].startswith('text/plain; version=0.0.4')
+        assert 'pipeline_stage_duration_seconds_count{stage="scan"} 1' in response.get_data(as_text=True)
+
+        os.environ['METRICS_TOKEN'] = 'segredo'
+        assert client.get('/metrics').status_code == 401
+        assert client.get('/metrics', headers={'Authorization': 'Bearer segredo'}).status_code == 200
+    finally:
+        os.environ.pop('METRICS_TOKEN', None)
+        metrics_registry.disable()
+        metrics_registry.reset()
+
+    print("   ✅ 404 desligada, 200 com formato 0.0.4, 401 sem token")
+    return True
+
+
+if __name__ == "__main__":
+    ok = test_exposition_format() and test_disabled_overhead() and test_instrumented_stages() and test_metrics_route()
+    print("\n✅ Todos os testes passaram!" if ok else "\n❌ Falhas nos testes")
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste da Paginação das Rotas de Monitoramento
+Percorre /signals/active, /signals/expired e /signals/simulation por cursor e
+valida ordenação, projeção de campos e estatísticas (sem acesso à rede)
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import shutil
+import tempfile
+import time
+from datetime import datetime
+
+STATE_DIR = tempfile.mkdtemp(prefix='monitoring_state_')
+os.environ['MONITORING_STATE_DIR'] = STATE_DIR
+
+from flask import Flask
+import api_routes.signal_monitoring as routes
+from core.response_cache import response_cache
+from core.signal_monitoring_system import SignalMonitoringSystem, MonitoredSignal
+
+
+def _build_system(active: int, expired: int) -> SignalMonitoringSystem:
+    system = SignalMonitoringSystem(binance_client=None, database=None)
+    now = datetime.now().strftime('%d/%m/%Y %H:%M:%S')
+    for i in range(active + expired):
+        signal = MonitoredSignal(
+            id=f'signal-{i}', symbol=f'PAIR{i}USDT', signal_type='COMPRA', entry_price=100.0,
+            target_price=110.0, created_at=now, confirmed_at=now, max_leverage=50, required_percentage=6.0
+        )
+        signal.simulation_current_value = 500.0 + (i * 37) % 3000
+        signal.max_profit_reached = float((i * 13) % 400)
+        signal.price_history.append(time.time(), 100.0, 0.0, 0.0)
+        system.monitored_signals[signal.id] = signal
+        system.active_by_value.insert(signal)
+
+    # Os primeiros `expired` sinais terminam o monitoramento
+    for i in range(expired):
+        system.monitored_signals[f'signal-{i}'].status = 'COMPLETED' if i % 2 else 'EXPIRED'
+    system._move_to_history([f'signal-{i}' for i in range(expired)])
+    return system
+
+
+def _walk(client, path: str, key: str, limit: int = 7):
+    """Percorre todas as páginas e retorna (itens, número de páginas)"""
+    items, pages, cursor = [], 0, None
+    while True:
+        url = f'{path}?limit={limit}' + (f'&cursor={cursor}' if cursor else '')
+        data = client.get(url).get_json()['data']
+        pages += 1
+        if key == 'expired':
+            items.extend(data['completed_signals'] + data['expired_signals'])
+        else:
+            items.extend(data['signals'])
+        cursor = data['next_cursor']
+        if not cursor:
+            return items, pages
+
+
+def test_pagination() -> bool:
+    """Testa que as páginas cobrem todos os sinais, em ordem, sem repetição"""
+    print("📄 === TESTE DE PAGINAÇÃO POR CURSOR ===")
+
+    routes.monitoring_system = _build_system(active=40, expired=20)
+    app = Flask(__name__)
+    app.register_blueprint(routes.signal_monitoring_bp)
+    client = app.test_client()
+
+    active, pages = _walk(client, '/api/signal-monitoring/signals/active', 'signals')
+    values = [s['simulation_current_value'] for s in active]
+    assert len(active) == 40 and len({s['id'] for s in active}) == 40
+    assert values == sorted(values, reverse=True)
+    assert 'price_history' not in active[0]
+    print(f"   ✅ Ativos: {len(active)} sinais em {pages} páginas, ordenados por valor")
+
+    simulation, pages = _walk(client, '/api/signal-monitoring/signals/simulation', 'signals')
+    values = [s['simulation']['current_value'] for s in simulation]
+    assert len(simulation) == 60 and values == sorted(values, reverse=True)
+    print(f"   ✅ Simulação: {len(simulation)} sinais em {pages} páginas")
+
+    expired, pages = _walk(client, '/api/signal-monitoring/signals/expired', 'expired', limit=6)
+    assert len(expired) == 20 and len({s['id'] for s in expired}) == 20
+    print(f"   ✅ Expirados: {len(expired)} sinais em {pages} páginas")
+    return True
+
+
+def test_projection_and_statistics() -> bool:
+    """Testa projeção de campos, histórico sob demanda e estatísticas completas"""
+    print("\n🔍 === TESTE DE PROJEÇÃO E ESTATÍSTICAS ===")
+
+    app = Flask(__name__)
+    app.register_blueprint(routes.signal_monitoring_bp)
+    client = app.test_client()
+
+    data = client.get('/api/signal-monitoring/signals/active?fields=symbol,current_profit&limit=3').get_json()['data']
+    assert set(data['signals'][0]) == {'id', 'symbol', 'current_profit'}, data['signals'][0]
+
+    data = client.get('/api/signal-monitoring/signals/active?include_history=1&limit=1').get_json()['data']
+    assert len(data['signals'][0]['price_history']) == 1
+
+    response = client.get('/api/signal-monitoring/signals/active?fields=password')
+    assert response.status_code == 400
+
+    stats = client.get('/api/signal-monitoring/signals/simulation?limit=1').get_json()['data']['statistics']
+    system = routes.monitoring_system
+    everything = list(system.monitored_signals.values()) + list(system.expired_signals.values())
+    assert stats['total_signals'] == 60 and stats['active_signals'] == 40
+    assert stats['completed_signals'] == 10
+    assert stats['total_current_value'] == round(sum(s.simulation_current_value for s in everything), 2)
+
+    print(f"   ✅ Projeção ok, estatísticas sobre {stats['total_signals']} sinais com página de 1")
+    return True
+
+
+def test_unpaginated_default() -> bool:
+    """Testa que sem limit/cursor as rotas devolvem todos os sinais (frontend não segue next_cursor)"""
+    print("\n📋 === TESTE DA LISTAGEM SEM PAGINAÇÃO ===")
+
+    active_count = routes.DEFAULT_PAGE_SIZE + 20
+    routes.monitoring_system = _build_system(active=active_count, expired=30)
+    response_cache.clear()
+    app = Flask(__name__)
+    app.register_blueprint(routes.signal_monitoring_bp)
+    client = app.test_client()
+
+    data = client.get('/api/signal-monitoring/signals/active').get_json()['data']
+    values = [s['simulation_current_value'] for s in data['signals']]
+    assert data['count'] == data['total'] == active_count and data['next_cursor'] is None
+    assert values == sorted(values, reverse=True)
+
+    data = client.get('/api/signal-monitoring/signals/simulation').get_json()['data']
+    assert len(data['signals']) == active_count + 30 and data['next_cursor'] is None
+
+    data = client.get('/api/signal-monitoring/signals/expired').get_json()['data']
+    assert len(data['completed_signals'] + data['expired_signals']) == 30 and data['next_cursor'] is None
+
+    # Simulação sem paginação: só os últimos expirados, estatísticas sobre a mesma janela
+    routes.monitoring_system = _build_system(active=10, expired=routes.SIMULATION_EXPIRED_WINDOW + 30)
+    response_cache.clear()
+    system = routes.monitoring_system
+    data = client.get('/api/signal-monitoring/signals/simulation').get_json()['data']
+    window = list(system.monitored_signals.values()) + list(system.expired_signals.values())[-routes.SIMULATION_EXPIRED_WINDOW:]
+    assert {s['id'] for s in data['signals']} == {s.id for s in window}
+    stats = data['statistics']
+    assert stats['total_signals'] == 10 + routes.SIMULATION_EXPIRED_WINDOW and stats['active_signals'] == 10
+    assert stats['completed_signals'] == sum(1 for s in window if s.status == 'COMPLETED')
+    assert stats['total_current_value'] == round(sum(s.simulation_current_value for s in window), 2)
+
+    # Com limit explícito a paginação continua valendo
+    data = client.get('/api/signal-monitoring/signals/simulation?limit=10').get_json()['data']
+    assert len(data['signals']) == 10 and data['next_cursor']
+
+    print(f"   ✅ {active_count} sinais sem paginação acima do tamanho padrão de página ({routes.DEFAULT_PAGE_SIZE})")
+    return True
+
+
+if __name__ == "__main__":
+    try:
+        ok = test_pagination() and test_projection_and_statistics() and test_unpaginated_default()
+        print("\n✅ Todos os testes passaram!" if ok else "\n❌ Falhas nos testes")
+    finally:
+        shutil.rmtree(STATE_DIR, ignore_errors=True)
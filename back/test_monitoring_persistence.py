@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste da Persistência do Monitoramento de Sinais
+Valida snapshot + deltas do SignalMonitoringSystem, o tempo de recarga com
+milhares de sinais e os agregados de estatísticas (diretório temporário, sem
+acesso à rede)
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import shutil
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+
+STATE_DIR = tempfile.mkdtemp(prefix='monitoring_state_')
+os.environ['MONITORING_STATE_DIR'] = STATE_DIR
+
+from core.signal_monitoring_system import SignalMonitoringSystem, MonitoredSignal
+
+SIGNAL_COUNT = 5000
+
+
+def _new_system() -> SignalMonitoringSystem:
+    return SignalMonitoringSystem(binance_client=None, database=None)
+
+
+def _populate(system: SignalMonitoringSystem) -> None:
+    now = datetime.now().strftime('%d/%m/%Y %H:%M:%S')
+    base = time.time()
+    for i in range(SIGNAL_COUNT):
+        signal = MonitoredSignal(
+            id=f'signal-{i}', symbol=f'PAIR{i}USDT', signal_type='COMPRA' if i % 2 else 'VENDA',
+            entry_price=100.0 + i, target_price=110.0 + i, created_at=now, confirmed_at=now,
+            max_leverage=50, required_percentage=6.0
+        )
+        for j in range(100):
+            signal.price_history.append(base + j * 300, 100.0 + i + j * 0.01, j * 0.01, j * 0.5)
+        if i % 10 == 0:
+            signal.status = 'EXPIRED'
+            system.expired_signals[signal.id] = signal
+        else:
+            system.monitored_signals[signal.id] = signal
+
+
+def test_snapshot_and_deltas() -> bool:
+    """Testa que snapshot + deltas restauram exatamente o estado salvo"""
+    print(f"💾 === TESTE DE SNAPSHOT + DELTAS ({SIGNAL_COUNT} sinais) ===")
+
+    system = _new_system()
+    _populate(system)
+    # Valores vindos de cálculos com NumPy/pandas: tipos preservados no snapshot...
+    system.monitored_signals['signal-4999'].max_leverage = np.int64(75)
+    system.monitored_signals['signal-4999'].current_profit = np.float32(2.5)
+    system._save_monitoring_state(force_snapshot=True)
+    # ...e nos deltas
+    system.monitored_signals['signal-2'].days_monitored = np.int64(4)
+    system.monitored_signals['signal-2'].last_updated = datetime(2025, 1, 2, 10, 30, 5)
+    print(f"   📊 Snapshot: {system.state_store.stats['last_snapshot_ms']}ms "
+          f"({system.state_store.get_stats()['snapshot_bytes'] / 1024 / 1024:.1f} MB)")
+
+    # Dois ciclos de atualização gravados apenas como delta
+    for cycle in range(2):
+        for signal in list(system.monitored_signals.values())[:500]:
+            signal.current_price += 1
+            signal.price_history.append(time.time() + cycle, signal.current_price, 1.0, 2.0)
+            system._dirty_ids.add(signal.id)
+        system._save_monitoring_state()
+
+    # Um sinal concluído move para expirados
+    completed = system.monitored_signals.pop('signal-1')
+    completed.status = 'COMPLETED'
+    system.expired_signals[completed.id] = completed
+    system._dirty_ids.add(completed.id)
+    system._save_monitoring_state()
+    print(f"   📊 Deltas pendentes: {system.state_store.get_stats()['deltas_since_snapshot']} "
+          f"({system.state_store.stats['last_delta_ms']}ms no último)")
+
+    start = time.time()
+    reloaded = _new_system()
+    elapsed = time.time() - start
+    print(f"   ⏱️ Recarga: {elapsed * 1000:.0f}ms (store: {reloaded.state_store.stats['last_load_ms']}ms)")
+
+    assert len(reloaded.monitored_signals) == len(system.monitored_signals)
+    assert len(reloaded.expired_signals) == len(system.expired_signals)
+    assert reloaded.expired_signals['signal-1'].status == 'COMPLETED'
+    for signal_id in ('signal-2', 'signal-3', 'signal-10', 'signal-4999'):
+        original = (system.monitored_signals.get(signal_id) or system.expired_signals[signal_id]).to_dict()
+        restored = (reloaded.monitored_signals.get(signal_id) or reloaded.expired_signals[signal_id]).to_dict()
+        assert original == restored, signal_id
+    assert elapsed < 1.0, elapsed
+
+    from_snapshot = reloaded.monitored_signals['signal-4999']
+    assert type(from_snapshot.max_leverage) is int and from_snapshot.max_leverage == 75
+    assert type(from_snapshot.current_profit) is float and from_snapshot.current_profit == 2.5
+    from_delta = reloaded.monitored_signals['signal-2']
+    assert type(from_delta.days_monitored) is int and from_delta.days_monitored == 4
+    assert from_delta.last_updated == datetime(2025, 1, 2, 10, 30, 5)
+
+    print("   ✅ Estado restaurado idêntico")
+    return True
+
+
+def test_incremental_history() -> bool:
+    """Testa que deltas após uma recarga continuam gravando só o histórico novo"""
+    print("\n🔁 === TESTE DE DELTA APÓS RECARGA ===")
+
+    system = _new_system()
+    signal = system.monitored_signals['signal-2']
+    before = len(signal.price_history)
+    signal.price_history.append(time.time(), 999.0, 9.0, 9.0)
+    system._dirty_ids.add(signal.id)
+    system._save_monitoring_state()
+
+    reloaded = _new_system()
+    history = reloaded.monitored_signals['signal-2'].price_history
+    assert len(history) == before == 100
+    assert history.to_array()[-1][1] == 999.0
+    assert history.appended == signal.price_history.appended
+
+    print(f"   ✅ {history.appended} entradas registradas, últimas {len(history)} mantidas")
+    return True
+
+
+def _brute_force_statistics(expired) -> dict:
+    """Cálculo direto sobre todos os expirados (formato anterior)"""
+    completed = [s for s in expired if s.status == 'COMPLETED']
+    profits = [s.max_profit_reached for s in completed if s.max_profit_reached > 0]
+    buys = [s for s in expired if s.signal_type == 'COMPRA']
+    return {
+        'total_evaluated_signals': len(expired),
+        'successful_signals': len(completed),
+        'overall_success_rate': round(len(completed) / len(expired) * 100, 2),
+        'average_successful_profit': round(sum(profits) / len(profits), 2) if profits else 0,
+        'max_profit_achieved': max(s.max_profit_reached for s in expired),
+        'buy_signals_count': len(buys),
+        'buy_signals_success_rate': round(len([s for s in buys if s.status == 'COMPLETED']) / len(buys) * 100, 2)
+    }
+
+
+def test_statistics_aggregates() -> bool:
+    """Testa que os agregados incrementais batem com o cálculo completo"""
+    print("\n📈 === TESTE DE AGREGADOS DE ESTATÍSTICAS ===")
+
+    system = _new_system()
+    for i, signal in enumerate(list(system.monitored_signals.values())[:2000]):
+        signal.days_monitored = i % 20
+        signal.max_profit_reached = float(i % 400)
+        if i % 3 == 0:
+            signal.current_profit = 350.0
+    system._check_completed_signals()
+    system._check_expired_signals()
+
+    expected = _brute_force_statistics(list(system.expired_signals.values()))
+
+    start = time.time()
+    for _ in range(1000):
+        stats = system.get_system_statistics()
+    elapsed_ms = (time.time() - start)
+    print(f"   ⏱️ get_system_statistics: {elapsed_ms:.3f}ms/chamada com {len(system.expired_signals)} expirados")
+
+    for key, value in expected.items():
+        assert stats[key] == value, (key, stats[key], value)
+
+    # Após recarga os agregados são reconstruídos a partir dos expirados
+    system._save_monitoring_state(force_snapshot=True)
+    reloaded = _new_system()
+    assert reloaded.get_system_statistics()['leverage_analysis'] == stats['leverage_analysis']
+
+    print(f"   ✅ {stats['successful_signals']}/{stats['total_evaluated_signals']} sucesso "
+          f"({stats['overall_success_rate']}%) igual ao cálculo completo")
+    return True
+
+
+def test_single_owner() -> bool:
+    """Testa que rotas e BTCSignalManager compartilham a instância (e o estado em disco)"""
+    print("\n🔒 === TESTE DE DONO ÚNICO DO ESTADO ===")
+
+    import api_routes.signal_monitoring as routes
+
+    state_dir = tempfile.mkdtemp(prefix='monitoring_owner_')
+    os.environ['MONITORING_STATE_DIR'] = state_dir
+    SignalMonitoringSystem._instance = None
+    try:
+        routes.init_signal_monitoring_routes(None, binance_client=None)
+        manager_side = SignalMonitoringSystem.get_instance(None)  # como em _add_to_monitoring_system
+        assert manager_side is routes.monitoring_system
+
+        now = datetime.now().strftime('%d/%m/%Y %H:%M:%S')
+        signal = MonitoredSignal(id='owner-1', symbol='OWNERUSDT', signal_type='COMPRA', entry_price=1.0,
+                                 target_price=1.1, created_at=now, confirmed_at=now, max_leverage=20,
+                                 required_percentage=6.0)
+        manager_side.monitored_signals[signal.id] = signal
+        manager_side._save_signal_to_database(signal)
+        routes.monitoring_system._save_monitoring_state(force_snapshot=True)
+
+        assert 'owner-1' in _new_system().monitored_signals
+    finally:
+        SignalMonitoringSystem._instance = None
+        os.environ['MONITORING_STATE_DIR'] = STATE_DIR
+        shutil.rmtree(state_dir, ignore_errors=True)
+
+    print("   ✅ Sinal adicionado pelo gerenciador sobrevive ao snapshot da rota")
+    return True
+
+
+if __name__ == "__main__":
+    try:
+        ok = (test_snapshot_and_deltas() and test_incremental_history() and test_statistics_aggregates()
+              and test_single_owner())
+        print("\n✅ Todos os testes passaram!" if ok else "\n❌ Falhas nos testes")
+    finally:
+        shutil.rmtree(STATE_DIR, ignore_errors=True)
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste da Varredura de Parâmetros
+Valida a expansão da grade, o sorteio reprodutível, que o pool de processos
+devolve exatamente o mesmo que run_backtest em série e a ordenação da tabela
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import shutil
+import tempfile
+
+import numpy as np
+
+from benchmarks.synthetic import synthetic_history
+from core.backtest import compute_features, load_features, run_backtest, save_features
+from core.parameter_sweep import (
+    format_table, grid_parameter_sets, random_parameter_sets, rank_results, run_sweep
+)
+
+WORK_DIR = tempfile.mkdtemp(prefix='parameter_sweep_')
+
+
+def test_parameter_sets() -> bool:
+    """Testa grade, sorteio e validação dos nomes"""
+    print("🔍 === TESTE DOS CONJUNTOS DE PARÂMETROS ===")
+
+    grid = grid_parameter_sets({'min_breakout_percentage': [0.3, 0.5], 'max_confirmation_attempts': [6, 12, 24]})
+    assert len(grid) == 6 and {'min_breakout_percentage': 0.5, 'max_confirmation_attempts': 24} in grid
+
+    space = {'min_volume_increase': (1.0, 2.0), 'max_confirmation_attempts': (6, 48),
+             'quality_score_minimum': [65.0, 70.0]}
+    first, second = random_parameter_sets(space, 20, seed=7), random_parameter_sets(space, 20, seed=7)
+    assert first == second
+    assert all(isinstance(p['max_confirmation_attempts'], int) and 1.0 <= p['min_volume_increase'] <= 2.0
+               for p in first)
+
+    try:
+        grid_parameter_sets({'min_breakout': [0.5]})
+        return False
+    except ValueError:
+        pass
+
+    print(f"   ✅ Grade com {len(grid)} conjuntos, sorteio reprodutível e nomes validados")
+    return True
+
+
+def test_parallel_matches_serial() -> bool:
+    """Testa que o pool (features mapeadas em memória) reproduz run_backtest em série"""
+    print("\n🔬 === TESTE DA VARREDURA PARALELA ===")
+
+    features = compute_features(synthetic_history(pairs=20, hours=2000, seed=11))
+
+    path = save_features(features, os.path.join(WORK_DIR, 'features'))
+    loaded = load_features(path)
+    assert isinstance(loaded['quality_score'], np.memmap) and loaded['symbols'] == features['symbols']
+    assert run_backtest(loaded)['overall'] == run_backtest(features)['overall']
+
+    parameter_sets = grid_parameter_sets({'quality_score_minimum': [65.0, 75.0],
+                                          'min_breakout_percentage': [0.3, 1.0],
+                                          'max_confirmation_attempts': [12, 36]})
+    parallel = run_sweep(features, parameter_sets, workers=2)
+    serial = run_sweep(features, parameter_sets, workers=1)
+    assert parallel == serial
+
+    for params, row in zip(parameter_sets, parallel):
+        overall = run_backtest(features, params)['overall']
+        assert row['confirmed'] == overall['confirmed'] and row['hit_rate_confirmed'] == overall['hit_rate_confirmed']
+
+    print(f"   ✅ {len(parallel)} conjuntos idênticos em 2 processos e em série")
+    return True
+
+
+def test_ranking() -> bool:
+    """Testa a ordenação: conjuntos com poucos confirmados ficam no fim"""
+    print("\n📊 === TESTE DA TABELA ORDENADA ===")
+
+    rows = [
+        {'min_breakout_percentage': 0.3, 'signals': 100, 'confirmed': 60, 'confirmation_rate': 60.0,
+         'hit_rate_confirmed': 40.0},
+        {'min_breakout_percentage': 0.5, 'signals': 100, 'confirmed': 40, 'confirmation_rate': 40.0,
+         'hit_rate_confirmed': 55.0},
+        {'min_breakout_percentage': 1.0, 'signals': 100, 'confirmed': 5, 'confirmation_rate': 5.0,
+         'hit_rate_confirmed': 90.0},
+        {'min_breakout_percentage': 2.0, 'signals': 100, 'confirmed': 0, 'confirmation_rate': 0.0,
+         'hit_rate_confirmed': None}
+    ]
+    table = rank_results(rows, min_confirmed=30)
+    assert list(table['min_breakout_percentage']) == [0.5, 0.3, 1.0, 2.0], table
+    assert list(table.index) == [1, 2, 3, 4]
+    assert list(rank_results(rows, rank_by='confirmation_rate')['min_breakout_percentage'])[:2] == [0.3, 0.5]
+
+    print(format_table(table))
+    print("   ✅ Ordenação por acerto dos confirmados, com amostra mínima")
+    return True
+
+
+if __name__ == "__main__":
+    try:
+        ok = test_parameter_sets() and test_parallel_matches_serial() and test_ranking()
+        print("\n✅ Todos os testes passaram!" if ok else "\n❌ Falhas nos testes")
+    finally:
+        shutil.rmtree(WORK_DIR, ignore_errors=True)
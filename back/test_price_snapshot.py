@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste do Snapshot Compartilhado de Preços
+Valida que requisições concorrentes geram uma única chamada à Binance por
+intervalo, a busca em lote via ?symbols= e a idade do snapshot (cliente falso,
+sem acesso à rede)
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+os.environ['USE_BINANCE_API'] = 'false'
+
+import threading
+import time
+
+from flask import Flask
+
+import api_routes.binance_prices as routes
+from core.price_snapshot import PriceSnapshot
+
+
+class FakeBinanceClient:
+    """Simula /fapi/v1/ticker/price com latência e contagem de chamadas"""
+
+    use_binance_api = True
+
+    def __init__(self, latency: float = 0.1):
+        self.latency = latency
+        self.calls = 0
+        self.fail = False
+
+    def get_all_prices(self):
+        self.calls += 1
+        time.sleep(self.latency)
+        if self.fail:
+            return {}
+        return {f'PAIR{i}USDT': 100.0 + i for i in range(600)} | {'BTCUSDT': 65000.0, 'ETHUSDT': 3200.0}
+
+
+def _client_for(snapshot: PriceSnapshot, fake: FakeBinanceClient):
+    routes.binance_client = fake
+    routes.price_snapshot = snapshot
+    app = Flask(__name__)
+    app.register_blueprint(routes.binance_prices_bp)
+    return app
+
+
+def test_single_upstream_call() -> bool:
+    """Testa 50 usuários simultâneos com uma chamada à Binance"""
+    print("📡 === TESTE DE CHAMADA ÚNICA POR INTERVALO (50 requisições) ===")
+
+    fake = FakeBinanceClient()
+    app = _client_for(PriceSnapshot(fake, refresh_interval=1.0), fake)
+    results = []
+
+    def worker():
+        with app.test_client() as client:
+            results.append(client.get('/api/binance/prices').get_json()['count'])
+
+    threads = [threading.Thread(target=worker) for _ in range(50)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert fake.calls == 1 and results == [602] * 50, (fake.calls, set(results))
+    print(f"   ✅ 50 respostas com {results[0]} preços e {fake.calls} chamada à Binance")
+
+    time.sleep(1.1)
+    app.test_client().get('/api/binance/prices')
+    assert fake.calls == 2
+    print("   ✅ Snapshot atualizado após o intervalo")
+    return True
+
+
+def test_batch_lookup_and_age() -> bool:
+    """Testa ?symbols=, rota de símbolo único, idade e fallback para snapshot anterior"""
+    print("\n🔍 === TESTE DE BUSCA EM LOTE E IDADE ===")
+
+    fake = FakeBinanceClient(latency=0)
+    client = _client_for(PriceSnapshot(fake, refresh_interval=0.2, max_stale=5), fake).test_client()
+
+    data = client.get('/api/binance/prices?symbols=btcusdt, ETHUSDT,XYZUSDT').get_json()
+    assert data['prices'] == {'BTCUSDT': 65000.0, 'ETHUSDT': 3200.0}
+    assert data['missing'] == ['XYZUSDT'] and data['age_ms'] is not None
+
+    single = client.get('/api/binance/price/ethusdt').get_json()
+    assert single['success'] and single['price'] == 3200.0
+    assert client.get('/api/binance/price/XYZUSDT').status_code == 404
+
+    # Falha na atualização: serve o snapshot anterior enquanto não passar de max_stale
+    fake.fail = True
+    time.sleep(0.3)
+    data = client.get('/api/binance/prices?symbols=BTCUSDT').get_json()
+    assert data['success'] and data['age_ms'] >= 300, data
+
+    stats = client.get('/api/binance/prices/status').get_json()['data']
+    assert stats['refresh_errors'] >= 1 and stats['symbols'] == 602
+    print(f"   ✅ Lote ok, snapshot anterior servido com {data['age_ms']}ms após falha")
+    return True
+
+
+if __name__ == "__main__":
+    ok = test_single_upstream_call() and test_batch_lookup_and_age()
+    print("\n✅ Todos os testes passaram!" if ok else "\n❌ Falhas nos testes")
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste do Cache de Respostas
+Valida TTL por rota, recomputação single-flight sob concorrência, chaves por
+query string e estatísticas de hit ratio (Flask test client, sem rede)
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import threading
+import time
+
+from flask import Flask, jsonify, request
+
+from core.response_cache import ResponseCache
+
+
+def _build_app(cache: ResponseCache, calls: dict, delay: float = 0.0) -> Flask:
+    app = Flask(__name__)
+
+    @app.route('/api/slow')
+    @cache.cached(ttl=1)
+    def slow_route():
+        calls['slow'] = calls.get('slow', 0) + 1
+        time.sleep(delay)
+        return jsonify({'value': calls['slow'], 'symbols': request.args.get('symbols')})
+
+    @app.route('/api/failing')
+    @cache.cached(ttl=60)
+    def failing_route():
+        calls['failing'] = calls.get('failing', 0) + 1
+        return jsonify({'error': 'indisponível'}), 500
+
+    return app
+
+
+def test_ttl_and_keys() -> bool:
+    """Testa expiração por TTL, chaves por query string e erros não cacheados"""
+    print("⏱️ === TESTE DE TTL E CHAVES ===")
+
+    cache, calls = ResponseCache(use_redis=False), {}
+    client = _build_app(cache, calls).test_client()
+
+    first = client.get('/api/slow')
+    second = client.get('/api/slow')
+    assert first.headers['X-Cache'] == 'MISS' and second.headers['X-Cache'] == 'HIT'
+    assert first.get_json() == second.get_json() and calls['slow'] == 1
+
+    # Ordem dos parâmetros não muda a chave; valores diferentes sim
+    client.get('/api/slow?symbols=BTCUSDT&x=1')
+    assert client.get('/api/slow?x=1&symbols=BTCUSDT').headers['X-Cache'] == 'HIT'
+    assert client.get('/api/slow?symbols=ETHUSDT').get_json()['symbols'] == 'ETHUSDT'
+    assert calls['slow'] == 3
+
+    time.sleep(1.1)
+    assert client.get('/api/slow').headers['X-Cache'] == 'MISS' and calls['slow'] == 4
+
+    for _ in range(3):
+        assert client.get('/api/failing').status_code == 500
+    assert calls['failing'] == 3
+
+    print(f"   ✅ TTL respeitado, {calls['slow']} recomputações, erros nunca cacheados")
+    return True
+
+
+def test_single_flight() -> bool:
+    """Testa que requisições concorrentes numa chave expirada recalculam uma vez"""
+    print("\n🔒 === TESTE DE SINGLE-FLIGHT (50 requisições concorrentes) ===")
+
+    cache, calls = ResponseCache(use_redis=False), {}
+    app = _build_app(cache, calls, delay=0.2)
+    results = []
+
+    def worker():
+        with app.test_client() as client:
+            results.append(client.get('/api/slow').get_json()['value'])
+
+    threads = [threading.Thread(target=worker) for _ in range(50)]
+    start = time.time()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.time() - start
+
+    stats = cache.get_stats()['routes']['slow_route']
+    assert calls['slow'] == 1 and set(results) == {1}, (calls, set(results))
+    assert stats['misses'] == 1 and stats['hits'] + stats['coalesced'] == 49
+    print(f"   📊 {stats['coalesced']} aguardaram o cálculo em andamento, {stats['hits']} hits diretos")
+    print(f"   ✅ 1 recomputação para 50 requisições em {elapsed * 1000:.0f}ms "
+          f"(hit ratio {stats['hit_ratio']:.0%})")
+    return True
+
+
+if __name__ == "__main__":
+    ok = test_ttl_and_keys() and test_single_flight()
+    print("\n✅ Todos os testes passaram!" if ok else "\n❌ Falhas nos testes")
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste do Escalonador Adaptativo de Escaneamento
+Valida as faixas de prioridade (pontuação do ciclo anterior, ATR e ticker 24h),
+a frequência de reanálise por faixa e, sobre o mercado sintético, a cobertura
+efetiva por peso de API em comparação com a varredura completa
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from benchmarks.synthetic import build_client, build_technical_analysis
+from core.binance_limiter import binance_limiter, request_lane, request_weight
+from core.scan_scheduler import AdaptiveScanScheduler
+
+PAIRS = 30
+CYCLES = 8
+
+
+def test_tiers() -> bool:
+    """Testa a classificação e a frequência de reanálise de cada faixa"""
+    print("🎯 === TESTE DAS FAIXAS DE PRIORIDADE ===")
+
+    scheduler = AdaptiveScanScheduler(quality_score_minimum=65.0)
+    pairs = ['NEARUSDT', 'VOLATILEUSDT', 'ACTIVEUSDT', 'MIDUSDT', 'FLATUSDT']
+
+    assert scheduler.select(pairs) == pairs  # nunca analisados: todos entram
+    scheduler.record_score('NEARUSDT', 60.0, 0.005)       # 5 pts do mínimo
+    scheduler.record_score('VOLATILEUSDT', 30.0, 0.03)    # ATR alto
+    scheduler.record_score('ACTIVEUSDT', 30.0, 0.005)
+    scheduler.record_score('MIDUSDT', 50.0, 0.005)
+    scheduler.record_score('FLATUSDT', 20.0, 0.002)
+    scheduler.update_ticker({
+        'ACTIVEUSDT': {'volume': 5e9, 'volatility': 12.0},
+        'NEARUSDT': {'volume': 1e6, 'volatility': 2.0},
+        'VOLATILEUSDT': {'volume': 1e6, 'volatility': 2.0},
+        'MIDUSDT': {'volume': 1e5, 'volatility': 1.0},
+        'FLATUSDT': {'volume': 1e4, 'volatility': 0.5}
+    })
+    tiers = {symbol: scheduler.tier_for(symbol) for symbol in pairs}
+    assert tiers == {'NEARUSDT': 'hot', 'VOLATILEUSDT': 'hot', 'ACTIVEUSDT': 'hot',
+                     'MIDUSDT': 'warm', 'FLATUSDT': 'cold'}, tiers
+
+    scanned = {symbol: 0 for symbol in pairs}
+    for _ in range(CYCLES):
+        selected = scheduler.select(pairs)
+        assert selected[:3] == ['NEARUSDT', 'VOLATILEUSDT', 'ACTIVEUSDT']
+        for symbol in selected:
+            scanned[symbol] += 1
+        scheduler.finish_cycle(weight_spent=4 * len(selected))
+    assert scanned == {'NEARUSDT': 8, 'VOLATILEUSDT': 8, 'ACTIVEUSDT': 8, 'MIDUSDT': 4, 'FLATUSDT': 2}, scanned
+
+    report = scheduler.get_stats()['last_cycle']
+    assert report['effective_coverage_pct'] == 100.0 and report['by_tier']['hot']['scanned'] == 3
+
+    # Ticker vazio (falha na consulta) não apaga a atividade nem adia a nova consulta
+    scheduler.config['ticker_refresh_interval'] = 0.5
+    scheduler.update_ticker({})
+    assert scheduler.tier_for('ACTIVEUSDT') == 'hot' and scheduler.tier_for('MIDUSDT') == 'warm'
+    scheduler._ticker_updated_at -= 1
+    scheduler.update_ticker({})
+    assert scheduler.needs_ticker_refresh()
+
+    # Par frio que se aproxima do mínimo sobe para hot no ciclo seguinte
+    scheduler.record_score('FLATUSDT', 58.0, 0.002)
+    assert scheduler.tier_for('FLATUSDT') == 'hot'
+
+    print(f"   ✅ Reanálises em {CYCLES} ciclos: {scanned}")
+    return True
+
+
+def _run_cycles(adaptive: bool):
+    """Roda CYCLES varreduras no mercado sintético contando o peso da faixa scan"""
+    client = build_client(PAIRS)
+    request = client.transport.request
+
+    def weighted_request(endpoint, method='GET', params=None):
+        binance_limiter.acquire(request_weight(endpoint, params))
+        return request(endpoint, method, params)
+
+    client.transport.request = weighted_request
+    analyzer = build_technical_analysis(client, PAIRS)
+
+    weight_before = binance_limiter.get_stats()['lanes']['scan']['weight']
+    for _ in range(CYCLES):
+        # Ciclos espaçados além do TTL do cache de klines: toda análise vai à API
+        for cache in (analyzer.cache_manager.klines_1h, analyzer.cache_manager.klines_4h):
+            cache.clear()
+        # Confirmações no mesmo processo não contam como peso da varredura
+        with request_lane('confirmation'):
+            binance_limiter.acquire(10)
+        with request_lane('scan'):
+            analyzer.scan_market(adaptive=adaptive)
+    return analyzer, binance_limiter.get_stats()['lanes']['scan']['weight'] - weight_before
+
+
+def test_weight_per_coverage() -> bool:
+    """Compara peso gasto e cobertura efetiva com a varredura completa"""
+    print("\n📊 === TESTE DE COBERTURA POR PESO DE API ===")
+
+    _, full_weight = _run_cycles(adaptive=False)
+    analyzer, adaptive_weight = _run_cycles(adaptive=True)
+
+    stats = analyzer.scan_scheduler.get_stats()
+    report = stats['last_cycle']
+    assert stats['totals']['cycles'] == CYCLES
+    assert stats['totals']['weight_spent'] == adaptive_weight, (stats['totals'], adaptive_weight)
+    assert report['effective_coverage_pct'] == 100.0
+    assert report['by_tier']['hot']['scanned'] == report['by_tier']['hot']['pairs']
+    assert adaptive_weight < full_weight, (adaptive_weight, full_weight)
+
+    full_per_100 = PAIRS * CYCLES / full_weight * 100
+    adaptive_per_100 = PAIRS * CYCLES / adaptive_weight * 100
+    print(f"   ✅ {CYCLES} ciclos x {PAIRS} pares: peso {full_weight} → {adaptive_weight} "
+          f"({full_per_100:.1f} → {adaptive_per_100:.1f} pares cobertos/100 de peso), "
+          f"faixas no último ciclo {report['by_tier']}")
+    return True
+
+
+if __name__ == "__main__":
+    ok = test_tiers() and test_weight_per_coverage()
+    print("\n✅ Todos os testes passaram!" if ok else "\n❌ Falhas nos testes")
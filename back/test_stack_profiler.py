@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste do Profiler por Amostragem
+Valida que as pilhas de threads de fundo aparecem no formato collapsed, o
+limite de um perfil por vez, a sobrecarga limitada e a rota
+/api/debug/profile restrita a administradores (Flask test client, sem rede)
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import threading
+import time
+
+from flask import Flask
+
+from api_routes.debug import debug_bp
+from core.stack_profiler import MAX_OVERHEAD, ProfilerBusyError, sample_stacks, to_collapsed, top_functions
+
+_stop = threading.Event()
+
+
+def busy_confirmation_loop():
+    while not _stop.is_set():
+        sum(i * i for i in range(2000))
+
+
+def idle_monitoring_loop():
+    while not _stop.is_set():
+        _stop.wait(0.05)
+
+
+def _start_workers():
+    _stop.clear()
+    workers = [threading.Thread(target=busy_confirmation_loop, name='confirmation-loop', daemon=True),
+               threading.Thread(target=idle_monitoring_loop, name='monitoring-loop', daemon=True)]
+    for worker in workers:
+        worker.start()
+    return workers
+
+
+def test_sampling() -> bool:
+    """Testa amostragem de todas as threads, formato collapsed e filtro por nome"""
+    print("🔍 === TESTE DA AMOSTRAGEM DE PILHAS ===")
+
+    workers = _start_workers()
+    try:
+        profile = sample_stacks(duration=1.0, interval_ms=10)
+        filtered = sample_stacks(duration=0.3, interval_ms=10, thread_filter='monitoring')
+    finally:
+        _stop.set()
+        for worker in workers:
+            worker.join()
+
+    assert 20 <= profile['samples'] <= 110, profile['samples']
+    assert {'confirmation-loop', 'monitoring-loop'} <= set(profile['threads'])
+    assert profile['overhead_pct'] <= MAX_OVERHEAD * 100 + 1, profile['overhead_pct']
+
+    collapsed = to_collapsed(profile['stacks'])
+    busy = [line for line in collapsed.splitlines() if line.startswith('confirmation-loop;')]
+    assert busy and all('busy_confirmation_loop (test_stack_profiler.py:' in line for line in busy)
+    assert all(line.rsplit(' ', 1)[1].isdigit() for line in collapsed.splitlines())
+
+    top = {row['function'].split(' ')[0]: row for row in top_functions(profile['stacks'])}
+    assert top['busy_confirmation_loop']['total'] >= profile['threads']['confirmation-loop'] * 0.9
+
+    assert set(filtered['threads']) == {'monitoring-loop'}, filtered['threads']
+
+    print(f"   ✅ {profile['samples']} amostras, {len(profile['stacks'])} pilhas distintas, "
+          f"sobrecarga {profile['overhead_pct']}%")
+    return True
+
+
+def test_single_profile() -> bool:
+    """Testa que um segundo perfil simultâneo é recusado"""
+    print("\n🚦 === TESTE DE PERFIL ÚNICO ===")
+
+    runner = threading.Thread(target=sample_stacks, args=(0.5, 10))
+    runner.start()
+    time.sleep(0.1)
+    try:
+        sample_stacks(0.1)
+        return False
+    except ProfilerBusyError:
+        pass
+    finally:
+        runner.join()
+
+    assert sample_stacks(0.1)['samples'] > 0
+    print("   ✅ Perfil concorrente recusado; liberado ao terminar")
+    return True
+
+
+def test_non_finite() -> bool:
+    """Testa que nan/inf são recusados sem prender o perfil"""
+    print("\n⚠️ === TESTE DE VALORES NÃO FINITOS ===")
+
+    for duration, interval_ms in ((float('nan'), 10), (float('inf'), 10), (0.2, float('nan')), (0.2, float('-inf'))):
+        try:
+            sample_stacks(duration, interval_ms)
+            return False
+        except ValueError:
+            pass
+
+    start = time.perf_counter()
+    assert sample_stacks(0.1)['samples'] > 0  # lock liberado
+    assert time.perf_counter() - start < 1.0
+
+    print("   ✅ nan/inf recusados; próximo perfil roda normalmente")
+    return True
+
+
+class _FakeDatabase:
+    users = {'admin-token': {'username': 'admin', 'is_admin': True},
+             'user-token': {'username': 'user', 'is_admin': False}}
+
+    def get_user_by_token(self, token):
+        return self.users.get(token)
+
+
+class _FakeBot:
+    db = _FakeDatabase()
+
+
+def test_profile_route() -> bool:
+    """Testa a rota: 401 sem token, 403 para não-admin, collapsed e json para admin"""
+    print("\n🌐 === TESTE DA ROTA /api/debug/profile ===")
+
+    app = Flask(__name__)
+    app.bot_instance = _FakeBot()
+    app.register_blueprint(debug_bp, url_prefix='/api/debug')
+    client = app.test_client()
+
+    assert client.get('/api/debug/profile').status_code == 401
+    assert client.get('/api/debug/profile', headers={'Authorization': 'Bearer user-token'}).status_code == 403
+
+    admin = {'Authorization': 'Bearer admin-token'}
+    response = client.get('/api/debug/profile?seconds=0.3', headers=admin)
+    assert response.status_code == 200 and 'attachment' in response.headers['Content-Disposition']
+    assert int(response.headers['X-Profile-Samples']) > 0
+
+    response = client.get('/api/debug/profile?seconds=0.2&format=json', headers=admin)
+    body = response.get_json()
+    assert response.status_code == 200 and body['samples'] > 0 and 'collapsed' in body
+    assert client.get('/api/debug/profile?seconds=x', headers=admin).status_code == 400
+    for query in ('seconds=nan', 'seconds=inf', 'seconds=-inf', 'interval_ms=nan'):
+        start = time.perf_counter()
+        assert client.get(f'/api/debug/profile?{query}', headers=admin).status_code == 400, query
+        assert time.perf_counter() - start < 1.0
+    assert client.get('/api/debug/profile?seconds=0.1&format=json', headers=admin).status_code == 200
+
+    print("   ✅ Autenticação, arquivo collapsed e resumo json")
+    return True
+
+
+if __name__ == "__main__":
+    ok = test_sampling() and test_single_profile() and test_non_finite() and test_profile_route()
+    print("\n✅ Todos os testes passaram!" if ok else "\n❌ Falhas nos testes")
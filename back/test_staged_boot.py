@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste da Inicialização em Estágios
+Valida que /api/health responde enquanto os subsistemas aquecem em fundo,
+o relatório de prontidão por estágio em /api/ready e o orçamento de tempo de
+importação do app_supabase (sem carregar pandas/ta/binance/supabase no import)
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import threading
+import time
+
+from flask import Flask, jsonify
+from werkzeug.test import Client
+
+from core.staged_boot import (BootTracker, StagedBootApp, check_import_budget,
+                              BUILD_STAGE, DEFAULT_IMPORT_BUDGET_MS, FAILED, PENDING, READY)
+
+
+def test_tracker() -> bool:
+    """Testa estados, durações e falha de estágio"""
+    print("⏱️ === TESTE DO REGISTRO DE ESTÁGIOS ===")
+
+    tracker = BootTracker()
+    tracker.add_stages(['bot', 'blueprints'])
+    assert [stage['state'] for stage in tracker.get_status()['stages']] == [PENDING, PENDING]
+
+    assert tracker.run_stage('bot', lambda: time.sleep(0.05) or 'bot') == 'bot'
+
+    def broken():
+        raise RuntimeError('supabase indisponível')
+
+    assert tracker.run_stage('blueprints', broken) is None
+    status = tracker.get_status()
+    assert status['phase'] == 'starting' and not status['ready']
+    stages = {stage['name']: stage for stage in status['stages']}
+    assert stages['bot']['state'] == READY and stages['bot']['duration_ms'] >= 50
+    assert stages['blueprints']['state'] == FAILED and 'supabase' in stages['blueprints']['error']
+
+    tracker.mark_finished()
+    tracker.mark_finished()
+    status = tracker.get_status()
+    assert status['ready'] and status['phase'] == 'degraded' and status['failed_stages'] == ['blueprints']
+
+    print(f"   ✅ Estágios registrados; falha vira fase degraded em {status['boot_seconds']}s")
+    return True
+
+
+def _full_app(tracker: BootTracker, release: threading.Event) -> Flask:
+    """Monta um app completo lento, como o create_app com os subsistemas pesados"""
+    app = Flask(__name__)
+
+    def build_subsystems():
+        release.wait(5)
+
+    tracker.run_stage('bot', build_subsystems)
+
+    @app.route('/api/health')
+    def health():
+        return jsonify({'status': 'healthy', 'phase': tracker.get_status()['phase']})
+
+    @app.route('/api/ready')
+    def ready():
+        status = tracker.get_status()
+        return jsonify(status), 200 if status['ready'] else 503
+
+    @app.route('/api/signals/public')
+    def signals():
+        return jsonify({'success': True, 'signals': []})
+
+    tracker.run_stage('blueprints', lambda: None)
+    tracker.mark_finished()
+    return app
+
+
+def test_staged_app() -> bool:
+    """Testa respostas durante o aquecimento e a troca para o app completo"""
+    print("\n🌐 === TESTE DO APP EM ESTÁGIOS ===")
+
+    tracker = BootTracker()
+    release = threading.Event()
+    staged = StagedBootApp(tracker)
+    tracker.add_stages(['bot', 'blueprints'])
+    thread = tracker.start_background(lambda: _full_app(tracker, release), on_ready=staged.set_target)
+    client = Client(staged)
+    while tracker.get_status()['stages'][0]['state'] != 'running':
+        time.sleep(0.01)
+
+    start = time.perf_counter()
+    health = client.get('/api/health')
+    health_ms = (time.perf_counter() - start) * 1000
+    assert health.status_code == 200 and health.json['phase'] == 'starting'
+
+    ready = client.get('/api/ready')
+    assert ready.status_code == 503 and not ready.json['ready']
+    assert {stage['name']: stage['state'] for stage in ready.json['stages']}['bot'] == 'running'
+
+    busy = client.get('/api/signals/public')
+    assert busy.status_code == 503 and busy.headers['Retry-After']
+    assert busy.headers['Access-Control-Allow-Origin'] == '*'
+
+    release.set()
+    thread.join(5)
+    assert client.get('/api/ready').status_code == 200
+    assert client.get('/api/signals/public').json['success']
+    assert client.get('/api/health').json['phase'] == 'ready'
+
+    print(f"   ✅ /api/health em {health_ms:.1f}ms durante o aquecimento; app completo assume ao final")
+    return True
+
+
+def test_build_failure() -> bool:
+    """Testa que a falha da montagem em fundo vira fase failed e nunca ready"""
+    print("\n💥 === TESTE DE FALHA NA MONTAGEM ===")
+
+    tracker = BootTracker()
+    staged = StagedBootApp(tracker)
+    tracker.add_stages(['bot', 'blueprints'])
+
+    def build():
+        tracker.run_stage('bot', lambda: 'bot')
+        tracker.run_stage('blueprints', lambda: None)
+        tracker.mark_finished()  # como o create_app: ignorado até o app ser entregue
+        raise RuntimeError('rota duplicada')
+
+    tracker.start_background(build, on_ready=staged.set_target).join(5)
+    status = tracker.get_status()
+    assert not status['ready'] and not tracker.is_ready() and status['phase'] == 'failed', status
+    assert status['failed_stages'] == [BUILD_STAGE]
+    assert {stage['name']: stage for stage in status['stages']}[BUILD_STAGE]['error'] == 'rota duplicada'
+
+    client = Client(staged)
+    assert client.get('/api/ready').status_code == 503
+    health = client.get('/api/health')
+    assert health.status_code == 503 and health.json['phase'] == 'failed'
+    busy = client.get('/api/signals/public')
+    assert busy.status_code == 503 and busy.json['phase'] == 'failed'
+
+    # Montagem que não devolve o app também não pode marcar a inicialização como pronta
+    tracker = BootTracker()
+    tracker.start_background(lambda: None, on_ready=StagedBootApp(tracker).set_target).join(5)
+    assert tracker.get_status()['phase'] == 'failed' and not tracker.is_ready()
+
+    print(f"   ✅ Falha registrada no estágio '{BUILD_STAGE}'; /api/health e /api/ready respondem 503")
+    return True
+
+
+def test_import_budget() -> bool:
+    """Testa que importar o app_supabase não carrega módulos pesados e cabe no orçamento"""
+    print("\n📊 === TESTE DO ORÇAMENTO DE IMPORTAÇÃO ===")
+
+    report = check_import_budget('app_supabase', DEFAULT_IMPORT_BUDGET_MS)
+    assert not report['heavy_modules'], report['heavy_modules']
+    assert report['ok'], report['violations']
+
+    print(f"   ✅ import app_supabase: {report['total_ms']:.0f}ms (orçamento {report['budget_ms']:.0f}ms), "
+          "sem pandas/ta/binance/supabase")
+    return True
+
+
+if __name__ == "__main__":
+    ok = test_tracker() and test_staged_app() and test_build_failure() and test_import_budget()
+    print("\n✅ Todos os testes passaram!" if ok else "\n❌ Falhas nos testes")
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste da Camada de Acesso ao Supabase
+Valida cliente compartilhado, limite de concorrência e métricas usando o
+servidor local supabase_standin (sem acesso à rede)
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import threading
+import time
+
+from supabase_standin import SupabaseStandIn
+from core.supabase_client import SupabaseAccess
+
+
+def test_shared_client_and_queries(server: SupabaseStandIn) -> bool:
+    """Testa select/insert/delete reaproveitando um único cliente"""
+    print("🔍 === TESTE DE CONSULTAS COM CLIENTE COMPARTILHADO ===")
+
+    access = SupabaseAccess(server.url, server.key)
+    server.seed('signals', [
+        {'symbol': 'BTCUSDT', 'type': 'COMPRA', 'status': 'CONFIRMED', 'confirmed_at': '2025-01-02T10:00:00'},
+        {'symbol': 'ETHUSDT', 'type': 'VENDA', 'status': 'CONFIRMED', 'confirmed_at': '2025-01-02T11:00:00'},
+        {'symbol': 'SOLUSDT', 'type': 'COMPRA', 'status': 'PENDING', 'confirmed_at': None},
+    ])
+
+    result = access.execute('signals', 'select_confirmed',
+                            lambda t: t.select('*').eq('status', 'CONFIRMED').order('confirmed_at', desc=True))
+    symbols = [row['symbol'] for row in result.data]
+    print(f"   📊 Confirmados: {symbols}")
+    assert symbols == ['ETHUSDT', 'BTCUSDT'], symbols
+
+    access.execute('signals', 'insert', lambda t: t.insert({'symbol': 'XRPUSDT', 'type': 'COMPRA', 'status': 'OPEN'}))
+    access.execute('signals', 'delete', lambda t: t.delete().eq('status', 'PENDING'))
+
+    count = access.execute('signals', 'count', lambda t: t.select('id', count='exact'))
+    print(f"   📊 Total após insert/delete: {count.count}")
+    assert count.count == 3, count.count
+
+    metrics = access.get_metrics()
+    assert metrics['clients_created'] == 1, metrics
+    assert metrics['operations']['signals.select_confirmed']['calls'] == 1
+    print(f"   ✅ Cliente criado {metrics['clients_created']}x para {sum(m['calls'] for m in metrics['operations'].values())} consultas")
+    return True
+
+
+def test_bounded_concurrency(server: SupabaseStandIn) -> bool:
+    """Testa que no máximo max_concurrency consultas executam ao mesmo tempo"""
+    print("\n⚡ === TESTE DE CONCORRÊNCIA LIMITADA ===")
+
+    access = SupabaseAccess(server.url, server.key, max_concurrency=2)
+    server.latency = 0.05
+    server.peak_in_flight = 0
+
+    threads = [threading.Thread(target=access.execute, args=('signals', 'select', lambda t: t.select('id')))
+               for _ in range(8)]
+    start = time.time()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    server.latency = 0.0
+
+    metrics = access.get_metrics()['operations']['signals.select']
+    print(f"   ⏱️ 8 consultas em {time.time() - start:.2f}s | pico simultâneo: {server.peak_in_flight} | espera média: {metrics['avg_wait_ms']}ms")
+    assert server.peak_in_flight <= 2, server.peak_in_flight
+    assert metrics['calls'] == 8
+    return True
+
+
+def test_cleanup_batches(server: SupabaseStandIn) -> bool:
+    """Testa a limpeza com paginação e deletes em lote (sem um round trip por linha)"""
+    print("\n🧹 === TESTE DE LIMPEZA EM LOTES ===")
+
+    from core.signal_cleanup import SignalCleanup
+
+    server.tables['signals'] = []
+    server.seed('signals', [
+        {'symbol': f'PAIR{i}USDT', 'status': 'REJECTED' if i % 2 else 'PENDING', 'created_at': '2020-01-01T00:00:00+00:00'}
+        for i in range(2500)
+    ] + [
+        {'symbol': 'KEEPUSDT', 'status': 'CONFIRMED', 'created_at': '2999-01-01T00:00:00+00:00'}
+    ])
+
+    cleanup = SignalCleanup()
+    cleanup.supabase = SupabaseAccess(server.url, server.key)
+    requests_before = len(server.requests)
+    cleanup.cleanup_old_signals()
+
+    report = cleanup.get_system_status()['last_cleanup']
+    phase = report['phases']['pending_rejected']
+    print(f"   📊 Removidos: {phase['deleted']} em {phase['pages']} páginas / {phase['batches']} lotes "
+          f"| requisições: {len(server.requests) - requests_before}")
+    assert phase['deleted'] == 2500, phase
+    assert report['remaining'] == 1, report
+    assert len(server.requests) - requests_before < 40
+    return True
+
+
+if __name__ == "__main__":
+    server = SupabaseStandIn().start()
+    try:
+        ok = (test_shared_client_and_queries(server) and test_bounded_concurrency(server)
+              and test_cleanup_batches(server))
+        print("\n✅ Todos os testes passaram!" if ok else "\n❌ Falhas nos testes")
+    finally:
+        server.stop()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste da Fila de Entrega do Telegram
+Valida que enfileirar não bloqueia mesmo com o Telegram lento, o agrupamento
+de rajadas em lotes, retry com backoff e as métricas (notifier falso, sem rede)
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import time
+
+from core.telegram_notifier import TelegramDeliveryQueue, TELEGRAM_MAX_MESSAGE_LENGTH
+
+
+class FakeNotifier:
+    """Simula sendMessage com latência e falhas programadas"""
+
+    def __init__(self, latency: float = 0.0, failures: int = 0, status: str = 'retry'):
+        self.latency = latency
+        self.failures = failures
+        self.status = status
+        self.posts = []
+
+    def _post_message(self, message: str):
+        time.sleep(self.latency)
+        if self.failures > 0:
+            self.failures -= 1
+            return False, self.status == 'retry', None
+        self.posts.append(message)
+        return True, False, None
+
+
+def _wait_idle(delivery: TelegramDeliveryQueue, timeout: float = 10.0) -> None:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        metrics = delivery.get_metrics()
+        if metrics['queue_depth'] == 0 and \
+                metrics['delivered_messages'] + metrics['failed_messages'] + metrics['dropped'] == metrics['enqueued']:
+            return
+        time.sleep(0.05)
+    raise AssertionError(delivery.get_metrics())
+
+
+def test_non_blocking_and_coalescing() -> bool:
+    """Testa rajada de confirmações com Telegram lento (1s por envio)"""
+    print("📤 === TESTE DE ENFILEIRAMENTO E AGRUPAMENTO ===")
+
+    notifier = FakeNotifier(latency=1.0)
+    delivery = TelegramDeliveryQueue(notifier, coalesce_window=0.3, max_batch=10)
+
+    start = time.time()
+    for i in range(12):
+        assert delivery.enqueue(f"<b>PAIR{i}USDT</b>\n🟢 COMPRA")
+    enqueue_ms = (time.time() - start) * 1000
+    assert enqueue_ms < 50, enqueue_ms
+
+    _wait_idle(delivery)
+    metrics = delivery.get_metrics()
+    assert metrics['delivered_messages'] == 12 and metrics['delivered_batches'] == 2
+    assert len(notifier.posts) == 2 and 'PAIR11USDT' in notifier.posts[1]
+
+    print(f"   ✅ 12 confirmações enfileiradas em {enqueue_ms:.2f}ms (envio leva 1s cada)")
+    print(f"   📊 {len(notifier.posts)} chamadas ao Telegram, latência média {metrics['avg_latency_ms']:.0f}ms")
+    delivery.stop()
+    return True
+
+
+def test_retry_split_and_overflow() -> bool:
+    """Testa retry com backoff, divisão por tamanho e descarte com fila cheia"""
+    print("\n🔁 === TESTE DE RETRY, TAMANHO E FILA CHEIA ===")
+
+    notifier = FakeNotifier(failures=2)
+    delivery = TelegramDeliveryQueue(notifier, coalesce_window=0.1, backoff_base=0.05)
+    delivery.enqueue('sinal com falhas temporárias')
+    _wait_idle(delivery)
+    assert delivery.get_metrics()['retries'] == 2 and notifier.posts == ['sinal com falhas temporárias']
+
+    notifier = FakeNotifier(failures=1, status='fatal')
+    delivery = TelegramDeliveryQueue(notifier, coalesce_window=0.1, backoff_base=0.05)
+    delivery.enqueue('sinal rejeitado pela API')
+    _wait_idle(delivery)
+    assert delivery.get_metrics()['failed_messages'] == 1 and delivery.get_metrics()['retries'] == 0
+    print("   ✅ Erros temporários reenviados, erros definitivos descartados")
+
+    chunks = TelegramDeliveryQueue._build_chunks([(0.0, 'x' * 3000), (0.0, 'y' * 3000), (0.0, 'z' * 10)])
+    assert len(chunks) == 2 and all(len(text) <= TELEGRAM_MAX_MESSAGE_LENGTH for text, _ in chunks)
+    assert [len(items) for _, items in chunks] == [1, 2]
+
+    # Primeiro envio do lote rejeitado: só as mensagens dele contam como falha
+    notifier = FakeNotifier(failures=1, status='fatal')
+    delivery = TelegramDeliveryQueue(notifier, coalesce_window=0.3, backoff_base=0.05)
+    for message in ('x' * 3000, 'y' * 3000, 'z' * 10):
+        delivery.enqueue(message)
+    _wait_idle(delivery)
+    metrics = delivery.get_metrics()
+    assert metrics['failed_messages'] == 1 and metrics['delivered_messages'] == 2, metrics
+    assert notifier.posts == ['y' * 3000 + '\n\n' + 'z' * 10]
+    print("   ✅ Lote dividido em 2 envios: falha do primeiro não descarta o segundo")
+
+    notifier = FakeNotifier(latency=0.5)
+    delivery = TelegramDeliveryQueue(notifier, max_size=5, coalesce_window=0.0, max_batch=1)
+    for i in range(20):
+        delivery.enqueue(f'msg-{i}')
+    _wait_idle(delivery)
+    metrics = delivery.get_metrics()
+    assert metrics['dropped'] > 0 and notifier.posts[-1] == 'msg-19'
+    print(f"   ✅ Fila limitada: {metrics['dropped']} descartadas, mais recentes entregues")
+    return True
+
+
+if __name__ == "__main__":
+    ok = test_non_blocking_and_coalescing() and test_retry_split_and_overflow()
+    print("\n✅ Todos os testes passaram!" if ok else "\n❌ Falhas nos testes")
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste da Compactação de Tokens
+Valida a remoção de tokens expirados/duplicados/usados dos CSVs e que o índice
+em memória de auth_tokens.csv é invalidado pelas escritas do Database, mesmo
+quando a reescrita mantém o tamanho e o mtime do arquivo
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import shutil
+import tempfile
+import uuid
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from core.database import Database
+from core.token_compactor import TokenCompactor, get_auth_token_index
+
+
+class TempTokenDatabase(Database):
+    """Database apenas com os arquivos de tokens, num diretório temporário"""
+
+    def __init__(self, directory: str):
+        self.auth_tokens_file = os.path.join(directory, 'auth_tokens.csv')
+        self.password_reset_tokens_file = os.path.join(directory, 'password_reset_tokens.csv')
+        self.files_to_check = {
+            self.auth_tokens_file: ['token', 'user_id', 'created_at', 'expires_at'],
+            self.password_reset_tokens_file: ['user_id', 'token', 'expiration_time', 'used']
+        }
+        self._ensure_files_exist()
+
+
+def test_compaction(directory: str) -> bool:
+    """Testa a remoção de tokens expirados, duplicados e de redefinição usados"""
+    print("🔑 === TESTE DE COMPACTAÇÃO DOS TOKENS ===")
+
+    db = TempTokenDatabase(directory)
+    now = datetime.now()
+    valid, expired = str(uuid.uuid4()), str(uuid.uuid4())
+    pd.DataFrame([
+        {'token': valid, 'user_id': '1', 'created_at': now.isoformat(),
+         'expires_at': (now + timedelta(hours=1)).isoformat()},
+        {'token': valid, 'user_id': '1', 'created_at': now.isoformat(),
+         'expires_at': (now + timedelta(hours=2)).isoformat()},
+        {'token': expired, 'user_id': '2', 'created_at': now.isoformat(),
+         'expires_at': (now - timedelta(minutes=1)).isoformat()}
+    ]).to_csv(db.auth_tokens_file, index=False)
+
+    fmt = '%Y-%m-%d %H:%M:%S'
+    pd.DataFrame([
+        {'user_id': '1', 'token': 'reset-ok', 'expiration_time': (now + timedelta(hours=1)).strftime(fmt), 'used': False},
+        {'user_id': '1', 'token': 'reset-used', 'expiration_time': (now + timedelta(hours=1)).strftime(fmt), 'used': True},
+        {'user_id': '2', 'token': 'reset-old', 'expiration_time': (now - timedelta(hours=1)).strftime(fmt), 'used': False}
+    ]).to_csv(db.password_reset_tokens_file, index=False)
+
+    index = get_auth_token_index(db.auth_tokens_file)
+    assert index.lookup(valid) == '1' and index.lookup(expired) is None
+    assert index.get_stats()['expired_tokens'] == 1
+
+    compactor = TokenCompactor(interval=60)
+    compactor.db = db
+    report = compactor.run_compaction()
+    assert report['auth_tokens']['removed'] == 2 and report['auth_tokens']['after'] == 1, report
+    assert report['password_reset_tokens']['removed'] == 2, report
+
+    auth = pd.read_csv(db.auth_tokens_file)
+    assert list(auth['token']) == [valid]
+    assert pd.to_datetime(auth['expires_at'].iloc[0]) > now + timedelta(minutes=90)  # mantém o mais recente
+    assert list(pd.read_csv(db.password_reset_tokens_file)['token']) == ['reset-ok']
+
+    stats = index.get_stats()
+    assert stats['indexed_tokens'] == 1 and stats['expired_tokens'] == 0, stats
+    assert index.lookup(valid) == '1'
+
+    print(f"   ✅ Removidos {report['auth_tokens']['removed']} auth e "
+          f"{report['password_reset_tokens']['removed']} de redefinição; índice com {stats['indexed_tokens']} token")
+    return True
+
+
+def test_index_invalidation(directory: str) -> bool:
+    """Testa que um token revogado por reescrita de mesmo tamanho e mtime não é mais aceito"""
+    print("\n♻️ === TESTE DE INVALIDAÇÃO DO ÍNDICE ===")
+
+    db = TempTokenDatabase(directory)
+    index = get_auth_token_index(db.auth_tokens_file)
+    expires_at = datetime.now().replace(microsecond=0) + timedelta(hours=1)
+
+    old_token = str(uuid.uuid4())
+    assert db.save_auth_token(old_token, 7, expires_at)
+    assert index.lookup(old_token) == '7'
+    stat = os.stat(db.auth_tokens_file)
+
+    # Novo login do mesmo usuário substitui o token: mesmo tamanho de arquivo
+    new_token = str(uuid.uuid4())
+    assert db.save_auth_token(new_token, 7, expires_at)
+    # Simula a resolução grosseira do mtime (ex.: sistemas de arquivos com 1-2s)
+    os.utime(db.auth_tokens_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert os.stat(db.auth_tokens_file).st_size == stat.st_size
+
+    reloads = index.reloads
+    assert index.lookup(old_token) is None, 'token revogado ainda aceito'
+    assert index.lookup(new_token) == '7'
+    assert index.reloads == reloads + 1
+
+    # Remoção explícita também invalida
+    assert db.remove_auth_token(new_token)
+    os.utime(db.auth_tokens_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert index.lookup(new_token) is None
+
+    # Sem escrita, as consultas seguintes não releem o CSV
+    reloads = index.reloads
+    for _ in range(100):
+        index.lookup(new_token)
+    assert index.reloads == reloads
+
+    print(f"   ✅ Token revogado rejeitado após reescrita de {stat.st_size} bytes com o mesmo mtime")
+    return True
+
+
+if __name__ == "__main__":
+    compaction_dir = tempfile.mkdtemp(prefix='token_compaction_')
+    invalidation_dir = tempfile.mkdtemp(prefix='token_index_')
+    try:
+        ok = test_compaction(compaction_dir) and test_index_invalidation(invalidation_dir)
+        print("\n✅ Todos os testes passaram!" if ok else "\n❌ Falhas nos testes")
+    finally:
+        shutil.rmtree(compaction_dir, ignore_errors=True)
+        shutil.rmtree(invalidation_dir, ignore_errors=True)